@@ -0,0 +1,152 @@
+# executor.py
+"""Place the bot's orders on one follower account, in that account's executor process.
+
+Each executor owns one MT5 terminal session, logged in to its account, and
+answers the fan-out's requests (accounts/fanout.py) one at a time:
+
+    ("open", order id, signal)            size from this account's balance, send
+    ("breakeven", bot's ticket, pip value)  stop to this account's entry +1 pip
+
+Each position carries the bot's ticket in its comment (``link_comment``), so
+a breakeven finds this account's position for the one the bot moved from
+the terminal itself, across executor and bot restarts.
+"""
+import logging
+import os
+import queue
+import time
+from multiprocessing import parent_process
+
+import MetaTrader5 as mt5
+
+from config import Config
+from risk.risk_manager import RiskManager
+from trading.trade_manager import TradeManager
+
+
+def link_comment(ticket):
+    """Order comment tying a follower position to the bot's position ``ticket``."""
+    return f"SMC_F{ticket}"
+
+
+class AccountExecutor:
+    """Places the bot's orders on one account, through this process's MT5 session.
+
+    Each order is sized here: ``RiskManager`` reads this session's balance
+    (and this process's Config, with the account's overrides), so accounts
+    of different sizes trade proportionate volumes. The account's own
+    exposure cap (MAX_OPEN_LOTS over its positions) is checked before
+    sending. Every request is answered on the shared reply queue with
+    ``(account name, kind, order id, result)``.
+    """
+
+    def __init__(self, account, orders, replies):
+        self.config = Config
+        self.account = account
+        self.name = account["name"]
+        self.orders = orders
+        self.replies = replies
+        self.logger = logging.getLogger(f"SMC_Bot.account.{self.name}")
+        self.risk = RiskManager()
+        self.trade_manager = TradeManager(self.logger)
+
+    def connect(self):
+        """Open this process's terminal session and log in to the account."""
+        kwargs = {key: self.account[key] for key in ("login", "password", "server") if self.account.get(key)}
+        path = self.account.get("path")
+        if not (mt5.initialize(path, **kwargs) if path else mt5.initialize(**kwargs)):
+            return f"MT5 init failed: {mt5.last_error()}"
+        if kwargs.get("login") and not mt5.login(**kwargs):
+            return f"login failed: {mt5.last_error()}"
+        info = mt5.account_info()
+        if info is None:
+            return f"no account info: {mt5.last_error()}"
+        if not info.trade_allowed:
+            return "AutoTrading is disabled in this terminal"
+        return None
+
+    def run(self):
+        error = self.connect()
+        if error is not None:
+            self.replies.put((self.name, "failed", None, {"error": error}))
+            mt5.shutdown()
+            return
+        info = mt5.account_info()
+        self.replies.put((self.name, "ready", None, {"login": info.login, "balance": info.balance,
+                                                      "server": info.server, "pid": os.getpid()}))
+        try:
+            while True:
+                try:
+                    message = self.orders.get(timeout=1.0)
+                except queue.Empty:
+                    parent = parent_process()
+                    if parent is not None and not parent.is_alive():
+                        return
+                    continue
+                if message is None:
+                    return
+                kind, order_id, payload = message
+                try:
+                    result = self.open(order_id, payload) if kind == "open" else self.breakeven(order_id, payload)
+                except Exception as e:
+                    result = {"outcome": "rejected", "error": str(e)}
+                self.replies.put((self.name, kind, order_id, result))
+        finally:
+            mt5.shutdown()
+
+    def open(self, order_id, signal):
+        """Size and send one market order for ``signal``."""
+        sym = signal["symbol"]
+        info = mt5.account_info()
+        if info is None or not info.trade_allowed:
+            return {"outcome": "skipped", "error": "AutoTrading disabled"}
+        if info.balance < 100:
+            return {"outcome": "skipped", "error": f"insufficient balance (R{info.balance:.2f})",
+                    "balance": info.balance}
+
+        pv = self.config.SYMBOLS.get(sym, {}).get("pip_value", self.config.PIP_VALUE)
+        if signal.get("trade_type") == "SWING":
+            volume = round(max(self.config.SWING_FIXED_LOT_SIZE, 0.01), 2)
+        else:
+            volume = self.risk.calculate_position_size(signal["stop_pips"], pv)
+        if volume <= 0:
+            return {"outcome": "skipped", "error": "position size 0", "balance": info.balance}
+        open_lots = sum(p.volume for p in mt5.positions_get() or () if p.magic == self.config.MAGIC_NUMBER)
+        if open_lots + volume > self.config.MAX_OPEN_LOTS:
+            return {"outcome": "skipped", "error": f"max open exposure ({open_lots:.2f} lots open)",
+                    "balance": info.balance}
+
+        # A market order at this account's own quote (the signal's may have moved)
+        tick = mt5.symbol_info_tick(sym)
+        price = signal["price"] if tick is None else (tick.ask if signal["direction"] == "buy" else tick.bid)
+        started = time.perf_counter()
+        result = self.trade_manager.execute_order({**signal, "price": price, "volume": volume,
+                                                   "comment": link_comment(signal["link"])})
+        reply = {
+            "filled_at": time.time(),
+            "send_ms": (time.perf_counter() - started) * 1000,
+            "balance": info.balance,
+            "volume": volume,
+        }
+        if not result["success"]:
+            return {**reply, "outcome": "rejected", "error": result["error"], "error_code": result["error_code"]}
+
+        return {**reply, "outcome": "filled", "ticket": result["ticket"], "price": result["price"],
+                "volume": result["volume"]}
+
+    def breakeven(self, link, pip_value):
+        """Move this account's stop to its own entry +1 pip (as the bot did on its position ``link``)."""
+        comment = link_comment(link)
+        positions = [p for p in mt5.positions_get() or ()
+                     if p.magic == self.config.MAGIC_NUMBER and p.comment == comment]
+        if not positions:
+            return {"outcome": "skipped", "error": "no open position for this order"}
+        pos = positions[0]
+        ticket = pos.ticket
+        buy = pos.type == mt5.POSITION_TYPE_BUY
+        new_sl = pos.price_open + pip_value if buy else pos.price_open - pip_value
+        if pos.sl and (pos.sl >= new_sl if buy else pos.sl <= new_sl):
+            return {"outcome": "skipped", "error": "stop already at breakeven", "ticket": ticket}
+        if not self.trade_manager.modify_position(ticket, symbol=pos.symbol, sl=new_sl):
+            return {"outcome": "rejected", "error": "modify failed", "ticket": ticket}
+        return {"outcome": "moved", "ticket": ticket, "sl": new_sl}
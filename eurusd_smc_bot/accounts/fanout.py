@@ -0,0 +1,345 @@
+# fanout.py
+"""Send the bot's orders to follower accounts, one executor process each.
+
+    bot (this process)                        executors (accounts/executor.py)
+    ------------------                        --------------------------------
+    execute_signal ---- dispatch -----------> own MT5 session and RiskManager:
+                        (once its own          size from own balance, order_send
+                         order filled)
+    collector thread <----------------------- filled / rejected / skipped
+      (restarts dead executors)
+    _move_to_breakeven -- breakeven --------> stop to own entry +1 pip
+
+Signals are generated once, by the bot. Only orders the bot's own account
+filled are sent on, so every follower position belongs to a position the
+bot manages. ``dispatch`` just queues the order for every account: the
+accounts fill concurrently with each other and the trading loop never
+waits for them. A collector thread reads the replies and keeps, per
+account, the fill latency (dispatch to fill) and the slippage against the
+signal price, and per order the skew between the first and the last fill
+(the bot's own included). MT5 serves one terminal session per process,
+hence a process per account.
+"""
+import itertools
+import json
+import multiprocessing as mp
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+
+import MetaTrader5 as mt5
+
+from accounts.worker import run_executor
+from config import Config
+
+
+PRIMARY = "primary"   # the bot's own account in the figures
+SIGNAL_FIELDS = ("symbol", "direction", "price", "sl", "tp1", "tp2", "tp3", "stop_pips", "trade_type")
+
+
+def load_accounts(path):
+    """Follower accounts from a JSON file (a list of account dicts), each given a unique name."""
+    with open(path) as f:
+        accounts = json.load(f)
+    if not isinstance(accounts, list):
+        raise ValueError(f"{path}: expected a JSON list of accounts")
+    names = set()
+    for i, account in enumerate(accounts):
+        account.setdefault("name", str(account.get("login") or f"account{i + 1}"))
+        if account["name"] in names or account["name"] == PRIMARY:
+            raise ValueError(f"{path}: duplicate account name {account['name']!r}")
+        names.add(account["name"])
+    return accounts
+
+
+def _percentile(values, q):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 1)
+
+
+class AccountFanOut:
+    """Executor processes for the follower accounts, and the figures of their fills.
+
+    ``options`` may contain ``config`` (Config overrides for every executor)
+    and ``fake_mt5``; with the fake MT5 installed here, executors install it
+    with the same seed (the same market) by default.
+    """
+
+    def __init__(self, accounts, logger, options=None):
+        self.config = Config
+        self.accounts = {account["name"]: account for account in accounts}
+        self.logger = logger
+        self.options = options or {}
+        self._ctx = mp.get_context("spawn")
+        self._procs = {}
+        self._queues = {}
+        self._replies = None
+        self._collector = None
+        self._stop = threading.Event()
+        self._stopping = False   # set by stop(): no more executor restarts
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self.pending = OrderedDict()     # order id -> fills of an order still awaiting replies
+        size = self.config.ACCOUNT_STATS_SIZE
+        self.stats = {name: self._new_stats(size) for name in (PRIMARY, *self.accounts)}
+        self.stats[PRIMARY].update(state="ready", restarts=0)
+        self.skews = deque(maxlen=size)   # ms between the first and last fill of an order
+
+    @classmethod
+    def from_config(cls, logger):
+        return cls(load_accounts(Config.ACCOUNTS_FILE), logger)
+
+    @staticmethod
+    def _new_stats(size):
+        return {"state": "stopped", "pid": None, "login": None, "balance": None, "restarts": -1,
+                "dispatched": 0, "filled": 0, "rejected": 0, "skipped": 0, "timeouts": 0, "lots": 0.0,
+                "started": 0.0,
+                "latency": deque(maxlen=size), "slippage": deque(maxlen=size), "last_error": None}
+
+    # ── Executors ──
+
+    def start(self):
+        """Start one executor per account and the reply collector."""
+        info = mt5.account_info()
+        if info is not None:
+            self.stats[PRIMARY].update(login=info.login, balance=info.balance, pid=os.getpid())
+        self._replies = self._ctx.Queue()
+        self._stop.clear()
+        self._stopping = False
+        for name in self.accounts:
+            self._start_executor(name)
+        self._collector = threading.Thread(target=self._collect, name="smc-accounts", daemon=True)
+        self._collector.start()
+
+        # Let the terminals connect before the first signal (orders queue up meanwhile anyway)
+        deadline = time.monotonic() + self.config.ACCOUNT_CONNECT_TIMEOUT
+        while time.monotonic() < deadline and any(self.stats[name]["state"] == "starting" for name in self.accounts):
+            time.sleep(0.05)
+        ready = [name for name in self.accounts if self.stats[name]["state"] == "ready"]
+        self.logger.info(f"Order fan-out to {len(ready)}/{len(self.accounts)} accounts: {', '.join(ready) or '-'}")
+
+    def _start_executor(self, name):
+        """Spawn ``name``'s executor (outside the lock: spawning takes a while) and swap it in."""
+        options = dict(self.options)
+        if mt5.__name__ == "sim.fake_mt5":
+            options.setdefault("fake_mt5", {"seed": mt5.current_seed()})
+        orders = self._ctx.Queue()
+        proc = self._ctx.Process(target=run_executor, args=(self.accounts[name], orders, self._replies, options),
+                                 name=f"smc-account-{name}", daemon=True)
+        proc.start()
+        with self._lock:
+            if self._stopping:
+                proc.terminate()
+                proc.join(5)
+                orders.close()
+                return
+            old = self._queues.get(name)
+            self._procs[name] = proc
+            self._queues[name] = orders
+            stats = self.stats[name]
+            stats.update(state="starting", pid=proc.pid, started=time.monotonic())
+            stats["restarts"] += 1
+        if old is not None:
+            old.cancel_join_thread()   # its reader is gone; drop what it never read
+            old.close()
+
+    def _restart_dead(self):
+        """Restart executors that exited, each at most once per ACCOUNT_CONNECT_TIMEOUT."""
+        if self._stopping:
+            return
+        now = time.monotonic()
+        for name, proc in list(self._procs.items()):
+            if proc.is_alive() or now - self.stats[name]["started"] < self.config.ACCOUNT_CONNECT_TIMEOUT:
+                continue
+            self.logger.error(f"Account {name} executor exited - restarting")
+            self._start_executor(name)
+
+    def stop(self):
+        """Stop the executors (closing their sessions) and the collector; safe to call twice."""
+        if self._replies is None:
+            return
+        with self._lock:
+            self._stopping = True
+            procs = list(self._procs.values())
+            for orders in self._queues.values():
+                orders.put(None)
+        deadline = time.monotonic() + 10
+        for proc in procs:
+            proc.join(max(0.1, deadline - time.monotonic()))
+            if proc.is_alive():
+                proc.terminate()
+                proc.join(5)
+        self._stop.set()
+        self._collector.join(5)
+        with self._lock:
+            for name in self._procs:
+                self.stats[name]["state"] = "stopped"
+        # Release the queues' pipes, feeder threads and semaphores
+        for q in [self._replies, *self._queues.values()]:
+            q.close()
+            q.join_thread()
+        self._procs.clear()
+        self._queues.clear()
+        self._replies = None
+
+    # ── Orders (called from the bot thread) ──
+
+    def dispatch(self, signal, result, sent):
+        """Queue ``signal`` for every account once the bot's own order filled.
+
+        ``result`` is the bot's ``execute_order`` result and ``sent`` the
+        time its order went out (the bot's own fill latency).
+        """
+        filled = time.time()
+        order_id = next(self._ids)
+        payload = {key: signal.get(key) for key in SIGNAL_FIELDS}
+        payload["trade_type"] = signal.get("trade_type", "SCALP")
+        payload["link"] = result["ticket"]   # stamped on the followers' positions
+        with self._lock:
+            for name, orders in self._queues.items():
+                orders.put(("open", order_id, payload))
+                self.stats[name]["dispatched"] += 1
+            self.stats[PRIMARY]["dispatched"] += 1
+            order = {
+                "symbol": payload["symbol"], "direction": payload["direction"], "price": payload["price"],
+                "pip_value": self.config.SYMBOLS.get(payload["symbol"], {}).get("pip_value", self.config.PIP_VALUE),
+                "sent": sent, "fills": {}, "waiting": set(self._queues),
+            }
+            self._record_fill(PRIMARY, order, filled, result["price"], result["volume"])
+            order["sent"] = filled   # the followers' latency runs from here
+            self.pending[order_id] = order
+            self._finish(order_id)
+
+    def reject(self, error):
+        """Count an order the bot's own account rejected (it isn't sent on)."""
+        with self._lock:
+            self.stats[PRIMARY]["rejected"] += 1
+            self.stats[PRIMARY]["last_error"] = error
+
+    def breakeven(self, ticket, pip_value):
+        """Move the accounts' stops on their positions linked to the bot's position ``ticket``."""
+        with self._lock:
+            for orders in self._queues.values():
+                orders.put(("breakeven", ticket, pip_value))
+
+    # ── Replies (collector thread) ──
+
+    def _collect(self):
+        while not self._stop.is_set():
+            try:
+                reply = self._replies.get(timeout=0.25)
+            except queue.Empty:
+                reply = None
+            with self._lock:
+                if reply is not None:
+                    self._on_reply(*reply)
+                self._expire(time.time())
+            self._restart_dead()
+
+    def _on_reply(self, name, kind, order_id, result):
+        stats = self.stats[name]
+        if result.get("balance") is not None:
+            stats["balance"] = result["balance"]
+        if kind == "ready":
+            stats.update(state="ready", login=result["login"], pid=result["pid"])
+            self.logger.info(f"Account {name} connected (login {result['login']}, "
+                             f"balance R{result['balance']:.2f}, {result['server']})")
+            return
+        if kind == "failed":
+            stats.update(state="failed", last_error=result["error"])
+            self.logger.error(f"Account {name} executor could not connect: {result['error']}")
+            return
+        if kind == "breakeven":
+            if result["outcome"] == "moved":
+                self.logger.info(f"Account {name}: position {result['ticket']} stop moved to {result['sl']}")
+            elif result["outcome"] == "rejected":
+                self.logger.error(f"Account {name}: breakeven on {result.get('ticket')} failed: {result['error']}")
+            return
+
+        order = self.pending.get(order_id)
+        if order is None:
+            self.logger.warning(f"Account {name}: late reply to order {order_id} ({result['outcome']})")
+            return
+        order["waiting"].discard(name)
+        sym = order["symbol"]
+        if result["outcome"] == "filled":
+            latency = self._record_fill(name, order, result["filled_at"], result["price"], result["volume"])
+            self.logger.info(f"[{sym}] Account {name}: {order['direction'].upper()} {result['volume']} lots "
+                             f"@ {result['price']} (ticket {result['ticket']}, {latency:.0f} ms)")
+        else:
+            stats[result["outcome"]] += 1
+            stats["last_error"] = result["error"]
+            log = self.logger.error if result["outcome"] == "rejected" else self.logger.info
+            log(f"[{sym}] Account {name}: order {result['outcome']}: {result['error']}")
+        self._finish(order_id)
+
+    def _record_fill(self, name, order, filled_at, price, volume):
+        stats = self.stats[name]
+        latency = (filled_at - order["sent"]) * 1000
+        # Positive slippage: filled worse than the signal price
+        slippage = (price - order["price"]) if order["direction"] == "buy" else (order["price"] - price)
+        stats["filled"] += 1
+        stats["lots"] += volume
+        stats["latency"].append(latency)
+        stats["slippage"].append(slippage / order["pip_value"])
+        order["fills"][name] = filled_at
+        return latency
+
+    def _finish(self, order_id):
+        order = self.pending[order_id]
+        if order["waiting"]:
+            return
+        del self.pending[order_id]
+        fills = order["fills"].values()
+        if len(fills) >= 2:
+            self.skews.append((max(fills) - min(fills)) * 1000)
+
+    def _expire(self, now):
+        """Give up on accounts that haven't answered an order within ACCOUNT_ORDER_TIMEOUT."""
+        for order_id, order in list(self.pending.items()):
+            if now - order["sent"] < self.config.ACCOUNT_ORDER_TIMEOUT:
+                break
+            for name in order["waiting"]:
+                self.stats[name]["timeouts"] += 1
+                self.logger.warning(f"[{order['symbol']}] Account {name}: no reply to order {order_id}")
+            order["waiting"].clear()
+            self._finish(order_id)
+
+    # ── Figures ──
+
+    def status(self):
+        """JSON-friendly per-account state, fill latency and slippage, and the skew across accounts."""
+        with self._lock:
+            accounts = []
+            for name, stats in self.stats.items():
+                proc = self._procs.get(name)
+                latency, slippage = list(stats["latency"]), list(stats["slippage"])
+                accounts.append({
+                    "name": name,
+                    "state": stats["state"],
+                    "alive": name == PRIMARY or bool(proc and proc.is_alive()),
+                    "pid": stats["pid"],
+                    "login": stats["login"],
+                    "balance": stats["balance"],
+                    "restarts": max(stats["restarts"], 0),
+                    **{key: stats[key] for key in ("dispatched", "filled", "rejected", "skipped", "timeouts")},
+                    "lots": round(stats["lots"], 2),
+                    "latency_ms_p50": _percentile(latency, 0.5),
+                    "latency_ms_p95": _percentile(latency, 0.95),
+                    "latency_ms_max": round(max(latency), 1) if latency else None,
+                    "slippage_pips_avg": round(sum(slippage) / len(slippage), 2) if slippage else None,
+                    "last_error": stats["last_error"],
+                })
+            skews = list(self.skews)
+            return {
+                "accounts": accounts,
+                "pending": len(self.pending),
+                "skew_orders": len(skews),
+                "skew_ms_p50": _percentile(skews, 0.5),
+                "skew_ms_p95": _percentile(skews, 0.95),
+                "skew_ms_max": round(max(skews), 1) if skews else None,
+            }
@@ -0,0 +1,31 @@
+# worker.py
+"""Entry point of an account executor process.
+
+Kept free of trading imports at module level: the executor may need to
+install the fake MT5 stand-in before anything imports ``MetaTrader5``, and
+the account's ``config`` overrides must be in place before ``RiskManager``
+reads them.
+"""
+
+
+def run_executor(account, orders, replies, options):
+    """Execute ``account``'s share of the bot's orders until told to stop.
+
+    ``orders`` is this account's queue, ``replies`` the queue shared by all
+    executors. ``options`` may contain ``config`` (Config overrides for every
+    account) and ``fake_mt5`` (kwargs for ``sim.fake_mt5.install``; the
+    account's login and its own ``fake_mt5`` entry are applied on top).
+    """
+    if options.get("fake_mt5") is not None:
+        from sim import fake_mt5
+        fake = {**options["fake_mt5"], **account.get("fake_mt5", {})}
+        if account.get("login"):
+            fake["login"] = account["login"]
+        fake_mt5.install(**fake)
+
+    from config import Config
+    for name, value in {**options.get("config", {}), **account.get("config", {})}.items():
+        setattr(Config, name, value)
+
+    from accounts.executor import AccountExecutor
+    AccountExecutor(account, orders, replies).run()
@@ -0,0 +1,165 @@
+# monte_carlo.py
+"""Monte Carlo / bootstrap analysis of closed trades.
+
+Trade sequences are resampled as 2-D NumPy batches (paths x trades) and
+reduced with cumulative sums along the trade axis, so 100k paths of 1k trades
+run in a few seconds without a Python loop per path. Paths are processed in
+chunks to keep peak memory bounded (``chunk_paths`` x ``horizon`` float32).
+
+Two sizing models, matching RiskManager.calculate_position_size:
+
+* fixed lots (``FIXED_LOT_SIZE > 0``): each trade adds
+  ``pips * pip_value_per_lot * lots`` to the balance;
+* risk-based: each trade multiplies equity by ``1 + RISK_PERCENT * R`` where
+  R is the trade's result in multiples of its stop distance.
+"""
+import time
+
+import numpy as np
+
+from config import Config
+
+
+def pip_value_per_lot(symbol):
+    """Account-currency value of one pip per lot (same approximation as RiskManager)."""
+    pv = Config.SYMBOLS.get(symbol, {}).get("pip_value", 0.01 if "JPY" in (symbol or "") else 0.0001)
+    return 6.5 if pv == 0.01 else 10.0
+
+
+def closed_trade_arrays(trades, symbol=None, trade_type=None):
+    """Columns of the closed trades as arrays: pnl, pips, r (R-multiple) and pip value per lot."""
+    rows = [
+        t for t in trades
+        if t.get("status") == "CLOSED"
+        and (symbol is None or t.get("symbol") == symbol)
+        and (trade_type is None or (t.get("trade_type") or "SCALP") == trade_type)
+    ]
+    pnl = np.array([t.get("profit_loss") or 0.0 for t in rows], dtype=np.float64)
+    pips = np.array([t.get("pips_gained") or 0.0 for t in rows], dtype=np.float64)
+    stop = np.array([t.get("stop_pips") or 0.0 for t in rows], dtype=np.float64)
+    r = np.divide(pips, stop, out=np.zeros_like(pips), where=stop > 0)
+    ppl = np.array([pip_value_per_lot(t.get("symbol")) for t in rows], dtype=np.float64)
+    return {"pnl": pnl, "pips": pips, "r": r, "pip_value_per_lot": ppl}
+
+
+def _sample_indices(rng, n, paths, horizon, method):
+    if method == "shuffle":
+        # Reorderings of the actual sequence (horizon == n)
+        return rng.permuted(np.broadcast_to(np.arange(n, dtype=np.int32), (paths, n)), axis=1)
+    return rng.integers(0, n, size=(paths, horizon), dtype=np.int32)
+
+
+def bootstrap_mean_ci(values, samples=10_000, confidence=0.95, seed=0, chunk=2_000):
+    """Percentile bootstrap confidence interval of the mean."""
+    n = len(values)
+    if n == 0:
+        return 0.0, 0.0, 0.0
+    rng = np.random.default_rng(seed)
+    values = values.astype(np.float32)
+    means = np.empty(samples, dtype=np.float64)
+    for start in range(0, samples, chunk):
+        stop = min(start + chunk, samples)
+        idx = rng.integers(0, n, size=(stop - start, n), dtype=np.int32)
+        means[start:stop] = values[idx].mean(axis=1, dtype=np.float64)
+    tail = (1 - confidence) / 2 * 100
+    lo, hi = np.percentile(means, [tail, 100 - tail])
+    return float(values.mean(dtype=np.float64)), float(lo), float(hi)
+
+
+def simulate(columns, paths=100_000, horizon=1_000, method="bootstrap", balance=10_000.0,
+             risk_fraction=None, lot_size=None, ruin_drawdown=0.5, seed=0, chunk_paths=10_000):
+    """Equity paths from resampled trades; returns drawdown/return samples and ruin flags.
+
+    Exactly one of ``risk_fraction`` (compounding, per-trade R) or
+    ``lot_size`` (fixed lots, per-trade pips) selects the sizing model.
+    Ruin is equity falling ``ruin_drawdown`` below the starting balance, or
+    under the R100 floor at which RiskManager stops sizing trades.
+    """
+    n = len(columns["r"])
+    if method == "shuffle":
+        horizon = n
+    rng = np.random.default_rng(seed)
+
+    if lot_size:
+        per_trade = (columns["pips"] * columns["pip_value_per_lot"] * lot_size).astype(np.float32)
+    else:
+        # log-equity increments; a loss of >= 100% is capped just above total ruin
+        growth = np.maximum(1 + risk_fraction * columns["r"], 1e-6)
+        per_trade = np.log(growth).astype(np.float32)
+    ruin_equity = max(balance * (1 - ruin_drawdown), 100.0)
+
+    max_dd = np.empty(paths, dtype=np.float32)
+    final = np.empty(paths, dtype=np.float32)
+    ruined = np.empty(paths, dtype=bool)
+    for start in range(0, paths, chunk_paths):
+        stop = min(start + chunk_paths, paths)
+        steps = per_trade[_sample_indices(rng, n, stop - start, horizon, method)]
+        path = np.cumsum(steps, axis=1, out=steps)
+        peak = np.maximum.accumulate(path, axis=1)
+        np.maximum(peak, 0, out=peak)   # the starting balance is the first peak
+
+        if lot_size:
+            equity_peak = balance + peak
+            max_dd[start:stop] = ((equity_peak - (balance + path)) / equity_peak).max(axis=1)
+            final[start:stop] = path[:, -1] / balance
+            ruined[start:stop] = path.min(axis=1) <= ruin_equity - balance
+        else:
+            max_dd[start:stop] = -np.expm1(path - peak).min(axis=1)
+            # Capped at e^30 so runaway compounding stays finite (and JSON-serialisable)
+            final[start:stop] = np.expm1(np.minimum(path[:, -1], 30))
+            ruined[start:stop] = path.min(axis=1) <= np.log(ruin_equity / balance)
+
+    return {"max_drawdown": max_dd, "final_return": final, "ruined": ruined, "horizon": horizon}
+
+
+def _percentiles(values, qs=(5, 50, 95, 99)):
+    return {f"p{q}": round(float(v), 4) for q, v in zip(qs, np.percentile(values, qs))}
+
+
+def analyze(trades, paths=100_000, horizon=1_000, method="bootstrap", symbol=None, trade_type=None,
+            balance=None, ruin_drawdown=0.5, seed=0, bins=40):
+    """Full report for the dashboard: expectancy CIs, drawdown distribution, risk of ruin."""
+    started = time.perf_counter()
+    columns = closed_trade_arrays(trades, symbol, trade_type)
+    n = len(columns["pnl"])
+    report = {
+        "trades": n,
+        "symbol": symbol,
+        "trade_type": trade_type,
+        "method": method,
+    }
+    if n < 2:
+        report["error"] = "need at least 2 closed trades"
+        return report
+
+    lot_size = Config.FIXED_LOT_SIZE if Config.FIXED_LOT_SIZE > 0 else None
+    balance = balance or 10_000.0
+    report["sizing"] = ({"mode": "fixed", "lot_size": lot_size} if lot_size
+                        else {"mode": "risk", "risk_percent": Config.RISK_PERCENT})
+    report["balance"] = balance
+
+    expectancy = {}
+    for key in ("pnl", "pips", "r"):
+        mean, lo, hi = bootstrap_mean_ci(columns[key], seed=seed)
+        expectancy[key] = {"mean": round(mean, 4), "ci95": [round(lo, 4), round(hi, 4)]}
+    report["expectancy"] = expectancy
+
+    sim = simulate(columns, paths=paths, horizon=horizon, method=method, balance=balance,
+                   risk_fraction=Config.RISK_PERCENT, lot_size=lot_size,
+                   ruin_drawdown=ruin_drawdown, seed=seed)
+    counts, edges = np.histogram(sim["max_drawdown"], bins=bins, range=(0.0, 1.0))
+    report.update({
+        "paths": paths,
+        "horizon": sim["horizon"],
+        "max_drawdown": {
+            "mean": round(float(sim["max_drawdown"].mean()), 4),
+            **_percentiles(sim["max_drawdown"]),
+            "histogram": {"edges": np.round(edges, 4).tolist(), "counts": counts.tolist()},
+        },
+        "final_return": {"mean": round(float(sim["final_return"].mean(dtype=np.float64)), 4),
+                         **_percentiles(sim["final_return"], (1, 5, 50, 95))},
+        "ruin_drawdown": ruin_drawdown,
+        "risk_of_ruin": round(float(sim["ruined"].mean()), 5),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    })
+    return report
@@ -0,0 +1,175 @@
+# cache.py
+"""Content-addressed, size-bounded store of backtest stage outputs.
+
+Entries are addressed by a SHA-256 of everything that produced them (input
+bars, the config values the stage read, the source of the code that ran),
+so a key never has to be invalidated: changed inputs simply address a
+different entry. Each entry is a zlib-compressed pickle at
+``<dir>/<key[:2]>/<key>.pkl``, written to a temp file and renamed so a
+crash can't leave a torn entry. Reads touch the file's mtime; once the
+directory grows past ``max_bytes`` the least recently used entries are
+deleted.
+"""
+import hashlib
+import inspect
+import os
+import pickle
+import tempfile
+import zlib
+from pathlib import Path
+
+
+MAX_READ_SETS = 8   # settings sets remembered per stage
+
+
+def digest(*parts):
+    """SHA-256 hex digest of ``parts`` (bytes are hashed as-is, the rest by repr)."""
+    h = hashlib.sha256()
+    for part in parts:
+        data = part if isinstance(part, (bytes, memoryview)) else repr(part).encode()
+        h.update(len(data).to_bytes(8, "little"))
+        h.update(data)
+    return h.hexdigest()
+
+
+_code_versions = {}
+
+
+def code_version(*modules):
+    """Digest of the source files of ``modules`` (the code a stage ran)."""
+    key = tuple(m.__name__ for m in modules)
+    if key not in _code_versions:
+        _code_versions[key] = digest(*(Path(inspect.getsourcefile(m)).read_bytes() for m in modules))
+    return _code_versions[key]
+
+
+class ConfigReads:
+    """Config proxy that records which settings a stage reads.
+
+    Set as a component's ``config``; ``values()`` then gives the settings
+    the stage actually depended on, so its cache key covers exactly those.
+    """
+
+    def __init__(self, config):
+        self._config = config
+        self.names = set()
+
+    def __getattr__(self, name):
+        self.names.add(name)
+        return getattr(self._config, name)
+
+    def values(self):
+        return values_of(self._config, self.names)
+
+
+def values_of(config, names):
+    return tuple((name, repr(getattr(config, name, None))) for name in sorted(names))
+
+
+class ResultCache:
+    """On-disk LRU of pickled stage outputs keyed by content digest."""
+
+    def __init__(self, directory, max_bytes):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._size = None   # bytes on disk, scanned on first write
+
+    def path(self, key):
+        return self.directory / key[:2] / f"{key}.pkl"
+
+    def get(self, key):
+        """The stored value, or None."""
+        path = self.path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.loads(zlib.decompress(f.read()))
+        except (OSError, EOFError, zlib.error, pickle.UnpicklingError):
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def put(self, key, value):
+        data = zlib.compress(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), 1)
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            previous = path.stat().st_size
+        except OSError:
+            previous = 0
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        if self._size is None:
+            self._size = self.size()
+        else:
+            self._size += len(data) - previous
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def _entries(self):
+        out = []
+        for path in self.directory.glob("*/*.pkl"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            out.append((st.st_mtime, st.st_size, path))
+        return out
+
+    def size(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits ``max_bytes``."""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+        self._size = total
+
+    def find(self, base_key, config):
+        """Key of a stored output of the stage ``base_key`` valid under ``config``, or None.
+
+        Each set of settings the stage has been seen to read is tried (the
+        set depends on the code path taken); an entry exists when the
+        stage ran before with the same values for one of those sets.
+        """
+        for names in self.get(digest("config-reads", base_key)) or ():
+            key = digest(base_key, values_of(config, names))
+            if self.path(key).exists():
+                return key
+        return None
+
+    def stage(self, base_key, compute, config):
+        """Cached ``compute(config_proxy)`` for a stage whose other inputs hash to ``base_key``.
+
+        Returns (value, key, hit).
+        """
+        key = self.find(base_key, config)
+        value = self.get(key) if key else None
+        if value is not None:
+            return value, key, True
+        reads = ConfigReads(config)
+        value = compute(reads)
+        return value, self.store(base_key, reads, value), False
+
+    def store(self, base_key, reads, value):
+        """Store a stage output computed under ``reads``; returns its key."""
+        key = digest(base_key, reads.values())
+        manifest_key = digest("config-reads", base_key)
+        manifest = self.get(manifest_key) or []
+        names = sorted(reads.names)
+        if names not in manifest:
+            self.put(manifest_key, (manifest + [names])[-MAX_READ_SETS:])
+        self.put(key, value)
+        return key
@@ -0,0 +1,214 @@
+# replay.py
+"""Bar-by-bar replay of the bot's signal generators over stored history.
+
+At each replayed M15 bar the generators see what the live bot would have
+seen with that bar forming: the last ``SCALP_BARS`` / ``SWING_BARS`` bars
+of each timeframe, H1/H4/D1 resampled from the base series with the
+current period built from the base bars so far, and the bar's close as the
+bid (ask = bid + the bar's spread).
+
+Detector results are recorded per bar, keyed by method, timeframe and
+arguments, so the generators can later be re-run against the recording --
+with different downstream settings -- without touching the bars.
+"""
+import logging
+
+import numpy as np
+
+from config import Config
+from main import EURUSD_SMC_Bot
+from market_data.bars import Bars
+from market_data.resampler import TIMEFRAME_SECONDS, period_start, resample_rates
+from risk.risk_manager import RiskManager
+from strategies.panel import SCALP_BARS, SWING_BARS
+
+
+# kind: (generator, bars per timeframe)
+KINDS = {
+    "scalp": ("generate_signal", SCALP_BARS),
+    "swing": ("generate_swing_signal", SWING_BARS),
+}
+
+
+class StaleDetectors(Exception):
+    """A generator asked for a detector result the recording doesn't have."""
+
+
+def call_key(name, timeframe, args, kwargs):
+    return (name, timeframe) + args + tuple(sorted(kwargs.items()))
+
+
+class RecordingStrategies:
+    """Wraps ``SMCStrategies`` and records every detector result of a step."""
+
+    def __init__(self, strategies):
+        self.strategies = strategies
+        self.timeframes = {}   # {id(Bars): timeframe} for the current step
+        self.calls = {}
+
+    def __getattr__(self, name):
+        method = getattr(self.strategies, name)
+
+        def call(df, *args, **kwargs):
+            value = method(df, *args, **kwargs)
+            self.calls[call_key(name, self.timeframes[id(df)], args, kwargs)] = value
+            return value
+
+        setattr(self, name, call)
+        return call
+
+
+class ReplayStrategies:
+    """Serves recorded detector results; the "bars" passed in are timeframe names."""
+
+    def __init__(self):
+        self.calls = {}
+
+    def __getattr__(self, name):
+        def call(timeframe, *args, **kwargs):
+            try:
+                return self.calls[call_key(name, timeframe, args, kwargs)]
+            except KeyError:
+                raise StaleDetectors(name, timeframe) from None
+
+        setattr(self, name, call)
+        return call
+
+
+class FixedBalanceRisk(RiskManager):
+    """Position sizing against ``BACKTEST_BALANCE`` instead of the live account."""
+
+    def get_account_balance(self):
+        return self.config.BACKTEST_BALANCE
+
+
+class SignalHost:
+    """The bot's signal generators without the terminal, journal or order plumbing."""
+
+    generate_signal = EURUSD_SMC_Bot.generate_signal
+    generate_swing_signal = EURUSD_SMC_Bot.generate_swing_signal
+
+    def __init__(self, strategies=None):
+        self.config = Config
+        self.strategies = strategies
+        self.risk = FixedBalanceRisk()
+        self.logger = logging.getLogger('SMC_Bot.backtest')
+        self.logger.setLevel(logging.WARNING)
+
+    def use_config(self, config):
+        self.config = self.risk.config = config
+
+
+class Replay:
+    """Per-step timeframe windows over one symbol's base (M15) history."""
+
+    def __init__(self, base, offset_seconds=0):
+        self.base = base
+        self.time = base["time"]
+        self.offset_seconds = offset_seconds
+        self.full = {}     # {tf: resampled bars}
+        self.period = {}   # {tf: index into full[tf] of each base bar's period (-1 = dropped head)}
+        self.first = {}    # {tf: base index of the first bar of each full[tf] period}
+        for tf in ("H1", "H4", "D1"):
+            seconds = TIMEFRAME_SECONDS[tf]
+            full = resample_rates(base, seconds, offset_seconds, drop_partial_head=True)
+            starts = period_start(self.time, seconds, offset_seconds)
+            k = np.searchsorted(full["time"], starts)
+            found = k < len(full)
+            found[found] = full["time"][k[found]] == starts[found]
+            self.full[tf] = full
+            self.period[tf] = np.where(found, k, -1)
+            self.first[tf] = np.searchsorted(self.time, full["time"])
+
+    def ready(self, i, sizes):
+        """True if every window of ``sizes`` has its full length at step ``i``."""
+        for tf, count in sizes.items():
+            if (i if tf == "M15" else self.period[tf][i]) < count - 1:
+                return False
+        return True
+
+    def lookback(self, i, sizes):
+        """First base index any window of ``sizes`` reaches back to at step ``i``."""
+        earliest = i
+        for tf, count in sizes.items():
+            if tf == "M15":
+                earliest = min(earliest, i - count + 1)
+                continue
+            j = self.period[tf][i] - count + 1
+            if j <= 0:
+                return 0   # reaches the start of the data (and its dropped partial period)
+            earliest = min(earliest, self.first[tf][j])
+        return max(earliest, 0)
+
+    def window(self, tf, i, count):
+        """Last ``count`` bars of ``tf`` with bar ``i`` forming."""
+        if tf == "M15":
+            return self.base[max(i - count + 1, 0):i + 1]
+        k = self.period[tf][i]
+        rates = self.full[tf][max(k - count + 1, 0):k + 1].copy()
+        part = self.base[self.first[tf][k]:i + 1]
+        last = rates[-1:]
+        last["high"] = part["high"].max()
+        last["low"] = part["low"].min()
+        last["close"] = part["close"][-1]
+        last["tick_volume"] = part["tick_volume"].sum()
+        last["real_volume"] = part["real_volume"].sum()
+        last["spread"] = part["spread"].max()
+        return rates
+
+    def quote(self, i, pv):
+        """(bid, ask, spread in pips) at step ``i``; spread points are 1/10 pip."""
+        bid = float(self.base["close"][i])
+        spread = float(self.base["spread"][i]) / 10
+        return bid, bid + spread * pv, spread
+
+    def data(self, kind, i, symbol, pv, recorder=None):
+        """The generator's ``data`` dict at step ``i``.
+
+        With a ``recorder`` the timeframes are real ``Bars`` (registered so
+        the recorder can name them); without one they are the timeframe
+        names a ``ReplayStrategies`` looks results up by.
+        """
+        bid, ask, spread = self.quote(i, pv)
+        data = {'symbol': symbol, 'pip_value': pv, 'bid': bid, 'ask': ask, 'spread': spread}
+        for tf, count in KINDS[kind][1].items():
+            name = tf.lower()
+            if recorder is None:
+                data[name] = name
+            else:
+                bars = Bars(self.window(tf, i, count))
+                recorder.timeframes[id(bars)] = name
+                data[name] = bars
+        return data
+
+
+def record(host, recorder, replay, kind, steps, symbol, pv):
+    """Run the generator over ``steps`` on real bars.
+
+    Returns (detector results per step, [(time, signal)]).
+    """
+    generator = getattr(host, KINDS[kind][0])
+    host.strategies = recorder
+    outputs, signals = [], []
+    for i in steps:
+        recorder.calls = {}
+        data = replay.data(kind, i, symbol, pv, recorder)
+        signal = generator(data)
+        recorder.timeframes.clear()
+        outputs.append(recorder.calls)
+        if signal:
+            signals.append((int(replay.time[i]), signal))
+    return outputs, signals
+
+
+def rerun(host, replayer, replay, kind, steps, outputs, symbol, pv):
+    """Run the generator over ``steps`` against recorded detector results."""
+    generator = getattr(host, KINDS[kind][0])
+    host.strategies = replayer
+    signals = []
+    for i, calls in zip(steps, outputs):
+        replayer.calls = calls
+        signal = generator(replay.data(kind, i, symbol, pv))
+        if signal:
+            signals.append((int(replay.time[i]), signal))
+    return signals
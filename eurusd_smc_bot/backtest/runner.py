@@ -0,0 +1,216 @@
+# runner.py
+"""Cached backtests of ``generate_signal`` / ``generate_swing_signal``.
+
+A run replays each symbol's stored M15 bars (see backtest/replay.py) in
+server-day chunks and goes through three cached stages:
+
+* detectors -- every detector result of every bar of the day, per signal
+  kind. Keyed by the bytes of the bars the day's windows reach back to,
+  the detector settings read and the detector code, so runs over
+  overlapping date ranges share their common days;
+* signals -- the generator re-run against the recorded detector results.
+  Keyed by the detector entry, the signal settings read (OB distance,
+  stops, TP multipliers, ...) and the signal code, so changing only those
+  settings skips the detectors entirely;
+* trades -- the gated, walked-forward trades of the whole run (see
+  backtest/simulator.py).
+
+Each stage's key covers exactly the Config settings it read last time it
+ran (recorded next to its output), so no list of "relevant" settings has
+to be kept in sync with the code. Outputs live in a size-bounded
+content-addressed store (backtest/cache.py).
+
+    cd eurusd_smc_bot && python -m backtest.runner --symbols EURUSD.ecn --start 2024-01-01 --end 2024-04-01
+    cd eurusd_smc_bot && python -m backtest.runner --start 2024-01-01 --end 2024-04-01 --set TP1_MULTIPLIER=2.0
+
+The bars come from the bar warehouse (``python -m market_data.warehouse
+sync``); the generators import the MetaTrader5 package but never call the
+terminal.
+"""
+import argparse
+import ast
+import json
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+import numpy as np
+
+import main as bot_main
+from backtest import replay as replay_module, simulator
+from backtest.cache import ConfigReads, ResultCache, code_version, digest
+from backtest.replay import KINDS, RecordingStrategies, Replay, ReplayStrategies, SignalHost, StaleDetectors, record, rerun
+from config import Config
+from market_data import bars, resampler
+from market_data.warehouse import BarStore
+from risk import risk_manager
+from strategies import kernels, smc_strategies
+from strategies.smc_strategies import SMCStrategies
+
+
+# Source the output of each stage depends on
+DETECTOR_CODE = (smc_strategies, kernels, resampler, bars, replay_module)
+SIGNAL_CODE = (bot_main, risk_manager, replay_module)
+TRADE_CODE = (simulator,)
+
+
+def pip_value_of(symbol):
+    pv = Config.SYMBOLS.get(symbol, {}).get("pip_value")
+    return pv or (0.01 if "JPY" in symbol else 0.0001)
+
+
+class Backtest:
+    """Runs backtests over the bar warehouse through the result cache."""
+
+    def __init__(self, store=None, cache=None):
+        self.config = Config
+        self.store = store or BarStore(self.config.BAR_STORE_DIR)
+        self.cache = cache or ResultCache(self.config.BACKTEST_CACHE_DIR,
+                                          self.config.BACKTEST_CACHE_MAX_MB * 1024 * 1024)
+        self.strategies = SMCStrategies()
+        self.recorder = RecordingStrategies(self.strategies)
+        self.replayer = ReplayStrategies()
+        self.host = SignalHost()
+        self.stats = Counter()
+
+    def load(self, symbol, start, end):
+        """Base bars from ``BACKTEST_WARMUP_DAYS`` before ``start`` to ``end``."""
+        warm_up = self.config.BACKTEST_WARMUP_DAYS * 86400
+        return np.array(self.store.read_range(symbol, self.config.BASE_TIMEFRAME, start - warm_up, end))
+
+    def _chunk(self, replay, kind, symbol, pv, steps):
+        """Signals of one day's ``steps``; returns (signals, signal entry key)."""
+        sizes = KINDS[kind][1]
+        first, last = steps[0], steps[-1]
+        det_base = digest("detectors", kind, pv, replay.offset_seconds, code_version(*DETECTOR_CODE),
+                          int(replay.time[first]), replay.base[replay.lookback(first, sizes):last + 1].tobytes())
+
+        det_key = self.cache.find(det_base, self.config)
+        if det_key is not None:
+            sig_base = digest("signals", det_key, symbol, code_version(*SIGNAL_CODE))
+            sig_key = self.cache.find(sig_base, self.config)
+            signals = self.cache.get(sig_key) if sig_key else None
+            if signals is not None:
+                self.stats["detector hits"] += 1
+                self.stats["signal hits"] += 1
+                return signals, sig_key
+
+            # Only downstream settings changed: re-run the generator on the recorded detectors
+            outputs = self.cache.get(det_key)
+            if outputs is not None:
+                sig_reads = ConfigReads(self.config)
+                self.host.use_config(sig_reads)
+                try:
+                    signals = rerun(self.host, self.replayer, replay, kind, steps, outputs, symbol, pv)
+                except StaleDetectors:
+                    self.stats["stale detector entries"] += 1
+                else:
+                    self.stats["detector hits"] += 1
+                    self.stats["signal misses"] += 1
+                    return signals, self.cache.store(sig_base, sig_reads, signals)
+
+        # Cold: run the detectors on real bars, recording them as the generator asks
+        det_reads, sig_reads = ConfigReads(self.config), ConfigReads(self.config)
+        self.strategies.config = det_reads
+        self.host.use_config(sig_reads)
+        try:
+            outputs, signals = record(self.host, self.recorder, replay, kind, steps, symbol, pv)
+        finally:
+            self.strategies.config = self.config
+        det_key = self.cache.store(det_base, det_reads, outputs)
+        sig_key = self.cache.store(digest("signals", det_key, symbol, code_version(*SIGNAL_CODE)), sig_reads, signals)
+        self.stats["detector misses"] += 1
+        self.stats["signal misses"] += 1
+        return signals, sig_key
+
+    def run(self, symbols, start, end):
+        """Backtest ``symbols`` over [start, end) (epoch seconds, server time)."""
+        started = time.perf_counter()
+        self.stats = Counter()
+        kinds = [kind for kind in KINDS if kind != "swing" or self.config.SWING_ENABLED]
+        offset = int(self.config.SERVER_DAY_OFFSET_HOURS * 3600)
+        signals, keys, markets = [], [], {}
+        steps_total = 0
+        for symbol in symbols:
+            pv = pip_value_of(symbol)
+            base = self.load(symbol, start, end)
+            if len(base) == 0:
+                print(f"[{symbol}] no stored bars in range (run `python -m market_data.warehouse sync`)")
+                continue
+            replay = Replay(base, offset)
+            first = int(np.searchsorted(replay.time, start))
+            markets[symbol] = (base[first:], pv)
+            ready = [i for i in range(first, len(base)) if all(replay.ready(i, KINDS[k][1]) for k in kinds)]
+            if ready and ready[0] > first:
+                print(f"[{symbol}] not enough history before the start; replay starts at "
+                      f"{datetime.fromtimestamp(int(replay.time[ready[0]]), timezone.utc):%Y-%m-%d %H:%M}")
+            steps_total += len(ready)
+            days = resampler.period_start(replay.time[ready], 86400, offset) if ready else []
+            for day_steps in np.split(np.array(ready, dtype=np.int64), np.flatnonzero(np.diff(days)) + 1):
+                if len(day_steps) == 0:
+                    continue
+                for kind in kinds:
+                    found, key = self._chunk(replay, kind, symbol, pv, day_steps)
+                    signals.extend((t, kind, symbol, signal) for t, signal in found)
+                    keys.append(key)
+                    self.stats["chunks"] += 1
+
+        trade_base = digest("trades", code_version(*TRADE_CODE), list(markets), keys)
+        trades, _, hit = self.cache.stage(trade_base, lambda config: simulator.simulate(signals, markets, config),
+                                          self.config)
+        self.stats["trade hits" if hit else "trade misses"] += 1
+        return {
+            "symbols": list(markets),
+            "start": start,
+            "end": end,
+            "steps": steps_total,
+            "signals": len(signals),
+            "trades": trades,
+            "summary": summarize(trades),
+            "cache": dict(self.stats),
+            "seconds": round(time.perf_counter() - started, 3),
+        }
+
+
+def summarize(trades):
+    pnl = np.array([t['profit_loss'] for t in trades], dtype=np.float64)
+    pips = np.array([t['pips_gained'] for t in trades], dtype=np.float64)
+    return {
+        "trades": len(trades),
+        "wins": int((pnl > 0).sum()),
+        "win_rate": round(float((pnl > 0).mean()), 3) if len(trades) else 0.0,
+        "net_pnl": round(float(pnl.sum()), 2),
+        "net_pips": round(float(pips.sum()), 1),
+        "exits": dict(Counter(t['close_reason'] for t in trades)),
+    }
+
+
+def parse_date(text):
+    return int(datetime.strptime(text, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest the bot's signals over the bar warehouse (cached)")
+    parser.add_argument("--symbols", nargs="+", default=list(Config.SYMBOLS))
+    parser.add_argument("--start", required=True, help="YYYY-MM-DD (server time)")
+    parser.add_argument("--end", required=True, help="YYYY-MM-DD, exclusive")
+    parser.add_argument("--set", nargs="*", default=[], metavar="NAME=VALUE", help="override Config settings")
+    parser.add_argument("--out", help="write the trades as JSON")
+    args = parser.parse_args()
+
+    for item in args.set:
+        name, _, value = item.partition("=")
+        if not hasattr(Config, name):
+            sys.exit(f"unknown setting {name}")
+        setattr(Config, name, ast.literal_eval(value))
+
+    result = Backtest().run(args.symbols, parse_date(args.start), parse_date(args.end))
+    print(json.dumps({key: value for key, value in result.items() if key != "trades"}, indent=2))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(result["trades"], f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+# simulator.py
+"""Turns replayed signals into trades.
+
+Signals are taken in time order under the same gates ``process_symbol`` and
+``execute_signal`` apply live: session hours and spread limits, per-symbol
+daily limits and cooldowns, the global daily limit and ``MAX_OPEN_LOTS``.
+Each trade is then walked forward on the bid bars (ask = bid + spread for
+shorts): stop loss, TP3 (the broker-side take profit) and the breakeven
+move to entry +1 pip, as ``manage_positions`` does. When a bar reaches
+both the stop and a target, the stop is assumed to come first.
+"""
+from datetime import datetime, timezone
+
+import numpy as np
+
+from analytics.monte_carlo import pip_value_per_lot
+from market_data.resampler import period_start
+
+
+def _first(mask):
+    """Index of the first True in ``mask``, or len(mask)."""
+    return int(mask.argmax()) if mask.any() else len(mask)
+
+
+def walk(rates, i, signal, be_pips, pv):
+    """Exit of a position opened at bar ``i``: (exit index, exit price, reason)."""
+    price, sl, tp = signal['price'], signal['sl'], signal['tp3']
+    after = rates[i + 1:]
+    if signal['direction'] == 'buy':
+        favourable, adverse = after["high"], after["low"]
+        sign = 1
+    else:
+        ask = after["spread"] / 10 * pv
+        favourable, adverse = after["low"] + ask, after["high"] + ask
+        sign = -1
+
+    def hit(levels, level):
+        return sign * (levels - level) >= 0
+
+    stop = _first(hit(sl, adverse))
+    target = _first(hit(favourable, tp))
+    breakeven = _first(hit(favourable, price + sign * be_pips * pv))
+    first = min(stop, target, breakeven)
+    if first == len(after):
+        return len(rates) - 1, float(rates["close"][-1]), "END"
+    if first == stop:
+        return i + 1 + stop, sl, "SL"
+    if first == target:
+        return i + 1 + target, tp, "TP3"
+
+    # Stop moved to entry +1 pip from the next bar on
+    new_sl = price + sign * pv
+    rest = slice(breakeven + 1, None)
+    stop = _first(hit(new_sl, adverse[rest]))
+    target = _first(hit(favourable[rest], tp))
+    if min(stop, target) == len(adverse) - breakeven - 1:
+        return len(rates) - 1, float(rates["close"][-1]), "END"
+    if stop <= target:
+        return i + 2 + breakeven + stop, new_sl, "BE"
+    return i + 2 + breakeven + target, tp, "TP3"
+
+
+def simulate(signals, markets, config):
+    """Trades from ``signals`` ([(time, kind, symbol, signal)]).
+
+    ``markets`` is {symbol: (base rates, pip value)} for the replayed range.
+    Returns closed-trade dicts in the trade history's format.
+    """
+    offset = int(config.SERVER_DAY_OFFSET_HOURS * 3600)
+    trades, open_trades = [], []
+    state = {}
+    day = None
+    total = 0
+    order = {sym: n for n, sym in enumerate(markets)}
+    for t, kind, sym, signal in sorted(signals, key=lambda s: (s[0], order[s[2]], s[1] != "scalp")):
+        today = period_start(t, 86400, offset)
+        if today != day:
+            day, total = today, 0
+            state = {}
+        sym_state = state.setdefault(sym, {"scalp": 0, "swing": 0, "last_scalp": None, "last_swing": None})
+        sym_cfg = config.SYMBOLS.get(sym, {})
+        rates, pv = markets[sym]
+        i = int(np.searchsorted(rates["time"], t))
+        spread = float(rates["spread"][i]) / 10
+
+        if kind == "scalp":
+            hour = datetime.fromtimestamp(t, timezone.utc).hour
+            if not (config.SESSION_START_HOUR <= hour < config.SESSION_END_HOUR):
+                continue
+            if spread > sym_cfg.get('max_spread', config.MAX_SPREAD_PIPS):
+                continue
+            if sym_state["scalp"] >= config.MAX_DAILY_TRADES:
+                continue
+            if sym_state["last_scalp"] is not None and t - sym_state["last_scalp"] <= 300:
+                continue
+        else:
+            if not config.SWING_ENABLED:
+                continue
+            if spread > sym_cfg.get('swing_max_spread', config.SWING_MAX_SPREAD_PIPS):
+                continue
+            if sym_state["swing"] >= config.SWING_MAX_DAILY_TRADES:
+                continue
+            if sym_state["last_swing"] is not None and t - sym_state["last_swing"] <= config.SWING_COOLDOWN_SECONDS:
+                continue
+
+        # Global limits (execute_signal)
+        open_trades = [tr for tr in open_trades if tr["exit_time"] > t]
+        if total >= config.MAX_TOTAL_DAILY_TRADES:
+            continue
+        if sum(tr["volume"] for tr in open_trades) + signal['volume'] > config.MAX_OPEN_LOTS:
+            continue
+        total += 1
+        sym_state[kind] += 1
+        sym_state[f"last_{kind}"] = t
+
+        be_pips = config.SWING_BREAKEVEN_PIPS if kind == "swing" else config.BREAKEVEN_PIPS
+        j, exit_price, reason = walk(rates, i, signal, be_pips, pv)
+        sign = 1 if signal['direction'] == 'buy' else -1
+        pips = sign * (exit_price - signal['price']) / pv
+        trade = {
+            'ticket': len(trades) + 1,
+            'symbol': sym,
+            'trade_type': kind.upper(),
+            'direction': signal['direction'],
+            'entry_time': t,
+            'entry_price': signal['price'],
+            'stop_loss': signal['sl'],
+            'tp1': signal['tp1'],
+            'tp2': signal['tp2'],
+            'tp3': signal['tp3'],
+            'volume': signal['volume'],
+            'stop_pips': signal['stop_pips'],
+            'confidence': signal['confidence'],
+            'exit_time': int(rates["time"][j]),
+            'exit_price': exit_price,
+            'pips_gained': round(pips, 2),
+            'profit_loss': round(pips * pip_value_per_lot(sym) * signal['volume'], 2),
+            'close_reason': reason,
+            'status': 'CLOSED',
+        }
+        trades.append(trade)
+        open_trades.append(trade)
+    return trades
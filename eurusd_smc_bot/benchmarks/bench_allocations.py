@@ -0,0 +1,92 @@
+# bench_allocations.py
+"""Per-iteration allocation benchmark: DataFrame pipeline vs zero-copy Bars.
+
+Replays the detector calls made by one loop iteration (scalp + swing for every
+symbol in Config.SYMBOLS) on synthetic MT5 rates and reports tracemalloc peak
+and total allocated bytes per iteration.
+
+    cd eurusd_smc_bot && python -m benchmarks.bench_allocations
+"""
+import argparse
+import time
+import tracemalloc
+
+import pandas as pd
+
+from config import Config
+from market_data.bars import Bars
+from strategies.smc_strategies import SMCStrategies
+from benchmarks.synthetic import random_walk_rates
+
+
+WINDOWS = {"m15": (900, 200), "h1": (3600, 300), "h4": (14400, 200), "d1": (86400, 100)}
+
+
+def legacy_frame(rates):
+    df = pd.DataFrame(rates)
+    df['time'] = pd.to_datetime(df['time'], unit='s')
+    df.set_index('time', inplace=True)
+    return df
+
+
+def run_detectors(smc, data, pv):
+    m15, h1, h4, d1 = data["m15"], data["h1"], data["h4"], data["d1"]
+    smc.identify_order_blocks(m15, pv)
+    smc.identify_fair_value_gaps(m15, pv)
+    smc.analyze_trend(h1)
+    smc.analyze_trend(m15)
+    smc.detect_break_of_structure(h1, pv)
+    smc.detect_change_of_character(h1, pv)
+    smc.identify_liquidity_pools(h1, direction='buy', pip_value=pv)
+    smc.identify_order_blocks_swing(h1, pv)
+    smc.identify_fair_value_gaps_swing(h1, pv)
+    smc.analyze_trend(d1)
+    smc.analyze_trend(h4)
+    smc.detect_break_of_structure(h4, pv)
+    smc.detect_change_of_character(h4, pv)
+    smc.identify_breaker_blocks(h1, pv)
+
+
+def measure(label, wrap, raw, iterations):
+    smc = SMCStrategies()
+    tracemalloc.start()
+    peaks = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        for sym, frames in raw.items():
+            pv = Config.SYMBOLS[sym]["pip_value"]
+            data = {tf: wrap(rates) for tf, rates in frames.items()}
+            run_detectors(smc, data, pv)
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - before)
+    elapsed = time.perf_counter() - start
+    tracemalloc.stop()
+
+    peaks.sort()
+    print(f"{label:<10} peak/iter p50={peaks[len(peaks) // 2] / 1024:8.1f} KiB  "
+          f"max={peaks[-1] / 1024:8.1f} KiB  "
+          f"time/iter={elapsed / iterations * 1000:7.2f} ms (traced)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=50)
+    args = parser.parse_args()
+
+    raw = {}
+    for n, (sym, cfg) in enumerate(Config.SYMBOLS.items()):
+        raw[sym] = {
+            tf: random_walk_rates(count, period, pip_value=cfg["pip_value"], seed=n)
+            for tf, (period, count) in WINDOWS.items()
+        }
+
+    print(f"{len(raw)} symbols, {args.iterations} iterations")
+    measure("DataFrame", legacy_frame, raw, args.iterations)
+    measure("Bars", Bars, raw, args.iterations)
+    measure("Bars f32", lambda r: Bars(r, float32=True), raw, args.iterations)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# bench_backtest_cache.py
+"""Backtest time with the content-addressed result cache, cold and warm.
+
+Writes ``--days`` of synthetic M15 bars (plus the warm-up history) to a
+temporary bar warehouse and backtests the last ``--range`` days of it:
+
+* cold -- empty cache, every detector runs;
+* warm -- the same run again;
+* downstream -- TP multipliers and ``MAX_OB_DISTANCE_PIPS`` changed: detector
+  results are reused and only the generators re-run;
+* trades -- ``BREAKEVEN_PIPS`` changed: only the trade walk re-runs;
+* detector -- ``MIN_OB_SIZE_PIPS`` changed: scalp detectors re-run, swing reused;
+* shifted -- the range moved ``--shift`` days later: overlapping days reused.
+
+Every cached run is checked against the same run on an empty cache; exits
+non-zero if any trade differs.
+
+    cd eurusd_smc_bot && python -m benchmarks.bench_backtest_cache --range 20
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+from sim import fake_mt5
+
+
+SYMBOL = "EURUSD.ecn"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--range", type=int, default=20, help="backtested days")
+    parser.add_argument("--shift", type=int, default=5, help="days the last run's range moves")
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    fake_mt5.install()
+    from backtest.cache import ResultCache
+    from backtest.runner import Backtest
+    from benchmarks.synthetic import random_walk_rates
+    from config import Config
+    from market_data.warehouse import BarStore
+
+    os.chdir(tempfile.mkdtemp(prefix="smc_backtest_"))
+    Config.SESSION_START_HOUR, Config.SESSION_END_HOUR = 0, 24
+    days = Config.BACKTEST_WARMUP_DAYS + args.range + args.shift
+    origin = 1_700_006_400  # a server midnight
+    store = BarStore("bars")
+    store.append(SYMBOL, "M15", random_walk_rates(days * 96, start_time=origin, seed=args.seed))
+    start = origin + Config.BACKTEST_WARMUP_DAYS * 86400
+    end = start + args.range * 86400
+
+    cache = ResultCache("cache", 1 << 30)
+    scenarios = [
+        ("cold", {}, 0),
+        ("warm", {}, 0),
+        ("downstream", {"TP1_MULTIPLIER": 1.8, "TP3_MULTIPLIER": 3.0, "MAX_OB_DISTANCE_PIPS": 12}, 0),
+        ("trades", {"BREAKEVEN_PIPS": 12}, 0),
+        ("detector", {"MIN_OB_SIZE_PIPS": 6}, 0),
+        ("shifted", {}, args.shift),
+    ]
+    defaults = {name: getattr(Config, name) for _, changes, _ in scenarios for name in changes}
+    failed = False
+    cold_seconds = None
+    for n, (label, changes, shift) in enumerate(scenarios):
+        for name, value in defaults.items():
+            setattr(Config, name, changes.get(name, value))
+        lo, hi = start + shift * 86400, end + shift * 86400
+        result = Backtest(store, cache).run([SYMBOL], lo, hi)
+        reference = Backtest(store, ResultCache(f"fresh_{n}", 1 << 30)).run([SYMBOL], lo, hi)
+        same = result["trades"] == reference["trades"]
+        failed |= not same
+        cold_seconds = cold_seconds or result["seconds"]
+        stats = result["cache"]
+        print(f"{label:<11} {result['seconds'] * 1000:8.0f} ms  (x{cold_seconds / result['seconds']:6.1f})  "
+              f"steps {result['steps']:>5}  signals {result['signals']:>3}  trades {len(result['trades']):>3}  "
+              f"detectors {stats.get('detector hits', 0):>3} hit/{stats.get('detector misses', 0):>3} miss  "
+              f"signals {stats.get('signal hits', 0):>3} hit/{stats.get('signal misses', 0):>3} miss  "
+              f"trades {'hit' if stats.get('trade hits') else 'miss'}  "
+              f"{'matches' if same else 'DIFFERS from'} uncached")
+    print(f"cache size {cache.size() / 1e6:.1f} MB")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
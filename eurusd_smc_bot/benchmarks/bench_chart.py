@@ -0,0 +1,84 @@
+# bench_chart.py
+"""Chart payload size and decode time: binary columns vs the same data as JSON.
+
+Builds ``/chart`` payloads (market_data/chart.py) for ``--bars`` bars from a
+temporary bar store and compares them with a JSON body of the same bars
+and overlays (one object per bar, like the other dashboard endpoints), raw
+and gzip-compressed. "Decode" is what a client does before it can read a
+column: ``json.loads`` versus wrapping the buffers (``chart.decode``, the
+NumPy equivalent of the page's typed-array views). ``incremental`` is the
+poll a chart makes once it has the bars: ``since`` its last bar.
+
+    cd eurusd_smc_bot && python -m benchmarks.bench_chart --bars 5000
+"""
+import argparse
+import gzip
+import json
+import os
+import tempfile
+import time
+
+from sim import fake_mt5
+
+
+SYMBOL = "EURUSD.ecn"
+
+
+def best_ms(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def as_json(header, columns):
+    bars = [{"time": int(t), "open": float(o), "high": float(h), "low": float(l), "close": float(c),
+             "volume": float(v)} for t, o, h, l, c, v in zip(
+        columns["time"], columns["open"], columns["high"], columns["low"], columns["close"], columns["volume"])]
+    zones = [{"kind": header["zone_kinds"][k], "side": int(s), "time": int(t), "top": float(top),
+              "bottom": float(bottom), "strength": float(strength)} for k, s, t, top, bottom, strength in zip(
+        columns["zone_kind"], columns["zone_side"], columns["zone_time"], columns["zone_top"],
+        columns["zone_bottom"], columns["zone_strength"])]
+    return json.dumps({**header, "bars": bars, "zones": zones}, separators=(",", ":")).encode()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bars", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    fake_mt5.install()
+    from benchmarks.synthetic import random_walk_rates
+    from config import Config
+    from market_data.chart import ChartBuilder, decode
+    from market_data.warehouse import BarStore
+
+    os.chdir(tempfile.mkdtemp(prefix="smc_chart_"))
+    Config.CHART_MAX_BARS = max(Config.CHART_MAX_BARS, args.bars)
+    store = BarStore("bars")
+    rates = random_walk_rates(args.bars + Config.CHART_OVERLAY_BARS, seed=1)
+    store.append(SYMBOL, "M15", rates)
+    builder = ChartBuilder(store=store)
+    last = int(rates["time"][-1])
+
+    print(f"{args.bars} M15 bars, best of {args.repeat}\n")
+    print(f"{'payload':<26}{'bytes':>10}{'gzip':>10}{'build ms':>10}{'decode ms':>11}")
+    for label, since in (("full", None), ("incremental (since)", last)):
+        build = best_ms(lambda: builder.build(SYMBOL, "M15", since=since, count=args.bars), args.repeat)
+        binary = builder.build(SYMBOL, "M15", since=since, count=args.bars)
+        header, columns = decode(binary)
+        text = as_json(header, columns)
+        rows = [
+            (f"{label}, binary", binary, build, best_ms(lambda: decode(binary), args.repeat)),
+            (f"{label}, JSON", text, build + best_ms(lambda: as_json(header, columns), args.repeat),
+             best_ms(lambda: json.loads(text), args.repeat)),
+        ]
+        for name, body, build_ms, decode_ms in rows:
+            print(f"{name:<26}{len(body):>10}{len(gzip.compress(body, 6)):>10}{build_ms:>10.2f}{decode_ms:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+# bench_dashboard_bytes.py
+"""Bytes transferred per hour by one open dashboard tab, before and after.
+
+Runs the bot against the fake MT5 on a simulated clock (one loop iteration
+every ``LOOP_INTERVAL_SECONDS``, random entries so positions open and
+close) and polls the dashboard like the page's JavaScript does (/status
+every 5 s, /logs 7 s, /trades 3 s, /trade-stats 10 s, the page once).
+Two tabs poll the same state side by side:
+
+- before: plain requests, identity encoding (what every poll used to cost)
+- after:  If-None-Match with the last ETag and Accept-Encoding, like a browser
+
+Bytes are the wire size of each response: status line, headers and
+(possibly compressed) body.
+
+    cd eurusd_smc_bot && python -m benchmarks.bench_dashboard_bytes --minutes 60
+"""
+import argparse
+import logging
+import os
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime
+
+from sim import fake_mt5
+
+
+POLLS = {"/status": 5, "/logs": 7, "/trades": 3, "/trade-stats": 10}
+
+
+def wire_bytes(response):
+    head = len(f"HTTP/1.1 {response.status_code} {response.reason_phrase}\r\n")
+    head += sum(len(k) + len(v) + 4 for k, v in response.headers.items()) + 2
+    return head + response.num_bytes_downloaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--minutes", type=float, default=60.0, help="simulated time")
+    parser.add_argument("--signal-probability", type=float, default=0.01,
+                        help="random entry chance per symbol per iteration")
+    parser.add_argument("--start", type=float, default=1_700_038_800.0,
+                        help="fake clock start (epoch; the default is in the trading session)")
+    args = parser.parse_args()
+
+    clock = [args.start]
+    fake_mt5.install(clock=lambda: clock[0])
+    os.chdir(tempfile.mkdtemp(prefix="smc_dashboard_"))
+    os.makedirs("logs", exist_ok=True)
+
+    from fastapi.testclient import TestClient
+    from config import Config
+    from sim.stress_bot import StressBot
+    import http_cache
+    import webapp
+    from engine.client import LocalEngine
+    from engine.host import EngineHost
+
+    for name, value in {"JOURNAL_ENABLED": False, "CHECKPOINT_ENABLED": False, "BAR_STORE_ENABLED": False,
+                        "TICK_RECORDING_ENABLED": False,
+                        "STRESS_SIGNAL_PROBABILITY": args.signal_probability}.items():
+        setattr(Config, name, value)
+
+    bot = StressBot()
+    # Keep the bot's log file (the /logs source) but nothing on the console
+    for handler in logging.getLogger().handlers + list(bot._log_listener.handlers):
+        if type(handler) is logging.StreamHandler:
+            handler.setLevel(logging.CRITICAL)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    bot.connect()
+    webapp._engine = LocalEngine(EngineHost(bot=bot))  # driven here on the simulated clock
+    bot._running = True
+
+    client = TestClient(webapp.app)
+    encodings = "br, gzip" if http_cache.brotli is not None else "gzip"
+    before, after = Counter(), Counter()
+    requests, not_modified = Counter(), Counter()
+    etags = {}
+
+    def poll(url):
+        r = client.get(url, headers={"Accept-Encoding": "identity"})
+        before[url] += wire_bytes(r)
+        headers = {"Accept-Encoding": encodings}
+        if url in etags:
+            headers["If-None-Match"] = etags[url]
+        r = client.get(url, headers=headers)
+        after[url] += wire_bytes(r)
+        etags[url] = r.headers.get("etag", etags.get(url))
+        requests[url] += 1
+        not_modified[url] += r.status_code == 304
+
+    started = time.perf_counter()
+    poll("/")
+    seconds = int(args.minutes * 60)
+    for second in range(seconds):
+        clock[0] += 1
+        if second % Config.LOOP_INTERVAL_SECONDS == 0:
+            now = datetime.fromtimestamp(clock[0])
+            bot.scan_symbols(now, now.hour)
+            bot.manage_positions()
+        for url, every in POLLS.items():
+            if second % every == 0:
+                poll(url)
+    bot._running = False
+    bot.close_logging()
+
+    scale = 60.0 / args.minutes  # the page itself is loaded once per tab, not scaled
+    print(f"{args.minutes:g} simulated minutes, {len(bot.symbols)} symbols, "
+          f"{bot.trade_history.get_trade_stats().get('total_trades', 0)} trades, "
+          f"encodings offered: {encodings}  ({time.perf_counter() - started:.0f} s)\n")
+    print(f"{'endpoint':<14}{'requests':>9}{'304s':>7}{'before KB/h':>14}{'after KB/h':>13}{'saved':>8}")
+    for url, per_hour in [("/", 1.0)] + [(url, scale) for url in POLLS]:
+        before[url] *= per_hour
+        after[url] *= per_hour
+        b, a = before[url] / 1024, after[url] / 1024
+        print(f"{url:<14}{requests[url]:>9}{not_modified[url]:>7}{b:>14.1f}{a:>13.1f}{1 - a / b:>8.0%}")
+    b, a = sum(before.values()) / 1024, sum(after.values()) / 1024
+    print(f"{'total':<14}{sum(requests.values()):>9}{sum(not_modified.values()):>7}{b:>14.1f}{a:>13.1f}{1 - a / b:>8.0%}")
+
+
+if __name__ == "__main__":
+    main()
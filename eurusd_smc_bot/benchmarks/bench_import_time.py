@@ -0,0 +1,71 @@
+# bench_import_time.py
+"""Dashboard cold-start benchmark based on ``python -X importtime``.
+
+Imports ``webapp`` in a fresh interpreter, reports the cumulative import
+time and the slowest modules, and fails if the heavy trading stack is pulled
+in at import time or the budget is exceeded.
+
+    cd eurusd_smc_bot && python -m benchmarks.bench_import_time --budget-ms 1000
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+
+# Must only be imported when /start creates the bot
+HEAVY_MODULES = ("MetaTrader5", "pandas", "numpy", "talib")
+
+
+def parse_importtime(stderr):
+    """Return [(cumulative_us, self_us, module)] from -X importtime output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            rows.append((int(cumulative_us), int(self_us), name.rstrip()))
+        except ValueError:
+            continue
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="webapp")
+    parser.add_argument("--budget-ms", type=float, default=1000.0)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {args.module}"],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        print(proc.stderr[-2000:])
+        sys.exit(proc.returncode)
+
+    rows = parse_importtime(proc.stderr)
+    target = [r for r in rows if r[2].strip() == args.module]
+    total_ms = (target[-1][0] if target else sum(r[1] for r in rows)) / 1000
+
+    print(f"import {args.module}: {total_ms:.1f} ms cumulative (budget {args.budget_ms:.0f} ms)")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for cumulative_us, self_us, name in sorted(rows, reverse=True)[:args.top]:
+        print(f"{cumulative_us / 1000:14.1f} {self_us / 1000:9.1f}  {name}")
+
+    loaded = {r[2].strip() for r in rows}
+    heavy = [m for m in HEAVY_MODULES if m in loaded]
+    if heavy:
+        print(f"FAIL: heavy modules imported at startup: {', '.join(heavy)}")
+        sys.exit(1)
+    if total_ms > args.budget_ms:
+        print("FAIL: import time over budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
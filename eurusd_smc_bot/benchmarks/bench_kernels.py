@@ -0,0 +1,124 @@
+# bench_kernels.py
+"""Parity and speed of the NumPy and Numba detector kernels.
+
+Checks that both backends return identical results -- kernel by kernel and
+through the ``SMCStrategies`` detectors -- on synthetic rates of several
+lengths (strided MT5 field views and contiguous copies), then times each
+kernel and the per-symbol detector set on both. Exits non-zero on a parity
+mismatch. Without Numba installed only the NumPy backend is timed.
+
+    cd eurusd_smc_bot && python -m benchmarks.bench_kernels
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import random_walk_rates
+from market_data.bars import Bars
+from strategies import kernels
+from strategies.smc_strategies import SMCStrategies
+
+
+def kernel_calls(rates, pv=0.0001):
+    o, h, l, c = (rates[name] for name in ("open", "high", "low", "close"))
+    return {
+        "swing_highs": (h,),
+        "swing_lows": (l,),
+        "last_swings": (h, l),
+        "order_block_indices": (o, h, l, c, pv, 3.0, 8),
+        "fair_value_gap_indices": (h, l, pv, 1.0, 20.0, 12),
+        "breaker_candidates": (h[-30:], l[-30:], c[-30:], 4),
+    }
+
+
+def detector_calls(smc, bars, pv=0.0001):
+    return {
+        "order_blocks": smc.identify_order_blocks(bars, pv),
+        "order_blocks_swing": smc.identify_order_blocks_swing(bars, pv),
+        "fvgs": smc.identify_fair_value_gaps(bars, pv),
+        "bos": smc.detect_break_of_structure(bars, pv),
+        "liquidity_buy": smc.identify_liquidity_pools(bars, 'buy', pv),
+        "liquidity_sell": smc.identify_liquidity_pools(bars, 'sell', pv),
+        "breakers": smc.identify_breaker_blocks(bars, pv),
+    }
+
+
+def same(a, b):
+    if isinstance(a, tuple):
+        return len(a) == len(b) and all(same(x, y) for x, y in zip(a, b))
+    if isinstance(a, np.ndarray):
+        return np.array_equal(a, b)
+    return a == b
+
+
+def check_parity(numba_backend, lengths, seeds):
+    failures = 0
+    smc_np, smc_nb = SMCStrategies("numpy"), SMCStrategies("numba")
+    for n in lengths:
+        for seed in range(seeds):
+            rates = random_walk_rates(n, seed=seed)
+            contiguous = {name: np.ascontiguousarray(rates[name]) for name in ("open", "high", "low", "close")}
+            for layout in (rates, contiguous):
+                for name, args in kernel_calls(layout).items():
+                    if not same(getattr(kernels, name)(*args), getattr(numba_backend, name)(*args)):
+                        failures += 1
+                        print(f"kernel mismatch: {name} n={n} seed={seed}")
+            if n < 5:
+                continue  # the detectors need a few bars (ATR) before calling the kernels
+            bars = Bars(rates)
+            expected, got = detector_calls(smc_np, bars), detector_calls(smc_nb, bars)
+            for name in expected:
+                if repr(expected[name]) != repr(got[name]):  # repr: NaN stops compare equal
+                    failures += 1
+                    print(f"detector mismatch: {name} n={n} seed={seed}")
+    return failures
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bars", type=int, default=300, help="bars per timing call")
+    parser.add_argument("--repeat", type=int, default=2000)
+    args = parser.parse_args()
+
+    backends = [kernels]
+    try:
+        backends.append(kernels.load_backend("numba"))
+    except ImportError:
+        print("numba not installed - NumPy backend only")
+    for backend in backends:
+        print(f"{backend.NAME:<6} warm-up {kernels.warm_up(backend):8.1f} ms")
+
+    if len(backends) == 2:
+        failures = check_parity(backends[1], lengths=(0, 3, 5, 10, 31, 200, 1000), seeds=20)
+        print(f"parity: {'OK' if failures == 0 else f'{failures} mismatches'}")
+        if failures:
+            sys.exit(1)
+
+    rates = random_walk_rates(args.bars, seed=1)
+    print(f"\n{'us/call':<24}" + "".join(f"{b.NAME:>10}" for b in backends))
+    for name, call_args in kernel_calls(rates).items():
+        row = [best_of(lambda: [getattr(b, name)(*call_args) for _ in range(100)], args.repeat // 100) * 1e4
+               for b in backends]
+        print(f"{name:<24}" + "".join(f"{t:10.2f}" for t in row))
+
+    bars = Bars(rates)
+    row = []
+    for backend in backends:
+        smc = SMCStrategies(backend.NAME)
+        row.append(best_of(lambda: [detector_calls(smc, bars) for _ in range(100)], args.repeat // 100) * 1e4)
+    print(f"{'detector set':<24}" + "".join(f"{t:10.2f}" for t in row))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# bench_logging.py
+"""Logging cost per loop iteration: synchronous handlers vs queue + dedup.
+
+Replays the per-symbol status messages the loop emits every iteration and
+measures the time spent in the trading thread plus the bytes written.
+
+    cd eurusd_smc_bot && python -m benchmarks.bench_logging --iterations 5000
+"""
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+
+from bot_logging import LOG_FORMAT, setup_bot_logging, shutdown_bot_logging
+from config import Config
+
+
+def emit_iteration(logger, symbols, lazy):
+    for symbol in symbols:
+        trend, obs, fvgs, spread = "bullish", 3, 2, 2.4
+        if lazy:
+            logger.info("[%s] Spread too high (%.1f pips)", symbol, spread,
+                        extra={"dedup": f"[{symbol}] Spread too high"})
+            logger.info("[%s] %s (trend_h1=%s, OBs=%d, FVGs=%d)",
+                        symbol, "No BOS detected", trend, obs, fvgs,
+                        extra={"dedup": f"[{symbol}] No BOS detected"})
+        else:
+            logger.info(f"[{symbol}] Spread too high ({spread:.1f} pips)")
+            logger.info(f"[{symbol}] No BOS detected (trend_h1={trend}, OBs={obs}, FVGs={fvgs})")
+
+
+def run_sync(log_file, symbols, iterations):
+    logger = logging.getLogger("bench_sync")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    formatter = logging.Formatter(LOG_FORMAT)
+    fh = logging.FileHandler(log_file, encoding="utf-8")
+    ch = logging.StreamHandler(open(os.devnull, "w"))
+    for h in (fh, ch):
+        h.setFormatter(formatter)
+        logger.addHandler(h)
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        emit_iteration(logger, symbols, lazy=False)
+    elapsed = time.perf_counter() - start
+
+    for h in (fh, ch):
+        logger.removeHandler(h)
+        h.close()
+    return elapsed
+
+
+def run_queued(log_file, symbols, iterations):
+    stderr = sys.stderr
+    sys.stderr = open(os.devnull, "w")  # console handler writes to stderr
+    try:
+        logger, listener, qh = setup_bot_logging("bench_queued", log_file,
+                                                 Config.LOG_DEDUP_WINDOW_SECONDS)
+        logger.propagate = False
+        start = time.perf_counter()
+        for _ in range(iterations):
+            emit_iteration(logger, symbols, lazy=True)
+        elapsed = time.perf_counter() - start
+        shutdown_bot_logging(logger, listener, qh)
+    finally:
+        sys.stderr.close()
+        sys.stderr = stderr
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+
+    symbols = list(Config.SYMBOLS)
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {}
+        for label, runner in (("sync", run_sync), ("queued+dedup", run_queued)):
+            path = os.path.join(tmp, f"{label}.log")
+            elapsed = runner(path, symbols, args.iterations)
+            results[label] = (elapsed, os.path.getsize(path))
+
+    print(f"{len(symbols)} symbols, {args.iterations} iterations")
+    for label, (elapsed, size) in results.items():
+        print(f"{label:<13} {elapsed / args.iterations * 1e6:8.1f} µs/iter in trading thread  "
+              f"{size / 1024:9.1f} KiB written")
+    sync_t, queued_t = results["sync"][0], results["queued+dedup"][0]
+    print(f"logging time per iteration reduced {sync_t / queued_t:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
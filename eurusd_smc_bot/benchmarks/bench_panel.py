@@ -0,0 +1,94 @@
+# bench_panel.py
+"""Per-symbol signal path vs the vectorised panel pre-screen.
+
+Runs the bot's analysis against the fake MT5 for ``--symbols`` synthetic
+pairs over ``--steps`` consecutive M15 bars, timing the detailed
+generators for every symbol against one panel screen plus the detailed
+path for the candidates only. Fails if the panel screens out a symbol the
+detailed path would have signalled.
+
+    cd eurusd_smc_bot && python -m benchmarks.bench_panel --symbols 10 50 200
+"""
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from sim import fake_mt5
+
+
+def run(count, steps, start):
+    from config import Config
+    from main import EURUSD_SMC_Bot
+    from recording.journal import KIND_SCALP, KIND_SWING
+    from sim.run_sharded import synthetic_symbols
+
+    Config.SYMBOLS = synthetic_symbols(count)
+    clock = [start]
+    fake_mt5.configure(seed=0, clock=lambda: clock[0])
+    bot = EURUSD_SMC_Bot()
+    bot.logger.setLevel(logging.WARNING)
+
+    detailed = panel = 0.0
+    signals = candidates = 0
+    for _ in range(steps):
+        clock[0] += 900
+        all_data = [d for d in map(bot.get_market_data, bot.symbols) if d is not None]
+
+        t0 = time.perf_counter()
+        expected = {}
+        for data in all_data:
+            # Same spread gates as process_symbol
+            sym = data['symbol']
+            if data['spread'] <= Config.SYMBOLS[sym]['max_spread']:
+                expected[(KIND_SCALP, sym)] = bot.generate_signal(data)
+            if data['spread'] <= Config.SYMBOLS[sym]['swing_max_spread']:
+                expected[(KIND_SWING, sym)] = bot.generate_swing_signal(bot.get_swing_data(sym))
+        t1 = time.perf_counter()
+        screen = bot.panel.screen(all_data, bot.bar_cache)
+        got = {}
+        for data in all_data:
+            sym = data['symbol']
+            if screen.candidate(KIND_SCALP, sym):
+                got[(KIND_SCALP, sym)] = bot.generate_signal(data)
+            if screen.candidate(KIND_SWING, sym):
+                got[(KIND_SWING, sym)] = bot.generate_swing_signal(bot.get_swing_data(sym))
+        t2 = time.perf_counter()
+
+        for key, signal in expected.items():
+            if signal is not None:
+                signals += 1
+                assert got.get(key) == signal, f"panel screened out a signal: {key}"
+        candidates += sum(screen.candidates.values())
+        detailed += t1 - t0
+        panel += t2 - t1
+
+    bot.close_logging()
+    checks = 2 * count * steps
+    print(f"{count:>5} symbols  per-symbol {detailed / steps * 1000:8.1f} ms/loop   "
+          f"panel {panel / steps * 1000:7.1f} ms/loop   x{detailed / panel:5.1f}   "
+          f"detailed checks {candidates}/{checks}   signals {signals}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--steps", type=int, default=20, help="M15 bars to advance through")
+    parser.add_argument("--start", type=float, default=1_700_000_000.0, help="fake clock start (epoch)")
+    args = parser.parse_args()
+
+    fake_mt5.install()
+    from config import Config
+    for name, value in {"JOURNAL_ENABLED": False, "CHECKPOINT_ENABLED": False,
+                        "BAR_STORE_ENABLED": False, "PANEL_SCAN_MIN_SYMBOLS": 1}.items():
+        setattr(Config, name, value)
+    os.chdir(tempfile.mkdtemp(prefix="smc_panel_"))
+    os.makedirs("logs", exist_ok=True)
+
+    for count in args.symbols:
+        run(count, args.steps, args.start)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# bench_triggers.py
+"""Trigger book vs checking every open position on every price update.
+
+Opens ``--positions`` random positions (breakeven, TP1 and TP2 levels
+each) over ``--symbols`` random-walk symbols, then feeds ``--ticks`` price
+updates to both the per-position scan the bot used to do and the
+``TriggerBook``. Fails if they fire different levels on any update; new
+positions replace fully triggered ones so the open count stays constant.
+
+    cd eurusd_smc_bot && python -m benchmarks.bench_triggers --positions 10 100 1000
+"""
+import argparse
+import random
+import time
+
+from trading.triggers import BREAKEVEN, TP1, TP2, TriggerBook
+
+
+PIP = 0.0001
+SPREAD = 1.2 * PIP
+
+
+def new_position(rng, ticket, symbol, price):
+    direction = rng.choice(('buy', 'sell'))
+    stop = rng.uniform(8, 40) * PIP
+    sign = 1 if direction == 'buy' else -1
+    levels = {BREAKEVEN: price + sign * 10 * PIP, TP1: price + sign * 1.5 * stop, TP2: price + sign * 2.0 * stop}
+    return {"ticket": ticket, "symbol": symbol, "direction": direction, "levels": levels}
+
+
+def scan(positions, symbol, bid, ask):
+    """The old per-position checks: every pending level of every position of ``symbol``."""
+    fired = []
+    for pos in positions.values():
+        if pos["symbol"] != symbol:
+            continue
+        for kind, level in list(pos["levels"].items()):
+            if (bid >= level) if pos["direction"] == 'buy' else (ask <= level):
+                fired.append((pos["ticket"], kind))
+                del pos["levels"][kind]
+    return fired
+
+
+def run(count, symbols, ticks, seed):
+    rng = random.Random(seed)
+    names = [f"SYM{i}" for i in range(symbols)]
+    prices = {name: 1.1 for name in names}
+    ref, book = {}, TriggerBook()
+    next_ticket = [1]
+
+    def open_one(symbol):
+        pos = new_position(rng, next_ticket[0], symbol, prices[symbol])
+        next_ticket[0] += 1
+        ref[pos["ticket"]] = {**pos, "levels": dict(pos["levels"])}
+        for kind, level in pos["levels"].items():
+            book.add(symbol, pos["direction"], pos["ticket"], kind, level)
+
+    for i in range(count):
+        open_one(names[i % symbols])
+
+    scan_time = book_time = 0.0
+    fired = 0
+    for _ in range(ticks):
+        symbol = rng.choice(names)
+        prices[symbol] += rng.gauss(0, 1.5) * PIP
+        bid, ask = prices[symbol], prices[symbol] + SPREAD
+
+        t0 = time.perf_counter()
+        expected = scan(ref, symbol, bid, ask)
+        t1 = time.perf_counter()
+        got = [(t.ticket, t.kind) for t in book.crossed(symbol, bid, ask)]
+        t2 = time.perf_counter()
+        assert sorted(expected) == sorted(got), f"trigger mismatch: {sorted(expected)} != {sorted(got)}"
+
+        scan_time += t1 - t0
+        book_time += t2 - t1
+        fired += len(got)
+        for ticket in {ticket for ticket, _ in got}:
+            if not ref[ticket]["levels"]:
+                del ref[ticket]
+                book.discard(ticket)
+                open_one(symbol)
+
+    print(f"{count:>6} positions  scan {scan_time / ticks * 1e6:8.1f} us/update   "
+          f"book {book_time / ticks * 1e6:6.1f} us/update   x{scan_time / book_time:6.1f}   "
+          f"levels fired {fired}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--positions", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--symbols", type=int, default=5)
+    parser.add_argument("--ticks", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    for count in args.positions:
+        run(count, args.symbols, args.ticks, args.seed)
+    print("parity: OK")
+
+
+if __name__ == "__main__":
+    main()
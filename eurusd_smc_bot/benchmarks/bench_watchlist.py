@@ -0,0 +1,91 @@
+# bench_watchlist.py
+"""Per-loop cost of scanning every symbol vs the two-stage watchlist.
+
+Runs ``scan_symbols`` against the fake MT5 for universes of ``--symbols``
+synthetic pairs, advancing the clock ``--step`` seconds per loop: once
+with every symbol in the full M15 pipeline (panel pre-screen on, as for
+a large ``Config.SYMBOLS``) and once with the watchlist ranking the
+universe on H1 and promoting ``--active`` symbols. Warm-up (the first
+loop, or the watchlist's first scoring pass) is reported separately.
+
+    cd eurusd_smc_bot && python -m benchmarks.bench_watchlist --symbols 25 50 100
+"""
+import argparse
+import logging
+import os
+import tempfile
+import time
+from datetime import datetime
+
+from sim import fake_mt5
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * len(ordered))))]
+
+
+def run(count, loops, step, start, watchlist):
+    from config import Config
+    from main import EURUSD_SMC_Bot
+    from sim.run_sharded import synthetic_symbols
+
+    universe = synthetic_symbols(count)
+    clock = [start]
+    fake_mt5.configure(seed=0, clock=lambda: clock[0], symbols=universe)
+    Config.WATCHLIST_ENABLED = watchlist
+    Config.SYMBOLS = {} if watchlist else dict(universe)
+    bot = EURUSD_SMC_Bot()
+    bot.logger.setLevel(logging.WARNING)
+
+    t0 = time.perf_counter()
+    if watchlist:
+        bot.setup_watchlist()
+    else:
+        bot.scan_symbols(datetime.fromtimestamp(clock[0]), 12)
+    warm_up = time.perf_counter() - t0
+
+    times, changes = [], 0
+    for _ in range(loops):
+        clock[0] += step
+        before = set(bot.symbols)
+        t0 = time.perf_counter()
+        bot.scan_symbols(datetime.fromtimestamp(clock[0]), 12)
+        times.append((time.perf_counter() - t0) * 1000)
+        changes += len(before.symmetric_difference(bot.symbols))
+    bot.close_logging()
+
+    label = "watchlist" if watchlist else "every symbol"
+    print(f"{count:>5} symbols  {label:<13} warm-up {warm_up * 1000:8.0f} ms   "
+          f"loop mean {sum(times) / len(times):7.1f} ms  p99 {percentile(times, 99):7.1f} ms   "
+          f"full pipeline {len(bot.symbols):>3} symbols   promotions+demotions {changes}")
+    return sum(times) / len(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", type=int, nargs="+", default=[25, 50, 100])
+    parser.add_argument("--active", type=int, default=10, help="WATCHLIST_MAX_ACTIVE")
+    parser.add_argument("--loops", type=int, default=30)
+    parser.add_argument("--step", type=float, default=120.0, help="fake seconds per loop")
+    parser.add_argument("--start", type=float, default=1_700_038_800.0, help="fake clock start (epoch)")
+    args = parser.parse_args()
+
+    fake_mt5.install()
+    from config import Config
+    for name, value in {"JOURNAL_ENABLED": False, "CHECKPOINT_ENABLED": False,
+                        "BAR_STORE_ENABLED": False, "TICK_RECORDING_ENABLED": False,
+                        "SESSION_START_HOUR": 0, "SESSION_END_HOUR": 24,
+                        "WATCHLIST_MAX_ACTIVE": args.active}.items():
+        setattr(Config, name, value)
+    os.chdir(tempfile.mkdtemp(prefix="smc_watchlist_"))
+    os.makedirs("logs", exist_ok=True)
+
+    for count in args.symbols:
+        full = run(count, args.loops, args.step, args.start, watchlist=False)
+        staged = run(count, args.loops, args.step, args.start, watchlist=True)
+        print(f"{'':>13} x{full / staged:.1f} per loop")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+# synthetic.py
+import numpy as np
+
+
+# Same layout MT5 returns from copy_rates_from_pos
+RATES_DTYPE = np.dtype([
+    ("time", "<i8"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("tick_volume", "<u8"),
+    ("spread", "<i4"),
+    ("real_volume", "<u8"),
+])
+
+
+def random_walk_rates(count, period_seconds=900, start_price=1.1, pip_value=0.0001,
+                      start_time=1_700_000_100, seed=0):
+    """Generate a plausible OHLCV random walk in MT5 rates format."""
+    rng = np.random.default_rng(seed)
+    rates = np.zeros(count, dtype=RATES_DTYPE)
+    rates["time"] = start_time // period_seconds * period_seconds + np.arange(count) * period_seconds
+
+    step = pip_value * 4
+    close = start_price + np.cumsum(rng.normal(0, step, count))
+    open_ = close + rng.normal(0, step, count)
+    rates["open"] = open_
+    rates["close"] = close
+    rates["high"] = np.maximum(open_, close) + np.abs(rng.normal(0, step, count))
+    rates["low"] = np.minimum(open_, close) - np.abs(rng.normal(0, step, count))
+    rates["tick_volume"] = rng.integers(50, 500, count)
+    rates["spread"] = rng.integers(0, 20, count)
+    return rates
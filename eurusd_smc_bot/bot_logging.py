@@ -0,0 +1,181 @@
+# bot_logging.py
+import logging
+import os
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+
+def _format_window(seconds):
+    if seconds >= 3600:
+        return f"{seconds / 3600:.0f}h"
+    if seconds >= 60:
+        return f"{seconds / 60:.0f}m"
+    return f"{seconds:.0f}s"
+
+
+class DedupFilter(logging.Filter):
+    """Collapse repeated status messages into rate-limited summaries.
+
+    Records logged with ``extra={"dedup": "<label>"}`` pass through once per
+    window; repeats inside the window are only counted. Once the window
+    closes, the repeats are summarised, e.g.
+    ``[EURUSD.ecn] No BOS detected ×150 in 5m`` -- checked on every record
+    (at most once a second), so a condition that stops repeating is
+    summarised without waiting for the label to recur.
+    """
+
+    SWEEP_SECONDS = 1.0
+
+    def __init__(self, window_seconds=300):
+        super().__init__()
+        self.window_seconds = window_seconds
+        self._seen = {}  # {label: [window_start, suppressed_count, level, last_suppressed]}
+        self._next_sweep = 0.0
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        now = time.monotonic()
+        if now >= self._next_sweep:
+            self._sweep(record.name, now)
+
+        label = getattr(record, "dedup", None)
+        if label is None:
+            return True
+        with self._lock:
+            entry = self._seen.get(label)
+            if entry is not None and now - entry[0] < self.window_seconds:
+                entry[1] += 1
+                entry[3] = now
+                return False
+            self._seen[label] = [now, 0, record.levelno, now]
+        return True
+
+    def _sweep(self, logger_name, now):
+        """Summarise (and forget) labels whose window has closed."""
+        with self._lock:
+            self._next_sweep = now + self.SWEEP_SECONDS
+            expired = [(label, e) for label, e in self._seen.items() if now - e[0] >= self.window_seconds]
+            for label, _ in expired:
+                del self._seen[label]
+        for label, entry in expired:
+            if entry[1]:
+                self._emit_summary(logger_name, label, entry[1], entry[3] - entry[0], entry[2])
+
+    def flush(self, logger_name):
+        """Emit summaries for everything still being suppressed."""
+        with self._lock:
+            pending = [(label, e) for label, e in self._seen.items() if e[1]]
+            self._seen.clear()
+        for label, entry in pending:
+            self._emit_summary(logger_name, label, entry[1], entry[3] - entry[0], entry[2])
+
+    def _emit_summary(self, logger_name, label, count, elapsed, level):
+        logger = logging.getLogger(logger_name)
+        for handler in logger.handlers:
+            if self in handler.filters:
+                record = logger.makeRecord(
+                    logger_name, level, __file__, 0,
+                    "%s ×%d in %s", (label, count, _format_window(elapsed)), None,
+                )
+                handler.handle(record)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """QueueHandler that leaves message formatting to the listener thread.
+
+    The stock ``prepare()`` formats every record in the caller's thread; here
+    only exception text is rendered eagerly (tracebacks can't cross threads).
+    ``listener`` is the writer thread draining the queue.
+    """
+
+    listener = None
+
+    def prepare(self, record):
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class DailyFileHandler(logging.FileHandler):
+    """FileHandler over ``time.strftime(pattern)`` of each record's time.
+
+    A long-running bot keeps writing to the file of the current day (the one
+    the dashboard tails) instead of the one of the day it started.
+    """
+
+    def __init__(self, pattern, encoding='utf-8'):
+        self.pattern = pattern
+        super().__init__(time.strftime(pattern), encoding=encoding, delay=True)
+
+    def emit(self, record):
+        path = os.path.abspath(time.strftime(self.pattern, time.localtime(record.created)))
+        if path != self.baseFilename:
+            # Called with the handler lock held; the stream reopens on the new path
+            if self.stream is not None:
+                self.stream.close()
+                self.stream = None
+            self.baseFilename = path
+        super().emit(record)
+
+
+_setup_lock = threading.Lock()
+
+
+def setup_bot_logging(logger_name, log_pattern, dedup_window_seconds=300):
+    """Attach a background file/console writer to a logger.
+
+    ``log_pattern`` is a ``strftime`` pattern: one log file per day. Idempotent
+    per logger: a writer left attached by a previous owner (a bot that is
+    still shutting down, or was never run) is shut down first, so records
+    are never written twice and its files are closed.
+
+    Returns ``(logger, listener, queue_handler)``; pass them to
+    ``shutdown_bot_logging`` when the owner shuts down.
+    """
+    logger = logging.getLogger(logger_name)
+    logger.setLevel(logging.INFO)
+    for handler in list(logger.handlers):
+        if isinstance(handler, DeferredQueueHandler):
+            shutdown_bot_logging(logger, handler.listener, handler)
+
+    formatter = logging.Formatter(LOG_FORMAT)
+
+    # File handler
+    fh = DailyFileHandler(log_pattern)
+    fh.setLevel(logging.INFO)
+    fh.setFormatter(formatter)
+
+    # Console handler
+    ch = logging.StreamHandler()
+    ch.setLevel(logging.INFO)
+    ch.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    qh = DeferredQueueHandler(log_queue)
+    qh.addFilter(DedupFilter(dedup_window_seconds))
+    listener = QueueListener(log_queue, fh, ch, respect_handler_level=True)
+    qh.listener = listener
+    listener.start()
+    logger.addHandler(qh)
+    return logger, listener, qh
+
+
+def shutdown_bot_logging(logger, listener, queue_handler):
+    """Flush pending summaries, drain the queue and close the writers (idempotent)."""
+    with _setup_lock:
+        if queue_handler.listener is None:
+            return
+        queue_handler.listener = None
+    for f in queue_handler.filters:
+        if isinstance(f, DedupFilter):
+            f.flush(logger.name)
+    logger.removeHandler(queue_handler)
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
@@ -33,10 +33,13 @@ class Config:
     RISK_PERCENT = 0.25  # risk-based sizing (ignored if FIXED_LOT_SIZE > 0)
     FIXED_LOT_SIZE = 0.02  # use fixed 0.02 lots per trade for now
     MAX_DAILY_TRADES = 5        # per symbol
+    MAX_TOTAL_DAILY_TRADES = 21   # scalp + swing, all symbols together (sharded runs only)
+    MAX_OPEN_LOTS = 1.0           # total open exposure across all symbols (sharded runs; per follower account)
     MIN_STOP_PIPS = 5
     MAX_STOP_PIPS = 25
     
     # Trade Management
+    MAGIC_NUMBER = 123456       # tags our orders; used to find our positions after a restart
     BREAKEVEN_PIPS = 8
     TP1_MULTIPLIER = 1.5
     TP2_MULTIPLIER = 2.0
@@ -46,11 +49,114 @@ class Config:
     ENTRY_TIMEFRAME = 15  # M15
     BIAS_TIMEFRAME = 60   # H1
 
+    # Local resampling: H1/H4/D1 are built from one cached base series
+    BASE_TIMEFRAME = "M15"
+    BASE_HISTORY_BARS = 10000    # ~100 trading days of M15, enough for 100 D1 bars
+    BASE_REFRESH_BARS = 3        # bars pulled per loop once the cache is warm
+    SERVER_DAY_OFFSET_HOURS = 0  # shift if the broker's D1 candle doesn't open at server midnight
+    BARS_FLOAT32 = False         # store cached prices as float32 for memory-constrained runs
+
+    # On-disk bar warehouse (see market_data/warehouse.py): warm-up reads closed
+    # bars from disk and only asks the terminal for what is missing
+    BAR_STORE_ENABLED = True
+    BAR_STORE_DIR = "data/bars"
+    BAR_STORE_BACKFILL_BARS = 100000  # first `warehouse sync` from the CLI (~4 years of M15)
+
+    LOOP_INTERVAL_SECONDS = 2    # pause between analysis loop iterations
+
     # Session / Market Filters
     SESSION_START_HOUR = 7   # 07:00 server time
     SESSION_END_HOUR = 17    # 17:00 server time
     MAX_SPREAD_PIPS = 2.0
 
+    # Watchlists with at least this many symbols are pre-screened in one
+    # vectorised pass; only candidates run the per-symbol generators (0 = off)
+    PANEL_SCAN_MIN_SYMBOLS = 8
+
+    # Watchlist scanner (see strategies/watchlist.py): rank the whole Market
+    # Watch on cached H1 bars and run the M15 pipeline for the top symbols only.
+    # Discovered symbols are added to SYMBOLS (pip value from the quote digits,
+    # default spread limits). Single-process only (SHARD_WORKERS = 0).
+    WATCHLIST_ENABLED = os.getenv('SMC_WATCHLIST', '0') == '1'
+    WATCHLIST_GROUP = os.getenv('SMC_WATCHLIST_GROUP')  # MT5 group filter, e.g. "*USD*,*JPY*,!*.ecn"
+    WATCHLIST_MAX_ACTIVE = 10          # symbols promoted to the full pipeline
+    WATCHLIST_DEMOTE_MARGIN = 3        # places below the cut-off before an active symbol is demoted
+    WATCHLIST_REFRESH_PER_LOOP = 10    # symbols whose H1 features are refreshed each loop
+    WATCHLIST_MIN_TREND_STRENGTH = 1   # 1 = H1 trend score >= 3 or <= 1 (what the scalp bias needs)
+    WATCHLIST_MIN_ATR_RATIO = 0.6      # ATR(14) / ATR(100) on H1: skip dead markets...
+    WATCHLIST_MAX_ATR_RATIO = 2.5      # ...and news spikes
+
+    # Detector kernels: "auto" (Numba if installed, else NumPy), "numpy" or "numba"
+    DETECTOR_BACKEND = os.getenv('SMC_DETECTOR_BACKEND', 'auto')
+
+    # Logging: repeated per-symbol status lines are summarised once per window
+    LOG_DEDUP_WINDOW_SECONDS = 300
+
+    # Binary decision/event journal (see recording/journal.py)
+    JOURNAL_ENABLED = True
+    JOURNAL_DIR = "logs/journal"
+
+    # Per-symbol analysis records served at /symbols/{symbol}/analysis
+    # (see recording/analysis.py), kept in memory
+    ANALYSIS_HISTORY = 100    # records per symbol (scalp + swing)
+    ANALYSIS_MAX_ZONES = 3    # nearest order blocks / FVGs kept per record
+
+    # Chart data served at /chart/{symbol}/{timeframe} (see market_data/chart.py)
+    CHART_DEFAULT_BARS = 500
+    CHART_MAX_BARS = 5000
+    CHART_OVERLAY_BARS = 200   # bars the OB/FVG/breaker/BOS overlays are detected on
+
+    # State checkpoint (see trading/checkpoint.py), rewritten only when state changes
+    CHECKPOINT_ENABLED = True
+    CHECKPOINT_FILE = "logs/state.json"
+
+    # Equity curve (see recording/equity.py): balance/equity sampled every
+    # second into a ring, compacted to 1 s / 1 m / 1 h files
+    EQUITY_ENABLED = True
+    EQUITY_DIR = "logs/equity"
+    EQUITY_POLL_SECONDS = 1.0
+    EQUITY_FLUSH_SECONDS = 10        # ring -> disk compaction interval
+    EQUITY_RING_SIZE = 3600          # in-memory samples (1 h at 1 s)
+    EQUITY_1S_RETENTION_DAYS = 7
+    EQUITY_1M_RETENTION_DAYS = 400   # the 1 h tier is kept forever
+
+    # Backtests (see backtest/): detector, signal and trade outputs are cached
+    # on disk by content, least recently used entries evicted past the limit
+    BACKTEST_CACHE_DIR = "data/backtest_cache"
+    BACKTEST_CACHE_MAX_MB = 1024
+    BACKTEST_BALANCE = 10000.0       # account balance for position sizing
+    BACKTEST_WARMUP_DAYS = 150       # history loaded before the start (fills the D1 window)
+
+    # Tick recording (see recording/tick_recorder.py)
+    TICK_RECORDING_ENABLED = True
+    TICK_DIR = "logs/ticks"
+    TICK_POLL_SECONDS = 1.0
+    TICK_INDEX_SAVE_SECONDS = 30      # index.json rewrite interval (rebuilt from the day files on start)
+
+    # Symbol sharding (see sharding/): 0 runs every symbol in one process;
+    # N > 0 spreads symbols over N worker processes behind one order gateway
+    SHARD_WORKERS = int(os.getenv('SHARD_WORKERS', 0))
+    SHARD_HEARTBEAT_TIMEOUT = 30      # seconds without a heartbeat before a shard is restarted
+    SHARD_ORDER_TIMEOUT = 15          # seconds a worker waits for the gateway's reply
+    SHARD_ORDERS_PER_PASS = 20        # orders the gateway executes between position-management checks
+
+    # Engine process (see engine/): the dashboard runs the bot in its own
+    # process and serves the state it publishes; 0 runs it in a web-server thread
+    ENGINE_PROCESS = os.getenv('SMC_ENGINE_PROCESS', '1') != '0'
+    ENGINE_PUBLISH_SECONDS = 1.0      # state snapshot interval
+    ENGINE_CALL_TIMEOUT = 30          # seconds the dashboard waits for a command reply
+    ENGINE_RESTART_MAX_BACKOFF = 60   # max seconds between restarts of a crashed engine (doubles from 1)
+
+    # Follower accounts (see accounts/): every signal the bot executes is also
+    # sent to each account, by one executor process per account (its own MT5
+    # session, sized from its own balance). SMC_ACCOUNTS_FILE is a JSON list of
+    # {"name", "login", "password", "server", "path", "config"}; "config"
+    # overrides Config in that account's process (e.g. FIXED_LOT_SIZE, RISK_PERCENT)
+    ACCOUNTS_FILE = os.getenv('SMC_ACCOUNTS_FILE', '')
+    ACCOUNT_CONNECT_TIMEOUT = 30      # seconds the bot waits at start for the terminals to log in
+    ACCOUNT_ORDER_TIMEOUT = 15        # seconds before an account that hasn't replied counts as timed out
+    ACCOUNT_STATS_SIZE = 500          # fills kept per account for the latency/skew figures
+
     # ── Swing Trade Parameters ──
     SWING_ENABLED = True
     SWING_FIXED_LOT_SIZE = 0.02       # smaller size for longer holds
@@ -0,0 +1,171 @@
+# profiler.py
+"""On-demand sampling profiler and allocation tracker for the live bot.
+
+Nothing here runs until a diagnostic is requested, so there is no overhead
+while idle. ``profile_thread`` samples another thread's stack with
+``sys._current_frames()`` from the calling thread -- it never installs a
+trace or profile hook, so the sampled thread runs unmodified. ``memory_growth``
+turns tracemalloc on for the measurement window only (it does slow
+allocations while it runs) and compares a snapshot at each end.
+
+Only one diagnostic runs at a time.
+"""
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+
+MAX_SECONDS = 60
+MIN_INTERVAL = 0.001
+
+_busy = threading.Lock()
+
+
+class DiagnosticBusy(RuntimeError):
+    """Another profile or memory diagnostic is in progress."""
+
+
+def _clamp(seconds):
+    return max(0.1, min(float(seconds), MAX_SECONDS))
+
+
+def _function(code):
+    return f"{getattr(code, 'co_qualname', code.co_name)} ({os.path.basename(code.co_filename)})"
+
+
+def sample_stacks(thread_id, seconds, interval):
+    """Sample a thread's stack every ``interval`` s for ``seconds``.
+
+    Returns ``(Counter of stacks, samples)``; a stack is a tuple of
+    ``(function, line)`` pairs from the outermost frame to the innermost.
+    """
+    stacks = Counter()
+    samples = 0
+    deadline = time.perf_counter() + seconds
+    labels = {}
+    while time.perf_counter() < deadline:
+        frame = sys._current_frames().get(thread_id)
+        if frame is None:
+            break  # the thread exited
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            label = labels.get(code)
+            if label is None:
+                label = labels[code] = _function(code)
+            stack.append((label, frame.f_lineno))
+            frame = frame.f_back
+        del frame
+        stacks[tuple(reversed(stack))] += 1
+        samples += 1
+        time.sleep(interval)
+    return stacks, samples
+
+
+def collapse(stacks):
+    """Brendan Gregg's collapsed-stack format (``a;b;c count`` per line)."""
+    lines = [
+        ";".join(f"{func}:{line}" for func, line in stack) + f" {count}"
+        for stack, count in stacks.most_common()
+    ]
+    return "\n".join(lines)
+
+
+def top_functions(stacks, samples, limit):
+    """Per-function self (innermost frame) and total (anywhere on the stack) samples."""
+    own = Counter()
+    total = Counter()
+    for stack, count in stacks.items():
+        own[stack[-1][0]] += count
+        for func in {func for func, _ in stack}:
+            total[func] += count
+    pct = lambda n: round(100.0 * n / samples, 1) if samples else 0.0
+    ranked = sorted(total, key=lambda f: (own[f], total[f]), reverse=True)[:limit]
+    return [
+        {"function": f, "self": own[f], "self_pct": pct(own[f]), "total": total[f], "total_pct": pct(total[f])}
+        for f in ranked
+    ]
+
+
+def profile_thread(thread, seconds=5.0, interval=0.005, top=30):
+    """Sampling profile of ``thread`` (a ``threading.Thread``) for ``seconds``."""
+    if not _busy.acquire(blocking=False):
+        raise DiagnosticBusy("another diagnostic is running")
+    try:
+        seconds = _clamp(seconds)
+        interval = max(float(interval), MIN_INTERVAL)
+        start = time.perf_counter()
+        stacks, samples = sample_stacks(thread.ident, seconds, interval)
+        elapsed = time.perf_counter() - start
+    finally:
+        _busy.release()
+
+    return {
+        "thread": thread.name,
+        "seconds": round(elapsed, 3),
+        "interval_ms": round(interval * 1000, 3),
+        "samples": samples,
+        "top": top_functions(stacks, samples, top),
+        "collapsed": collapse(stacks),
+    }
+
+
+def _stat(stat):
+    return {
+        "location": [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback],
+        "size_diff_kb": round(stat.size_diff / 1024, 1),
+        "count_diff": stat.count_diff,
+        "size_kb": round(stat.size / 1024, 1),
+        "count": stat.count,
+    }
+
+
+def memory_growth(seconds=10.0, top=25, group_by="lineno", frames=1):
+    """Allocations made during the window that are still alive at its end.
+
+    ``group_by`` is ``lineno``, ``filename`` or ``traceback`` (with
+    ``frames`` frames per allocation).
+    """
+    if group_by not in ("lineno", "filename", "traceback"):
+        raise ValueError("group_by must be 'lineno', 'filename' or 'traceback'")
+    if not _busy.acquire(blocking=False):
+        raise DiagnosticBusy("another diagnostic is running")
+    try:
+        seconds = _clamp(seconds)
+        frames = max(1, min(int(frames), 25))
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start(frames)
+        try:
+            before = tracemalloc.take_snapshot()
+            time.sleep(seconds)
+            after = tracemalloc.take_snapshot()
+            traced, peak = tracemalloc.get_traced_memory()
+            overhead = tracemalloc.get_tracemalloc_memory()
+        finally:
+            if started:
+                tracemalloc.stop()
+    finally:
+        _busy.release()
+
+    ignore = [
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    ]
+    stats = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), group_by)
+    growth = [s for s in stats if s.size_diff > 0]
+    return {
+        "seconds": seconds,
+        "group_by": group_by,
+        "already_tracing": not started,
+        "growth_kb": round(sum(s.size_diff for s in growth) / 1024, 1),
+        "traced_kb": round(traced / 1024, 1),
+        "peak_kb": round(peak / 1024, 1),
+        "tracemalloc_overhead_kb": round(overhead / 1024, 1),
+        "top": [_stat(s) for s in growth[:top]],
+    }
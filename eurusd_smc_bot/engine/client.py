@@ -0,0 +1,256 @@
+# client.py
+"""Web side of the engine: spawn, supervise and talk to the bot process.
+
+``EngineProcess`` keeps the engine process (``engine/process.py``) alive:
+a reader thread stores the state snapshots it publishes and hands command
+replies back to their callers, and a supervisor thread respawns the
+process if it dies while the bot is meant to be running (doubling the
+delay between attempts up to ``ENGINE_RESTART_MAX_BACKOFF``). The restored
+bot reconciles its checkpoint with the terminal as on any restart.
+
+``LocalEngine`` has the same interface over an in-process ``EngineHost``
+(``Config.ENGINE_PROCESS`` off, or harnesses driving a bot directly).
+"""
+import itertools
+import logging
+import multiprocessing as mp
+import os
+import sys
+import threading
+import time
+
+
+class EngineUnavailable(RuntimeError):
+    """The engine process is not running or stopped answering."""
+
+
+class EngineCallError(RuntimeError):
+    """A command failed in the engine; ``kind`` is the exception's class name."""
+
+    def __init__(self, kind, message):
+        super().__init__(message)
+        self.kind = kind
+
+
+class EngineProcess:
+    """Handle to the engine process, owned by the web process."""
+
+    def __init__(self, options=None, call_timeout=None, max_backoff=None):
+        from config import Config
+        self.options = dict(options or {})
+        fake = sys.modules.get("MetaTrader5")
+        if fake is not None and fake.__name__ == "sim.fake_mt5":
+            # The engine talks to the same synthetic market as this process
+            self.options.setdefault("fake_mt5", {"seed": fake.current_seed()})
+        self.call_timeout = call_timeout or Config.ENGINE_CALL_TIMEOUT
+        self.max_backoff = max_backoff or Config.ENGINE_RESTART_MAX_BACKOFF
+        self._ctx = mp.get_context("spawn")
+        self._proc = None
+        self._conn = None
+        self._send_lock = threading.Lock()
+        self._lock = threading.Lock()          # spawn / shutdown
+        self._ids = itertools.count(1)
+        self._pending = {}                     # {req_id: [Event, reply]}
+        self._generation = 0                   # bumped per spawn: seq restarts at 1
+        self._state = ((0, 0), None)           # ((generation, seq), snapshot) last published
+        self._state_time = None
+        self.wanted_running = False
+        self.restarts = 0
+        self.started = None
+        self._closing = False
+        self._supervisor = None
+
+    # ── Process lifecycle ──
+
+    def alive(self):
+        return self._proc is not None and self._proc.is_alive()
+
+    def pid(self):
+        return self._proc.pid if self._proc is not None else None
+
+    def ensure_process(self):
+        """Spawn the engine process unless it is already alive."""
+        with self._lock:
+            if self.alive():
+                return
+            self._spawn()
+            if self._supervisor is None:
+                self._supervisor = threading.Thread(target=self._supervise, name="smc-engine-supervisor",
+                                                    daemon=True)
+                self._supervisor.start()
+
+    def _spawn(self):
+        from engine.process import run_engine
+        if self._conn is not None:
+            self._conn.close()
+        self._fail_pending("engine process restarted")
+        parent_conn, child_conn = self._ctx.Pipe(duplex=True)
+        # Not a daemon: with sharding the bot itself spawns worker processes
+        proc = self._ctx.Process(target=run_engine, args=(child_conn, self.options), name="smc-engine")
+        proc.start()
+        child_conn.close()
+        self._proc, self._conn = proc, parent_conn
+        self._generation += 1
+        self._state, self._state_time = ((self._generation, 0), None), None
+        self.started = time.time()
+        threading.Thread(target=self._read, args=(parent_conn,), name="smc-engine-reader", daemon=True).start()
+
+    def _read(self, conn):
+        while True:
+            try:
+                message = conn.recv()
+            except (EOFError, OSError):
+                break
+            if message[0] == "state":
+                self._state = ((self._generation, message[1]), message[2])
+                self._state_time = time.monotonic()
+            else:
+                _, req_id, ok, result = message
+                waiter = self._pending.pop(req_id, None)
+                if waiter is not None:
+                    waiter[1] = (ok, result)
+                    waiter[0].set()
+        if conn is self._conn:
+            self._state = ((self._generation, -1), None)
+            self._fail_pending("engine process exited")
+
+    def _fail_pending(self, reason):
+        for req_id in list(self._pending):
+            waiter = self._pending.pop(req_id, None)
+            if waiter is not None:
+                waiter[1] = (False, ("EngineUnavailable", reason))
+                waiter[0].set()
+
+    def _supervise(self):
+        """Respawn the engine if it dies while the bot should be running."""
+        logger = logging.getLogger("engine")
+        backoff = 1.0
+        while not self._closing:
+            time.sleep(1.0)
+            if self._closing or not self.wanted_running or self.alive():
+                if self.alive() and self.started and time.time() - self.started > 60:
+                    backoff = 1.0  # stayed up for a while: next crash restarts quickly again
+                continue
+            code = self._proc.exitcode if self._proc is not None else None
+            logger.error(f"Engine process exited unexpectedly (exit code {code}); restarting in {backoff:.0f}s")
+            time.sleep(backoff)
+            backoff = min(backoff * 2, self.max_backoff)
+            if self._closing or not self.wanted_running:
+                continue
+            try:
+                with self._lock:
+                    self._spawn()
+                self.restarts += 1
+                self.call("start")
+            except Exception as e:
+                logger.error(f"Engine restart failed: {e}")
+
+    def shutdown(self, timeout=90):
+        """Stop the bot cleanly and end the engine process."""
+        with self._lock:
+            self._closing = True
+            self.wanted_running = False
+            if not self.alive():
+                return
+            try:
+                self.call("shutdown", timeout=timeout, wait=60)
+            except (EngineUnavailable, EngineCallError):
+                pass
+            self._proc.join(timeout)
+            if self._proc.is_alive():
+                self._proc.terminate()
+                self._proc.join(5)
+
+    # ── Commands ──
+
+    def call(self, command, timeout=None, **kwargs):
+        """Run ``command`` in the engine and return its result."""
+        conn = self._conn
+        if conn is None or not self.alive():
+            raise EngineUnavailable("engine process is not running")
+        req_id = next(self._ids)
+        waiter = self._pending[req_id] = [threading.Event(), None]
+        try:
+            with self._send_lock:
+                conn.send((req_id, command, kwargs))
+        except (OSError, EOFError, ValueError) as e:
+            self._pending.pop(req_id, None)
+            raise EngineUnavailable(f"engine process unreachable: {e}")
+        if not waiter[0].wait(timeout or self.call_timeout):
+            self._pending.pop(req_id, None)
+            raise EngineUnavailable(f"engine did not answer {command!r} in time")
+        ok, result = waiter[1]
+        if not ok:
+            kind, message = result
+            if kind == "EngineUnavailable":
+                raise EngineUnavailable(message)
+            raise EngineCallError(kind, message)
+        return result
+
+    def start(self):
+        self.ensure_process()
+        self.wanted_running = True
+        return self.call("start")
+
+    def stop(self):
+        self.wanted_running = False
+        return self.call("stop")
+
+    # ── Published state ──
+
+    def snapshot(self):
+        """``(key, snapshot)``: the last published state (snapshot None until the first).
+
+        ``key`` is ``(generation, seq)``, so it changes whenever the state does,
+        across engine restarts too.
+        """
+        return self._state
+
+    def running(self):
+        snapshot = self._state[1]
+        return self.alive() and snapshot is not None and snapshot["status"].get("running", False)
+
+    def state_age(self):
+        return None if self._state_time is None else time.monotonic() - self._state_time
+
+
+class LocalEngine:
+    """The ``EngineProcess`` interface over an ``EngineHost`` in this process."""
+
+    def __init__(self, host):
+        self.host = host
+        self.restarts = 0
+        self.started = None
+
+    def alive(self):
+        return True
+
+    def pid(self):
+        return os.getpid()
+
+    def ensure_process(self):
+        pass
+
+    def shutdown(self, timeout=90):
+        self.host.stop(wait=timeout)
+
+    def call(self, command, timeout=None, **kwargs):
+        try:
+            return self.host.handle(command, kwargs)
+        except Exception as e:
+            raise EngineCallError(type(e).__name__, str(e))
+
+    def start(self):
+        return self.call("start")
+
+    def stop(self):
+        return self.call("stop")
+
+    def snapshot(self):
+        return None, self.host.snapshot()   # built per call: no publisher in-process
+
+    def running(self):
+        return self.host.running()
+
+    def state_age(self):
+        return 0.0
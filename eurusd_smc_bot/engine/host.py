@@ -0,0 +1,226 @@
+# host.py
+"""Bot side of the engine: owns the bot thread and answers the dashboard.
+
+``EngineHost`` runs in the engine process (``engine/process.py``), or in
+the web process when ``Config.ENGINE_PROCESS`` is off. Every dashboard
+command goes through ``handle``; ``snapshot`` builds the state the engine
+publishes (status, open trades, shard health, balance).
+"""
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+
+class NotRunning(RuntimeError):
+    """The command needs a running bot."""
+
+
+def default_bot_class():
+    """The trading bot class (the shard supervisor if SHARD_WORKERS > 0)."""
+    from config import Config
+    if Config.SHARD_WORKERS > 0:
+        from sharding.supervisor import ShardSupervisor
+        return ShardSupervisor
+    from main import EURUSD_SMC_Bot
+    return EURUSD_SMC_Bot
+
+
+class EngineHost:
+    """Starts/stops the bot and reads its state.
+
+    ``bot_class`` builds the bot on ``start``; a harness can pass an
+    already-built ``bot`` (and the ``thread`` running it, if any) instead.
+    """
+
+    COMMANDS = ("ping", "start", "stop", "snapshot", "debug", "loop_history", "analysis", "chart", "profile",
+                "memory")
+    RESTART_WAIT_SECONDS = 20
+
+    def __init__(self, bot_class=None, bot=None, thread=None):
+        self.bot_class = bot_class
+        self.bot = bot
+        self.thread = thread
+        self.started_at = None
+        self.charts = None
+
+    def running(self):
+        return self.bot is not None and getattr(self.bot, "_running", False)
+
+    def handle(self, command, kwargs):
+        if command not in self.COMMANDS:
+            raise ValueError(f"unknown engine command {command!r}")
+        return getattr(self, command)(**kwargs)
+
+    # ── Control ──
+
+    def ping(self):
+        return {"pid": os.getpid(), "running": self.running()}
+
+    def start(self):
+        if self.running():
+            return {"status": "already_running"}
+        if self.thread is not None and self.thread.is_alive():
+            # The previous bot is still shutting down; it closes MT5 on its way out
+            self.thread.join(self.RESTART_WAIT_SECONDS)
+            if self.thread.is_alive():
+                raise RuntimeError("the previous bot is still shutting down; try again shortly")
+        bot_class = self.bot_class or default_bot_class()
+        self.bot = bot_class()
+        self.thread = threading.Thread(target=self.bot.run, name="smc-bot", daemon=True)
+        self.thread.start()
+        self.started_at = time.time()
+        return {"status": "started"}
+
+    def stop(self, wait=0.0):
+        """Ask the loop to stop; with ``wait`` > 0 join the bot thread for up to that long."""
+        if not self.running():
+            return {"status": "not_running"}
+        self.bot.stop()
+        if wait and self.thread is not None:
+            self.thread.join(wait)
+        return {"status": "stopping"}
+
+    # ── State ──
+
+    def snapshot(self):
+        """Everything the dashboard polls, in one JSON-friendly dict."""
+        if not self.running():
+            return {"status": {"running": False}, "trades": {"running": False, "trades": []},
+                    "shards": None, "balance": None}
+        import MetaTrader5 as mt5
+        info = mt5.account_info()
+        return {
+            "status": self.status(),
+            "trades": self.open_trades(mt5),
+            "shards": self.bot.shard_status() if hasattr(self.bot, "shard_status") else None,
+            "balance": info.balance if info else None,
+        }
+
+    def status(self):
+        bot = self.bot
+        per_symbol = {}
+        for sym, state in list(bot.symbol_state.items()):
+            latest = bot.analysis.latest(sym)
+            per_symbol[sym] = {
+                "daily_trades": state.get("daily_trades", 0),
+                "swing_trades": state.get("swing_trades", 0),
+                "scalp_reason": latest["scalp"]["reason"] if "scalp" in latest else None,
+                "swing_reason": latest["swing"]["reason"] if "swing" in latest else None,
+            }
+        return {
+            "running": True,
+            "daily_trades": bot.daily_trades,
+            "open_positions": bot.positions.open_count,
+            "last_signal_time": bot.last_signal_time.isoformat() if bot.last_signal_time else None,
+            "wins": getattr(bot, "wins", 0),
+            "losses": getattr(bot, "losses", 0),
+            "swing_trades": getattr(bot, "swing_trades", 0),
+            "per_symbol": per_symbol,
+            "shards": bot.shard_status() if hasattr(bot, "shard_status") else None,
+            "watchlist": bot.watchlist.status() if getattr(bot, "watchlist", None) is not None else None,
+            "accounts": bot.fanout.status() if getattr(bot, "fanout", None) is not None else None,
+        }
+
+    def open_trades(self, mt5):
+        """Open positions with live profit/loss."""
+        bot = self.bot
+        trades = []
+        total_profit = 0
+
+        for position in bot.positions.open_positions():
+            sym = position.symbol
+            pv = bot.config.SYMBOLS.get(sym, {}).get('pip_value', bot.config.PIP_VALUE)
+
+            # Get current position data from MT5
+            pos = mt5.positions_get(ticket=position.ticket)
+            if not pos or len(pos) == 0:
+                continue
+
+            pos = pos[0]
+            current_price = pos.price_current
+
+            # Calculate profit/loss
+            profit = pos.profit + pos.swap + pos.commission
+            total_profit += profit
+
+            # Calculate pips
+            if position.direction == 'buy':
+                pips = (current_price - position.price) / pv
+            else:
+                pips = (position.price - current_price) / pv
+
+            trades.append({
+                "ticket": position.ticket,
+                "symbol": sym,
+                "direction": position.direction.upper(),
+                "entry_price": round(position.price, 5),
+                "current_price": round(current_price, 5),
+                "volume": position.volume,
+                "pips": round(pips, 2),
+                "profit_r": round(profit, 2),
+                "profit_percent": round((profit / bot.config.FIXED_LOT_SIZE) * 100, 2) if bot.config.FIXED_LOT_SIZE else 0,
+                "tp1": round(position.tp1, 5),
+                "tp2": round(position.tp2, 5),
+                "sl": round(position.sl, 5),
+                "tp1_hit": position.tp1_hit,
+                "tp2_hit": position.tp2_hit,
+                "be_moved": position.be_moved,
+            })
+
+        return {
+            "running": True,
+            "trades": trades,
+            "total_profit": round(total_profit, 2),
+            "trade_count": len(trades),
+        }
+
+    def loop_history(self, since=0):
+        """``[(iteration, loop ms)]`` of recent loop iterations after ``since``."""
+        history = getattr(self.bot, "loop_history", ()) if self.bot is not None else ()
+        return [entry for entry in list(history) if entry[0] > since]
+
+    def analysis(self, symbol, depth=20, kind=None, since=0):
+        """Newest analysis records of ``symbol`` (kept after the bot stops, until the next start)."""
+        log = getattr(self.bot, "analysis", None)
+        if log is None:
+            return []
+        return log.history(symbol, max(1, min(int(depth), log.depth)), kind, since)
+
+    def chart(self, symbol, timeframe, start=None, end=None, since=None, count=None):
+        """Binary chart payload (see market_data/chart.py): the bot's live bars, else the bar store."""
+        if self.charts is None:
+            from market_data.chart import ChartBuilder
+            self.charts = ChartBuilder()
+        self.charts.bar_cache = getattr(self.bot, "bar_cache", None)
+        return self.charts.build(symbol, timeframe, start, end, since, count)
+
+    def debug(self):
+        mt5 = sys.modules.get("MetaTrader5")
+        return {
+            "pid": os.getpid(),
+            "bot_running": self.running(),
+            "bot_instance": self.bot is not None,
+            "bot_started": datetime.fromtimestamp(self.started_at).isoformat() if self.started_at else None,
+            "iterations": getattr(self.bot, "iterations", 0),
+            "detector_backend": self.detector_backend(),
+            "mt5_version": mt5.version() if mt5 is not None else "Not available",
+        }
+
+    def detector_backend(self):
+        strategies = getattr(self.bot, "strategies", None)
+        return strategies.kernels.NAME if strategies is not None else None
+
+    # ── Diagnostics (run where the bot runs) ──
+
+    def profile(self, seconds=5.0, interval=0.005, top=30):
+        thread = self.thread if self.running() else None
+        if thread is None or not thread.is_alive():
+            raise NotRunning("bot is not running")
+        from diagnostics.profiler import profile_thread
+        return profile_thread(thread, seconds, interval, top)
+
+    def memory(self, seconds=10.0, top=25, group_by="lineno", frames=1):
+        from diagnostics.profiler import memory_growth
+        return memory_growth(seconds, top, group_by, frames)
@@ -0,0 +1,110 @@
+# process.py
+"""Entry point of the engine process (the bot, apart from the web server).
+
+The dashboard talks to it over one duplex pipe (a local socket pair):
+
+    web process (engine/client.py)           engine process (this module)
+    ------------------------------           ----------------------------
+    (req_id, command, kwargs)  ------------> EngineHost.handle
+                               <------------ ("reply", req_id, ok, result)
+    latest state               <------------ ("state", seq, snapshot) every
+                                             ENGINE_PUBLISH_SECONDS
+
+The bot thread never touches the pipe: snapshots are built and sent by a
+publisher thread and commands are served by the main thread, so a slow or
+busy web process can't hold up the trading loop. Slow commands (profiling)
+run on their own thread. When the pipe closes -- the web process exited or
+died -- the bot is stopped and the process exits.
+
+Kept free of trading imports at module level: the engine may need to
+install the fake MT5 stand-in before ``main`` imports ``MetaTrader5``.
+"""
+import os
+import sys
+import threading
+import traceback
+
+
+SLOW_COMMANDS = ("profile", "memory")
+
+
+class EngineServer:
+    """Serves one connection for an ``EngineHost``."""
+
+    def __init__(self, conn, host, publish_seconds):
+        self.conn = conn
+        self.host = host
+        self.publish_seconds = publish_seconds
+        self._send_lock = threading.Lock()
+        self._closed = threading.Event()
+        self.seq = 0
+
+    def send(self, message):
+        with self._send_lock:
+            try:
+                self.conn.send(message)
+            except (OSError, EOFError, ValueError):
+                self._closed.set()
+
+    def publish(self):
+        while not self._closed.wait(self.publish_seconds):
+            try:
+                snapshot = self.host.snapshot()
+            except Exception:
+                continue  # state changed under us (e.g. a dict resized); next round
+            self.seq += 1
+            self.send(("state", self.seq, snapshot))
+
+    def reply(self, req_id, command, kwargs):
+        try:
+            result = (True, self.host.handle(command, kwargs))
+        except Exception as e:
+            result = (False, (type(e).__name__, str(e) or traceback.format_exc(limit=1)))
+        self.send(("reply", req_id) + result)
+
+    def serve(self):
+        """Answer commands until ``shutdown`` or the pipe closes."""
+        threading.Thread(target=self.publish, name="smc-engine-publish", daemon=True).start()
+        try:
+            while not self._closed.is_set():
+                try:
+                    req_id, command, kwargs = self.conn.recv()
+                except (EOFError, OSError):
+                    break
+                if command == "shutdown":
+                    self.send(("reply", req_id, True, self.host.stop(**kwargs)))
+                    break
+                if command in SLOW_COMMANDS:
+                    threading.Thread(target=self.reply, args=(req_id, command, kwargs), daemon=True).start()
+                else:
+                    self.reply(req_id, command, kwargs)
+        finally:
+            self._closed.set()
+            # Stop trading cleanly (checkpoint, MT5 shutdown) before exiting
+            self.host.stop(wait=60)
+
+
+def run_engine(conn, options):
+    """Run the engine until the dashboard shuts it down or goes away.
+
+    ``options`` may contain ``config`` (Config attribute overrides),
+    ``fake_mt5`` (kwargs for ``sim.fake_mt5.install``), ``bot_class``
+    (``"package.module:ClassName"``) and ``quiet`` (no console output; the
+    log files are still written).
+    """
+    if options.get("quiet"):
+        sys.stdout = sys.stderr = open(os.devnull, "w")
+    if options.get("fake_mt5") is not None:
+        from sim import fake_mt5
+        fake_mt5.install(**options["fake_mt5"])
+
+    from config import Config
+    for name, value in options.get("config", {}).items():
+        setattr(Config, name, value)
+
+    from engine.host import EngineHost
+    from sharding.worker import load_class
+
+    os.makedirs("logs", exist_ok=True)
+    bot_class = load_class(options["bot_class"]) if options.get("bot_class") else None
+    EngineServer(conn, EngineHost(bot_class), Config.ENGINE_PUBLISH_SECONDS).serve()
@@ -0,0 +1,151 @@
+# http_cache.py
+"""Revisioned, conditional and compressed responses for the dashboard.
+
+Each piece of dashboard state (status, positions, stats, logs) is a
+``Revisioned`` resource: its revision increases whenever the serialised
+payload changes, and the revision is the response's ETag. A client that
+sends the ETag back in ``If-None-Match`` gets an empty 304 until the state
+changes. Bodies above ``MIN_COMPRESS_BYTES`` are gzip- or brotli-encoded
+(brotli only if the ``brotli`` package is installed) once per revision and
+shared by every open tab; the static page is precompressed at startup.
+"""
+import gzip
+import hashlib
+import json
+import threading
+import time
+
+from starlette.responses import Response
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+MIN_COMPRESS_BYTES = 1024
+CACHE_CONTROL = "no-cache"   # clients may store responses but must revalidate
+
+# ETags include the server start so revisions from a previous run never match
+_BOOT = format(int(time.time() * 1000) & 0xFFFFFFFF, "x")
+
+
+def _compress(raw, encoding, level):
+    if encoding == "br":
+        return brotli.compress(raw, quality=min(level, 11))
+    return gzip.compress(raw, compresslevel=level, mtime=0)
+
+
+def accepted_encoding(accept_encoding, size):
+    """Best encoding the client accepts for a body of ``size`` bytes (None = identity)."""
+    if size < MIN_COMPRESS_BYTES or not accept_encoding:
+        return None
+    offered = set()
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        if params.strip().replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            offered.add(name.strip())
+    if brotli is not None and "br" in offered:
+        return "br"
+    if "gzip" in offered or "*" in offered:
+        return "gzip"
+    return None
+
+
+class Body:
+    """One immutable representation of a resource, with lazily cached encodings."""
+
+    __slots__ = ("etag", "raw", "media_type", "level", "_encoded", "_lock")
+
+    def __init__(self, raw, etag, media_type="application/json", level=6):
+        self.raw = raw
+        self.etag = etag
+        self.media_type = media_type
+        self.level = level
+        self._encoded = {}
+        self._lock = threading.Lock()
+
+    def encoded(self, encoding):
+        if encoding is None:
+            return self.raw
+        data = self._encoded.get(encoding)
+        if data is None:
+            with self._lock:
+                data = self._encoded.get(encoding)
+                if data is None:
+                    data = self._encoded[encoding] = _compress(self.raw, encoding, self.level)
+        return data
+
+    def precompress(self):
+        """Encode every supported encoding now (for static content)."""
+        self.encoded("gzip")
+        if brotli is not None:
+            self.encoded("br")
+        return self
+
+
+def static_body(text, media_type="text/html; charset=utf-8"):
+    """Precompressed body with a content-hash ETag (stable across restarts)."""
+    raw = text.encode("utf-8")
+    etag = f'"{hashlib.sha1(raw).hexdigest()[:16]}"'
+    return Body(raw, etag, media_type, level=9).precompress()
+
+
+def binary_body(raw, media_type="application/octet-stream"):
+    """Body of a per-request payload with a content-hash ETag (compressed on demand)."""
+    return Body(raw, f'"{hashlib.sha1(raw).hexdigest()[:16]}"', media_type)
+
+
+class Revisioned:
+    """A piece of dashboard state with a monotonically increasing revision.
+
+    ``get(build, source=None)`` returns the current ``Body``: ``build()``
+    makes the JSON payload, and when the caller can cheaply identify the
+    underlying data (``source``, e.g. a file's mtime and size) an unchanged
+    source skips ``build`` entirely.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.revision = 0
+        self._body = None
+        self._source = None
+        self._lock = threading.Lock()
+
+    def get(self, build, source=None):
+        if source is not None:
+            with self._lock:
+                if self._body is not None and source == self._source:
+                    return self._body
+        raw = json.dumps(build(), separators=(",", ":"), default=str).encode()
+        with self._lock:
+            if self._body is None or raw != self._body.raw:
+                self.revision += 1
+                self._body = Body(raw, f'W/"{_BOOT}-{self.name}-{self.revision}"')
+            self._source = source
+            return self._body
+
+
+def _etag_matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if (tag[2:] if tag.startswith("W/") else tag) == opaque:
+            return True
+    return False
+
+
+def respond(request, body, status_code=200):
+    """304 if the client already has ``body``, else the (possibly compressed) body."""
+    headers = {"ETag": body.etag, "Cache-Control": CACHE_CONTROL, "Vary": "Accept-Encoding"}
+    if _etag_matches(request.headers.get("if-none-match"), body.etag):
+        return Response(status_code=304, headers=headers)
+    encoding = accepted_encoding(request.headers.get("accept-encoding"), len(body.raw))
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    return Response(body.encoded(encoding), status_code=status_code,
+                    media_type=body.media_type, headers=headers)
@@ -1,9 +1,9 @@
 # main.py
 import MetaTrader5 as mt5
-import pandas as pd
+import threading
 import time
-from datetime import datetime
-import logging
+from collections import deque
+from datetime import date, datetime, timedelta
 import sys
 
 from config import Config
@@ -11,32 +11,45 @@ from strategies.smc_strategies import SMCStrategies
 from risk.risk_manager import RiskManager
 from trading.trade_manager import TradeManager
 from trade_history import TradeHistory
+from trading.positions import Position, PositionBook
+from trading.triggers import BREAKEVEN, TP1, TP2, TriggerBook
+from market_data.bar_cache import MultiTimeframeCache
+from market_data.bars import Bars
+from bot_logging import setup_bot_logging, shutdown_bot_logging
+from recording.journal import DecisionJournal, KIND_SCALP, KIND_SWING
+from recording.tick_recorder import TickRecorder
+from recording.equity import EquitySampler
+from recording.analysis import AnalysisLog
+from trading.checkpoint import CheckpointStore, dump_state, load_symbol_state
+from strategies.panel import SCALP_BARS, SWING_BARS, SignalPanel
+from strategies.watchlist import Watchlist
 
 class EURUSD_SMC_Bot:
     """Multi-Symbol SMC Trading Bot - Direct MT5 Connection"""
     
-    def __init__(self):
+    def __init__(self, symbols=None):
         self.config = Config
         self.strategies = SMCStrategies()
         self.risk = RiskManager()
+        self.bar_cache = MultiTimeframeCache()
+
+        # Symbols this instance analyses (a shard runs a subset of Config.SYMBOLS)
+        self.symbols = list(symbols) if symbols is not None else list(self.config.SYMBOLS)
         
         # Per-symbol state: {symbol: {daily_trades, last_signal_time, swing_trades, last_swing_signal_time}}
-        self.symbol_state = {}
-        for sym, sym_cfg in self.config.SYMBOLS.items():
-            self.symbol_state[sym] = {
-                "daily_trades": 0,
-                "last_signal_time": None,
-                "swing_trades": 0,
-                "last_swing_signal_time": None,
-                "pip_value": sym_cfg["pip_value"],
-            }
+        self.symbol_state = {sym: self._new_symbol_state(self.config.SYMBOLS[sym]) for sym in self.symbols}
 
         # Global state
+        self.global_limits = False   # MAX_TOTAL_DAILY_TRADES / MAX_OPEN_LOTS (the shard gateway only)
         self.daily_trades = 0
         self.daily_pips = 0
-        self.positions = []
+        self.positions = PositionBook()
+        self.triggers = TriggerBook()
         self.last_signal_time = None
         self._running = False
+        self._wake = threading.Event()     # set by stop(): ends the pause between iterations
+        self.trading_day = None            # date the daily counters belong to
+        self.state_restored = False        # the checkpoint may only be rewritten after a restore
         self.wins = 0
         self.losses = 0
         self.swing_trades = 0
@@ -46,27 +59,62 @@ class EURUSD_SMC_Bot:
         self.setup_logging()
         self.trade_manager = TradeManager(self.logger)
         self.trade_history = TradeHistory()
+        self.journal = DecisionJournal(self.journal_dir()) if self.config.JOURNAL_ENABLED else None
+        self.analysis = AnalysisLog(self.config.ANALYSIS_HISTORY, self.config.ANALYSIS_MAX_ZONES)
+        self.tick_recorder = None
+        self.equity = self.new_equity_sampler() if self.config.EQUITY_ENABLED else None
+        self.checkpoint = CheckpointStore(self.config.CHECKPOINT_FILE) if self.config.CHECKPOINT_ENABLED else None
+        self.loop_latency_ms = 0.0
+        self.iterations = 0
+        self.loop_history = deque(maxlen=600)  # (iteration, loop ms) of recent iterations
+
+        # Vectorised pre-screen for larger watchlists
+        min_symbols = self.config.PANEL_SCAN_MIN_SYMBOLS
+        self.panel = SignalPanel(self.symbols) if 0 < min_symbols <= len(self.symbols) else None
+        self.last_screen = None
+
+        # Two-stage scan of the whole Market Watch (universe loaded once connected)
+        self.watchlist = Watchlist() if self.config.WATCHLIST_ENABLED and symbols is None else None
+
+        # Orders mirrored to the follower accounts (executor processes start with the loop)
+        self.fanout = None
+        if self.config.ACCOUNTS_FILE:
+            from accounts.fanout import AccountFanOut
+            self.fanout = AccountFanOut.from_config(self.logger)
+
+    @staticmethod
+    def _new_symbol_state(sym_cfg):
+        return {
+            "daily_trades": 0,
+            "last_signal_time": None,
+            "swing_trades": 0,
+            "last_swing_signal_time": None,
+            "pip_value": sym_cfg["pip_value"],
+        }
+
+    def journal_dir(self):
+        return self.config.JOURNAL_DIR
+
+    def new_equity_sampler(self):
+        cfg = self.config
+        return EquitySampler(cfg.EQUITY_DIR, cfg.EQUITY_RING_SIZE, cfg.EQUITY_POLL_SECONDS,
+                             cfg.EQUITY_FLUSH_SECONDS, logger=self.logger,
+                             retention_days={"1s": cfg.EQUITY_1S_RETENTION_DAYS,
+                                             "1m": cfg.EQUITY_1M_RETENTION_DAYS})
         
     def setup_logging(self):
-        """Configure logging"""
-        self.logger = logging.getLogger('SMC_Bot')
-        self.logger.setLevel(logging.INFO)
-        
-        # File handler
-        fh = logging.FileHandler(f'logs/bot_{datetime.now().strftime("%Y%m%d")}.log')
-        fh.setLevel(logging.INFO)
-        
-        # Console handler
-        ch = logging.StreamHandler()
-        ch.setLevel(logging.INFO)
-        
-        # Format
-        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-        fh.setFormatter(formatter)
-        ch.setFormatter(formatter)
-        
-        self.logger.addHandler(fh)
-        self.logger.addHandler(ch)
+        """Configure logging (file + console written by a background thread)"""
+        self.logger, self._log_listener, self._log_handler = setup_bot_logging(
+            'SMC_Bot',
+            'logs/bot_%Y%m%d.log',
+            dedup_window_seconds=self.config.LOG_DEDUP_WINDOW_SECONDS,
+        )
+
+    def close_logging(self):
+        """Flush and stop the background log writer (idempotent)."""
+        if getattr(self, '_log_listener', None) is not None:
+            shutdown_bot_logging(self.logger, self._log_listener, self._log_handler)
+            self._log_listener = None
         
     def connect(self):
         """Connect to JustMarkets MT5"""
@@ -111,26 +159,21 @@ class EURUSD_SMC_Bot:
         """Fetch M15+H1 data for a symbol"""
         pip_value = self.config.SYMBOLS[symbol]["pip_value"]
 
-        rates_m15 = mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_M15, 0, 200)
-        rates_h1 = mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_H1, 0, 100)
+        # Single base-timeframe fetch; H1 is resampled locally
+        if not self.bar_cache.refresh(symbol):
+            return None
+        rates_m15 = self.bar_cache.get_rates(symbol, "M15", SCALP_BARS["M15"])
+        rates_h1 = self.bar_cache.get_rates(symbol, "H1", SCALP_BARS["H1"])
         tick = mt5.symbol_info_tick(symbol)
         
         if rates_m15 is None or rates_h1 is None or tick is None:
             return None
-            
-        df_m15 = pd.DataFrame(rates_m15)
-        df_m15['time'] = pd.to_datetime(df_m15['time'], unit='s')
-        df_m15.set_index('time', inplace=True)
-        
-        df_h1 = pd.DataFrame(rates_h1)
-        df_h1['time'] = pd.to_datetime(df_h1['time'], unit='s')
-        df_h1.set_index('time', inplace=True)
         
         return {
             'symbol': symbol,
             'pip_value': pip_value,
-            'm15': df_m15,
-            'h1': df_h1,
+            'm15': Bars(rates_m15),
+            'h1': Bars(rates_h1),
             'bid': tick.bid,
             'ask': tick.ask,
             'spread': (tick.ask - tick.bid) / pip_value
@@ -140,32 +183,21 @@ class EURUSD_SMC_Bot:
         """Fetch H1+H4+D1 data for swing trades."""
         pip_value = self.config.SYMBOLS[symbol]["pip_value"]
 
-        rates_h1 = mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_H1, 0, 300)
-        rates_h4 = mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_H4, 0, 200)
-        rates_d1 = mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_D1, 0, 100)
+        # Served from the bar cache refreshed by get_market_data this loop
+        rates_h1 = self.bar_cache.get_rates(symbol, "H1", SWING_BARS["H1"])
+        rates_h4 = self.bar_cache.get_rates(symbol, "H4", SWING_BARS["H4"])
+        rates_d1 = self.bar_cache.get_rates(symbol, "D1", SWING_BARS["D1"])
         tick = mt5.symbol_info_tick(symbol)
 
         if rates_h1 is None or rates_h4 is None or rates_d1 is None or tick is None:
             return None
 
-        df_h1 = pd.DataFrame(rates_h1)
-        df_h1['time'] = pd.to_datetime(df_h1['time'], unit='s')
-        df_h1.set_index('time', inplace=True)
-
-        df_h4 = pd.DataFrame(rates_h4)
-        df_h4['time'] = pd.to_datetime(df_h4['time'], unit='s')
-        df_h4.set_index('time', inplace=True)
-
-        df_d1 = pd.DataFrame(rates_d1)
-        df_d1['time'] = pd.to_datetime(df_d1['time'], unit='s')
-        df_d1.set_index('time', inplace=True)
-
         return {
             'symbol': symbol,
             'pip_value': pip_value,
-            'h1': df_h1,
-            'h4': df_h4,
-            'd1': df_d1,
+            'h1': Bars(rates_h1),
+            'h4': Bars(rates_h4),
+            'd1': Bars(rates_d1),
             'bid': tick.bid,
             'ask': tick.ask,
             'spread': (tick.ask - tick.bid) / pip_value
@@ -191,8 +223,20 @@ class EURUSD_SMC_Bot:
         
         # NEW: Check for Change of Character (avoid trading during reversals)
         choch_h1 = self.strategies.detect_change_of_character(df_h1, pv)
+        data['analysis'] = {
+            'trend': trend_h1,
+            'trend_entry': trend_m15,
+            'bos': bos_h1,
+            'choch': choch_h1,
+            'ob_count': len(order_blocks),
+            'fvg_count': len(fvgs),
+            'order_blocks': order_blocks,
+            'fvgs': fvgs,
+        }
         if choch_h1:
-            self.logger.info(f"[{symbol}] ChoCH detected ({choch_h1['reason']}) - skipping scalp signals")
+            data['reason'] = 'choch'
+            self.logger.info("[%s] ChoCH detected (%s) - skipping scalp signals", symbol, choch_h1['reason'],
+                             extra={"dedup": f"[{symbol}] ChoCH detected - skipping scalp signals"})
             return None
         
         # NEW: Get liquidity pools
@@ -281,17 +325,21 @@ class EURUSD_SMC_Bot:
                 f"SL {best['sl']:.5f} ({best['stop_pips']:.1f} pips) "
                 f"trend_h1={trend_h1['trend']} BOS_confirmed"
             )
+            data['reason'] = 'signal'
             return best
 
         reason = "No valid signal"
+        data['reason'] = 'no_setup'
         if not bos_h1:
             reason = "No BOS detected"
+            data['reason'] = 'no_bos'
         elif choch_h1:
             reason = f"ChoCH detected - reversal risk"
         
         self.logger.info(
-            f"[{symbol}] {reason} (trend_h1={trend_h1['trend']}, "
-            f"OBs={len(order_blocks)}, FVGs={len(fvgs)})"
+            "[%s] %s (trend_h1=%s, OBs=%d, FVGs=%d)",
+            symbol, reason, trend_h1['trend'], len(order_blocks), len(fvgs),
+            extra={"dedup": f"[{symbol}] {reason}"},
         )
         return None
 
@@ -316,8 +364,20 @@ class EURUSD_SMC_Bot:
         
         # NEW: ChoCH check
         choch_h4 = self.strategies.detect_change_of_character(df_h4, pv)
+        data['analysis'] = {
+            'trend': trend_d1,
+            'trend_entry': trend_h4,
+            'bos': bos_h4,
+            'choch': choch_h4,
+            'ob_count': len(order_blocks),
+            'fvg_count': len(fvgs),
+            'order_blocks': order_blocks,
+            'fvgs': fvgs,
+        }
         if choch_h4:
-            self.logger.info(f"[{symbol}] Swing ChoCH detected - skipping swing signals")
+            data['reason'] = 'choch'
+            self.logger.info("[%s] Swing ChoCH detected - skipping swing signals", symbol,
+                             extra={"dedup": f"[{symbol}] Swing ChoCH detected"})
             return None
         
         # NEW: Breaker block detection (avoid trading over broken levels)
@@ -419,8 +479,10 @@ class EURUSD_SMC_Bot:
                 f"SL {best['sl']:.5f} ({best['stop_pips']:.1f} pips) "
                 f"trend_d1={trend_d1['trend']} BOS_confirmed"
             )
+            data['reason'] = 'signal'
             return best
 
+        data['reason'] = 'no_bos' if not bos_h4 else 'no_setup'
         return None
     
     def execute_signal(self, signal):
@@ -430,6 +492,8 @@ class EURUSD_SMC_Bot:
         trade_type = signal.get('trade_type', 'SCALP')
 
         # Pre-execution validation
+        kind = KIND_SWING if trade_type == 'SWING' else KIND_SCALP
+        signal['outcome'] = 'blocked'
         account_info = mt5.account_info()
         if not account_info.trade_allowed:
             self.logger.error(f"[{sym}] AUTOTRADING DISABLED - Cannot execute trade")
@@ -439,6 +503,16 @@ class EURUSD_SMC_Bot:
             self.logger.error(f"[{sym}] INSUFFICIENT BALANCE (R{account_info.balance:.2f}) - Cannot trade")
             return False
 
+        # Global limits (all symbols; with sharding, in the gateway only)
+        if self.global_limits:
+            if self.daily_trades + self.swing_trades >= self.config.MAX_TOTAL_DAILY_TRADES:
+                self.logger.warning(f"[{sym}] Global daily trade limit reached")
+                return False
+
+            if self.positions.open_volume + signal['volume'] > self.config.MAX_OPEN_LOTS:
+                self.logger.warning(f"[{sym}] Max open exposure reached ({self.positions.open_volume:.2f} lots open)")
+                return False
+
         # Per-symbol daily limit check
         if trade_type == 'SWING':
             if sym_state.get('swing_trades', 0) >= self.config.SWING_MAX_DAILY_TRADES:
@@ -449,9 +523,21 @@ class EURUSD_SMC_Bot:
                 self.logger.warning(f"[{sym}] Daily trade limit reached")
                 return False
             
+        self._journal_event('order_sent', sym, direction=signal['direction'], kind=kind,
+                            price=signal['price'], volume=signal['volume'], sl=signal['sl'], tp=signal['tp3'])
+        sent = time.time()
         result = self.trade_manager.execute_order(signal)
+        if self.fanout is not None:
+            # Only orders our own account filled go to the follower accounts
+            if result['success']:
+                self.fanout.dispatch(signal, result, sent)
+            else:
+                self.fanout.reject(result['error'])
         
         if result['success']:
+            signal['outcome'] = 'executed'
+            self._journal_event('fill', sym, ticket=result['ticket'], direction=signal['direction'], kind=kind,
+                                price=result['price'], volume=result['volume'], sl=signal['sl'], tp=signal['tp3'])
             # Update per-symbol state
             if trade_type == 'SWING':
                 sym_state['swing_trades'] = sym_state.get('swing_trades', 0) + 1
@@ -464,18 +550,7 @@ class EURUSD_SMC_Bot:
 
             self.last_signal_time = datetime.now()
 
-            position = {
-                'ticket': result['ticket'],
-                **signal,
-                'open_time': datetime.now(),
-                'status': 'open',
-                'be_moved': False,
-                'tp1_hit': False,
-                'tp2_hit': False,
-                'trade_type': trade_type,
-                'symbol': sym,
-            }
-            self.positions.append(position)
+            self.add_position(Position.from_signal(result['ticket'], signal, sym, trade_type))
             
             # Save to trade history
             self.trade_history.save_executed_trade({
@@ -514,136 +589,253 @@ class EURUSD_SMC_Bot:
             
             return True
         else:
+            signal['outcome'] = 'order_failed'
+            self._journal_event('reject', sym, direction=signal['direction'], kind=kind,
+                                price=signal['price'], volume=signal['volume'], retcode=result['error_code'])
             self.logger.error(f"[{sym}] Order failed: {result['error']}")
             return False
+
+    def _record_decision(self, data, kind, reason=None, signal=None, cooldown=0):
+        """Record one decision for a symbol in the analysis ring and the journal (if on)."""
+        reason = reason or data.get('reason', 'none')
+        self.analysis.record(data, kind, reason, signal=signal, cooldown=cooldown)
+        if self.journal is None:
+            return
+        self.journal.record_decision(
+            data, kind=kind, reason=reason,
+            outcome=signal.get('outcome', 'none') if signal else 'none', signal=signal,
+        )
+
+    def _record_swing_gate(self, data, reason, cooldown=0):
+        """Analysis record for a swing check stopped before the generator (not journalled)."""
+        swing_data = {key: data[key] for key in ('symbol', 'pip_value', 'bid', 'ask', 'spread')}
+        self.analysis.record(swing_data, KIND_SWING, reason, cooldown=cooldown)
+
+    def _journal_event(self, event, symbol, **fields):
+        if self.journal is not None:
+            self.journal.record_event(event, symbol, **fields)
     
     def manage_positions(self):
-        """Manage open positions"""
-        for position in self.positions[:]:
-            if position['status'] != 'open':
-                continue
-            
-            sym = position.get('symbol', self.config.SYMBOL)
-            pv = self.config.SYMBOLS.get(sym, {}).get('pip_value', self.config.PIP_VALUE)
-                
-            # Get current position data
-            pos = mt5.positions_get(ticket=position['ticket'])
-            if not pos or len(pos) == 0:
+        """Manage open positions.
+
+        One ``positions_get`` finds positions closed by SL/TP. Breakeven, TP1
+        and TP2 are levels in ``self.triggers``: each symbol with pending
+        levels gets one tick, and only the levels that price crossed are
+        handled, however many positions are open.
+        """
+        live = mt5.positions_get()
+        if live is not None:  # None = terminal error, not "everything closed"
+            for position in self.positions.missing_from({p.ticket for p in live}):
                 # Position closed by SL/TP -- check history for result
-                position['status'] = 'closed'
                 try:
-                    deals = mt5.history_deals_get(position=position['ticket'])
-                    if deals and len(deals) >= 2:
-                        close_deal = deals[-1]
-                        profit = close_deal.profit + close_deal.swap + close_deal.commission
-                    else:
-                        profit = 0
+                    deals = mt5.history_deals_get(position=position.ticket)
                 except Exception:
-                    profit = 0
-                close_reason = "WIN" if profit >= 0 else "LOSS"
-                if profit >= 0:
-                    self.wins += 1
-                    self.logger.info(f"[{sym}] Position {position['ticket']}: CLOSED WIN (R{profit:.2f})")
-                else:
-                    self.losses += 1
-                    self.logger.info(f"[{sym}] Position {position['ticket']}: CLOSED LOSS (R{profit:.2f})")
-                
-                # Calculate exit price and pips from history
-                try:
-                    deals = mt5.history_deals_get(position=position['ticket'])
-                    if deals and len(deals) >= 2:
-                        exit_price = deals[-1].price
-                        if position['direction'] == 'buy':
-                            pips_closed = (exit_price - position['price']) / pv
-                        else:
-                            pips_closed = (position['price'] - exit_price) / pv
-                    else:
-                        exit_price = 0
-                        pips_closed = 0
-                except:
-                    exit_price = 0
-                    pips_closed = 0
-                
-                # Save closed trade to history
-                self.trade_history.save_closed_trade(
-                    ticket=position['ticket'],
-                    exit_price=exit_price,
-                    profit_loss=round(profit, 2),
-                    pips_gained=round(pips_closed, 2),
-                    close_reason=close_reason
-                )
-                
-                self.positions.remove(position)
+                    deals = None
+                self._on_position_closed(position, deals)
+
+        for sym in self.triggers.symbols():
+            tick = mt5.symbol_info_tick(sym)
+            if tick is None:
                 continue
-                
-            pos = pos[0]
-            current_price = pos.price_current
-            
-            # Calculate profit in pips
-            if position['direction'] == 'buy':
-                pips = (current_price - position['price']) / pv
+            for trigger in self.triggers.crossed(sym, tick.bid, tick.ask):
+                position = self.positions.get(trigger.ticket)
+                current_price = tick.bid if position.direction == 'buy' else tick.ask
+                if trigger.kind == BREAKEVEN:
+                    self._move_to_breakeven(position, trigger, current_price)
+                else:
+                    self._take_profit_hit(position, trigger.kind, current_price)
+
+    def add_position(self, position):
+        """Book an open position and arm its breakeven/TP1/TP2 triggers."""
+        self.positions.add(position)
+        sym, direction = position.symbol, position.direction
+        if not position.be_moved:
+            pv = self.config.SYMBOLS.get(sym, {}).get('pip_value', self.config.PIP_VALUE)
+            be_pips = self.config.SWING_BREAKEVEN_PIPS if position.trade_type == 'SWING' else self.config.BREAKEVEN_PIPS
+            level = position.price + be_pips * pv if direction == 'buy' else position.price - be_pips * pv
+            self.triggers.add(sym, direction, position.ticket, BREAKEVEN, level)
+        if not position.tp1_hit:
+            self.triggers.add(sym, direction, position.ticket, TP1, position.tp1)
+        if not position.tp2_hit:
+            self.triggers.add(sym, direction, position.ticket, TP2, position.tp2)
+
+    def _move_to_breakeven(self, position, trigger, current_price):
+        """Move the stop to entry +1 pip once price reaches the breakeven level."""
+        sym = position.symbol
+        pv = self.config.SYMBOLS.get(sym, {}).get('pip_value', self.config.PIP_VALUE)
+        new_sl = position.price + (1 * pv) if position.direction == 'buy' else position.price - (1 * pv)
+
+        if not self.trade_manager.modify_position(position.ticket, sl=new_sl, symbol=sym):
+            # Re-arm so the next loop retries
+            self.triggers.add(sym, position.direction, position.ticket, BREAKEVEN, trigger.level)
+            return
+        position.be_moved = True
+        if self.fanout is not None:
+            self.fanout.breakeven(position.ticket, pv)
+        if position.direction == 'buy':
+            pips = (current_price - position.price) / pv
+        else:
+            pips = (position.price - current_price) / pv
+        self._journal_event('breakeven', sym, ticket=position.ticket,
+                            direction=position.direction, price=current_price, sl=new_sl)
+        self.logger.info(f"[{sym}] Position {position.ticket}: Breakeven @ +{pips:.1f} pips")
+
+    def _take_profit_hit(self, position, kind, current_price):
+        """Record a TP1/TP2 milestone (the position itself stays open)."""
+        sym = position.symbol
+        multiple, tp = (1.5, position.tp1) if kind == TP1 else (2.0, position.tp2)
+        setattr(position, f"{kind}_hit", True)
+        self._journal_event(kind, sym, ticket=position.ticket,
+                            direction=position.direction, price=current_price, tp=tp)
+        self.logger.info(f"[{sym}] Position {position.ticket}: {kind.upper()} Hit (+{position.stop_pips * multiple:.1f} pips)")
+        # Update trade history with the milestone
+        self.trade_history.save_closed_trade(
+            ticket=position.ticket,
+            exit_price=tp,
+            profit_loss=round(position.stop_pips * multiple * (0.0001 if 'JPY' in sym else 0.00001), 2),
+            pips_gained=round(position.stop_pips * multiple, 2),
+            close_reason=kind.upper()
+        )
+
+    def _on_position_closed(self, position, deals):
+        """Book a position the terminal no longer has (SL/TP hit or closed while we were down)."""
+        sym = position.symbol
+        pv = self.config.SYMBOLS.get(sym, {}).get('pip_value', self.config.PIP_VALUE)
+        self.positions.close(position.ticket)
+        self.triggers.discard(position.ticket)
+
+        if deals and len(deals) >= 2:
+            close_deal = deals[-1]
+            profit = close_deal.profit + close_deal.swap + close_deal.commission
+            exit_price = close_deal.price
+            if position.direction == 'buy':
+                pips_closed = (exit_price - position.price) / pv
             else:
-                pips = (position['price'] - current_price) / pv
-            
-            # Move to breakeven
-            be_pips = self.config.SWING_BREAKEVEN_PIPS if position.get('trade_type') == 'SWING' else self.config.BREAKEVEN_PIPS
-            if pips >= be_pips and not position['be_moved']:
-                new_sl = position['price'] + (1 * pv) if position['direction'] == 'buy' else position['price'] - (1 * pv)
-                
-                if self.trade_manager.modify_position(position['ticket'], sl=new_sl, symbol=sym):
-                    position['be_moved'] = True
-                    self.logger.info(f"[{sym}] Position {position['ticket']}: Breakeven @ +{pips:.1f} pips")
-            
-            # Check TP1
-            if position['direction'] == 'buy' and current_price >= position['tp1'] and not position['tp1_hit']:
-                position['tp1_hit'] = True
-                self.logger.info(f"[{sym}] Position {position['ticket']}: TP1 Hit (+{position['stop_pips'] * 1.5:.1f} pips)")
-                # Update trade history with TP1 milestone
-                self.trade_history.save_closed_trade(
-                    ticket=position['ticket'],
-                    exit_price=position['tp1'],
-                    profit_loss=round(position['stop_pips'] * 1.5 * (0.0001 if 'JPY' in sym else 0.00001), 2),
-                    pips_gained=round(position['stop_pips'] * 1.5, 2),
-                    close_reason="TP1"
-                )
-                
-            elif position['direction'] == 'sell' and current_price <= position['tp1'] and not position['tp1_hit']:
-                position['tp1_hit'] = True
-                self.logger.info(f"[{sym}] Position {position['ticket']}: TP1 Hit (+{position['stop_pips'] * 1.5:.1f} pips)")
-                # Update trade history with TP1 milestone
-                self.trade_history.save_closed_trade(
-                    ticket=position['ticket'],
-                    exit_price=position['tp1'],
-                    profit_loss=round(position['stop_pips'] * 1.5 * (0.0001 if 'JPY' in sym else 0.00001), 2),
-                    pips_gained=round(position['stop_pips'] * 1.5, 2),
-                    close_reason="TP1"
-                )
-            
-            # Check TP2
-            if position['direction'] == 'buy' and current_price >= position['tp2'] and not position['tp2_hit']:
-                position['tp2_hit'] = True
-                self.logger.info(f"[{sym}] Position {position['ticket']}: TP2 Hit (+{position['stop_pips'] * 2.0:.1f} pips)")
-                # Update trade history with TP2 milestone
-                self.trade_history.save_closed_trade(
-                    ticket=position['ticket'],
-                    exit_price=position['tp2'],
-                    profit_loss=round(position['stop_pips'] * 2.0 * (0.0001 if 'JPY' in sym else 0.00001), 2),
-                    pips_gained=round(position['stop_pips'] * 2.0, 2),
-                    close_reason="TP2"
-                )
-                
-            elif position['direction'] == 'sell' and current_price <= position['tp2'] and not position['tp2_hit']:
-                position['tp2_hit'] = True
-                self.logger.info(f"[{sym}] Position {position['ticket']}: TP2 Hit (+{position['stop_pips'] * 2.0:.1f} pips)")
-                # Update trade history with TP2 milestone
-                self.trade_history.save_closed_trade(
-                    ticket=position['ticket'],
-                    exit_price=position['tp2'],
-                    profit_loss=round(position['stop_pips'] * 2.0 * (0.0001 if 'JPY' in sym else 0.00001), 2),
-                    pips_gained=round(position['stop_pips'] * 2.0, 2),
-                    close_reason="TP2"
-                )
-    
+                pips_closed = (position.price - exit_price) / pv
+        else:
+            profit = 0
+            exit_price = 0
+            pips_closed = 0
+
+        close_reason = "WIN" if profit >= 0 else "LOSS"
+        if profit >= 0:
+            self.wins += 1
+            self.logger.info(f"[{sym}] Position {position.ticket}: CLOSED WIN (R{profit:.2f})")
+        else:
+            self.losses += 1
+            self.logger.info(f"[{sym}] Position {position.ticket}: CLOSED LOSS (R{profit:.2f})")
+
+        self._journal_event('closed', sym, ticket=position.ticket, direction=position.direction,
+                            kind=KIND_SWING if position.trade_type == 'SWING' else KIND_SCALP,
+                            price=exit_price, volume=position.volume, pnl=profit)
+
+        # Save closed trade to history
+        self.trade_history.save_closed_trade(
+            ticket=position.ticket,
+            exit_price=exit_price,
+            profit_loss=round(profit, 2),
+            pips_gained=round(pips_closed, 2),
+            close_reason=close_reason
+        )
+
+    def save_checkpoint(self):
+        """Persist trading state (skipped when nothing changed since the last write)."""
+        if self.checkpoint is None or not self.state_restored:
+            return
+        try:
+            self.checkpoint.save(dump_state(self))
+        except OSError as e:
+            self.logger.error(f"Checkpoint write failed: {e}")
+
+    def restore_state(self):
+        """Reload the checkpoint and reconcile it with the terminal.
+
+        Uses one ``positions_get`` and at most one ``history_deals_get``:
+        checkpointed positions that are still open are managed again, ones
+        closed while we were down are booked from their deals, and open
+        positions with our magic number that the checkpoint missed (opened
+        just before a crash) are adopted, so none is left unmanaged.
+        """
+        if self.checkpoint is None:
+            return
+        started = time.perf_counter()
+        state = self.checkpoint.load() or {}
+
+        # Daily counters and cooldowns only carry over within the same day
+        if state.get('day') == date.today().isoformat():
+            for key in ('daily_trades', 'daily_pips', 'swing_trades', 'wins', 'losses'):
+                setattr(self, key, state.get(key, 0))
+            if state.get('last_signal_time'):
+                self.last_signal_time = datetime.fromisoformat(state['last_signal_time'])
+            saved = load_symbol_state(state.get('symbol_state', {}))
+            for sym, sym_state in self.symbol_state.items():
+                for key in ('daily_trades', 'swing_trades', 'last_signal_time', 'last_swing_signal_time'):
+                    if key in saved.get(sym, {}):
+                        sym_state[key] = saved[sym][key]
+
+        saved_positions = {p['ticket']: Position.from_dict(p) for p in state.get('positions', [])}
+        live = {p.ticket: p for p in (mt5.positions_get() or ())
+                if p.magic == self.config.MAGIC_NUMBER}
+
+        missing = []
+        for ticket, position in saved_positions.items():
+            if ticket in live:
+                self.add_position(position)
+            else:
+                missing.append(position)
+
+        if missing:
+            # Broker server time may be ahead of local time; pad the window by a day
+            since = min(p.open_time for p in missing) - timedelta(days=1)
+            deals_by_position = {}
+            for deal in mt5.history_deals_get(since, datetime.now() + timedelta(days=1)) or ():
+                deals_by_position.setdefault(deal.position_id, []).append(deal)
+            for position in missing:
+                self._on_position_closed(position, deals_by_position.get(position.ticket))
+
+        self.state_restored = True
+        adopted = [self._adopt_position(p) for t, p in live.items() if t not in saved_positions]
+        for position in adopted:
+            self.add_position(position)
+            self.logger.warning(f"[{position.symbol}] Adopted open position {position.ticket} "
+                                f"missing from checkpoint (TP1/TP2 estimated from SL)")
+
+        self.logger.info(
+            f"State restored in {(time.perf_counter() - started) * 1000:.0f} ms: "
+            f"{len(saved_positions) - len(missing)} positions resumed, {len(missing)} closed while down, "
+            f"{len(adopted)} adopted; {self.daily_trades} scalp / {self.swing_trades} swing trades today"
+        )
+        self.save_checkpoint()
+
+    def _adopt_position(self, live):
+        """Build a Position for a terminal position we have no record of."""
+        direction = 'buy' if live.type == mt5.POSITION_TYPE_BUY else 'sell'
+        pv = self.config.SYMBOLS.get(live.symbol, {}).get('pip_value', self.config.PIP_VALUE)
+        stop_pips = abs(live.price_open - live.sl) / pv if live.sl else 0.0
+        be_moved = bool(live.sl) and (live.sl >= live.price_open if direction == 'buy' else live.sl <= live.price_open)
+        if live.sl and not be_moved:
+            tp_levels = self.risk.calculate_tp_levels(live.price_open, live.sl, direction, pv)
+        else:
+            # SL no longer reflects the original risk; only the broker TP is known
+            tp_levels = {'tp1': live.tp, 'tp2': live.tp, 'tp3': live.tp}
+        return Position(
+            ticket=live.ticket,
+            symbol=live.symbol,
+            direction=direction,
+            price=live.price_open,
+            sl=live.sl,
+            tp1=tp_levels['tp1'],
+            tp2=tp_levels['tp2'],
+            tp3=live.tp or tp_levels['tp3'],
+            volume=live.volume,
+            stop_pips=stop_pips,
+            trade_type='SWING' if stop_pips > self.config.MAX_STOP_PIPS else 'SCALP',
+            open_time=datetime.fromtimestamp(live.time),
+            be_moved=be_moved,
+            tp1_hit=not tp_levels['tp1'],
+            tp2_hit=not tp_levels['tp2'],
+        )
+
     def print_status(self, symbol_data_list):
         """Print real-time status for all symbols"""
         parts = [f"[{datetime.now().strftime('%H:%M:%S')}]"]
@@ -652,112 +844,252 @@ class EURUSD_SMC_Bot:
             parts.append(f"{sym}: {sd['bid']:.5f}/{sd['ask']:.5f} sp={sd['spread']:.1f}")
         total_scalp = sum(s.get('daily_trades', 0) for s in self.symbol_state.values())
         total_swing = sum(s.get('swing_trades', 0) for s in self.symbol_state.values())
-        open_count = len([p for p in self.positions if p['status'] == 'open'])
-        parts.append(f"T:{total_scalp} S:{total_swing} O:{open_count} Bal:R{mt5.account_info().balance:.2f}")
+        open_count = self.positions.open_count
+        latest = self.equity.latest() if self.equity is not None else None
+        balance = latest["balance"] if latest is not None else mt5.account_info().balance
+        parts.append(f"T:{total_scalp} S:{total_swing} O:{open_count} Bal:R{balance:.2f}")
         status = "\r" + " | ".join(parts)
         print(status, end="")
     
+    def reset_daily_counters(self):
+        """Zero the daily counters (called at midnight)."""
+        self.daily_trades = 0
+        self.daily_pips = 0
+        self.wins = 0
+        self.losses = 0
+        self.swing_trades = 0
+        for sym in self.symbol_state:
+            self.symbol_state[sym]['daily_trades'] = 0
+            self.symbol_state[sym]['swing_trades'] = 0
+            self.symbol_state[sym]['last_signal_time'] = None
+            self.symbol_state[sym]['last_swing_signal_time'] = None
+        self.logger.info("\nNew trading day started")
+
+    def submit_signal(self, signal):
+        """Send a signal for execution (overridden by shard workers to use the gateway)."""
+        return self.execute_signal(signal)
+
+    def on_iteration(self, all_data):
+        """Called once per loop after positions are managed."""
+        if all_data:
+            self.print_status(all_data)
+
+    def setup_watchlist(self):
+        """Load the Market Watch universe, score it once and promote the first symbols."""
+        started = time.perf_counter()
+        universe = self.watchlist.discover()
+        for sym, sym_cfg in universe.items():
+            self.config.SYMBOLS.setdefault(sym, sym_cfg)
+            self.symbol_state.setdefault(sym, self._new_symbol_state(sym_cfg))
+        min_symbols = self.config.PANEL_SCAN_MIN_SYMBOLS
+        self.panel = SignalPanel(list(universe)) if 0 < min_symbols <= self.config.WATCHLIST_MAX_ACTIVE else None
+        self.watchlist.warm_up()
+        self.symbols = list(self.watchlist.active)
+        self.logger.info(f"Watchlist: {len(universe)} symbols scored in "
+                         f"{(time.perf_counter() - started) * 1000:.0f} ms; active: {', '.join(self.symbols) or 'none'}")
+
+    def update_watchlist(self):
+        """Stage 1 for this loop: re-rank and swap promoted/demoted symbols in."""
+        promoted, demoted = self.watchlist.update()
+        for sym in demoted:
+            self.bar_cache.evict(sym)
+            self.logger.info(f"[{sym}] Demoted from the watchlist")
+        for sym in promoted:
+            self.logger.info(f"[{sym}] Promoted to the watchlist")
+        self.symbols = list(self.watchlist.active)
+        if (promoted or demoted) and self.tick_recorder is not None:
+            self.tick_recorder.set_symbols(self.symbols)
+
+    def scan_symbols(self, now, hour):
+        """Run every symbol's checks; returns the market data of the symbols that had any.
+
+        With the panel enabled all symbols are fetched first and screened in
+        one vectorised pass, and only the candidates run the detailed
+        signal generators. With the watchlist enabled only its active
+        symbols are checked.
+        """
+        if self.watchlist is not None:
+            self.update_watchlist()
+        if self.panel is None:
+            all_data = (self.process_symbol(symbol, now, hour) for symbol in self.symbols)
+            return [data for data in all_data if data is not None]
+
+        all_data = [data for data in map(self.get_market_data, self.symbols) if data is not None]
+        screen = self.panel.screen(all_data, self.bar_cache)
+        for data in all_data:
+            self.process_symbol(data['symbol'], now, hour, data=data, screen=screen)
+        self.last_screen = screen
+        return all_data
+
+    def process_symbol(self, symbol, now, hour, data=None, screen=None):
+        """Run the scalp and swing checks for one symbol; returns its market data.
+
+        ``data`` is this loop's market data if already fetched; symbols ruled
+        out by the panel ``screen`` skip the detailed signal generators.
+        """
+        sym_cfg = self.config.SYMBOLS[symbol]
+        sym_state = self.symbol_state[symbol]
+
+        # Get market data for this symbol
+        if data is None:
+            data = self.get_market_data(symbol)
+        if data is None:
+            return None
+
+        # ── Scalp signals (session + spread filter) ──
+        signal = None
+        remaining = 0
+        if not (self.config.SESSION_START_HOUR <= hour < self.config.SESSION_END_HOUR):
+            data['reason'] = 'out_of_session'
+        elif data['spread'] > sym_cfg.get('max_spread', self.config.MAX_SPREAD_PIPS):
+            data['reason'] = 'spread'
+            self.logger.info("[%s] Spread too high (%.1f pips)", symbol, data['spread'],
+                             extra={"dedup": f"[{symbol}] Spread too high"})
+        elif sym_state.get('daily_trades', 0) < self.config.MAX_DAILY_TRADES:
+            last_sig = sym_state.get('last_signal_time')
+            if last_sig is None or (now - last_sig).seconds > 300:
+                if screen is None or screen.candidate(KIND_SCALP, symbol):
+                    signal = self.generate_signal(data)
+                    if signal:
+                        self.submit_signal(signal)
+                else:
+                    screen.annotate(data, KIND_SCALP)
+            else:
+                data['reason'] = 'cooldown'
+                remaining = 300 - (now - last_sig).seconds
+                # Log cooldown every 60 seconds instead of every 2 seconds (already rate-limited: no dedup)
+                if remaining % 60 == 0:
+                    self.logger.info("[%s] Scalp cooldown: %ds", symbol, remaining)
+        else:
+            data['reason'] = 'daily_limit'
+        self._record_decision(data, KIND_SCALP, signal=signal, cooldown=remaining)
+
+        # ── Swing signals (no session filter) ──
+        swing_spread_ok = data['spread'] <= sym_cfg.get('swing_max_spread', self.config.SWING_MAX_SPREAD_PIPS)
+        if self.config.SWING_ENABLED and swing_spread_ok:
+            if sym_state.get('swing_trades', 0) < self.config.SWING_MAX_DAILY_TRADES:
+                last_swing = sym_state.get('last_swing_signal_time')
+                if last_swing is None or (now - last_swing).seconds > self.config.SWING_COOLDOWN_SECONDS:
+                    if screen is not None and not screen.candidate(KIND_SWING, symbol):
+                        swing_data = {key: data[key] for key in ('symbol', 'pip_value', 'bid', 'ask', 'spread')}
+                        screen.annotate(swing_data, KIND_SWING)
+                        self._record_decision(swing_data, KIND_SWING)
+                    else:
+                        swing_data = self.get_swing_data(symbol)
+                        if swing_data:
+                            swing_signal = self.generate_swing_signal(swing_data)
+                            if swing_signal:
+                                self.submit_signal(swing_signal)
+                            self._record_decision(swing_data, KIND_SWING, signal=swing_signal)
+                else:
+                    remaining = self.config.SWING_COOLDOWN_SECONDS - (now - last_swing).seconds
+                    # Log swing cooldown every 300 seconds instead of every 2 seconds
+                    if remaining % 300 == 0:
+                        self.logger.info("[%s] Swing cooldown: %ds", symbol, remaining)
+                    self._record_swing_gate(data, 'cooldown', remaining)
+            else:
+                self._record_swing_gate(data, 'daily_limit')
+        elif self.config.SWING_ENABLED:
+            self._record_swing_gate(data, 'spread')
+        return data
+
     def run(self):
-        """Main bot execution loop"""
-        self._running = True
+        """Main bot execution loop.
 
-        # Connect to MT5
-        if not self.connect():
-            self.logger.error("Failed to connect. Exiting...")
-            self._running = False
-            return
-        
-        symbols_list = list(self.config.SYMBOLS.keys())
-        self.logger.info(f"\nSTARTING SMC BOT - LIVE TRADING ({', '.join(symbols_list)})")
-        self.logger.info("=" * 60)
-        
+        Everything the loop needs (MT5 session, recorder threads) is opened
+        here and released by ``release`` however the loop ends, so a stopped
+        bot holds no threads, files or log handlers.
+        """
+        self._running = True
+        self._wake.clear()
         try:
+            # Connect to MT5
+            if not self.connect():
+                self.logger.error("Failed to connect. Exiting...")
+                return
+
+            if self.watchlist is not None:
+                self.setup_watchlist()
+            self.restore_state()
+            self.trading_day = date.today()
+
+            # Compile (or load cached) detector kernels before the first iteration
+            warm_ms = self.strategies.warm_up()
+            self.logger.info(f"Detector kernels: {self.strategies.kernels.NAME} backend ({warm_ms:.0f} ms warm-up)")
+
+            symbols_list = list(self.symbols)  # with the watchlist: the active symbols only
+            if self.config.TICK_RECORDING_ENABLED:
+                self.tick_recorder = TickRecorder(self.config.TICK_DIR, symbols_list,
+                                                  self.config.TICK_POLL_SECONDS, self.logger,
+                                                  self.config.TICK_INDEX_SAVE_SECONDS)
+                self.tick_recorder.start()
+            if self.equity is not None:
+                self.equity.start()
+            if self.fanout is not None:
+                self.fanout.start()
+            self.logger.info(f"\nSTARTING SMC BOT - LIVE TRADING ({', '.join(self.symbols)})")
+            self.logger.info("=" * 60)
+
             while self._running:
+                loop_start = time.perf_counter()
                 now = datetime.now()
                 hour = now.hour
 
-                # Reset daily counters at midnight
-                if hour == 0 and now.minute == 0:
-                    self.daily_trades = 0
-                    self.daily_pips = 0
-                    self.wins = 0
-                    self.losses = 0
-                    self.swing_trades = 0
-                    for sym in self.symbol_state:
-                        self.symbol_state[sym]['daily_trades'] = 0
-                        self.symbol_state[sym]['swing_trades'] = 0
-                        self.symbol_state[sym]['last_signal_time'] = None
-                        self.symbol_state[sym]['last_swing_signal_time'] = None
-                    self.logger.info("\nNew trading day started")
+                # Reset daily counters when the date changes
+                if now.date() != self.trading_day:
+                    self.trading_day = now.date()
+                    self.reset_daily_counters()
                 
-                all_data = []
-
                 # ── Iterate over each symbol ──
-                for symbol in symbols_list:
-                    sym_cfg = self.config.SYMBOLS[symbol]
-                    sym_state = self.symbol_state[symbol]
-
-                    # Get market data for this symbol
-                    data = self.get_market_data(symbol)
-                    if data is None:
-                        continue
-                    all_data.append(data)
-
-                    # ── Scalp signals (session + spread filter) ──
-                    if not (self.config.SESSION_START_HOUR <= hour < self.config.SESSION_END_HOUR):
-                        pass  # Outside trading session
-                    elif data['spread'] > sym_cfg.get('max_spread', self.config.MAX_SPREAD_PIPS):
-                        self.logger.info(f"[{symbol}] Spread too high ({data['spread']:.1f} pips)")
-                    elif sym_state.get('daily_trades', 0) < self.config.MAX_DAILY_TRADES:
-                        last_sig = sym_state.get('last_signal_time')
-                        if last_sig is None or (now - last_sig).seconds > 300:
-                            signal = self.generate_signal(data)
-                            if signal:
-                                self.execute_signal(signal)
-                        else:
-                            remaining = 300 - (now - last_sig).seconds
-                            # Log cooldown every 60 seconds instead of every 2 seconds
-                            if remaining % 60 == 0:
-                                self.logger.info(f"[{symbol}] Scalp cooldown: {remaining}s")
-
-                    # ── Swing signals (no session filter) ──
-                    swing_spread_ok = data['spread'] <= sym_cfg.get('swing_max_spread', self.config.SWING_MAX_SPREAD_PIPS)
-                    if self.config.SWING_ENABLED and swing_spread_ok:
-                        if sym_state.get('swing_trades', 0) < self.config.SWING_MAX_DAILY_TRADES:
-                            last_swing = sym_state.get('last_swing_signal_time')
-                            if last_swing is None or (now - last_swing).seconds > self.config.SWING_COOLDOWN_SECONDS:
-                                swing_data = self.get_swing_data(symbol)
-                                if swing_data:
-                                    swing_signal = self.generate_swing_signal(swing_data)
-                                    if swing_signal:
-                                        self.execute_signal(swing_signal)
-                            else:
-                                remaining = self.config.SWING_COOLDOWN_SECONDS - (now - last_swing).seconds
-                                # Log swing cooldown every 300 seconds instead of every 2 seconds
-                                if remaining % 300 == 0:
-                                    self.logger.info(f"[{symbol}] Swing cooldown: {remaining}s")
+                all_data = self.scan_symbols(now, hour)
                 
                 # Manage open positions (all symbols)
                 self.manage_positions()
+                if self.journal is not None:
+                    self.journal.flush()
+                self.save_checkpoint()
+
+                self.iterations += 1
+                self.loop_latency_ms = (time.perf_counter() - loop_start) * 1000
+                self.loop_history.append((self.iterations, self.loop_latency_ms))
+                self.on_iteration(all_data)
                 
-                # Print status
-                if all_data:
-                    self.print_status(all_data)
-                
-                # Wait
-                time.sleep(2)
+                # Wait (stop() cuts the pause short)
+                self._wake.wait(self.config.LOOP_INTERVAL_SECONDS)
                 
         except KeyboardInterrupt:
             self.logger.info("\nBot stopped by user")
         except Exception as e:
             self.logger.error(f"Bot error: {str(e)}")
         finally:
-            mt5.shutdown()
-            self.logger.info("MT5 connection closed")
+            self._running = False
+            self.release()
+
+    def release(self):
+        """Stop the recorders and executors, write the final checkpoint and close MT5, files and logging.
+
+        Safe to call more than once and after a failed start.
+        """
+        if self.tick_recorder is not None:
+            self.tick_recorder.stop()
+            self.tick_recorder = None
+        if self.equity is not None:
+            self.equity.stop()
+        if self.fanout is not None:
+            self.fanout.stop()
+        self.save_checkpoint()
+        mt5.shutdown()
+        if self.journal is not None:
+            self.journal.close()
+        if self.bar_cache.store is not None:
+            self.bar_cache.store.close()
+        self.logger.info("MT5 connection closed")
+        self.close_logging()
 
     def stop(self):
         """Signal the bot loop to stop gracefully."""
         self._running = False
+        self._wake.set()
 
 # ============================================
 # ENTRY POINT
@@ -0,0 +1,149 @@
+# bar_cache.py
+import MetaTrader5 as mt5
+import numpy as np
+
+from config import Config
+from market_data.bars import compact_rates
+from market_data.resampler import TIMEFRAME_SECONDS, IncrementalResampler
+from market_data.warehouse import BarStore
+
+
+MT5_TIMEFRAMES = {
+    "M1": mt5.TIMEFRAME_M1,
+    "M5": mt5.TIMEFRAME_M5,
+    "M15": mt5.TIMEFRAME_M15,
+    "M30": mt5.TIMEFRAME_M30,
+    "H1": mt5.TIMEFRAME_H1,
+    "H4": mt5.TIMEFRAME_H4,
+    "D1": mt5.TIMEFRAME_D1,
+}
+
+
+class MultiTimeframeCache:
+    """Per-symbol base-timeframe bars with locally resampled H1/H4/D1.
+
+    One ``copy_rates_from_pos`` call per symbol per loop replaces the
+    separate M15/H1/H4/D1 fetches, and every timeframe is derived from the
+    same base series so scalp and swing logic see a consistent market.
+
+    With the bar store enabled, warm-up reads closed bars from disk and only
+    fetches the bars missing since the last run; bars that close while the
+    bot runs are appended to the store from memory.
+    """
+
+    def __init__(self, higher_timeframes=("H1", "H4", "D1")):
+        self.config = Config
+        self.base_timeframe = self.config.BASE_TIMEFRAME
+        self.base_seconds = TIMEFRAME_SECONDS[self.base_timeframe]
+        self.higher_timeframes = tuple(higher_timeframes)
+        self.offset_seconds = int(self.config.SERVER_DAY_OFFSET_HOURS * 3600)
+
+        # {symbol: structured rates array}
+        self.base = {}
+        # {symbol: {timeframe: IncrementalResampler}}
+        self.resamplers = {}
+        self.store = BarStore(self.config.BAR_STORE_DIR) if self.config.BAR_STORE_ENABLED else None
+
+    def _fetch(self, symbol, count):
+        rates = mt5.copy_rates_from_pos(symbol, MT5_TIMEFRAMES[self.base_timeframe], 0, count)
+        if rates is not None and self.config.BARS_FLOAT32:
+            rates = compact_rates(rates)
+        return rates
+
+    def _new_resamplers(self):
+        # Trimmed like the base series: the bars BASE_HISTORY_BARS span, +10% for gaps
+        history = self.config.BASE_HISTORY_BARS
+        return {
+            tf: IncrementalResampler(TIMEFRAME_SECONDS[tf], self.offset_seconds,
+                                     max_bars=int(history * self.base_seconds / TIMEFRAME_SECONDS[tf] * 1.1) + 1)
+            for tf in self.higher_timeframes
+        }
+
+    def _load_history(self, symbol):
+        """Base history: bar store + the newest bars, or a full terminal fetch."""
+        history = self.config.BASE_HISTORY_BARS
+        if self.store is None:
+            return self._fetch(symbol, history)
+
+        try:
+            self.store.sync(mt5, symbol, self.base_timeframe, history)
+            stored = self.store.tail(symbol, self.base_timeframe, history)
+        except OSError:
+            stored = ()
+        fresh = self._fetch(symbol, self.config.BASE_REFRESH_BARS)
+        if len(stored) == 0 or fresh is None or len(fresh) == 0:
+            return self._fetch(symbol, history)
+        if fresh["time"][0] > stored["time"][-1] + self.base_seconds:
+            return self._fetch(symbol, history)
+
+        # Copy out of the memmap into the cache's own (possibly float32) array
+        stored = compact_rates(stored) if self.config.BARS_FLOAT32 else np.array(stored)
+        idx = np.searchsorted(stored["time"], fresh["time"][0], side="left")
+        return np.concatenate((stored[:idx], fresh))[-history:]
+
+    def _persist_closed(self, symbol, rates):
+        """Append newly closed base bars (all but the forming one) to the store."""
+        if self.store is None or self.config.BARS_FLOAT32:
+            return  # float32 prices are lossy; the store keeps terminal precision
+        try:
+            self.store.append(symbol, self.base_timeframe, rates[-self.config.BASE_REFRESH_BARS - 1:-1])
+        except OSError:
+            pass
+
+    def warm_up(self, symbol):
+        """Load the full base history for a symbol and build every timeframe."""
+        rates = self._load_history(symbol)
+        if rates is None or len(rates) == 0:
+            return False
+
+        self.base[symbol] = rates
+        self.resamplers[symbol] = self._new_resamplers()
+        for resampler in self.resamplers[symbol].values():
+            resampler.rebuild(rates)
+        return True
+
+    def refresh(self, symbol):
+        """Pull the newest base bars and update the higher timeframes.
+
+        Falls back to a full warm-up on first use or when the fresh bars no
+        longer overlap the cache (e.g. after a disconnect).
+        """
+        cached = self.base.get(symbol)
+        if cached is None or len(cached) == 0:
+            return self.warm_up(symbol)
+
+        fresh = self._fetch(symbol, self.config.BASE_REFRESH_BARS)
+        if fresh is None or len(fresh) == 0:
+            return False
+        if fresh["time"][0] > cached["time"][-1]:
+            return self.warm_up(symbol)
+
+        idx = np.searchsorted(cached["time"], fresh["time"][0], side="left")
+        merged = np.concatenate((cached[:idx], fresh))
+        if len(merged) > self.config.BASE_HISTORY_BARS:
+            merged = merged[-self.config.BASE_HISTORY_BARS:]
+        self.base[symbol] = merged
+        if fresh["time"][-1] != cached["time"][-1]:
+            # A new bar opened, so the previous one just closed
+            self._persist_closed(symbol, merged)
+
+        for resampler in self.resamplers[symbol].values():
+            resampler.update(merged, fresh["time"][0])
+        return True
+
+    def evict(self, symbol):
+        """Drop a symbol's cached bars (the next refresh warms it up again)."""
+        self.base.pop(symbol, None)
+        self.resamplers.pop(symbol, None)
+
+    def get_rates(self, symbol, timeframe, count):
+        """Return the last ``count`` bars of a timeframe (a view, not a copy)."""
+        if symbol not in self.base:
+            return None
+        if timeframe == self.base_timeframe:
+            rates = self.base[symbol]
+        else:
+            rates = self.resamplers[symbol][timeframe].bars
+        if rates is None or len(rates) == 0:
+            return None
+        return rates[-count:]
@@ -0,0 +1,96 @@
+# bars.py
+import numpy as np
+
+
+# Compact MT5 rates layout for memory-constrained runs (prices as float32)
+COMPACT_RATES_DTYPE = np.dtype([
+    ("time", "<i8"),
+    ("open", "<f4"),
+    ("high", "<f4"),
+    ("low", "<f4"),
+    ("close", "<f4"),
+    ("tick_volume", "<u8"),
+    ("spread", "<i4"),
+    ("real_volume", "<u8"),
+])
+
+
+def compact_rates(rates):
+    """Return a float32-price copy of an MT5 rates array."""
+    if rates is None or rates.dtype == COMPACT_RATES_DTYPE:
+        return rates
+    out = np.empty(len(rates), dtype=COMPACT_RATES_DTYPE)
+    for name in COMPACT_RATES_DTYPE.names:
+        if name in rates.dtype.names:
+            out[name] = rates[name]
+        else:
+            out[name] = 0
+    return out
+
+
+class Bars:
+    """Lightweight OHLCV view over an MT5 ``copy_rates_from_pos`` array.
+
+    Columns are zero-copy field views of the underlying record array;
+    a pandas DataFrame is only built when ``to_frame()`` is called.
+    """
+
+    __slots__ = ("rates", "time", "open", "high", "low", "close", "tick_volume", "_labels")
+
+    def __init__(self, rates, float32=False, labels=None):
+        if float32:
+            rates = compact_rates(rates)
+        self.rates = rates
+        self.time = rates["time"]
+        self.open = rates["open"]
+        self.high = rates["high"]
+        self.low = rates["low"]
+        self.close = rates["close"]
+        self.tick_volume = rates["tick_volume"]
+        self._labels = labels
+
+    @classmethod
+    def from_frame(cls, df):
+        """Wrap a time-indexed OHLCV DataFrame (as built from MT5 rates)."""
+        rates = np.empty(len(df), dtype=[
+            ("time", "<i8"),
+            ("open", "<f8"),
+            ("high", "<f8"),
+            ("low", "<f8"),
+            ("close", "<f8"),
+            ("tick_volume", "<u8"),
+        ])
+        rates["time"] = df.index.values.astype("datetime64[s]").astype(np.int64)
+        for name in ("open", "high", "low", "close", "tick_volume"):
+            rates[name] = df[name].to_numpy()
+        return cls(rates, labels=df.index)
+
+    def __len__(self):
+        return len(self.rates)
+
+    def tail(self, n):
+        """Last ``n`` bars as a view."""
+        labels = self._labels[-n:] if self._labels is not None else None
+        return Bars(self.rates[-n:], labels=labels)
+
+    def label(self, i):
+        """Timestamp of bar ``i`` (negative indices allowed)."""
+        if self._labels is not None:
+            return self._labels[i]
+        return np.datetime64(int(self.time[i]), "s")
+
+    def to_frame(self):
+        """Materialize a time-indexed DataFrame (copies)."""
+        import pandas as pd
+
+        df = pd.DataFrame(self.rates)
+        df["time"] = pd.to_datetime(df["time"], unit="s")
+        df.set_index("time", inplace=True)
+        return df
+
+
+def as_bars(data):
+    """Accept either ``Bars`` or a DataFrame and return ``Bars``."""
+    if isinstance(data, Bars):
+        return data
+    return Bars.from_frame(data)
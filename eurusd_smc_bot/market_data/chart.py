@@ -0,0 +1,224 @@
+# chart.py
+"""Binary columnar chart data: OHLCV bars plus the SMC overlays on them.
+
+A payload is laid out as (little-endian throughout)::
+
+    b"SMCC"  u32 header length  header JSON  zero padding to 8  column buffers
+
+The JSON header carries the request's metadata and a ``columns`` list of
+``{"name", "type", "offset", "length"}``: ``type`` is the JavaScript typed
+array to wrap the buffer with and ``offset`` is counted from the end of the
+padded header (every buffer starts 8-byte aligned). The browser parses only
+the header; each column is ``new Float32Array(buf, dataStart + offset, length)``.
+
+Bar columns: ``time`` (u32 epoch seconds, server time), ``open``, ``high``,
+``low``, ``close``, ``volume`` (tick volume), all f32.
+
+Overlay columns, one row per zone: ``zone_kind`` (u8 index into
+``ZONE_KINDS``), ``zone_side`` (i8, +1 bullish / -1 bearish), ``zone_time``
+(u32 bar the zone formed on, 0 if the detector doesn't say), ``zone_top``,
+``zone_bottom``, ``zone_strength`` (f32). An order block spans its entry
+price to its stop, an FVG its gap, a breaker and a BOS sit on one level
+(a BOS's bottom/top is the broken level and the breaking price).
+"""
+import json
+import struct
+from collections import OrderedDict
+
+import numpy as np
+
+from config import Config
+from market_data.bars import Bars
+from market_data.resampler import TIMEFRAME_SECONDS, resample_rates
+from market_data.warehouse import BarStore
+from strategies.smc_strategies import SMCStrategies
+
+
+MAGIC = b"SMCC"
+ZONE_KINDS = ("order_block", "fvg", "breaker", "bos")
+OVERLAY_CACHE_SIZE = 64
+
+ZONE_COLUMNS = (("zone_kind", "<u1"), ("zone_side", "<i1"), ("zone_time", "<u4"),
+                ("zone_top", "<f4"), ("zone_bottom", "<f4"), ("zone_strength", "<f4"))
+JS_TYPES = {"<u1": "Uint8Array", "<i1": "Int8Array", "<u4": "Uint32Array", "<f4": "Float32Array"}
+
+
+def _pad(n):
+    return -n % 8
+
+
+def encode(meta, columns):
+    """Pack ``{name: array}`` columns (in order) behind a JSON header."""
+    specs, buffers, offset = [], [], 0
+    for name, values in columns.items():
+        data = np.ascontiguousarray(values).tobytes()
+        specs.append({"name": name, "type": JS_TYPES[values.dtype.str.replace("|", "<")],
+                      "offset": offset, "length": len(values)})
+        buffers.append(data + b"\0" * _pad(len(data)))
+        offset += len(data) + _pad(len(data))
+    header = json.dumps({**meta, "columns": specs}, separators=(",", ":")).encode()
+    head = MAGIC + struct.pack("<I", len(header)) + header
+    return b"".join([head, b"\0" * _pad(len(head))] + buffers)
+
+
+def decode(payload):
+    """(header, {name: array}) of an ``encode``d payload (zero-copy views)."""
+    if payload[:4] != MAGIC:
+        raise ValueError("not a chart payload")
+    (size,) = struct.unpack_from("<I", payload, 4)
+    header = json.loads(payload[8:8 + size])
+    start = 8 + size + _pad(8 + size)
+    types = {js: np.dtype(dt) for dt, js in JS_TYPES.items()}
+    columns = {c["name"]: np.frombuffer(payload, types[c["type"]], c["length"], start + c["offset"])
+               for c in header.pop("columns")}
+    return header, columns
+
+
+def _zone_time(label):
+    if label is None:
+        return 0
+    try:
+        return int(label.astype("datetime64[s]").astype("int64"))
+    except AttributeError:
+        return int(label.timestamp())
+
+
+class ChartBuilder:
+    """Builds chart payloads from the bot's bar cache or the bar store.
+
+    Bars come from ``bar_cache`` (the running bot's, forming bar included)
+    when it holds the symbol and timeframe and reaches back far enough;
+    otherwise closed bars are read from the bar store and resampled from
+    the base timeframe. Overlays are detected on the last
+    ``CHART_OVERLAY_BARS`` bars up to the newest one returned, with the
+    scalp filters on the base timeframe and the swing filters above it, and
+    are cached until that window's last bar changes.
+    """
+
+    def __init__(self, bar_cache=None, store=None):
+        self.config = Config
+        self.bar_cache = bar_cache
+        self.store = store or BarStore(self.config.BAR_STORE_DIR)
+        self.strategies = SMCStrategies()   # own instance: runs beside the bot thread
+        self.base_timeframe = self.config.BASE_TIMEFRAME
+        self.offset_seconds = int(self.config.SERVER_DAY_OFFSET_HOURS * 3600)
+        self._overlays = OrderedDict()
+
+    def timeframes(self):
+        base = TIMEFRAME_SECONDS[self.base_timeframe]
+        return [tf for tf, seconds in TIMEFRAME_SECONDS.items() if seconds >= base and seconds % base == 0]
+
+    def _cached_rates(self, symbol, timeframe):
+        """The live bot's bars, or None (read once each: the bot thread may evict or replace them)."""
+        cache = self.bar_cache
+        if cache is None:
+            return None
+        if timeframe == cache.base_timeframe:
+            return cache.base.get(symbol)
+        resampler = cache.resamplers.get(symbol, {}).get(timeframe)
+        return None if resampler is None else resampler.bars
+
+    def _stored_rates(self, symbol, timeframe, end, count):
+        ratio = TIMEFRAME_SECONDS[timeframe] // TIMEFRAME_SECONDS[self.base_timeframe]
+        if end is None:
+            base = self.store.bars(symbol, self.base_timeframe)
+        else:
+            base = self.store.read_range(symbol, self.base_timeframe, 0, end)
+        base = base[-(count + 1) * ratio:]
+        if ratio == 1:
+            return base
+        return resample_rates(base, TIMEFRAME_SECONDS[timeframe], self.offset_seconds, drop_partial_head=True)
+
+    def rates(self, symbol, timeframe, start=None, end=None, count=0):
+        """Bars before ``end`` (epoch seconds), ``count`` of them or back to ``start`` where available."""
+        cached = self._cached_rates(symbol, timeframe)
+        if cached is not None and end is not None:
+            cached = cached[:np.searchsorted(cached["time"], end)]
+        if cached is not None and len(cached):
+            if len(cached) >= count or (start is not None and cached["time"][0] <= start):
+                return cached
+        stored = self._stored_rates(symbol, timeframe, end, count)
+        if cached is not None and len(cached) and (len(stored) == 0 or stored["time"][0] >= cached["time"][0]):
+            return cached   # the store reaches no further back, and lacks the forming bar
+        return stored
+
+    def overlays(self, symbol, timeframe, rates, pv):
+        """Zone columns detected on ``rates`` (cached by the window's last bar)."""
+        if len(rates) == 0:
+            return {name: np.zeros(0, dtype) for name, dtype in ZONE_COLUMNS}
+        last = rates[-1]
+        key = (symbol, timeframe, len(rates), int(rates["time"][0]), int(last["time"]),
+               float(last["high"]), float(last["low"]), float(last["close"]))
+        cached = self._overlays.get(key)
+        if cached is not None:
+            self._overlays.move_to_end(key)
+            return cached
+
+        s = self.strategies
+        bars = Bars(rates)
+        swing = TIMEFRAME_SECONDS[timeframe] > TIMEFRAME_SECONDS[self.base_timeframe]
+        rows = []   # (kind, side, time, top, bottom, strength)
+        obs = s.identify_order_blocks_swing(bars, pv) if swing else s.identify_order_blocks(bars, pv)
+        for ob in obs:
+            rows.append((0, 1 if ob["type"] == "bullish" else -1, _zone_time(ob["time"]),
+                         max(ob["price"], ob["stop"]), min(ob["price"], ob["stop"]), ob["strength"]))
+        fvgs = s.identify_fair_value_gaps_swing(bars, pv) if swing else s.identify_fair_value_gaps(bars, pv)
+        for fvg in fvgs:
+            rows.append((1, 1 if fvg["type"] == "bullish" else -1, _zone_time(fvg["time"]),
+                         fvg["top"], fvg["bottom"], fvg["size"]))
+        for breaker in s.identify_breaker_blocks(bars, pv):
+            rows.append((2, 1 if breaker["type"] == "bullish_breaker" else -1, 0,
+                         breaker["level"], breaker["level"], breaker["strength"]))
+        bos = s.detect_break_of_structure(bars, pv)
+        if bos:
+            rows.append((3, 1 if bos["type"] == "bullish" else -1, _zone_time(bos["time"]),
+                         max(bos["level"], bos["price"]), min(bos["level"], bos["price"]), bos["strength"]))
+
+        table = list(zip(*rows)) if rows else [()] * len(ZONE_COLUMNS)
+        zones = {name: np.array(values, dtype=dtype) for (name, dtype), values in zip(ZONE_COLUMNS, table)}
+        self._overlays[key] = zones
+        while len(self._overlays) > OVERLAY_CACHE_SIZE:
+            self._overlays.popitem(last=False)
+        return zones
+
+    def build(self, symbol, timeframe, start=None, end=None, since=None, count=None):
+        """Chart payload for ``symbol``: the newest ``count`` bars in [start, end).
+
+        With ``since`` only bars from that time on are sent (the bar at
+        ``since`` included, as it may still have been forming); overlays are
+        always sent whole.
+        """
+        if timeframe not in self.timeframes():
+            raise ValueError(f"timeframe must be one of {', '.join(self.timeframes())}")
+        count = max(1, min(int(count or self.config.CHART_DEFAULT_BARS), self.config.CHART_MAX_BARS))
+        window = self.config.CHART_OVERLAY_BARS
+        rates = self.rates(symbol, timeframe, start, end, max(count, window))
+
+        first = len(rates) - count
+        if start is not None:
+            first = max(first, int(np.searchsorted(rates["time"], start)))
+        if since is not None:
+            first = max(first, int(np.searchsorted(rates["time"], since)))
+        bars = rates[max(first, 0):]
+
+        pv = self.config.SYMBOLS.get(symbol, {}).get("pip_value", self.config.PIP_VALUE)
+        columns = {
+            "time": bars["time"].astype("<u4"),
+            "open": bars["open"].astype("<f4"),
+            "high": bars["high"].astype("<f4"),
+            "low": bars["low"].astype("<f4"),
+            "close": bars["close"].astype("<f4"),
+            "volume": bars["tick_volume"].astype("<f4"),
+        }
+        columns.update(self.overlays(symbol, timeframe, rates[-window:], pv))
+        meta = {
+            "symbol": symbol,
+            "timeframe": timeframe,
+            "count": len(bars),
+            "first_time": int(bars["time"][0]) if len(bars) else None,
+            "last_time": int(rates["time"][-1]) if len(rates) else None,
+            "since": since,
+            "pip_value": pv,
+            "zone_kinds": ZONE_KINDS,
+        }
+        return encode(meta, columns)
@@ -0,0 +1,101 @@
+# resampler.py
+import numpy as np
+
+
+# Bar length in seconds for the timeframes the bot works with
+TIMEFRAME_SECONDS = {
+    "M1": 60,
+    "M5": 300,
+    "M15": 900,
+    "M30": 1800,
+    "H1": 3600,
+    "H4": 14400,
+    "D1": 86400,
+}
+
+
+def period_start(times, period_seconds, offset_seconds=0):
+    """Return the opening time of the period each timestamp falls in.
+
+    MT5 bar times are broker server time expressed as epoch seconds, so
+    flooring them aligns H1/H4/D1 periods to server-time boundaries exactly
+    like the terminal does. ``offset_seconds`` shifts the boundary for brokers
+    whose daily candle does not open at server midnight.
+    """
+    offset = offset_seconds % period_seconds
+    return (times - offset) // period_seconds * period_seconds + offset
+
+
+def resample_rates(rates, period_seconds, offset_seconds=0, drop_partial_head=False):
+    """Aggregate an MT5 rates array into a higher timeframe.
+
+    Vectorized group-by-period: open first, high max, low min, close last,
+    tick/real volume summed and spread maxed. The result has the same dtype
+    as the input, so downstream code cannot tell it apart from a
+    ``copy_rates_from_pos`` result.
+    """
+    if rates is None or len(rates) == 0:
+        return rates
+
+    times = rates["time"].astype(np.int64)
+    starts_time = period_start(times, period_seconds, offset_seconds)
+    starts = np.flatnonzero(np.r_[True, starts_time[1:] != starts_time[:-1]])
+    ends = np.r_[starts[1:], len(rates)] - 1
+
+    out = np.empty(len(starts), dtype=rates.dtype)
+    out["time"] = starts_time[starts]
+    out["open"] = rates["open"][starts]
+    out["high"] = np.maximum.reduceat(rates["high"], starts)
+    out["low"] = np.minimum.reduceat(rates["low"], starts)
+    out["close"] = rates["close"][ends]
+    for field in ("tick_volume", "real_volume"):
+        if field in rates.dtype.names:
+            out[field] = np.add.reduceat(rates[field], starts)
+    if "spread" in rates.dtype.names:
+        out["spread"] = np.maximum.reduceat(rates["spread"], starts)
+
+    # The oldest period is incomplete when the base window starts mid-period
+    if drop_partial_head and times[0] != starts_time[0]:
+        out = out[1:]
+    return out
+
+
+class IncrementalResampler:
+    """Keeps one higher timeframe in sync with a growing base series.
+
+    Only the periods touched by new or revised base bars are re-aggregated;
+    completed periods are never recomputed.
+    """
+
+    def __init__(self, period_seconds, offset_seconds=0, max_bars=None):
+        self.period_seconds = period_seconds
+        self.offset_seconds = offset_seconds
+        self.max_bars = max_bars
+        self.bars = None
+
+    def rebuild(self, base):
+        """Resample the whole base series from scratch."""
+        self.bars = resample_rates(base, self.period_seconds, self.offset_seconds,
+                                   drop_partial_head=True)
+        self._trim()
+        return self.bars
+
+    def update(self, base, first_changed_time):
+        """Re-aggregate from the period containing ``first_changed_time`` onward."""
+        if self.bars is None or len(self.bars) == 0:
+            return self.rebuild(base)
+
+        start = period_start(np.int64(first_changed_time), self.period_seconds, self.offset_seconds)
+        if start < self.bars["time"][0]:
+            return self.rebuild(base)
+
+        base_idx = np.searchsorted(base["time"], start, side="left")
+        keep = np.searchsorted(self.bars["time"], start, side="left")
+        tail = resample_rates(base[base_idx:], self.period_seconds, self.offset_seconds)
+        self.bars = np.concatenate((self.bars[:keep], tail))
+        self._trim()
+        return self.bars
+
+    def _trim(self):
+        if self.max_bars and self.bars is not None and len(self.bars) > self.max_bars:
+            self.bars = self.bars[-self.max_bars:]
@@ -0,0 +1,221 @@
+# warehouse.py
+"""On-disk store of closed bars per symbol and timeframe.
+
+Bars are appended as raw MT5 rate records to ``<dir>/<symbol>/<TF>.bars``.
+The file is time-ordered, so the ``time`` column is its own index: a range
+query is a binary search on a memory-mapped file and returns a zero-copy
+slice. Only closed bars are stored (never the forming bar), so appends never
+have to rewrite data.
+
+Research tooling can read years of bars without a terminal:
+
+    from market_data.warehouse import BarStore
+    bars = BarStore("data/bars").read_range("EURUSD.ecn", "M15", start_ts, end_ts)
+
+Backfill / inspect from the command line (needs the terminal for ``sync``):
+
+    cd eurusd_smc_bot && python -m market_data.warehouse sync --timeframes M15 H1 --bars 100000
+    cd eurusd_smc_bot && python -m market_data.warehouse gaps --timeframes M15
+"""
+import argparse
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from market_data.resampler import TIMEFRAME_SECONDS
+
+
+RATES_DTYPE = np.dtype([
+    ("time", "<i8"),
+    ("open", "<f8"),
+    ("high", "<f8"),
+    ("low", "<f8"),
+    ("close", "<f8"),
+    ("tick_volume", "<u8"),
+    ("spread", "<i4"),
+    ("real_volume", "<u8"),
+])
+
+WEEKEND_MAX_SECONDS = 3 * 86400
+
+
+def _as_store_dtype(rates):
+    if rates.dtype == RATES_DTYPE:
+        return rates
+    out = np.zeros(len(rates), dtype=RATES_DTYPE)
+    for name in RATES_DTYPE.names:
+        out[name] = rates[name]
+    return out
+
+
+def is_weekend_gap(start, end):
+    """True for the usual Friday-close to Sunday/Monday-open gap."""
+    if end - start > WEEKEND_MAX_SECONDS:
+        return False
+    start_day = datetime.fromtimestamp(start, timezone.utc).weekday()
+    end_day = datetime.fromtimestamp(end, timezone.utc).weekday()
+    return start_day in (4, 5) and end_day in (5, 6, 0)
+
+
+class BarStore:
+    """Append-only, memory-mapped bar files (reader and writer)."""
+
+    def __init__(self, directory, logger=None):
+        self.directory = Path(directory)
+        self.logger = logger or logging.getLogger('SMC_Bot')
+        self._maps = {}   # {(symbol, tf): (file size, memmap)}
+
+    def path(self, symbol, timeframe):
+        return self.directory / symbol / f"{timeframe}.bars"
+
+    # ── Reading ──
+
+    def bars(self, symbol, timeframe):
+        """All stored bars as a read-only memmap (empty array if none)."""
+        path = self.path(symbol, timeframe)
+        try:
+            size = path.stat().st_size
+        except OSError:
+            return np.zeros(0, dtype=RATES_DTYPE)
+        count = size // RATES_DTYPE.itemsize
+        if count == 0:
+            return np.zeros(0, dtype=RATES_DTYPE)
+
+        key = (symbol, timeframe)
+        cached = self._maps.get(key)
+        if cached is None or cached[0] != size:
+            cached = (size, np.memmap(path, dtype=RATES_DTYPE, mode="r", shape=(count,)))
+            self._maps[key] = cached
+        return cached[1]
+
+    def last_time(self, symbol, timeframe):
+        bars = self.bars(symbol, timeframe)
+        return int(bars["time"][-1]) if len(bars) else None
+
+    def read_range(self, symbol, timeframe, start, end):
+        """Bars with start <= time < end (epoch seconds), as a zero-copy slice."""
+        bars = self.bars(symbol, timeframe)
+        lo, hi = np.searchsorted(bars["time"], [start, end])
+        return bars[lo:hi]
+
+    def tail(self, symbol, timeframe, count):
+        return self.bars(symbol, timeframe)[-count:]
+
+    def close(self):
+        """Drop the cached memmaps (each holds the file open until released)."""
+        self._maps.clear()
+
+    def gaps(self, symbol, timeframe, include_weekends=False):
+        """Missing stretches as ``[(last bar before, first bar after, missing bars)]``."""
+        times = self.bars(symbol, timeframe)["time"]
+        period = TIMEFRAME_SECONDS[timeframe]
+        jumps = np.flatnonzero(np.diff(times) > period)
+        out = []
+        for i in jumps:
+            start, end = int(times[i]), int(times[i + 1])
+            if include_weekends or not is_weekend_gap(start, end):
+                out.append((start, end, (end - start) // period - 1))
+        return out
+
+    # ── Writing ──
+
+    def append(self, symbol, timeframe, rates):
+        """Append closed bars newer than the last stored bar; returns bars written."""
+        last = self.last_time(symbol, timeframe)
+        if last is not None:
+            rates = rates[rates["time"] > last]
+        if len(rates) == 0:
+            return 0
+
+        path = self.path(symbol, timeframe)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "ab") as f:
+            torn = f.tell() % RATES_DTYPE.itemsize
+            if torn:
+                # Drop a partial record left by a crash mid-write
+                f.truncate(f.tell() - torn)
+            f.write(_as_store_dtype(rates).tobytes())
+        return len(rates)
+
+    def sync(self, mt5, symbol, timeframe, history_bars):
+        """Bring the store up to the last closed bar.
+
+        Only the bars since the last stored one are requested (or
+        ``history_bars`` on first sync). A hole between the stored data and
+        the oldest bar the terminal still returns is logged as a gap.
+        """
+        tf_code = getattr(mt5, f"TIMEFRAME_{timeframe}")
+        period = TIMEFRAME_SECONDS[timeframe]
+        last = self.last_time(symbol, timeframe)
+
+        if last is None:
+            count = history_bars
+        else:
+            forming = mt5.copy_rates_from_pos(symbol, tf_code, 0, 1)
+            if forming is None or len(forming) == 0:
+                return 0
+            count = int(forming["time"][0] - last) // period - 1
+            if count <= 0:
+                return 0
+            count = min(count, history_bars)
+
+        # start_pos=1 skips the forming bar
+        rates = mt5.copy_rates_from_pos(symbol, tf_code, 1, count)
+        if rates is None or len(rates) == 0:
+            return 0
+        first = int(rates["time"][0])
+        if last is not None and first > last + period and not is_weekend_gap(last, first):
+            self.logger.warning(
+                "[%s] %s bar store gap: %s -> %s (%d bars not available from the terminal)",
+                symbol, timeframe,
+                datetime.fromtimestamp(last, timezone.utc).isoformat(),
+                datetime.fromtimestamp(first, timezone.utc).isoformat(),
+                (first - last) // period - 1,
+            )
+        return self.append(symbol, timeframe, rates)
+
+
+def main():
+    from config import Config
+
+    parser = argparse.ArgumentParser(description="Bar warehouse maintenance")
+    parser.add_argument("command", choices=("sync", "gaps", "info"))
+    parser.add_argument("--symbols", nargs="*", default=list(Config.SYMBOLS))
+    parser.add_argument("--timeframes", nargs="*", default=[Config.BASE_TIMEFRAME])
+    parser.add_argument("--bars", type=int, default=Config.BAR_STORE_BACKFILL_BARS,
+                        help="history to request on first sync")
+    parser.add_argument("--dir", default=Config.BAR_STORE_DIR)
+    args = parser.parse_args()
+
+    store = BarStore(args.dir)
+    if args.command == "sync":
+        import MetaTrader5 as mt5
+        if not mt5.initialize():
+            raise SystemExit(f"MT5 init failed: {mt5.last_error()}")
+        try:
+            for symbol in args.symbols:
+                for tf in args.timeframes:
+                    print(f"{symbol:<14} {tf:<4} +{store.sync(mt5, symbol, tf, args.bars)} bars")
+        finally:
+            mt5.shutdown()
+        return
+
+    for symbol in args.symbols:
+        for tf in args.timeframes:
+            bars = store.bars(symbol, tf)
+            if args.command == "info":
+                span = ""
+                if len(bars):
+                    fmt = lambda t: datetime.fromtimestamp(int(t), timezone.utc).strftime("%Y-%m-%d %H:%M")
+                    span = f"{fmt(bars['time'][0])} .. {fmt(bars['time'][-1])}"
+                print(f"{symbol:<14} {tf:<4} {len(bars):>8} bars  {span}")
+            else:
+                for start, end, missing in store.gaps(symbol, tf):
+                    print(f"{symbol:<14} {tf:<4} gap after {datetime.fromtimestamp(start, timezone.utc)}"
+                          f" ({missing} bars)")
+
+
+if __name__ == "__main__":
+    main()
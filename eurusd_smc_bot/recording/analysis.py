@@ -0,0 +1,161 @@
+# analysis.py
+"""Structured per-symbol analysis records in bounded in-memory rings.
+
+Every scalp/swing decision for a symbol appends one JSON-friendly record:
+trend scores, BOS/ChoCH, the order blocks and FVGs nearest to price, the
+spread, the cooldown left and the reason the symbol did or didn't trade.
+The dashboard reads them from ``/symbols/{symbol}/analysis`` instead of
+pattern-matching log lines. Each symbol keeps its last ``depth`` records
+(scalp and swing together); ``seq`` numbers let a poller ask only for
+records it hasn't seen.
+
+Appends happen on the bot thread and reads on the engine's command thread;
+both are single deque operations, so no lock is needed.
+"""
+import math
+import time
+from collections import deque
+from itertools import count
+
+from recording.journal import KIND_SWING
+
+
+def _num(value, digits=5):
+    """Rounded float, or None for missing and non-finite values (not valid JSON)."""
+    if value is None or not math.isfinite(value):
+        return None
+    return round(float(value), digits)
+
+
+def _time(value):
+    """Detector bar label (datetime64 or Timestamp) as epoch seconds."""
+    if value is None:
+        return None
+    try:
+        return int(value.astype("datetime64[s]").astype("int64"))
+    except AttributeError:
+        return int(value.timestamp())
+
+
+def _structure(found):
+    """BOS/ChoCH dict without NumPy types (None stays None)."""
+    if not found:
+        return None
+    out = {}
+    for key, value in found.items():
+        if key == "time":
+            out[key] = _time(value)
+        elif isinstance(value, str) or value is None:
+            out[key] = value
+        else:
+            out[key] = _num(value)
+    return out
+
+
+def _near_order_blocks(order_blocks, price, pv, keep):
+    zones = [{
+        "type": ob["type"],
+        "price": _num(ob["price"]),
+        "stop": _num(ob["stop"]),
+        "strength": _num(ob["strength"], 2),
+        "time": _time(ob.get("time")),
+        "distance": round(abs(price - ob["price"]) / pv, 1),
+    } for ob in order_blocks]
+    return sorted(zones, key=lambda z: z["distance"])[:keep]
+
+
+def _near_fvgs(fvgs, price, pv, keep):
+    zones = [{
+        "type": fvg["type"],
+        "top": _num(fvg["top"]),
+        "bottom": _num(fvg["bottom"]),
+        "size": _num(fvg["size"], 1),
+        "time": _time(fvg.get("time")),
+        # 0 = price inside the gap
+        "distance": round(max(fvg["bottom"] - price, price - fvg["top"], 0) / pv, 1),
+    } for fvg in fvgs]
+    return sorted(zones, key=lambda z: z["distance"])[:keep]
+
+
+class AnalysisLog:
+    """Last ``depth`` analysis records per symbol.
+
+    With ``forward`` set (shard workers) new records are also queued in
+    ``outbox`` for the heartbeat to carry to the supervisor.
+    """
+
+    def __init__(self, depth, max_zones=3, forward=False):
+        self.depth = depth
+        self.max_zones = max_zones
+        self.rings = {}     # {symbol: deque of records}
+        self.outbox = [] if forward else None
+        self._seq = count(1)
+
+    def record(self, data, kind, reason, signal=None, cooldown=0):
+        """Append the record of one decision; ``data`` is the generator's market-data dict."""
+        analysis = data.get('analysis') or {}
+        pv = data['pip_value']
+        mid = (data['bid'] + data['ask']) / 2
+        trend = analysis.get('trend')
+        trend_entry = analysis.get('trend_entry')
+        record = {
+            "time": round(time.time(), 3),
+            "symbol": data['symbol'],
+            "kind": "swing" if kind == KIND_SWING else "scalp",
+            "reason": reason,
+            "outcome": signal.get('outcome', 'none') if signal else 'none',
+            "bid": _num(data['bid']),
+            "ask": _num(data['ask']),
+            "spread": _num(data['spread'], 2),
+            "cooldown": int(cooldown),
+            "trend": dict(trend) if trend else None,
+            "trend_entry": dict(trend_entry) if trend_entry else None,
+            "bos": _structure(analysis.get('bos')),
+            "choch": _structure(analysis.get('choch')),
+            "ob_count": analysis.get('ob_count', 0),
+            "fvg_count": analysis.get('fvg_count', 0),
+            "order_blocks": _near_order_blocks(analysis.get('order_blocks', ()), mid, pv, self.max_zones),
+            "fvgs": _near_fvgs(analysis.get('fvgs', ()), mid, pv, self.max_zones),
+            "signal": {
+                "direction": signal['direction'],
+                "price": _num(signal['price']),
+                "sl": _num(signal['sl']),
+                "tp1": _num(signal['tp1']),
+                "tp3": _num(signal['tp3']),
+                "stop_pips": _num(signal['stop_pips'], 1),
+                "confidence": _num(signal.get('confidence', 0), 2),
+            } if signal else None,
+        }
+        self.add(record)
+        if self.outbox is not None:
+            self.outbox.append(record)
+        return record
+
+    def add(self, record):
+        """Append a finished record (numbered here, e.g. one forwarded by a shard)."""
+        record["seq"] = next(self._seq)
+        ring = self.rings.get(record["symbol"])
+        if ring is None:
+            ring = self.rings.setdefault(record["symbol"], deque(maxlen=self.depth))
+        ring.append(record)
+
+    def drain(self):
+        """Records queued for forwarding since the last call."""
+        records, self.outbox = self.outbox, []
+        return records
+
+    def history(self, symbol, depth=None, kind=None, since=0):
+        """The newest ``depth`` records of ``symbol`` (oldest first), after ``since``."""
+        records = list(self.rings.get(symbol, ()))
+        if since or kind:
+            records = [r for r in records if r["seq"] > since and (kind is None or r["kind"] == kind)]
+        return records[-depth:] if depth else records
+
+    def latest(self, symbol):
+        """{kind: newest record} for ``symbol``."""
+        out = {}
+        for record in reversed(list(self.rings.get(symbol, ()))):
+            out.setdefault(record["kind"], record)
+            if len(out) == 2:
+                break
+        return out
@@ -0,0 +1,367 @@
+# equity.py
+"""Account equity sampler and its tiered on-disk series.
+
+``EquitySampler`` polls ``account_info`` from a background thread into a
+fixed-size in-memory ring (balance, equity, open P&L once per second) and
+every ``flush_seconds`` compacts the new samples into three tiers:
+
+    1s   every sample         files per UTC day    kept EQUITY_1S_RETENTION_DAYS
+    1m   one row per minute   files per month      kept EQUITY_1M_RETENTION_DAYS
+    1h   one row per hour     files per year       kept forever
+
+Rows are fixed-size little-endian records after a small header (as in
+``journal.py``), so ``EquityStore.read`` memory-maps only the files a time
+range touches and slices them with a binary search. Minute and hour rows
+carry the last balance/equity/P&L of the bucket plus the equity low and
+high, and are written once the bucket is complete; after a restart the
+open buckets are rebuilt from the finer tier, so nothing is written twice.
+
+``series`` reads a range from the finest tier whose row count stays
+bounded, filling in from coarser tiers where the finer one has been
+pruned, and downsamples it to the requested point count with LTTB
+(largest triangle three buckets), which keeps peaks and drawdowns.
+"""
+import logging
+import struct
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+
+MAGIC = b"SMCE"
+VERSION = 1
+HEADER = struct.Struct("<4sHHQ")  # magic, version, record size, reserved
+
+EQUITY_DTYPE = np.dtype([
+    ("time", "<i8"),          # epoch seconds (bucket start for 1m/1h)
+    ("balance", "<f8"),
+    ("equity", "<f8"),
+    ("equity_low", "<f8"),
+    ("equity_high", "<f8"),
+    ("profit", "<f8"),        # open P&L
+])
+
+# (name, bucket seconds, file partition strftime format)
+TIERS = (("1s", 1, "%Y%m%d"), ("1m", 60, "%Y%m"), ("1h", 3600, "%Y"))
+TIER_SECONDS = {name: seconds for name, seconds, _ in TIERS}
+
+
+def _partition(tier, ts):
+    fmt = next(f for name, _, f in TIERS if name == tier)
+    return datetime.fromtimestamp(ts, timezone.utc).strftime(fmt)
+
+
+class EquityStore:
+    """The tier files under one directory (reader and writer)."""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+
+    def _files(self, tier):
+        return sorted(self.directory.glob(f"equity_{tier}_*.bin"))
+
+    def path_for(self, tier, ts):
+        return self.directory / f"equity_{tier}_{_partition(tier, ts)}.bin"
+
+    # ── Writing ──
+
+    def append(self, tier, rows):
+        """Append time-ordered EQUITY_DTYPE rows, split by file partition."""
+        if len(rows) == 0:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        keys = [_partition(tier, int(t)) for t in rows["time"]]
+        start = 0
+        for i in range(1, len(rows) + 1):
+            if i == len(rows) or keys[i] != keys[start]:
+                self._append_file(self.path_for(tier, int(rows["time"][start])), rows[start:i])
+                start = i
+
+    @staticmethod
+    def _append_file(path, rows):
+        fresh = not path.exists() or path.stat().st_size == 0
+        with open(path, "ab") as f:
+            if fresh:
+                f.write(HEADER.pack(MAGIC, VERSION, EQUITY_DTYPE.itemsize, 0))
+            else:
+                # Drop a torn tail record so appends stay aligned
+                torn = (path.stat().st_size - HEADER.size) % EQUITY_DTYPE.itemsize
+                if torn:
+                    f.truncate(path.stat().st_size - torn)
+            f.write(np.ascontiguousarray(rows, dtype=EQUITY_DTYPE).tobytes())
+
+    def prune(self, tier, keep_days, now=None):
+        """Delete ``tier`` files that end more than ``keep_days`` ago (0 = keep all)."""
+        if not keep_days:
+            return
+        cutoff = _partition(tier, (now or time.time()) - keep_days * 86400)
+        for path in self._files(tier):
+            if path.stem.rsplit("_", 1)[1] < cutoff:
+                path.unlink(missing_ok=True)
+
+    # ── Reading ──
+
+    @staticmethod
+    def _load(path):
+        size = path.stat().st_size - HEADER.size
+        count = max(size, 0) // EQUITY_DTYPE.itemsize
+        if count == 0:
+            return np.empty(0, EQUITY_DTYPE)
+        return np.memmap(path, dtype=EQUITY_DTYPE, mode="r", offset=HEADER.size, shape=(count,))
+
+    def read(self, tier, start=None, end=None):
+        """Rows of ``tier`` with ``start <= time <= end`` (a copy)."""
+        lo = _partition(tier, start) if start is not None else None
+        hi = _partition(tier, end) if end is not None else None
+        parts = []
+        for path in self._files(tier):
+            key = path.stem.rsplit("_", 1)[1]
+            if (lo is not None and key < lo) or (hi is not None and key > hi):
+                continue
+            rows = self._load(path)
+            first = np.searchsorted(rows["time"], start, side="left") if start is not None else 0
+            last = np.searchsorted(rows["time"], end, side="right") if end is not None else len(rows)
+            parts.append(np.array(rows[first:last]))
+        return np.concatenate(parts) if parts else np.empty(0, EQUITY_DTYPE)
+
+    def first_time(self, tier):
+        for path in self._files(tier):
+            rows = self._load(path)
+            if len(rows):
+                return int(rows["time"][0])
+        return None
+
+    def last_time(self, tier):
+        for path in reversed(self._files(tier)):
+            rows = self._load(path)
+            if len(rows):
+                return int(rows["time"][-1])
+        return None
+
+    def version(self):
+        """Changes whenever any tier file is appended to."""
+        latest = max(self.directory.glob("equity_*.bin"), key=lambda p: p.stat().st_mtime_ns, default=None)
+        if latest is None:
+            return None
+        st = latest.stat()
+        return (latest.name, st.st_mtime_ns, st.st_size)
+
+
+class _Bucket:
+    """Running minute/hour aggregate of finer rows."""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.row = None
+
+    def add(self, row):
+        """Fold a finer row in; returns the completed bucket row when a new one starts."""
+        start = int(row["time"]) // self.seconds * self.seconds
+        done = None
+        if self.row is not None and self.row["time"] != start:
+            done, self.row = self.row, None
+        if self.row is None:
+            self.row = row.copy()
+            self.row["time"] = start
+        else:
+            self.row["balance"], self.row["equity"], self.row["profit"] = row["balance"], row["equity"], row["profit"]
+            self.row["equity_low"] = min(self.row["equity_low"], row["equity_low"])
+            self.row["equity_high"] = max(self.row["equity_high"], row["equity_high"])
+        return done
+
+
+class EquitySampler:
+    """Background thread sampling the account into a ring and compacting it to disk."""
+
+    def __init__(self, directory, capacity=3600, poll_seconds=1.0, flush_seconds=10.0,
+                 retention_days=None, logger=None):
+        self.store = EquityStore(directory)
+        self.ring = np.zeros(capacity, EQUITY_DTYPE)
+        self.count = 0               # samples taken (ring index = count % capacity)
+        self.flushed = 0             # samples already written to the 1s tier
+        self.poll_seconds = poll_seconds
+        self.flush_seconds = flush_seconds
+        self.retention_days = retention_days or {}
+        self.logger = logger or logging.getLogger('SMC_Bot')
+        self._buckets = {"1m": _Bucket(60), "1h": _Bucket(3600)}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._resume()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="equity-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=5)
+        self._thread = None
+        self.compact()
+
+    def _resume(self):
+        """Rebuild the open minute and hour from the rows after the last ones written."""
+        now = int(time.time())
+        last_hour, last_minute = self.store.last_time("1h"), self.store.last_time("1m")
+        hours = []
+        for row in self.store.read("1m", last_hour + 3600 if last_hour is not None else now - 31 * 86400):
+            hour = self._buckets["1h"].add(row)
+            if hour is not None:
+                hours.append(hour)
+        seconds = self.store.read("1s", last_minute + 60 if last_minute is not None else now - 86400)
+        minutes, more_hours = self._fold(seconds)
+        try:
+            self.store.append("1m", minutes)
+            self.store.append("1h", np.array(hours + list(more_hours), EQUITY_DTYPE))
+        except OSError as e:
+            self.logger.error(f"Equity series write failed: {e}")
+
+    def _run(self):
+        last_flush = time.monotonic()
+        while not self._stop.wait(self.poll_seconds):
+            try:
+                self.sample()
+                if time.monotonic() - last_flush >= self.flush_seconds:
+                    self.compact()
+                    last_flush = time.monotonic()
+            except Exception as e:
+                self.logger.error(f"Equity sampler error: {e}")
+
+    def sample(self, info=None, ts=None):
+        """Record one account snapshot (``account_info()`` unless given)."""
+        if info is None:
+            import MetaTrader5 as mt5
+            info = mt5.account_info()
+            if info is None:
+                return
+        ts = int(ts if ts is not None else time.time())
+        with self._lock:
+            if self.count and self.ring[(self.count - 1) % len(self.ring)]["time"] >= ts:
+                return  # one sample per second
+            self.ring[self.count % len(self.ring)] = (ts, info.balance, info.equity, info.equity,
+                                                      info.equity, info.profit)
+            self.count += 1
+
+    def latest(self):
+        """The newest sample (an EQUITY_DTYPE record) or None."""
+        with self._lock:
+            return self.ring[(self.count - 1) % len(self.ring)].copy() if self.count else None
+
+    def recent(self, since=None):
+        """Ring samples (oldest first), optionally only those after ``since``."""
+        with self._lock:
+            n = min(self.count, len(self.ring))
+            idx = np.arange(self.count - n, self.count) % len(self.ring)
+            rows = self.ring[idx]
+        return rows[rows["time"] > since] if since is not None else rows
+
+    def _fold(self, rows):
+        """Fold 1s rows into the open buckets; returns completed (minutes, hours)."""
+        minutes, hours = [], []
+        for row in rows:
+            minute = self._buckets["1m"].add(row)
+            if minute is not None:
+                minutes.append(minute)
+                hour = self._buckets["1h"].add(minute)
+                if hour is not None:
+                    hours.append(hour)
+        return np.array(minutes, EQUITY_DTYPE), np.array(hours, EQUITY_DTYPE)
+
+    def compact(self):
+        """Write new samples to the 1s tier and completed minutes/hours to 1m/1h."""
+        with self._lock:
+            pending = min(self.count - self.flushed, len(self.ring))
+            idx = np.arange(self.count - pending, self.count) % len(self.ring)
+            rows = self.ring[idx]
+            self.flushed = self.count
+        if len(rows) == 0:
+            return
+        minutes, hours = self._fold(rows)
+        try:
+            self.store.append("1s", rows)
+            self.store.append("1m", minutes)
+            self.store.append("1h", hours)
+            if len(minutes):
+                for tier, keep in self.retention_days.items():
+                    self.store.prune(tier, keep)
+        except OSError as e:
+            self.logger.error(f"Equity series write failed: {e}")
+
+
+# ── Downsampling ──
+
+def lttb(x, y, points):
+    """Indices of ``points`` samples chosen by Largest-Triangle-Three-Buckets.
+
+    Keeps the first and last sample; from each of the ``points - 2`` equal
+    buckets in between it keeps the sample forming the largest triangle
+    with the previously kept one and the next bucket's mean.
+    """
+    n = len(x)
+    if points >= n or points < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    # Bucket b spans edges[b]:edges[b + 1] over samples 1..n-2; the last sample is its own bucket
+    edges = np.linspace(1, n - 1, points - 1).astype(np.int64)
+    edges = np.append(edges, n)
+    sizes = np.diff(edges)
+    avg_x = np.add.reduceat(x, edges[:-1]) / sizes
+    avg_y = np.add.reduceat(y, edges[:-1]) / sizes
+
+    keep = np.empty(points, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for b in range(points - 2):
+        lo, hi = edges[b], edges[b + 1]
+        xs, ys = x[lo:hi], y[lo:hi]
+        area = np.abs((x[a] - avg_x[b + 1]) * (ys - y[a]) - (x[a] - xs) * (avg_y[b + 1] - y[a]))
+        a = lo + int(area.argmax())
+        keep[b + 1] = a
+    return keep
+
+
+def series(store, start=None, end=None, points=500, max_rows=None, recent=None):
+    """Equity over ``[start, end]`` downsampled to at most ``points`` rows.
+
+    Reads the finest tier with at most ``max_rows`` rows (default 20 per
+    point, at least 10,000) over the range and
+    fills the part it no longer covers (pruned, or recorded before it
+    existed) from coarser tiers; ``recent`` (ring samples not yet on disk)
+    extends the end. Returns ``(tiers used, rows)``.
+    """
+    end = int(end if end is not None else time.time())
+    if start is None:
+        firsts = [t for t in (store.first_time(name) for name, _, _ in TIERS) if t is not None]
+        start = min(firsts) if firsts else end
+    start = int(start)
+    max_rows = max_rows or max(points * 20, 10_000)
+    usable = [name for name, seconds, _ in TIERS if (end - start) / seconds <= max_rows] or [TIERS[-1][0]]
+
+    parts, used, cut = [], [], end + 1
+    for name in usable:
+        # Coarser rows only where the finer tiers have nothing: buckets ending before ``cut``
+        rows = store.read(name, start, cut - TIER_SECONDS[name])
+        if len(rows):
+            parts.insert(0, rows)
+            used.insert(0, name)
+            cut = int(rows["time"][0])
+        if cut <= start:
+            break
+    rows = np.concatenate(parts) if parts else np.empty(0, EQUITY_DTYPE)
+    if recent is not None and len(recent):
+        newer = recent[(recent["time"] > (rows["time"][-1] if len(rows) else start - 1)) & (recent["time"] <= end)]
+        if len(newer):
+            rows = np.concatenate((rows, newer))
+            used = used if "1s" in used else used + ["1s"]
+    if len(rows) > points:
+        rows = rows[lttb(rows["time"], rows["equity"], points)]
+    return used, rows
@@ -0,0 +1,279 @@
+# journal.py
+"""Append-only binary journal of per-iteration decisions and trade events.
+
+Each file starts with a 16-byte header (magic, version, record size) followed
+by fixed-size little-endian records, so readers can memory-map the file and
+scan millions of records with NumPy without parsing. A torn record at the
+tail (crash mid-write) is ignored by the reader.
+"""
+import os
+import struct
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+
+MAGIC = b"SMCJ"
+VERSION = 1
+HEADER = struct.Struct("<4sHHQ")  # magic, version, record size, reserved
+
+# Decision kinds
+KIND_SCALP = 0
+KIND_SWING = 1
+
+# Why a symbol did or didn't trade this iteration
+REASONS = (
+    "none",            # 0 - not evaluated
+    "out_of_session",  # 1
+    "spread",          # 2
+    "daily_limit",     # 3
+    "cooldown",        # 4
+    "choch",           # 5
+    "no_bos",          # 6
+    "no_setup",        # 7
+    "signal",          # 8
+)
+REASON_CODES = {name: code for code, name in enumerate(REASONS)}
+
+# What happened to the chosen signal
+OUTCOMES = ("none", "executed", "order_failed", "blocked")
+OUTCOME_CODES = {name: code for code, name in enumerate(OUTCOMES)}
+
+# Trade event types
+EVENTS = ("order_sent", "fill", "reject", "breakeven", "tp1", "tp2", "closed")
+EVENT_CODES = {name: code for code, name in enumerate(EVENTS)}
+
+TREND_CODES = {"bearish": -1, "ranging": 0, "bullish": 1}
+DIRECTION_CODES = {"sell": -1, None: 0, "buy": 1}
+
+DECISION_DTYPE = np.dtype([
+    ("time", "<f8"),
+    ("symbol", "S16"),
+    ("bid", "<f8"),
+    ("ask", "<f8"),
+    ("spread", "<f4"),
+    ("kind", "i1"),
+    ("trend", "i1"),         # higher-timeframe trend (-1/0/1)
+    ("trend_score", "i1"),
+    ("trend_entry", "i1"),   # entry-timeframe trend (-1/0/1)
+    ("bos", "i1"),           # -1 bearish, 0 none, 1 bullish
+    ("choch", "i1"),
+    ("ob_count", "u1"),
+    ("fvg_count", "u1"),
+    ("signal", "i1"),        # -1 sell, 0 none, 1 buy
+    ("reason", "u1"),
+    ("outcome", "u1"),
+    ("_pad", "u1"),
+    ("signal_price", "<f8"),
+    ("signal_sl", "<f8"),
+    ("confidence", "<f4"),
+    ("_pad2", "<u4"),
+])
+
+EVENT_DTYPE = np.dtype([
+    ("time", "<f8"),
+    ("symbol", "S16"),
+    ("ticket", "<u8"),
+    ("event", "u1"),
+    ("direction", "i1"),
+    ("kind", "i1"),
+    ("_pad", "u1"),
+    ("retcode", "<i4"),
+    ("price", "<f8"),
+    ("volume", "<f8"),
+    ("sl", "<f8"),
+    ("tp", "<f8"),
+    ("pnl", "<f8"),
+])
+
+
+def _direction(bias):
+    """Map a detector result ({'type': 'bullish'|'bearish'} or None) to -1/0/1."""
+    if not bias:
+        return 0
+    return 1 if bias["type"] == "bullish" else -1
+
+
+_STRUCT_CODES = {"f8": "d", "f4": "f", "i1": "b", "u1": "B", "i4": "i", "u4": "I", "u8": "Q"}
+
+
+def _struct_for(dtype):
+    """struct.Struct packing one record of a (packed, little-endian) dtype."""
+    codes = []
+    for name in dtype.names:
+        field = dtype.fields[name][0]
+        if field.kind == "S":
+            codes.append(f"{field.itemsize}s")
+        else:
+            codes.append(_STRUCT_CODES[f"{field.kind}{field.itemsize}"])
+    packer = struct.Struct("<" + "".join(codes))
+    assert packer.size == dtype.itemsize
+    return packer
+
+
+class _JournalFile:
+    """Daily-rotated append-only file of fixed-size records."""
+
+    def __init__(self, directory, prefix, dtype):
+        self.directory = Path(directory)
+        self.prefix = prefix
+        self.dtype = dtype
+        self._day = None
+        self._day_end = 0.0
+        self._fh = None
+        self._packer = _struct_for(dtype)
+
+    def path_for(self, day):
+        return self.directory / f"{self.prefix}_{day}.bin"
+
+    def _open(self, day):
+        if self._fh is not None:
+            self._fh.close()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.path_for(day)
+        fresh = not path.exists() or path.stat().st_size == 0
+        self._fh = open(path, "ab")
+        if fresh:
+            self._fh.write(HEADER.pack(MAGIC, VERSION, self.dtype.itemsize, 0))
+        else:
+            # Drop a torn tail record so appends stay aligned
+            size = path.stat().st_size - HEADER.size
+            torn = size % self.dtype.itemsize
+            if torn:
+                self._fh.truncate(path.stat().st_size - torn)
+        self._day = day
+
+    def write(self, ts, *values):
+        """Append one record; ``values`` follow the dtype field order after time."""
+        if ts >= self._day_end:
+            # Rotate on the first record of each UTC day
+            self._open(datetime.fromtimestamp(ts, timezone.utc).strftime("%Y%m%d"))
+            self._day_end = (ts // 86400 + 1) * 86400
+        self._fh.write(self._packer.pack(ts, *values))
+
+    def flush(self):
+        if self._fh is not None:
+            self._fh.flush()
+
+    def close(self):
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+            self._day = None
+            self._day_end = 0.0
+
+
+class DecisionJournal:
+    """Writer for decision records and trade events."""
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.decisions = _JournalFile(directory, "decisions", DECISION_DTYPE)
+        self.events = _JournalFile(directory, "events", EVENT_DTYPE)
+
+    def record_decision(self, data, kind=KIND_SCALP, reason="none", outcome="none", signal=None):
+        """Append one decision record for a symbol.
+
+        ``data`` is the market-data dict for the symbol; ``data['analysis']``
+        (filled in by the signal generators) supplies the detector fields.
+        """
+        analysis = data.get("analysis") or {}
+        trend = analysis.get("trend") or {}
+        trend_entry = analysis.get("trend_entry") or {}
+        self.decisions.write(
+            time.time(),
+            data["symbol"].encode(),
+            data["bid"],
+            data["ask"],
+            data["spread"],
+            kind,
+            TREND_CODES.get(trend.get("trend"), 0),
+            trend.get("score", 0),
+            TREND_CODES.get(trend_entry.get("trend"), 0),
+            _direction(analysis.get("bos")),
+            _direction(analysis.get("choch")),
+            min(analysis.get("ob_count", 0), 255),
+            min(analysis.get("fvg_count", 0), 255),
+            DIRECTION_CODES[signal["direction"]] if signal else 0,
+            REASON_CODES[reason],
+            OUTCOME_CODES[outcome],
+            0,
+            signal["price"] if signal else 0.0,
+            signal["sl"] if signal else 0.0,
+            signal.get("confidence", 0.0) if signal else 0.0,
+            0,
+        )
+
+    def record_event(self, event, symbol, ticket=0, direction=None, kind=KIND_SCALP,
+                     price=0.0, volume=0.0, sl=0.0, tp=0.0, pnl=0.0, retcode=0):
+        """Append one order/fill/position event."""
+        self.events.write(
+            time.time(),
+            symbol.encode(),
+            ticket or 0,
+            EVENT_CODES[event],
+            DIRECTION_CODES.get(direction, 0),
+            kind,
+            0,
+            retcode if isinstance(retcode, int) else -1,
+            price or 0.0,
+            volume or 0.0,
+            sl or 0.0,
+            tp or 0.0,
+            pnl or 0.0,
+        )
+
+    def flush(self):
+        self.decisions.flush()
+        self.events.flush()
+
+    def close(self):
+        self.decisions.close()
+        self.events.close()
+
+
+class JournalReader:
+    """Memory-mapped, zero-copy view over one journal file."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            magic, version, itemsize, _ = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not a journal file")
+        if self.path.name.startswith("events"):
+            self.dtype = EVENT_DTYPE
+        else:
+            self.dtype = DECISION_DTYPE
+        if itemsize != self.dtype.itemsize or version != VERSION:
+            raise ValueError(f"{self.path}: unsupported journal layout (v{version}, {itemsize} bytes)")
+
+        count = (os.path.getsize(self.path) - HEADER.size) // itemsize
+        if count:
+            self.records = np.memmap(self.path, dtype=self.dtype, mode="r",
+                                     offset=HEADER.size, shape=(count,))
+        else:
+            self.records = np.zeros(0, dtype=self.dtype)
+
+    def __len__(self):
+        return len(self.records)
+
+    def between(self, start_ts, end_ts):
+        """Records with start_ts <= time < end_ts (time is append-ordered)."""
+        t = self.records["time"]
+        lo, hi = np.searchsorted(t, [start_ts, end_ts])
+        return self.records[lo:hi]
+
+    def for_symbol(self, symbol):
+        return self.records[self.records["symbol"] == symbol.encode()]
+
+    def reason_counts(self, records=None):
+        """{symbol: {reason: count}} for decision records."""
+        records = self.records if records is None else records
+        out = {}
+        for sym in np.unique(records["symbol"]):
+            counts = np.bincount(records["reason"][records["symbol"] == sym], minlength=len(REASONS))
+            out[sym.decode()] = {REASONS[i]: int(c) for i, c in enumerate(counts) if c}
+        return out
@@ -0,0 +1,278 @@
+# tick_recorder.py
+"""Tick capture to per-symbol, per-day columnar files and replay.
+
+Ticks are appended as fixed-size little-endian records to
+``<dir>/<symbol>/<YYYYMMDD>.ticks`` so a day can be opened with
+``np.memmap`` and sliced by time with a binary search. ``index.json`` in each
+symbol directory records the first/last tick time and count per day, so a
+time-range lookup only touches the days it needs. The index is rewritten
+(atomically) at day rollover, on close and every ``index_seconds``; on load it
+is reconciled with the day files themselves, which are the source of truth
+after a crash (a torn trailing record is truncated before appending).
+"""
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import MetaTrader5 as mt5
+
+
+TICK_DTYPE = np.dtype([
+    ("time_msc", "<i8"),
+    ("bid", "<f8"),
+    ("ask", "<f8"),
+    ("volume", "<u8"),
+    ("flags", "<u4"),
+    ("_pad", "<u4"),
+])
+
+MS_PER_DAY = 86_400_000
+
+
+def _day_of(time_msc):
+    return datetime.fromtimestamp(time_msc / 1000, timezone.utc).strftime("%Y%m%d")
+
+
+class TickStore:
+    """On-disk tick files for one directory tree (reader and writer)."""
+
+    def __init__(self, directory, index_seconds=30.0):
+        self.directory = Path(directory)
+        self.index_seconds = index_seconds
+        self._files = {}     # {symbol: (day, file handle)}
+        self._index = {}     # {symbol: {day: {"first": ms, "last": ms, "count": n}}}
+        self._index_saved = time.monotonic()
+
+    def _symbol_dir(self, symbol):
+        return self.directory / symbol
+
+    def load_index(self, symbol):
+        if symbol not in self._index:
+            path = self._symbol_dir(symbol) / "index.json"
+            try:
+                with open(path, "r") as f:
+                    index = json.load(f)
+            except (OSError, ValueError):
+                index = {}
+            self._index[symbol] = self._reconcile(symbol, index)
+        return self._index[symbol]
+
+    def _reconcile(self, symbol, index):
+        """Count, first and last of every day from its file (the index may lag after a crash)."""
+        days = {path.stem for path in self._symbol_dir(symbol).glob("*.ticks")}
+        reconciled = {}
+        for day in sorted(days | set(index)):
+            path = self._symbol_dir(symbol) / f"{day}.ticks"
+            count = path.stat().st_size // TICK_DTYPE.itemsize if day in days else 0
+            if day in index and index[day]["count"] == count:
+                reconciled[day] = index[day]
+                continue
+            ticks = self.read_day(symbol, day)
+            if len(ticks):
+                reconciled[day] = {"first": int(ticks["time_msc"][0]), "last": int(ticks["time_msc"][-1]),
+                                   "count": len(ticks)}
+        return reconciled
+
+    def save_index(self, symbol):
+        path = self._symbol_dir(symbol) / "index.json"
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump(self._index.get(symbol, {}), f)
+        os.replace(tmp, path)
+
+    def last_time_msc(self, symbol):
+        index = self.load_index(symbol)
+        return max((d["last"] for d in index.values()), default=0)
+
+    def count_at(self, symbol, time_msc):
+        """Number of stored ticks stamped exactly ``time_msc``."""
+        ticks = self.read_day(symbol, _day_of(time_msc))
+        lo, hi = np.searchsorted(ticks["time_msc"], [time_msc, time_msc + 1])
+        return int(hi - lo)
+
+    # ── Writing ──
+
+    def append(self, symbol, ticks):
+        """Append a time-ordered TICK_DTYPE array, splitting at day boundaries."""
+        if len(ticks) == 0:
+            return
+        index = self.load_index(symbol)
+        days = ticks["time_msc"] // MS_PER_DAY
+        splits = np.flatnonzero(np.diff(days)) + 1
+        for chunk in np.split(ticks, splits):
+            day = _day_of(int(chunk["time_msc"][0]))
+            fh = self._handle(symbol, day)
+            fh.write(chunk.tobytes())
+            entry = index.setdefault(day, {"first": int(chunk["time_msc"][0]), "last": 0, "count": 0})
+            entry["last"] = int(chunk["time_msc"][-1])
+            entry["count"] += len(chunk)
+
+    def _handle(self, symbol, day):
+        current = self._files.get(symbol)
+        if current and current[0] == day:
+            return current[1]
+        if current:
+            current[1].close()
+            self.save_index(symbol)   # day rollover
+        path = self._symbol_dir(symbol) / f"{day}.ticks"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists() and path.stat().st_size % TICK_DTYPE.itemsize:
+            # A record torn by a crash: drop it so appends stay aligned
+            os.truncate(path, path.stat().st_size - path.stat().st_size % TICK_DTYPE.itemsize)
+        fh = open(path, "ab")
+        self._files[symbol] = (day, fh)
+        return fh
+
+    def flush(self, save_index=False):
+        """Flush the day files; the index too every ``index_seconds`` (or if ``save_index``)."""
+        save_index = save_index or time.monotonic() - self._index_saved >= self.index_seconds
+        if save_index:
+            self._index_saved = time.monotonic()
+        for symbol, (_, fh) in self._files.items():
+            fh.flush()
+            if save_index:
+                self.save_index(symbol)
+
+    def close(self):
+        self.flush(save_index=True)
+        for _, fh in self._files.values():
+            fh.close()
+        self._files.clear()
+
+    # ── Reading ──
+
+    def read_day(self, symbol, day):
+        """Memory-map one day of ticks (empty array if none)."""
+        path = self._symbol_dir(symbol) / f"{day}.ticks"
+        if not path.exists():
+            return np.zeros(0, dtype=TICK_DTYPE)
+        count = path.stat().st_size // TICK_DTYPE.itemsize
+        if count == 0:
+            return np.zeros(0, dtype=TICK_DTYPE)
+        return np.memmap(path, dtype=TICK_DTYPE, mode="r", shape=(count,))
+
+    def read_range(self, symbol, start_msc, end_msc):
+        """Yield zero-copy slices of ticks with start_msc <= time_msc < end_msc, day by day."""
+        index = self.load_index(symbol)
+        for day in sorted(index):
+            entry = index[day]
+            if entry["last"] < start_msc or entry["first"] >= end_msc:
+                continue
+            ticks = self.read_day(symbol, day)
+            lo, hi = np.searchsorted(ticks["time_msc"], [start_msc, end_msc])
+            if hi > lo:
+                yield ticks[lo:hi]
+
+    def replay(self, symbol, start_msc, end_msc, speed=1.0):
+        """Stream ticks back in order, paced at ``speed`` x real time.
+
+        ``speed=None`` (or 0) replays as fast as possible.
+        """
+        wall_start = None
+        first_msc = None
+        for chunk in self.read_range(symbol, start_msc, end_msc):
+            for tick in chunk:
+                if speed:
+                    t = int(tick["time_msc"])
+                    if wall_start is None:
+                        wall_start, first_msc = time.monotonic(), t
+                    delay = (t - first_msc) / 1000 / speed - (time.monotonic() - wall_start)
+                    if delay > 0:
+                        time.sleep(delay)
+                yield tick
+
+
+class TickRecorder:
+    """Background thread capturing every tick for the configured symbols.
+
+    Uses ``copy_ticks_from`` from the last stored tick, so ticks that arrive
+    between loop iterations are captured too, without adding any work to the
+    trading loop itself. Several ticks can share a millisecond, and more of
+    them can arrive after a poll: each poll re-reads the last stored
+    millisecond and skips only as many ticks there as are already stored.
+    """
+
+    def __init__(self, directory, symbols, poll_seconds=1.0, logger=None, index_seconds=30.0):
+        self.store = TickStore(directory, index_seconds)
+        self.symbols = list(symbols)
+        self.poll_seconds = poll_seconds
+        self.logger = logger or logging.getLogger('SMC_Bot')
+        self._last_msc = {}
+        self._last_count = {}   # ticks stored at _last_msc
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _resume(self, symbol):
+        # Resume from disk; on first run start from "now"
+        last = self.store.last_time_msc(symbol)
+        self._last_msc[symbol] = last or int(time.time() * 1000)
+        self._last_count[symbol] = self.store.count_at(symbol, last) if last else 0
+
+    def set_symbols(self, symbols):
+        """Record ``symbols`` from the next poll on (e.g. the watchlist after a promotion)."""
+        self.symbols = list(symbols)
+
+    def start(self):
+        if self._thread is not None:
+            return
+        for symbol in self.symbols:
+            self._resume(symbol)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="tick-recorder", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout=5)
+        self._thread = None
+        self.store.close()
+
+    def poll_once(self):
+        """Fetch and store new ticks for every symbol; returns ticks written."""
+        written = 0
+        for symbol in self.symbols:
+            if symbol not in self._last_msc:
+                self._resume(symbol)
+            last = self._last_msc[symbol]
+            raw = mt5.copy_ticks_from(symbol, last // 1000, 100_000, mt5.COPY_TICKS_ALL)
+            if raw is None or len(raw) == 0:
+                continue
+            # From the last stored millisecond on, minus the ticks already stored there
+            first = int(np.searchsorted(raw["time_msc"], last))
+            at_last = int(np.searchsorted(raw["time_msc"], last + 1)) - first
+            raw = raw[first + min(at_last, self._last_count.get(symbol, 0)):]
+            if len(raw) == 0:
+                continue
+
+            ticks = np.zeros(len(raw), dtype=TICK_DTYPE)
+            ticks["time_msc"] = raw["time_msc"]
+            ticks["bid"] = raw["bid"]
+            ticks["ask"] = raw["ask"]
+            ticks["volume"] = raw["volume"]
+            ticks["flags"] = raw["flags"]
+            self.store.append(symbol, ticks)
+            newest = int(ticks["time_msc"][-1])
+            at_newest = len(ticks) - int(np.searchsorted(ticks["time_msc"], newest))
+            if newest == last:
+                at_newest += self._last_count.get(symbol, 0)
+            self._last_msc[symbol] = newest
+            self._last_count[symbol] = at_newest
+            written += len(ticks)
+        if written:
+            self.store.flush()
+        return written
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.poll_once()
+            except Exception as e:
+                self.logger.error("Tick recorder error: %s", e)
+            self._stop.wait(self.poll_seconds)
@@ -0,0 +1,57 @@
+# gateway.py
+"""Worker-side client of the supervisor's execution gateway.
+
+Workers never call ``order_send`` themselves: every signal is sent to the
+supervisor, which runs ``execute_signal`` one request at a time. Global
+limits (daily trade count, open exposure, balance) are therefore checked and
+updated atomically, no matter how many workers produce signals at once.
+"""
+import itertools
+import queue
+import time
+
+
+def blocked_reply(error):
+    return {"success": False, "outcome": "blocked", "error": error,
+            "daily_trades": None, "swing_trades": None}
+
+
+class GatewayClient:
+    """Request/reply over a shared request queue and a per-shard reply queue."""
+
+    def __init__(self, shard_id, requests, replies, timeout=15):
+        self.shard_id = shard_id
+        self.requests = requests
+        self.replies = replies
+        self.timeout = timeout
+        self._ids = itertools.count(1)
+        self.sent = 0
+
+    def execute(self, signal):
+        """Send a signal and wait for the gateway's verdict.
+
+        Returns ``{"success", "outcome", "daily_trades", "swing_trades"}``;
+        the counters are the gateway's authoritative per-symbol counts. A
+        timed-out request is reported as blocked with ``timed_out``: the gateway
+        drops requests that are already past their deadline when it reaches
+        them, but one it was executing may still have filled, so the caller
+        treats it like a sent order (cooldown) and the next reply carries the
+        corrected counts.
+        """
+        req_id = next(self._ids)
+        sent = time.time()
+        self.requests.put((self.shard_id, req_id, sent + self.timeout, signal))
+        self.sent += 1
+
+        deadline = time.monotonic() + self.timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return {**blocked_reply("gateway timeout"), "timed_out": True}
+            try:
+                reply_id, reply = self.replies.get(timeout=remaining)
+            except queue.Empty:
+                continue
+            if reply_id == req_id:
+                return reply
+            # A late reply to a request that already timed out; drop it
@@ -0,0 +1,77 @@
+# shard_bot.py
+import os
+import time
+from datetime import datetime
+from multiprocessing import parent_process
+
+from main import EURUSD_SMC_Bot
+from recording.analysis import AnalysisLog
+
+
+class ShardWorkerBot(EURUSD_SMC_Bot):
+    """Analysis loop for one shard of symbols.
+
+    Signals go to the supervisor's gateway instead of the terminal, and
+    position management stays with the supervisor (which owns the positions).
+    After every iteration a heartbeat with the loop latency and the new
+    analysis records is published.
+    """
+
+    def __init__(self, shard_id, symbols, gateway, health_queue, stop_event):
+        self.shard_id = shard_id
+        super().__init__(symbols)
+        self.checkpoint = None  # the supervisor owns positions and counters
+        self.equity = None      # ... and samples the account
+        self.fanout = None      # ... and sends orders to the follower accounts
+        # Analysis records ride on the heartbeat to the supervisor's ring
+        self.analysis = AnalysisLog(self.config.ANALYSIS_HISTORY, self.config.ANALYSIS_MAX_ZONES, forward=True)
+        self.gateway = gateway
+        self.health_queue = health_queue
+        self.stop_event = stop_event
+        self.rejected = 0
+
+    def journal_dir(self):
+        # One decision journal per shard: records are never interleaved across processes
+        return os.path.join(self.config.JOURNAL_DIR, f"shard{self.shard_id}")
+
+    def submit_signal(self, signal):
+        sym = signal['symbol']
+        reply = self.gateway.execute(signal)
+        signal['outcome'] = reply['outcome']
+
+        # Adopt the gateway's counts so per-symbol limits and cooldowns match
+        sym_state = self.symbol_state[sym]
+        if reply.get('daily_trades') is not None:
+            sym_state['daily_trades'] = reply['daily_trades']
+            sym_state['swing_trades'] = reply['swing_trades']
+        # A timed-out request may still have been executed: start the cooldown as if it had
+        if reply['success'] or reply.get('timed_out'):
+            if signal.get('trade_type') == 'SWING':
+                sym_state['last_swing_signal_time'] = datetime.now()
+            else:
+                sym_state['last_signal_time'] = datetime.now()
+            self.last_signal_time = datetime.now()
+        if not reply['success']:
+            self.rejected += 1
+            self.logger.info("[%s] Gateway did not execute signal: %s", sym,
+                             reply.get('error') or reply['outcome'])
+        return reply['success']
+
+    def manage_positions(self):
+        """Positions are managed by the supervisor."""
+
+    def on_iteration(self, all_data):
+        self.health_queue.put({
+            "shard": self.shard_id,
+            "pid": os.getpid(),
+            "time": time.time(),
+            "iteration": self.iterations,
+            "loop_ms": round(self.loop_latency_ms, 1),
+            "symbols_ok": len(all_data),
+            "signals_sent": self.gateway.sent,
+            "signals_rejected": self.rejected,
+            "analysis": self.analysis.drain(),
+        })
+        parent = parent_process()
+        if self.stop_event.is_set() or (parent is not None and not parent.is_alive()):
+            self.stop()
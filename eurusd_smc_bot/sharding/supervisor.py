@@ -0,0 +1,254 @@
+# supervisor.py
+"""Run the analysis loop for many symbols across worker processes.
+
+    ShardSupervisor (this process)           workers (one per shard)
+    ------------------------------           -----------------------
+    execution gateway: execute_signal  <---  ShardWorkerBot.submit_signal
+    global + per-symbol limits               analysis loop for its symbols
+    manage_positions, trade history          heartbeat after each iteration
+    shard health / restarts            <---
+
+The supervisor is itself an ``EURUSD_SMC_Bot`` over all symbols, so the
+dashboard reads the same attributes (positions, counters, symbol_state) it
+reads from a single-process bot, plus ``shard_status()``.
+"""
+import multiprocessing as mp
+import queue
+import time
+from collections import deque
+from datetime import date, datetime
+
+import MetaTrader5 as mt5
+
+from main import EURUSD_SMC_Bot
+from sharding.gateway import blocked_reply
+from sharding.worker import run_worker
+
+
+def partition_symbols(symbols, shards):
+    """Round-robin symbols over ``shards`` non-empty groups."""
+    shards = max(1, min(shards, len(symbols)))
+    return [list(symbols[i::shards]) for i in range(shards)]
+
+
+class ShardSupervisor(EURUSD_SMC_Bot):
+    """Owns the MT5 session used for orders and supervises the shard workers."""
+
+    def __init__(self, workers=None, options=None):
+        super().__init__()
+        self.global_limits = True
+        self.options = options or {}
+        self.shards = partition_symbols(self.symbols, workers or self.config.SHARD_WORKERS or 1)
+        self.shard_health = {}
+        self._ctx = mp.get_context("spawn")
+        self._procs = {}
+        self._channels = None
+
+    # ── Workers ──
+
+    def _start_shard(self, shard_id):
+        symbols = self.shards[shard_id]
+        options = dict(self.options)
+        if mt5.__name__ == "sim.fake_mt5":
+            # Workers talk to the same synthetic market as the supervisor
+            options.setdefault("fake_mt5", {"seed": mt5.current_seed()})
+        options["config"] = {
+            **self.options.get("config", {}),
+            "SYMBOLS": {s: self.config.SYMBOLS[s] for s in symbols},
+        }
+        channels = {
+            "requests": self._channels["requests"],
+            "health": self._channels["health"],
+            "stop": self._channels["stop"],
+            "reply": self._channels["replies"][shard_id],
+        }
+        proc = self._ctx.Process(target=run_worker, args=(shard_id, symbols, channels, options),
+                                 name=f"smc-shard-{shard_id}", daemon=True)
+        proc.start()
+        self._procs[shard_id] = proc
+
+        health = self.shard_health.setdefault(shard_id, {
+            "restarts": -1, "orders": 0, "executed": 0, "latencies": deque(maxlen=200),
+        })
+        health.update(pid=proc.pid, started=time.time(), last_heartbeat=None, iteration=0)
+        health["restarts"] += 1
+        self.logger.info(f"Shard {shard_id} started (pid {proc.pid}, {len(symbols)} symbols)")
+
+    def _check_shards(self):
+        """Restart shards that died or stopped sending heartbeats."""
+        now = time.time()
+        for shard_id, proc in self._procs.items():
+            health = self.shard_health[shard_id]
+            seen = health["last_heartbeat"] or health["started"]
+            stale = now - seen > self.config.SHARD_HEARTBEAT_TIMEOUT
+            if proc.is_alive() and not stale:
+                continue
+            self.logger.error(f"Shard {shard_id} {'unresponsive' if proc.is_alive() else 'exited'} - restarting")
+            if proc.is_alive():
+                proc.terminate()
+                proc.join(5)
+            self._start_shard(shard_id)
+
+    def _stop_shards(self):
+        if self._channels is None:
+            return
+        self._channels["stop"].set()
+        deadline = time.monotonic() + self.config.LOOP_INTERVAL_SECONDS + 10
+        for proc in self._procs.values():
+            proc.join(max(0.1, deadline - time.monotonic()))
+            if proc.is_alive():
+                proc.terminate()
+                proc.join(5)
+        self._procs.clear()
+        # Release the queues' pipes, feeder threads and semaphores
+        channels, self._channels = self._channels, None
+        for q in [channels["requests"], channels["health"]] + channels["replies"]:
+            q.close()
+            q.join_thread()
+
+    def _drain_health(self):
+        while True:
+            try:
+                beat = self._channels["health"].get_nowait()
+            except queue.Empty:
+                return
+            health = self.shard_health.get(beat["shard"])
+            if health is None or beat["pid"] != health["pid"]:
+                continue  # heartbeat from a replaced worker
+            health["last_heartbeat"] = beat["time"]
+            health["latencies"].append(beat["loop_ms"])
+            health.update((k, beat[k]) for k in ("iteration", "symbols_ok", "signals_sent", "signals_rejected"))
+            for record in beat.get("analysis", ()):
+                self.analysis.add(record)
+
+    # ── Gateway ──
+
+    def _serve_orders(self, timeout, limit):
+        """Execute up to ``limit`` queued signals one at a time; returns the number handled.
+
+        A request whose worker has stopped waiting (past its deadline) is
+        answered ``expired`` without being executed: the worker may already
+        have moved on, and executing it late could duplicate a later order.
+        """
+        handled = 0
+        block = True
+        while handled < limit:
+            try:
+                shard_id, req_id, deadline, signal = self._channels["requests"].get(block, timeout)
+            except queue.Empty:
+                return handled
+            block = False
+
+            if time.time() >= deadline:
+                self.logger.warning(f"[{signal.get('symbol')}] Gateway dropped an expired order request "
+                                    f"from shard {shard_id}")
+                self._channels["replies"][shard_id].put((req_id, blocked_reply("expired")))
+                handled += 1
+                continue
+
+            try:
+                success = self.execute_signal(signal)
+                sym_state = self.symbol_state.get(signal['symbol'], {})
+                reply = {
+                    "success": success,
+                    "outcome": signal.get('outcome', 'blocked'),
+                    "daily_trades": sym_state.get('daily_trades', 0),
+                    "swing_trades": sym_state.get('swing_trades', 0),
+                }
+            except Exception as e:
+                self.logger.error(f"[{signal.get('symbol')}] Gateway error: {e}")
+                reply = blocked_reply(str(e))
+
+            health = self.shard_health.get(shard_id)
+            if health is not None:
+                health["orders"] += 1
+                health["executed"] += bool(reply["success"])
+            self._channels["replies"][shard_id].put((req_id, reply))
+            handled += 1
+        return handled
+
+    def shard_status(self):
+        """JSON-friendly per-shard health for the dashboard."""
+        now = time.time()
+        out = []
+        for shard_id, symbols in enumerate(self.shards):
+            health = self.shard_health.get(shard_id, {})
+            proc = self._procs.get(shard_id)
+            latencies = sorted(health.get("latencies", ()))
+            last = health.get("last_heartbeat")
+            out.append({
+                "shard": shard_id,
+                "pid": health.get("pid"),
+                "alive": bool(proc and proc.is_alive()),
+                "symbols": symbols,
+                "iterations": health.get("iteration", 0),
+                "loop_ms": health["latencies"][-1] if latencies else None,
+                "loop_ms_p50": latencies[len(latencies) // 2] if latencies else None,
+                "loop_ms_max": latencies[-1] if latencies else None,
+                "heartbeat_age": round(now - last, 1) if last else None,
+                "restarts": max(health.get("restarts", 0), 0),
+                "orders": health.get("orders", 0),
+                "executed": health.get("executed", 0),
+            })
+        return out
+
+    # ── Main loop ──
+
+    def run(self):
+        """Start the shards, then serve orders and manage positions until stopped."""
+        self._running = True
+        self._wake.clear()
+        try:
+            if not self.connect():
+                self.logger.error("Failed to connect. Exiting...")
+                return
+
+            self.restore_state()
+            self.trading_day = date.today()
+            self._channels = {
+                "requests": self._ctx.Queue(),
+                "health": self._ctx.Queue(),
+                "stop": self._ctx.Event(),
+                "replies": [self._ctx.Queue() for _ in self.shards],
+            }
+            if self.equity is not None:
+                self.equity.start()
+            if self.fanout is not None:
+                self.fanout.start()
+            self.logger.info(f"\nSTARTING SMC BOT - {len(self.symbols)} symbols over {len(self.shards)} shards")
+            self.logger.info("=" * 60)
+
+            last_manage = 0.0
+            for shard_id in range(len(self.shards)):
+                self._start_shard(shard_id)
+
+            while self._running:
+                now = datetime.now()
+                if now.date() != self.trading_day:
+                    self.trading_day = now.date()
+                    self.reset_daily_counters()
+
+                # Capped, so a steady stream of orders can't hold off position management
+                self._serve_orders(timeout=0.2, limit=self.config.SHARD_ORDERS_PER_PASS)
+                self._drain_health()
+
+                if time.monotonic() - last_manage >= self.config.LOOP_INTERVAL_SECONDS:
+                    loop_start = time.perf_counter()
+                    self.manage_positions()
+                    if self.journal is not None:
+                        self.journal.flush()
+                    self.save_checkpoint()
+                    self._check_shards()
+                    self.iterations += 1
+                    self.loop_latency_ms = (time.perf_counter() - loop_start) * 1000
+                    self.loop_history.append((self.iterations, self.loop_latency_ms))
+                    last_manage = time.monotonic()
+
+        except KeyboardInterrupt:
+            self.logger.info("\nBot stopped by user")
+        except Exception as e:
+            self.logger.error(f"Supervisor error: {str(e)}")
+        finally:
+            self._running = False
+            self._stop_shards()
+            self.release()
@@ -0,0 +1,40 @@
+# worker.py
+"""Entry point of a shard worker process.
+
+Kept free of trading imports at module level: the worker may need to
+install the fake MT5 stand-in before ``main`` imports ``MetaTrader5``.
+"""
+import importlib
+import os
+
+
+def load_class(path):
+    """Resolve ``"package.module:ClassName"``."""
+    module_name, _, attr = path.partition(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def run_worker(shard_id, symbols, channels, options):
+    """Run the analysis loop for ``symbols`` until the supervisor stops us.
+
+    ``channels`` holds the shared request/health queues, this shard's reply
+    queue and the stop event. ``options`` may contain ``config`` (Config
+    attribute overrides, including the SYMBOLS subset), ``fake_mt5`` (kwargs
+    for ``sim.fake_mt5.install``) and ``bot_class``.
+    """
+    if options.get("fake_mt5") is not None:
+        from sim import fake_mt5
+        fake_mt5.install(**options["fake_mt5"])
+
+    from config import Config
+    for name, value in options.get("config", {}).items():
+        setattr(Config, name, value)
+
+    from sharding.gateway import GatewayClient
+
+    os.makedirs("logs", exist_ok=True)
+    bot_class = load_class(options.get("bot_class", "sharding.shard_bot:ShardWorkerBot"))
+    gateway = GatewayClient(shard_id, channels["requests"], channels["reply"],
+                            timeout=Config.SHARD_ORDER_TIMEOUT)
+    bot = bot_class(shard_id, symbols, gateway, channels["health"], channels["stop"])
+    bot.run()
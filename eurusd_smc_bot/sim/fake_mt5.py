@@ -0,0 +1,472 @@
+# fake_mt5.py
+"""In-process stand-in for the ``MetaTrader5`` package.
+
+Implements the part of the MT5 Python API the bot uses (market data, ticks,
+account/positions/deals and order_send) on top of a deterministic synthetic
+market, so the bot, the dashboard and the harnesses in this package can run
+on Linux/CI without a terminal. Prices are a pure function of
+(seed, symbol, time): separate processes that install the fake with the same
+seed see the same market.
+
+    from sim import fake_mt5
+    fake_mt5.install()          # before anything imports MetaTrader5
+"""
+import sys
+import threading
+import time
+import zlib
+from collections import namedtuple
+
+import numpy as np
+
+
+# ── Constants (values match the real package) ──
+TIMEFRAME_M1 = 1
+TIMEFRAME_M5 = 5
+TIMEFRAME_M15 = 15
+TIMEFRAME_M30 = 30
+TIMEFRAME_H1 = 16385
+TIMEFRAME_H4 = 16388
+TIMEFRAME_D1 = 16408
+
+ORDER_TYPE_BUY = 0
+ORDER_TYPE_SELL = 1
+ORDER_FILLING_FOK = 0
+ORDER_FILLING_IOC = 1
+ORDER_FILLING_RETURN = 2
+ORDER_TIME_GTC = 0
+
+TRADE_ACTION_DEAL = 1
+TRADE_ACTION_SLTP = 6
+
+TRADE_RETCODE_DONE = 10009
+TRADE_RETCODE_INVALID = 10013
+TRADE_RETCODE_INVALID_PRICE = 10015
+TRADE_RETCODE_NO_MONEY = 10019
+TRADE_RETCODE_POSITION_CLOSED = 10036
+
+POSITION_TYPE_BUY = 0
+POSITION_TYPE_SELL = 1
+DEAL_TYPE_BUY = 0
+DEAL_TYPE_SELL = 1
+DEAL_ENTRY_IN = 0
+DEAL_ENTRY_OUT = 1
+
+COPY_TICKS_ALL = -1
+
+_TIMEFRAME_SECONDS = {
+    TIMEFRAME_M1: 60,
+    TIMEFRAME_M5: 300,
+    TIMEFRAME_M15: 900,
+    TIMEFRAME_M30: 1800,
+    TIMEFRAME_H1: 3600,
+    TIMEFRAME_H4: 14400,
+    TIMEFRAME_D1: 86400,
+}
+
+RATES_DTYPE = np.dtype([
+    ("time", "<i8"), ("open", "<f8"), ("high", "<f8"), ("low", "<f8"), ("close", "<f8"),
+    ("tick_volume", "<u8"), ("spread", "<i4"), ("real_volume", "<u8"),
+])
+TICKS_DTYPE = np.dtype([
+    ("time", "<i8"), ("bid", "<f8"), ("ask", "<f8"), ("last", "<f8"), ("volume", "<u8"),
+    ("time_msc", "<i8"), ("flags", "<u4"), ("volume_real", "<f8"),
+])
+
+AccountInfo = namedtuple("AccountInfo", "login balance equity profit margin margin_free leverage "
+                                        "server currency trade_allowed")
+SymbolInfo = namedtuple("SymbolInfo", "name point digits filling_mode trade_contract_size visible")
+Tick = namedtuple("Tick", "time bid ask last volume time_msc flags volume_real")
+OrderSendResult = namedtuple("OrderSendResult", "retcode deal order volume price bid ask comment request")
+TradePosition = namedtuple("TradePosition", "ticket time type magic identifier volume price_open sl tp "
+                                            "price_current swap profit symbol comment commission")
+TradeDeal = namedtuple("TradeDeal", "ticket order time type entry magic position_id volume price "
+                                    "commission swap profit symbol comment")
+
+_M15 = 900
+_BARS_PER_DAY = 96
+
+
+def _seed(*parts):
+    return zlib.crc32("|".join(str(p) for p in parts).encode())
+
+
+class SyntheticMarket:
+    """Deterministic M15 price paths, generated one day at a time.
+
+    Each day is a Brownian bridge between two seeded daily anchors, so any
+    day can be built independently (no history to replay) and consecutive
+    days join up.
+    """
+
+    def __init__(self, seed=0, volatility_pips=6.0):
+        self.seed = seed
+        self.volatility_pips = volatility_pips
+        self._days = {}   # {(symbol, day): rates array}
+
+    @staticmethod
+    def pip_of(symbol):
+        return 0.01 if "JPY" in symbol else 0.0001
+
+    def base_price(self, symbol):
+        if "JPY" in symbol:
+            return 150.0 + _seed(self.seed, symbol) % 4000 / 100
+        return 0.6 + _seed(self.seed, symbol) % 8000 / 10000
+
+    def _anchor(self, symbol, day):
+        rng = np.random.default_rng(_seed(self.seed, symbol, "anchor", day))
+        wave = 0.02 * np.sin(day / 23.0 + _seed(symbol) % 7)
+        return self.base_price(symbol) * (1 + wave + rng.normal(0, 0.002))
+
+    def day_bars(self, symbol, day):
+        key = (symbol, day)
+        bars = self._days.get(key)
+        if bars is not None:
+            return bars
+
+        pip = self.pip_of(symbol)
+        rng = np.random.default_rng(_seed(self.seed, symbol, day))
+        start, end = self._anchor(symbol, day), self._anchor(symbol, day + 1)
+        steps = rng.normal(0, self.volatility_pips * pip, _BARS_PER_DAY)
+        walk = np.cumsum(steps)
+        walk -= np.linspace(1 / _BARS_PER_DAY, 1, _BARS_PER_DAY) * (walk[-1] - (end - start))
+        close = start + walk
+        open_ = np.r_[start, close[:-1]]
+
+        bars = np.zeros(_BARS_PER_DAY, dtype=RATES_DTYPE)
+        bars["time"] = day * 86400 + np.arange(_BARS_PER_DAY) * _M15
+        bars["open"] = open_
+        bars["close"] = close
+        wick = np.abs(rng.normal(0, self.volatility_pips * 0.6 * pip, (2, _BARS_PER_DAY)))
+        bars["high"] = np.maximum(open_, close) + wick[0]
+        bars["low"] = np.minimum(open_, close) - wick[1]
+        bars["tick_volume"] = rng.integers(80, 900, _BARS_PER_DAY)
+        bars["spread"] = rng.integers(5, 25, _BARS_PER_DAY)
+
+        if len(self._days) > 20000:
+            self._days.clear()
+        self._days[key] = bars
+        return bars
+
+    def m15_range(self, symbol, first_index, last_index):
+        """M15 bars with bar index (time // 900) in [first_index, last_index]."""
+        first_day, last_day = first_index // _BARS_PER_DAY, last_index // _BARS_PER_DAY
+        bars = np.concatenate([self.day_bars(symbol, d) for d in range(first_day, last_day + 1)])
+        offset = first_day * _BARS_PER_DAY
+        return bars[first_index - offset:last_index - offset + 1].copy()
+
+    def price_at(self, symbol, ts):
+        """Mid price at time ``ts``: interpolated within the M15 bar plus noise."""
+        idx = int(ts // _M15)
+        bar = self.day_bars(symbol, idx // _BARS_PER_DAY)[idx % _BARS_PER_DAY]
+        frac = (ts % _M15) / _M15
+        rng = np.random.default_rng(_seed(self.seed, symbol, "tick", int(ts)))
+        mid = bar["open"] + (bar["close"] - bar["open"]) * frac
+        noise = rng.normal(0, (bar["high"] - bar["low"]) * 0.15)
+        return float(min(max(mid + noise, bar["low"]), bar["high"]))
+
+    def spread_at(self, symbol, ts):
+        rng = np.random.default_rng(_seed(self.seed, symbol, "spread", int(ts) // 60))
+        return float(rng.choice([0.6, 0.8, 1.0, 1.2, 1.5, 2.5, 3.5], p=[.2, .25, .2, .15, .1, .06, .04]))
+
+
+class _Terminal:
+    """Account, positions and deal history of one fake terminal session."""
+
+    def __init__(self, market, clock, login, balance, server):
+        self.market = market
+        self.clock = clock
+        self.login_id = login
+        self.balance = balance
+        self.server = server
+        self.positions = {}
+        self.deals = []
+        self.next_ticket = 1_000_000
+        self.lock = threading.RLock()
+        self.symbols = set()
+        self.trade_allowed = True
+
+    def ticket(self):
+        self.next_ticket += 1
+        return self.next_ticket
+
+    def quote(self, symbol, ts=None):
+        ts = self.clock() if ts is None else ts
+        pip = self.market.pip_of(symbol)
+        bid = round(self.market.price_at(symbol, ts), 3 if pip == 0.01 else 5)
+        ask = round(bid + self.market.spread_at(symbol, ts) * pip, 3 if pip == 0.01 else 5)
+        return bid, ask
+
+    def profit(self, symbol, direction, entry, exit_price, volume):
+        pip = self.market.pip_of(symbol)
+        pip_value_per_lot = 6.5 if pip == 0.01 else 10.0
+        pips = (exit_price - entry) / pip if direction == POSITION_TYPE_BUY else (entry - exit_price) / pip
+        return round(pips * pip_value_per_lot * volume, 2)
+
+    def sweep(self):
+        """Close positions whose SL/TP was touched by the current price."""
+        for ticket, pos in list(self.positions.items()):
+            bid, ask = self.quote(pos["symbol"])
+            price = bid if pos["type"] == POSITION_TYPE_BUY else ask
+            hit = None
+            if pos["type"] == POSITION_TYPE_BUY:
+                if pos["sl"] and price <= pos["sl"]:
+                    hit = pos["sl"]
+                elif pos["tp"] and price >= pos["tp"]:
+                    hit = pos["tp"]
+            else:
+                if pos["sl"] and price >= pos["sl"]:
+                    hit = pos["sl"]
+                elif pos["tp"] and price <= pos["tp"]:
+                    hit = pos["tp"]
+            if hit is not None:
+                self.close(ticket, hit, "sl/tp")
+
+    def open(self, request):
+        symbol = request["symbol"]
+        bid, ask = self.quote(symbol)
+        is_buy = request["type"] == ORDER_TYPE_BUY
+        price = ask if is_buy else bid
+        ticket = self.ticket()
+        self.positions[ticket] = {
+            "ticket": ticket, "symbol": symbol, "time": int(self.clock()),
+            "type": POSITION_TYPE_BUY if is_buy else POSITION_TYPE_SELL,
+            "volume": request["volume"], "price_open": price,
+            "sl": request.get("sl", 0.0), "tp": request.get("tp", 0.0),
+            "magic": request.get("magic", 0), "comment": request.get("comment", ""),
+        }
+        self._deal(ticket, symbol, DEAL_TYPE_BUY if is_buy else DEAL_TYPE_SELL, DEAL_ENTRY_IN,
+                   request["volume"], price, 0.0, request.get("magic", 0), request.get("comment", ""))
+        return ticket, price
+
+    def close(self, ticket, price, comment=""):
+        pos = self.positions.pop(ticket)
+        pnl = self.profit(pos["symbol"], pos["type"], pos["price_open"], price, pos["volume"])
+        self.balance += pnl
+        deal_type = DEAL_TYPE_SELL if pos["type"] == POSITION_TYPE_BUY else DEAL_TYPE_BUY
+        self._deal(ticket, pos["symbol"], deal_type, DEAL_ENTRY_OUT, pos["volume"], price, pnl,
+                   pos["magic"], comment)
+        return pnl
+
+    def _deal(self, position_id, symbol, deal_type, entry, volume, price, profit, magic, comment):
+        self.deals.append(TradeDeal(
+            ticket=self.ticket(), order=position_id, time=int(self.clock()), type=deal_type,
+            entry=entry, magic=magic, position_id=position_id, volume=volume, price=price,
+            commission=0.0, swap=0.0, profit=profit, symbol=symbol, comment=comment,
+        ))
+
+    def position_tuple(self, pos):
+        bid, ask = self.quote(pos["symbol"])
+        current = bid if pos["type"] == POSITION_TYPE_BUY else ask
+        return TradePosition(
+            ticket=pos["ticket"], time=pos["time"], type=pos["type"], magic=pos["magic"],
+            identifier=pos["ticket"], volume=pos["volume"], price_open=pos["price_open"],
+            sl=pos["sl"], tp=pos["tp"], price_current=current, swap=0.0,
+            profit=self.profit(pos["symbol"], pos["type"], pos["price_open"], current, pos["volume"]),
+            symbol=pos["symbol"], comment=pos["comment"], commission=0.0,
+        )
+
+
+# ── Module state ──
+_market = SyntheticMarket()
+_clock = time.time
+_terminal = _Terminal(_market, lambda: _clock(), 5000000, 10000.0, "Fake-Server")
+_last_error = (1, "Success")
+_order_latency = 0.0   # seconds order_send takes (the broker round trip)
+
+
+def configure(seed=0, clock=None, login=5000000, balance=10000.0, server="Fake-Server", symbols=(),
+              order_latency_ms=0.0):
+    """Reset the fake terminal (market seed, clock function, account, order round trip)."""
+    global _market, _clock, _terminal, _order_latency
+    _market = SyntheticMarket(seed)
+    _clock = clock or time.time
+    _order_latency = order_latency_ms / 1000
+    _terminal = _Terminal(_market, lambda: _clock(), login, balance, server)
+    _terminal.symbols.update(symbols)
+    return sys.modules[__name__]
+
+
+def current_seed():
+    return _market.seed
+
+
+def install(**kwargs):
+    """Register this module as ``MetaTrader5`` (call before importing the bot)."""
+    module = configure(**kwargs)
+    sys.modules["MetaTrader5"] = module
+    return module
+
+
+# ── Session ──
+
+def initialize(*args, **kwargs):
+    return True
+
+
+def login(login=None, password=None, server=None, **kwargs):
+    if login:
+        _terminal.login_id = login
+    if server:
+        _terminal.server = server
+    return True
+
+
+def shutdown():
+    return None
+
+
+def last_error():
+    return _last_error
+
+
+def version():
+    return (500, 4000, "fake")
+
+
+# ── Market data ──
+
+def symbols_get(group=None):
+    return tuple(symbol_info(s) for s in sorted(_terminal.symbols))
+
+
+def symbol_info(symbol):
+    _terminal.symbols.add(symbol)
+    pip = _market.pip_of(symbol)
+    return SymbolInfo(name=symbol, point=pip / 10, digits=3 if pip == 0.01 else 5,
+                      filling_mode=2, trade_contract_size=100000, visible=True)
+
+
+def symbol_info_tick(symbol):
+    _terminal.symbols.add(symbol)
+    now = _clock()
+    bid, ask = _terminal.quote(symbol, now)
+    return Tick(time=int(now), bid=bid, ask=ask, last=0.0, volume=0,
+                time_msc=int(now * 1000), flags=6, volume_real=0.0)
+
+
+def copy_rates_from_pos(symbol, timeframe, start_pos, count):
+    period = _TIMEFRAME_SECONDS.get(timeframe)
+    if period is None or period < _M15 or count <= 0:
+        return None
+    _terminal.symbols.add(symbol)
+    now = _clock()
+    ratio = period // _M15
+    last_bar = int(now // period) - start_pos
+    first_bar = last_bar - count + 1
+    m15 = _market.m15_range(symbol, first_bar * ratio, int(now // _M15) if start_pos == 0
+                            else (last_bar + 1) * ratio - 1)
+
+    # The forming bar ends at the current price
+    if start_pos == 0:
+        bid, _ = _terminal.quote(symbol, now)
+        m15[-1]["close"] = bid
+        m15[-1]["high"] = max(m15[-1]["high"], bid)
+        m15[-1]["low"] = min(m15[-1]["low"], bid)
+    if ratio == 1:
+        return m15
+
+    from market_data.resampler import resample_rates
+    return resample_rates(m15, period)
+
+
+def copy_ticks_from(symbol, date_from, count, flags):
+    start = date_from.timestamp() if hasattr(date_from, "timestamp") else float(date_from)
+    now = _clock()
+    start = max(start, now - 3600)
+    times = np.arange(np.ceil(start), now, 1.0)[:count]
+    ticks = np.zeros(len(times), dtype=TICKS_DTYPE)
+    for i, t in enumerate(times):
+        ticks[i]["bid"], ticks[i]["ask"] = _terminal.quote(symbol, t)
+    ticks["time"] = times.astype(np.int64)
+    ticks["time_msc"] = (times * 1000).astype(np.int64)
+    ticks["volume"] = 1
+    ticks["flags"] = 6
+    return ticks
+
+
+# ── Account / trading ──
+
+def account_info():
+    with _terminal.lock:
+        _terminal.sweep()
+        floating = sum(_terminal.position_tuple(p).profit for p in _terminal.positions.values())
+        return AccountInfo(
+            login=_terminal.login_id, balance=round(_terminal.balance, 2),
+            equity=round(_terminal.balance + floating, 2), profit=round(floating, 2),
+            margin=0.0, margin_free=round(_terminal.balance + floating, 2), leverage=500,
+            server=_terminal.server, currency="ZAR", trade_allowed=_terminal.trade_allowed,
+        )
+
+
+def positions_total():
+    with _terminal.lock:
+        _terminal.sweep()
+        return len(_terminal.positions)
+
+
+def positions_get(symbol=None, ticket=None, group=None):
+    with _terminal.lock:
+        _terminal.sweep()
+        out = []
+        for pos in _terminal.positions.values():
+            if ticket is not None and pos["ticket"] != ticket:
+                continue
+            if symbol is not None and pos["symbol"] != symbol:
+                continue
+            out.append(_terminal.position_tuple(pos))
+        return tuple(out)
+
+
+def history_deals_get(date_from=None, date_to=None, group=None, position=None, ticket=None):
+    with _terminal.lock:
+        _terminal.sweep()
+        deals = _terminal.deals
+        if position is not None:
+            return tuple(d for d in deals if d.position_id == position)
+        if ticket is not None:
+            return tuple(d for d in deals if d.ticket == ticket)
+        lo = date_from.timestamp() if hasattr(date_from, "timestamp") else (date_from or 0)
+        hi = date_to.timestamp() if hasattr(date_to, "timestamp") else (date_to or float("inf"))
+        return tuple(d for d in deals if lo <= d.time <= hi)
+
+
+def order_send(request):
+    if _order_latency:
+        time.sleep(_order_latency)   # filled at the price after the round trip
+    with _terminal.lock:
+        def result(retcode, order=0, price=0.0, comment="Request executed"):
+            return OrderSendResult(retcode=retcode, deal=0, order=order, volume=request.get("volume", 0.0),
+                                   price=price, bid=0.0, ask=0.0, comment=comment, request=request)
+
+        if not _terminal.trade_allowed:
+            return result(10027, comment="AutoTrading disabled by client")
+
+        action = request.get("action")
+        if action == TRADE_ACTION_SLTP:
+            pos = _terminal.positions.get(request.get("position"))
+            if pos is None:
+                return result(TRADE_RETCODE_POSITION_CLOSED, comment="Position doesn't exist")
+            if request.get("sl"):
+                pos["sl"] = request["sl"]
+            if request.get("tp"):
+                pos["tp"] = request["tp"]
+            return result(TRADE_RETCODE_DONE, order=pos["ticket"])
+
+        if action != TRADE_ACTION_DEAL:
+            return result(TRADE_RETCODE_INVALID, comment="Invalid request")
+
+        if request.get("position"):
+            ticket = request["position"]
+            pos = _terminal.positions.get(ticket)
+            if pos is None:
+                return result(TRADE_RETCODE_POSITION_CLOSED, comment="Position doesn't exist")
+            bid, ask = _terminal.quote(pos["symbol"])
+            price = bid if pos["type"] == POSITION_TYPE_BUY else ask
+            _terminal.close(ticket, price, request.get("comment", ""))
+            return result(TRADE_RETCODE_DONE, order=ticket, price=price)
+
+        if _terminal.balance < request.get("volume", 0) * 1000:
+            return result(TRADE_RETCODE_NO_MONEY, comment="Not enough money")
+        ticket, price = _terminal.open(request)
+        return result(TRADE_RETCODE_DONE, order=ticket, price=price)
@@ -0,0 +1,285 @@
+# load_dashboard.py
+"""Load-test the dashboard while the bot trades against the fake MT5.
+
+Serves ``webapp.app`` with uvicorn on a local port and starts the bot
+(with random entries, so positions open and close) in the engine process
+as ``/start`` does -- or, with ``--engine thread``, in a thread of the web
+process, to compare the two. Then it runs one phase per ``--clients``
+value: that many simulated browser tabs, each loading the page and polling
+with the page's mix (/status 5 s, /logs 7 s, /trades 3 s, /trade-stats
+10 s, /equity 30 s, divided by ``--speed``) and revalidating with ETags
+like a browser. A first phase with
+no clients is the baseline for the bot's loop latency.
+
+Reports p50/p99/max latency per endpoint and the bot's loop-iteration
+latency for each phase, and writes them to a JSON report; ``--compare``
+prints the change against an earlier report.
+
+    cd eurusd_smc_bot && python -m sim.load_dashboard --clients 1 10 50 --seconds 30
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import socket
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+POLLS = {"/status": 5.0, "/logs": 7.0, "/trades": 3.0, "/trade-stats": 10.0, "/equity?points=600&days=1": 30.0}
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile (None for no values)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))]
+
+
+def summarize(values):
+    return {
+        "count": len(values),
+        "p50_ms": _round(percentile(values, 50)),
+        "p99_ms": _round(percentile(values, 99)),
+        "max_ms": _round(max(values) if values else None),
+    }
+
+
+def _round(value):
+    return None if value is None else round(value, 2)
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class DashboardClient(threading.Thread):
+    """One open dashboard tab: loads the page, then polls on the page's timers."""
+
+    def __init__(self, base_url, speed, stop, seed):
+        super().__init__(daemon=True)
+        self.base_url = base_url
+        self.speed = speed
+        self.stop_event = stop
+        self.rng = random.Random(seed)
+        self.samples = {url: [] for url in ["/", *POLLS]}
+        self.errors = {url: 0 for url in self.samples}
+
+    def request(self, client, url, etags):
+        headers = {"If-None-Match": etags[url]} if url in etags else {}
+        start = time.perf_counter()
+        try:
+            r = client.get(url, headers=headers)
+        except Exception:
+            self.errors[url] += 1
+            return
+        self.samples[url].append((time.perf_counter() - start) * 1000)
+        if r.status_code in (200, 304):
+            etags[url] = r.headers.get("etag", etags.get(url))
+        else:
+            self.errors[url] += 1
+
+    def run(self):
+        import httpx
+        etags = {}
+        with httpx.Client(base_url=self.base_url, timeout=30.0) as client:
+            self.request(client, "/", etags)
+            now = time.monotonic()
+            due = {url: now + self.rng.uniform(0, every / self.speed) for url, every in POLLS.items()}
+            while not self.stop_event.is_set():
+                url = min(due, key=due.get)
+                if self.stop_event.wait(max(0.0, due[url] - time.monotonic())):
+                    break
+                self.request(client, url, etags)
+                due[url] += POLLS[url] / self.speed
+
+
+def run_phase(base_url, clients, seconds, speed, seed):
+    stop = threading.Event()
+    tabs = [DashboardClient(base_url, speed, stop, seed + i) for i in range(clients)]
+    started = time.monotonic()
+    for tab in tabs:
+        tab.start()
+    time.sleep(seconds)
+    stop.set()
+    for tab in tabs:
+        tab.join(30)
+    elapsed = time.monotonic() - started
+
+    endpoints = {}
+    for url in ["/", *POLLS]:
+        samples = [ms for tab in tabs for ms in tab.samples[url]]
+        endpoints[url] = {**summarize(samples), "errors": sum(tab.errors[url] for tab in tabs)}
+    requests = sum(e["count"] for e in endpoints.values())
+    return {
+        "clients": clients,
+        "seconds": round(elapsed, 1),
+        "requests": requests,
+        "requests_per_s": round(requests / elapsed, 1),
+        "errors": sum(e["errors"] for e in endpoints.values()),
+        "endpoints": endpoints,
+    }
+
+
+def print_report(report):
+    print(f"\n{report['symbols']} symbols, bot in {report['engine']}, speed x{report['speed']:g}, "
+          f"{report['seconds']:g} s per phase, detector backend {report['detector_backend']}")
+    for phase in report["phases"]:
+        loop = phase["bot_loop"]
+        print(f"\n{phase['clients']} clients: {phase['requests']} requests ({phase['requests_per_s']}/s), "
+              f"{phase['errors']} errors | bot loop p50 {loop['p50_ms']} ms  p99 {loop['p99_ms']} ms  "
+              f"max {loop['max_ms']} ms  ({loop['count']} iterations)")
+        if phase["clients"] == 0:
+            continue
+        print(f"  {'endpoint':<28}{'count':>7}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}{'errors':>8}")
+        for url, e in phase["endpoints"].items():
+            print(f"  {url:<28}{e['count']:>7}{e['p50_ms'] or 0:>9.2f}{e['p99_ms'] or 0:>9.2f}"
+                  f"{e['max_ms'] or 0:>9.2f}{e['errors']:>8}")
+
+
+def print_comparison(report, previous):
+    """p99 now vs an earlier report, for phases with the same client count."""
+    earlier = {phase["clients"]: phase for phase in previous["phases"]}
+    print(f"\np99 vs {previous['created']} (earlier -> now, ms)")
+    for phase in report["phases"]:
+        old = earlier.get(phase["clients"])
+        if old is None:
+            continue
+        rows = [("bot loop", old["bot_loop"], phase["bot_loop"])]
+        rows += [(url, old["endpoints"].get(url, {}), e) for url, e in phase["endpoints"].items()
+                 if phase["clients"]]
+        print(f"  {phase['clients']} clients")
+        for name, before, after in rows:
+            b, a = before.get("p99_ms"), after.get("p99_ms")
+            change = f"{(a - b) / b:+.0%}" if a is not None and b else ""
+            print(f"    {name:<28}{b if b is not None else '-':>9} -> {a if a is not None else '-':<9}{change:>6}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 10, 50],
+                        help="concurrent dashboard tabs per phase (a 0-client baseline always runs first)")
+    parser.add_argument("--seconds", type=float, default=30, help="length of each phase")
+    parser.add_argument("--speed", type=float, default=1.0, help="poll rate multiplier (1 = the page's timers)")
+    parser.add_argument("--symbols", type=int, default=10)
+    parser.add_argument("--signal-probability", type=float, default=0.02)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--engine", choices=("process", "thread"), default="process",
+                        help="bot in the engine process, or in a thread of the web process")
+    parser.add_argument("--out", default="load_report.json", help="JSON report path")
+    parser.add_argument("--compare", help="earlier JSON report to compare against")
+    args = parser.parse_args()
+    out = os.path.abspath(args.out)
+    previous = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            previous = json.load(f)
+
+    sys.path.insert(0, ROOT)
+    from sim import fake_mt5
+    fake_mt5.install(seed=args.seed)
+    random.seed(args.seed)
+
+    from config import Config
+    from sim.run_sharded import synthetic_symbols
+    workdir = tempfile.mkdtemp(prefix="smc_load_")
+    os.chdir(workdir)
+    os.makedirs("logs", exist_ok=True)
+    overrides = {
+        "SESSION_START_HOUR": 0,
+        "SESSION_END_HOUR": 24,
+        "LOOP_INTERVAL_SECONDS": 1,
+        "SHARD_WORKERS": 0,
+        "TICK_RECORDING_ENABLED": False,
+        "JOURNAL_DIR": os.path.join(workdir, "journal"),
+        "STRESS_SIGNAL_PROBABILITY": args.signal_probability,
+    }
+    Config.SYMBOLS = synthetic_symbols(args.symbols)
+    for name, value in overrides.items():
+        setattr(Config, name, value)
+
+    import logging
+    import uvicorn
+    import webapp
+    from engine.client import EngineProcess, LocalEngine
+    from engine.host import EngineHost
+
+    # Headless: keep the log files, silence the console
+    for handler in logging.getLogger().handlers:
+        if type(handler) is logging.StreamHandler:
+            handler.setLevel(logging.CRITICAL)
+    if args.engine == "process":
+        engine = EngineProcess(options={
+            "fake_mt5": {"seed": args.seed},
+            "config": {**overrides, "SYMBOLS": Config.SYMBOLS},
+            "bot_class": "sim.stress_bot:StressBot",
+            "quiet": True,
+        })
+    else:
+        from sim.stress_bot import StressBot
+        engine = LocalEngine(EngineHost(StressBot))
+    webapp._engine = engine
+
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(webapp.app, host="127.0.0.1", port=port,
+                                          log_level="warning", access_log=False))
+    server_thread = threading.Thread(target=server.run, daemon=True)
+    server_thread.start()
+    engine.start()
+    if args.engine == "thread":
+        for handler in engine.host.bot._log_listener.handlers:
+            if type(handler) is logging.StreamHandler:
+                handler.setLevel(logging.CRITICAL)
+    while not (server.started and engine.call("debug")["iterations"] >= 3):
+        if not engine.call("ping")["running"]:
+            sys.exit("bot exited during start-up (see logs in " + workdir + ")")
+        time.sleep(0.1)
+
+    base_url = f"http://127.0.0.1:{port}"
+    phases = []
+    for clients in [0, *args.clients]:
+        print(f"phase: {clients} clients for {args.seconds:g} s ...", flush=True)
+        since = engine.call("debug")["iterations"]
+        phase = run_phase(base_url, clients, args.seconds, args.speed, args.seed)
+        phase["bot_loop"] = summarize([ms for _, ms in engine.call("loop_history", since=since)])
+        phases.append(phase)
+
+    debug = engine.call("debug")
+    status = engine.snapshot()[1]["status"]
+    engine.shutdown()
+    server.should_exit = True
+    server_thread.join(10)
+
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "symbols": args.symbols,
+        "seconds": args.seconds,
+        "speed": args.speed,
+        "signal_probability": args.signal_probability,
+        "seed": args.seed,
+        "engine": args.engine,
+        "detector_backend": debug["detector_backend"],
+        "trades": status.get("daily_trades", 0) + status.get("swing_trades", 0),
+        "phases": phases,
+    }
+    print_report(report)
+    if previous is not None:
+        print_comparison(report, previous)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nreport written to {out}  (logs in {workdir})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# run_accounts.py
+"""Run the bot with follower accounts, each on its own fake MT5 terminal.
+
+Starts ``StressBot`` (random scalp signals) on the fake MT5 with
+``--accounts`` follower accounts. Every account's executor process
+installs its own fake terminal on the same synthetic market, with its own
+balance (``--balance`` times 1, 2, 4, ...) and an order round trip that
+grows per account (``--latency-ms`` times 1, 2, 3, ...). Accounts size
+with RISK_PERCENT (no fixed lot), so volumes should scale with balance.
+
+After ``--seconds`` it prints each account's fills, fill latency and
+slippage, and the skew between the first and last fill of an order, and
+checks that every order reached every account and was answered, and that
+lots per unit of balance match across accounts.
+
+    cd eurusd_smc_bot && python -m sim.run_accounts --accounts 3 --seconds 30
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--accounts", type=int, default=3)
+    parser.add_argument("--symbols", type=int, default=12, help="synthetic symbols (each trades at most every 5 min)")
+    parser.add_argument("--seconds", type=float, default=30)
+    parser.add_argument("--signal-probability", type=float, default=0.1)
+    parser.add_argument("--balance", type=float, default=5000.0, help="first account's balance")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="first account's order round trip")
+    parser.add_argument("--risk-percent", type=float, default=0.001, help="RISK_PERCENT on the accounts")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    from sim import fake_mt5
+    fake_mt5.install(seed=args.seed, order_latency_ms=args.latency_ms)
+
+    from config import Config
+    from sim.run_sharded import synthetic_symbols
+    workdir = tempfile.mkdtemp(prefix="smc_accounts_")
+    os.chdir(workdir)
+    os.makedirs("logs", exist_ok=True)
+
+    accounts = [{
+        "name": f"acct{i + 1}",
+        "login": 7000001 + i,
+        "server": "Fake-Server",
+        "config": {"FIXED_LOT_SIZE": 0, "RISK_PERCENT": args.risk_percent},
+        "fake_mt5": {"balance": args.balance * 2 ** i, "order_latency_ms": args.latency_ms * (i + 1)},
+    } for i in range(args.accounts)]
+    with open("accounts.json", "w") as f:
+        json.dump(accounts, f, indent=2)
+
+    limits = {"MAX_DAILY_TRADES": 10_000, "MAX_TOTAL_DAILY_TRADES": 10_000, "MAX_OPEN_LOTS": 10_000}
+    overrides = {
+        **limits,
+        "SESSION_START_HOUR": 0,
+        "SESSION_END_HOUR": 24,
+        "LOOP_INTERVAL_SECONDS": 0.5,
+        "TICK_RECORDING_ENABLED": False,
+        "EQUITY_ENABLED": False,
+        "SWING_ENABLED": False,
+        "PANEL_SCAN_MIN_SYMBOLS": 0,      # the pre-screen would drop the random signals
+        "STRESS_SIGNAL_PROBABILITY": args.signal_probability,
+        "ACCOUNTS_FILE": "accounts.json",
+    }
+    Config.SYMBOLS = synthetic_symbols(args.symbols)
+    for name, value in overrides.items():
+        setattr(Config, name, value)
+
+    from sim.stress_bot import StressBot
+
+    class QuietBot(StressBot):
+        def on_iteration(self, all_data):
+            pass
+
+    bot = QuietBot()
+    bot.fanout.options = {"config": {**limits, "SYMBOLS": Config.SYMBOLS}}
+    thread = threading.Thread(target=bot.run, daemon=True)
+    thread.start()
+    time.sleep(args.seconds)
+    bot.stop()
+    thread.join(60)
+    status = bot.fanout.status()
+
+    print(f"\n{len(accounts)} accounts, {args.symbols} symbols, {args.seconds:.0f}s  (logs in {workdir})")
+    print(f"{'account':<8} {'login':>8} {'balance':>9} {'sent':>5} {'filled':>6} {'rej':>4} {'skip':>4} "
+          f"{'t/o':>4} {'lots':>6} {'lat p50':>8} {'p95':>7} {'max':>7} {'slip':>6}")
+    for a in status["accounts"]:
+        print(f"{a['name']:<8} {a['login'] or '-':>8} {a['balance'] or 0:>9.2f} {a['dispatched']:>5} "
+              f"{a['filled']:>6} {a['rejected']:>4} {a['skipped']:>4} {a['timeouts']:>4} {a['lots']:>6.2f} "
+              f"{a['latency_ms_p50'] or 0:>8.1f} {a['latency_ms_p95'] or 0:>7.1f} {a['latency_ms_max'] or 0:>7.1f} "
+              f"{a['slippage_pips_avg'] or 0:>6.2f}")
+    followers = [a for a in status["accounts"] if a["name"] != "primary"]
+    serial = sum(args.latency_ms * (i + 1) for i in range(len(followers)))
+    print(f"\nskew over {status['skew_orders']} orders: p50 {status['skew_ms_p50'] or 0:.1f} ms, "
+          f"p95 {status['skew_ms_p95'] or 0:.1f} ms, max {status['skew_ms_max'] or 0:.1f} ms "
+          f"(round trips in series: {serial:.0f} ms)")
+
+    failures = []
+    if not followers[0]["dispatched"]:
+        failures.append("no orders were dispatched")
+    for a in followers:
+        answered = a["filled"] + a["rejected"] + a["skipped"] + a["timeouts"]
+        if a["dispatched"] != status["accounts"][0]["dispatched"] or answered != a["dispatched"]:
+            failures.append(f"{a['name']}: {a['dispatched']} sent, {answered} answered")
+    # Same risk per unit of balance: lots / balance match (to the 0.01 lot rounding)
+    per_balance = [a["lots"] / a["balance"] / max(a["filled"], 1) for a in followers if a["filled"] and a["balance"]]
+    if per_balance and max(per_balance) > min(per_balance) * 1.25:
+        failures.append(f"sizing does not follow balance: {[f'{x * 1e6:.2f}' for x in per_balance]} lots/M per order")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    print("all accounts filled" if not failures else "FAN-OUT FAILED")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# run_sharded.py
+"""Run the sharded bot against the fake MT5 with many synthetic symbols.
+
+Starts a ShardSupervisor over ``--symbols`` synthetic pairs split across
+``--workers`` processes, lets the stress workers fire random signals for
+``--seconds``, then prints per-shard health and checks that the global
+limits held across all workers.
+
+    cd eurusd_smc_bot && python -m sim.run_sharded --symbols 50 --workers 4 --seconds 60
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def synthetic_symbols(count):
+    """{name: symbol config} for ``count`` synthetic pairs (every fifth is a JPY cross)."""
+    symbols = {}
+    for i in range(count):
+        jpy = i % 5 == 4
+        name = f"SYN{i:02d}JPY" if jpy else f"SYN{i:02d}USD"
+        symbols[name] = {"pip_value": 0.01 if jpy else 0.0001, "max_spread": 2.0, "swing_max_spread": 3.0}
+    return symbols
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--symbols", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=60)
+    parser.add_argument("--signal-probability", type=float, default=0.02)
+    parser.add_argument("--max-trades", type=int, default=10, help="MAX_TOTAL_DAILY_TRADES for the run")
+    parser.add_argument("--max-lots", type=float, default=0.1, help="MAX_OPEN_LOTS for the run")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT)
+    from sim import fake_mt5
+    fake_mt5.install(seed=args.seed)
+
+    from config import Config
+    workdir = tempfile.mkdtemp(prefix="smc_shards_")
+    os.chdir(workdir)
+    os.makedirs("logs", exist_ok=True)
+
+    overrides = {
+        "SESSION_START_HOUR": 0,
+        "SESSION_END_HOUR": 24,
+        "LOOP_INTERVAL_SECONDS": 1,
+        "TICK_RECORDING_ENABLED": False,
+        "JOURNAL_DIR": os.path.join(workdir, "journal"),
+        "MAX_TOTAL_DAILY_TRADES": args.max_trades,
+        "MAX_OPEN_LOTS": args.max_lots,
+        "STRESS_SIGNAL_PROBABILITY": args.signal_probability,
+    }
+    Config.SYMBOLS = synthetic_symbols(args.symbols)
+    for name, value in overrides.items():
+        setattr(Config, name, value)
+
+    from sharding.supervisor import ShardSupervisor
+    supervisor = ShardSupervisor(workers=args.workers, options={
+        "fake_mt5": {"seed": args.seed},
+        "bot_class": "sim.stress_bot:StressWorkerBot",
+        "config": overrides,
+    })
+
+    thread = threading.Thread(target=supervisor.run, daemon=True)
+    thread.start()
+    max_open_lots = 0.0
+    deadline = time.monotonic() + args.seconds
+    while time.monotonic() < deadline and thread.is_alive():
+        time.sleep(0.25)
+        max_open_lots = max(max_open_lots, sum(p.volume for p in fake_mt5.positions_get()))
+    status = supervisor.shard_status()
+    supervisor.stop()
+    thread.join(60)
+
+    print(f"\n{args.symbols} symbols, {len(status)} shards, {args.seconds:.0f}s  (logs in {workdir})")
+    print(f"{'shard':>5} {'pid':>7} {'alive':>5} {'syms':>4} {'iters':>5} {'loop ms':>8} "
+          f"{'p50':>7} {'max':>7} {'hb age':>6} {'orders':>6} {'filled':>6} {'restarts':>8}")
+    for s in status:
+        print(f"{s['shard']:>5} {s['pid']:>7} {str(s['alive']):>5} {len(s['symbols']):>4} "
+              f"{s['iterations']:>5} {s['loop_ms'] or 0:>8.1f} {s['loop_ms_p50'] or 0:>7.1f} "
+              f"{s['loop_ms_max'] or 0:>7.1f} {s['heartbeat_age'] or 0:>6.1f} {s['orders']:>6} "
+              f"{s['executed']:>6} {s['restarts']:>8}")
+
+    executed = supervisor.daily_trades + supervisor.swing_trades
+    requested = sum(s["orders"] for s in status)
+    print(f"\norders requested {requested}, executed {executed} (limit {args.max_trades}), "
+          f"peak open {max_open_lots:.2f} lots (limit {args.max_lots:.2f})")
+    ok = executed <= args.max_trades and max_open_lots <= args.max_lots + 1e-9
+    print("global limits held" if ok else "GLOBAL LIMIT EXCEEDED")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
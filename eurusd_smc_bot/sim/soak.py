@@ -0,0 +1,191 @@
+# soak.py
+"""Long-run soak test: the bot over simulated days, stopped and restarted.
+
+Runs ``StressBot`` (random entries, so positions open, close and reach the
+trade history, journal and checkpoint) against the fake MT5 on a simulated
+clock, through the same ``EngineHost`` start/stop the dashboard uses. Every
+loop iteration advances the clock by ``--step`` seconds and the bot is
+stopped and a new one started every ``--cycle-hours`` simulated hours.
+
+The bot's modules read the simulated clock too: their ``datetime``/``date``
+classes are swapped for ones whose ``now()``/``today()`` follow it, so
+midnight rollovers (daily counters, the daily trade file) happen in the
+run. Log, journal and recorder file names follow the wall clock.
+
+After each stop the harness samples the Python heap (allocated blocks after
+a full collection), RSS, open file descriptors, live threads, the handlers
+left on the bot's logger and the cycle's median loop time. It fails (exit
+status 1) unless, from the first cycle after ``--warm-up`` on, descriptors,
+threads and handlers don't grow at all, heap and RSS stay within their
+limits and the median loop time within ``--max-slowdown`` of the baseline.
+
+    cd eurusd_smc_bot && python -m sim.soak --days 3 --cycle-hours 6
+"""
+import argparse
+import gc
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, datetime
+
+from sim import fake_mt5
+
+
+def open_fds():
+    try:
+        return len(os.listdir("/proc/self/fd"))
+    except OSError:
+        return None
+
+
+def rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except (OSError, ValueError):
+        return None
+
+
+def follow_clock(clock):
+    """Point the loaded bot modules' ``datetime``/``date`` at the simulated clock."""
+    real_datetime, real_date = datetime, date
+
+    class SimDatetime(real_datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return cls.fromtimestamp(clock[0], tz)
+
+    class SimDate(real_date):
+        @classmethod
+        def today(cls):
+            day = real_datetime.fromtimestamp(clock[0]).date()
+            return cls(day.year, day.month, day.day)
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    harness = {sys.modules.get("__main__"), sys.modules.get("__mp_main__"), sys.modules[__name__]}
+    patched = []
+    for name, module in list(sys.modules.items()):
+        path = getattr(module, "__file__", None) or ""
+        if not path.startswith(root) or module in harness:
+            continue
+        if getattr(module, "datetime", None) is real_datetime:
+            module.datetime = SimDatetime
+            patched.append(name)
+        if getattr(module, "date", None) is real_date:
+            module.date = SimDate
+    return patched
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=float, default=3.0, help="simulated days")
+    parser.add_argument("--cycle-hours", type=float, default=6.0, help="simulated hours between restarts")
+    parser.add_argument("--step", type=float, default=60.0, help="simulated seconds per loop iteration")
+    parser.add_argument("--signal-probability", type=float, default=0.002,
+                        help="random entry chance per symbol per iteration")
+    parser.add_argument("--start", type=float, default=1_700_020_800.0,
+                        help="fake clock start (epoch)")
+    parser.add_argument("--warm-up", type=int, default=2, help="cycles before the baseline sample")
+    parser.add_argument("--max-heap-growth", type=float, default=0.05,
+                        help="allowed growth of allocated blocks over the baseline (fraction)")
+    parser.add_argument("--max-rss-growth", type=float, default=25.0, help="allowed RSS growth (MB)")
+    parser.add_argument("--max-slowdown", type=float, default=1.5,
+                        help="allowed median loop time over the baseline (ratio)")
+    args = parser.parse_args()
+
+    clock = [args.start]
+    fake_mt5.install(clock=lambda: clock[0])
+    workdir = tempfile.mkdtemp(prefix="smc_soak_")
+    os.chdir(workdir)
+    os.makedirs("logs", exist_ok=True)
+
+    from config import Config
+    from engine.host import EngineHost
+    from sim.stress_bot import StressBot
+
+    for name, value in {"SESSION_START_HOUR": 0, "SESSION_END_HOUR": 24, "LOOP_INTERVAL_SECONDS": 0,
+                        "STRESS_SIGNAL_PROBABILITY": args.signal_probability}.items():
+        setattr(Config, name, value)
+
+    class SoakBot(StressBot):
+        """StressBot whose iterations move the simulated clock (and print nothing)."""
+
+        def setup_logging(self):
+            super().setup_logging()
+            for handler in self._log_listener.handlers:
+                if type(handler) is logging.StreamHandler:
+                    handler.setLevel(logging.CRITICAL)
+
+        def on_iteration(self, all_data):
+            clock[0] += args.step
+
+    patched = follow_clock(clock)
+    host = EngineHost(bot_class=SoakBot)
+    logger = logging.getLogger("SMC_Bot")
+    end = args.start + args.days * 86400
+    samples = []
+    started = time.perf_counter()
+    print(f"{args.days:g} simulated days, restart every {args.cycle_hours:g} h, {args.step:g} s per iteration, "
+          f"{len(Config.SYMBOLS)} symbols  (files in {workdir}; clock patched in {len(patched)} modules)\n")
+    print(f"{'cycle':>5} {'sim time':>16} {'iters':>6} {'loop ms':>8} {'heap blocks':>12} {'RSS MB':>7} "
+          f"{'fds':>4} {'threads':>7} {'handlers':>8} {'trades':>6}")
+
+    while clock[0] < end:
+        cycle_end = min(end, clock[0] + args.cycle_hours * 3600)
+        host.start()
+        bot = host.bot
+        while clock[0] < cycle_end and host.thread.is_alive():
+            time.sleep(0.01)
+        host.stop(wait=60)
+        if host.thread.is_alive():
+            sys.exit("bot thread did not stop")
+
+        gc.collect()
+        sample = {
+            "iterations": bot.iterations,
+            "loop_ms": statistics.median(ms for _, ms in bot.loop_history) if bot.loop_history else 0.0,
+            "blocks": sys.getallocatedblocks(),
+            "rss": rss_mb(),
+            "fds": open_fds(),
+            "threads": threading.active_count(),
+            "handlers": len(logger.handlers),
+            "trades": bot.trade_history.get_trade_stats()["total_trades"],
+        }
+        samples.append(sample)
+        print(f"{len(samples):>5} {datetime.fromtimestamp(clock[0]):%Y-%m-%d %H:%M} {sample['iterations']:>6} "
+              f"{sample['loop_ms']:>8.2f} {sample['blocks']:>12} {sample['rss'] or 0:>7.1f} "
+              f"{sample['fds'] if sample['fds'] is not None else '-':>4} {sample['threads']:>7} "
+              f"{sample['handlers']:>8} {sample['trades']:>6}")
+        if bot.iterations == 0:
+            sys.exit("bot did not run (see the log in the work directory)")
+
+    daily_files = sorted(os.listdir(os.path.join("logs", "trade_history")))
+    print(f"\n{time.perf_counter() - started:.0f} s wall; trade history files: {', '.join(daily_files)}")
+    if len(samples) <= args.warm_up:
+        sys.exit(f"only {len(samples)} cycles: run longer or restart more often than --warm-up {args.warm_up}")
+
+    base, last = samples[args.warm_up], samples[-1]
+    failures = []
+    for key in ("fds", "threads"):
+        if base[key] is not None and max(s[key] for s in samples[args.warm_up:]) > base[key]:
+            failures.append(f"{key} grew from {base[key]} to {max(s[key] for s in samples[args.warm_up:])}")
+    if any(s["handlers"] for s in samples):
+        failures.append("log handlers left attached after stop")
+    if last["blocks"] > base["blocks"] * (1 + args.max_heap_growth):
+        failures.append(f"heap grew {last['blocks'] / base['blocks'] - 1:.1%} (blocks {base['blocks']} -> {last['blocks']})")
+    if base["rss"] is not None and last["rss"] - base["rss"] > args.max_rss_growth:
+        failures.append(f"RSS grew {last['rss'] - base['rss']:.1f} MB")
+    if last["loop_ms"] > base["loop_ms"] * args.max_slowdown + 1.0:
+        failures.append(f"median loop time {base['loop_ms']:.2f} -> {last['loop_ms']:.2f} ms")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    print("resources flat" if not failures else "SOAK FAILED")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
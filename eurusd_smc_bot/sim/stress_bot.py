@@ -0,0 +1,53 @@
+# stress_bot.py
+import random
+
+from main import EURUSD_SMC_Bot
+from sharding.shard_bot import ShardWorkerBot
+
+
+class StressWorkerBot(ShardWorkerBot):
+    """Shard worker that replaces SMC setups with random signals.
+
+    Real setups are rare on synthetic data; this fires a scalp signal with
+    probability ``Config.STRESS_SIGNAL_PROBABILITY`` per symbol per
+    iteration so the gateway and the global limits get exercised.
+    """
+
+    def generate_signal(self, data):
+        rate = getattr(self.config, "STRESS_SIGNAL_PROBABILITY", 0.05)
+        data['analysis'] = {}
+        if random.random() >= rate:
+            data['reason'] = 'no_setup'
+            return None
+
+        pv = data['pip_value']
+        direction = random.choice(('buy', 'sell'))
+        stop_pips = 10.0
+        price = data['ask'] if direction == 'buy' else data['bid']
+        sl = price - stop_pips * pv if direction == 'buy' else price + stop_pips * pv
+        data['reason'] = 'signal'
+        return {
+            'direction': direction,
+            'price': price,
+            'sl': sl,
+            **self.risk.calculate_tp_levels(price, sl, direction, pv),
+            'volume': self.risk.calculate_position_size(stop_pips, pv),
+            'stop_pips': stop_pips,
+            'ob_price': price,
+            'fvg_mid': price,
+            'confidence': 1.0,
+            'bos_confirmed': False,
+            'symbol': data['symbol'],
+        }
+
+    def generate_swing_signal(self, data):
+        data['analysis'] = {}
+        data['reason'] = 'no_setup'
+        return None
+
+
+class StressBot(EURUSD_SMC_Bot):
+    """Single-process bot with ``StressWorkerBot``'s random signals (dashboard harnesses)."""
+
+    generate_signal = StressWorkerBot.generate_signal
+    generate_swing_signal = StressWorkerBot.generate_swing_signal
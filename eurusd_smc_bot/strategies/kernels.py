@@ -0,0 +1,119 @@
+# kernels.py
+"""Detector kernels over plain float64 arrays (NumPy backend + selection).
+
+The inner scans of the SMC detectors -- swing points, the last swings used
+for BOS, order blocks, FVGs and breaker candidates -- return bar indices;
+``SMCStrategies`` turns those into its dicts. This module implements them
+with NumPy masks. ``strategies/kernels_numba.py`` implements the same
+functions as Numba-compiled loops that scan backwards from the newest bar
+and stop as soon as they have what the detector keeps.
+
+The backend is picked at runtime with ``load_backend`` (``Config.DETECTOR_BACKEND``):
+``auto`` uses Numba when it is installed and NumPy otherwise; ``numpy`` and
+``numba`` force one (forcing Numba without it installed raises ImportError).
+"""
+import sys
+import time
+
+import numpy as np
+
+
+NAME = "numpy"
+BACKENDS = ("auto", "numpy", "numba")
+
+
+def swing_highs(high):
+    """Indices of bars with a higher high than both neighbours."""
+    i = np.arange(2, len(high) - 2)
+    return i[(high[i] > high[i - 1]) & (high[i] > high[i + 1])]
+
+
+def swing_lows(low):
+    """Indices of bars with a lower low than both neighbours."""
+    i = np.arange(2, len(low) - 2)
+    return i[(low[i] < low[i - 1]) & (low[i] < low[i + 1])]
+
+
+def last_swings(high, low):
+    """(last high, previous high, last low, previous low) swing indices, -1 if missing."""
+    highs, lows = swing_highs(high), swing_lows(low)
+    pick = lambda idx, k: int(idx[-k]) if len(idx) >= k else -1
+    return pick(highs, 1), pick(highs, 2), pick(lows, 1), pick(lows, 2)
+
+
+def order_block_indices(o, h, l, c, pv, min_size_pips, keep):
+    """Last ``keep`` candles followed by a close beyond their range (ascending)."""
+    i = np.arange(2, len(c) - 2)
+    big = (h[i] - l[i]) / pv >= min_size_pips
+    bull = (c[i] > o[i]) & (c[i + 1] > h[i]) & big
+    bear = (c[i] < o[i]) & (c[i + 1] < l[i]) & big
+    return i[bull | bear][-keep:]
+
+
+def fair_value_gap_indices(h, l, pv, min_pips, max_pips, keep):
+    """Last ``keep`` middle candles of a 3-candle gap within the size limits (ascending)."""
+    i = np.arange(1, len(h) - 1)
+    bull_gap = (l[i + 1] - h[i - 1]) / pv
+    bear_gap = (l[i - 1] - h[i + 1]) / pv
+    bull = (l[i + 1] > h[i - 1]) & (bull_gap >= min_pips) & (bull_gap <= max_pips)
+    bear = (h[i + 1] < l[i - 1]) & (bear_gap >= min_pips) & (bear_gap <= max_pips)
+    return i[bull | bear][-keep:]
+
+
+def breaker_candidates(h, l, c, keep):
+    """Bars that pierced the prior 5-bar extreme and closed back inside.
+
+    Returns ``(index, support, resistance, bullish, bearish)`` arrays in bar
+    order for the fewest newest bars that hold the last ``keep`` breakers
+    (a bar can be both).
+    """
+    i = np.arange(5, len(c) - 2)
+    if len(i) == 0:
+        empty = np.zeros(0)
+        return i, empty, empty, np.zeros(0, dtype=bool), np.zeros(0, dtype=bool)
+    support = np.lib.stride_tricks.sliding_window_view(l, 5).min(axis=1)[i - 5]
+    resistance = np.lib.stride_tricks.sliding_window_view(h, 5).max(axis=1)[i - 5]
+    bull = (l[i] < support) & (c[i] > support)
+    bear = (h[i] > resistance) & (c[i] < resistance)
+    entries = bull.astype(np.int64) + bear
+    newer = np.cumsum(entries[::-1])[::-1] - entries
+    hit = (entries > 0) & (newer < keep)
+    return i[hit], support[hit], resistance[hit], bull[hit], bear[hit]
+
+
+def load_backend(name="auto"):
+    """Kernel module for ``name`` (see module docstring)."""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown detector backend {name!r} (expected one of {BACKENDS})")
+    if name != "numpy":
+        try:
+            from strategies import kernels_numba
+            return kernels_numba
+        except ImportError:
+            if name == "numba":
+                raise
+    return sys.modules[__name__]
+
+
+def warm_up(backend):
+    """Run every kernel once on small inputs; returns the elapsed ms.
+
+    For Numba this compiles (or loads from the on-disk cache) each kernel
+    for both contiguous arrays and strided field views of MT5 rates, so the
+    first live iteration doesn't pay for it.
+    """
+    start = time.perf_counter()
+    rates = np.zeros(32, dtype=[("open", "<f8"), ("high", "<f8"), ("low", "<f8"), ("close", "<f8")])
+    rates["close"] = 1.0 + np.sin(np.arange(32)) * 0.001
+    rates["open"] = np.roll(rates["close"], 1)
+    rates["high"] = np.maximum(rates["open"], rates["close"]) + 0.0002
+    rates["low"] = np.minimum(rates["open"], rates["close"]) - 0.0002
+    views = [rates[name] for name in ("open", "high", "low", "close")]
+    for o, h, l, c in (views, [np.ascontiguousarray(v) for v in views]):
+        backend.swing_highs(h)
+        backend.swing_lows(l)
+        backend.last_swings(h, l)
+        backend.order_block_indices(o, h, l, c, 0.0001, 1.0, 8)
+        backend.fair_value_gap_indices(h, l, 0.0001, 1.0, 20.0, 12)
+        backend.breaker_candidates(h, l, c, 4)
+    return (time.perf_counter() - start) * 1000
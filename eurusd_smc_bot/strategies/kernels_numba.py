@@ -0,0 +1,122 @@
+# kernels_numba.py
+"""Numba-compiled detector kernels (same API as ``strategies.kernels``).
+
+Importing this module requires Numba; ``kernels.load_backend`` falls back
+to the NumPy kernels when it isn't installed. Compiled code is cached on
+disk (``cache=True``), so only the first run on a machine compiles.
+
+The scans walk backwards from the newest bar and stop once they have the
+number of results the detector keeps, instead of building full-length masks.
+"""
+import numpy as np
+from numba import njit
+
+
+NAME = "numba"
+
+
+@njit(cache=True)
+def swing_highs(high):
+    n = len(high)
+    out = np.empty(max(n - 4, 0), dtype=np.int64)
+    k = 0
+    for i in range(2, n - 2):
+        if high[i] > high[i - 1] and high[i] > high[i + 1]:
+            out[k] = i
+            k += 1
+    return out[:k]
+
+
+@njit(cache=True)
+def swing_lows(low):
+    n = len(low)
+    out = np.empty(max(n - 4, 0), dtype=np.int64)
+    k = 0
+    for i in range(2, n - 2):
+        if low[i] < low[i - 1] and low[i] < low[i + 1]:
+            out[k] = i
+            k += 1
+    return out[:k]
+
+
+@njit(cache=True)
+def last_swings(high, low):
+    last_high = prev_high = last_low = prev_low = -1
+    for i in range(len(high) - 3, 1, -1):
+        if high[i] > high[i - 1] and high[i] > high[i + 1]:
+            if last_high < 0:
+                last_high = i
+            else:
+                prev_high = i
+                break
+    for i in range(len(low) - 3, 1, -1):
+        if low[i] < low[i - 1] and low[i] < low[i + 1]:
+            if last_low < 0:
+                last_low = i
+            else:
+                prev_low = i
+                break
+    return last_high, prev_high, last_low, prev_low
+
+
+@njit(cache=True)
+def order_block_indices(o, h, l, c, pv, min_size_pips, keep):
+    out = np.empty(max(keep, 0), dtype=np.int64)
+    k = 0
+    for i in range(len(c) - 3, 1, -1):
+        if k >= keep:
+            break
+        if (h[i] - l[i]) / pv < min_size_pips:
+            continue
+        if (c[i] > o[i] and c[i + 1] > h[i]) or (c[i] < o[i] and c[i + 1] < l[i]):
+            out[k] = i
+            k += 1
+    return out[:k][::-1].copy()
+
+
+@njit(cache=True)
+def fair_value_gap_indices(h, l, pv, min_pips, max_pips, keep):
+    out = np.empty(max(keep, 0), dtype=np.int64)
+    k = 0
+    for i in range(len(h) - 2, 0, -1):
+        if k >= keep:
+            break
+        bull_gap = (l[i + 1] - h[i - 1]) / pv
+        bear_gap = (l[i - 1] - h[i + 1]) / pv
+        if ((l[i + 1] > h[i - 1] and bull_gap >= min_pips and bull_gap <= max_pips)
+                or (h[i + 1] < l[i - 1] and bear_gap >= min_pips and bear_gap <= max_pips)):
+            out[k] = i
+            k += 1
+    return out[:k][::-1].copy()
+
+
+@njit(cache=True)
+def breaker_candidates(h, l, c, keep):
+    n = max(len(c) - 7, 0)
+    index = np.empty(n, dtype=np.int64)
+    support = np.empty(n)
+    resistance = np.empty(n)
+    bull = np.empty(n, dtype=np.bool_)
+    bear = np.empty(n, dtype=np.bool_)
+    k = 0
+    found = 0
+    for i in range(len(c) - 3, 4, -1):
+        if found >= keep:
+            break
+        lo = l[i - 5]
+        hi = h[i - 5]
+        for j in range(i - 4, i):
+            lo = min(lo, l[j])
+            hi = max(hi, h[j])
+        is_bull = l[i] < lo and c[i] > lo
+        is_bear = h[i] > hi and c[i] < hi
+        if is_bull or is_bear:
+            index[k] = i
+            support[k] = lo
+            resistance[k] = hi
+            bull[k] = is_bull
+            bear[k] = is_bear
+            k += 1
+            found += int(is_bull) + int(is_bear)
+    return (index[:k][::-1].copy(), support[:k][::-1].copy(), resistance[:k][::-1].copy(),
+            bull[:k][::-1].copy(), bear[:k][::-1].copy())
@@ -0,0 +1,328 @@
+# panel.py
+"""Vectorised pre-screen of the whole watchlist.
+
+``generate_signal`` / ``generate_swing_signal`` walk lists of order-block and
+FVG dicts in Python for one symbol at a time. The panel stacks each
+timeframe's bars into (symbols x bars) matrices and evaluates the necessary
+conditions of those generators -- trend scores, BOS, ATR-based stops, OB and
+FVG proximity, spread -- for every symbol in a handful of array operations.
+Only symbols that pass go through the detailed per-symbol path, which still
+makes the final decision, so the screen can skip work but never add a signal.
+
+Vetoes the screen doesn't model (ChoCH, breaker blocks) are left to the
+detailed path. Values built from floating-point sums (EMA, ATR) are compared
+with a small tolerance in the permissive direction, so rounding differences
+from TA-Lib can't screen out a symbol that would have produced a signal.
+"""
+import numpy as np
+
+from config import Config
+from recording.journal import KIND_SCALP, KIND_SWING
+
+
+# Bars per timeframe used by the scalp and swing generators
+SCALP_BARS = {"M15": 200, "H1": 100}
+SWING_BARS = {"H1": 300, "H4": 200, "D1": 100}
+
+TOLERANCE = 1e-9
+FIELDS = ("open", "high", "low", "close", "tick_volume")
+
+
+class Panel:
+    """One timeframe's OHLCV for many symbols as right-aligned (symbols x bars) matrices.
+
+    Rows with fewer than ``width`` bars are padded with NaN on the left;
+    ``lengths`` holds each row's real bar count.
+    """
+
+    def __init__(self, rates_list, width):
+        rates_list = [r[-width:] if r is not None else () for r in rates_list]
+        self.width = width
+        self.lengths = np.array([len(r) for r in rates_list], dtype=np.int64)
+        self.start = width - self.lengths
+
+        dtype = next((r.dtype for r in rates_list if len(r)), None)
+        if dtype is None:
+            columns = [np.full((len(rates_list), width), np.nan) for _ in FIELDS]
+        else:
+            # One raw byte copy per row (much cheaper than structured assignment),
+            # then one cast per field
+            block = np.zeros((len(rates_list), width), dtype=dtype)
+            raw = block.view(np.uint8).reshape(len(rates_list), -1)
+            for row, rates in enumerate(rates_list):
+                if len(rates):
+                    raw[row, (width - len(rates)) * dtype.itemsize:] = \
+                        np.ascontiguousarray(rates, dtype=dtype).view(np.uint8)
+            columns = [block[name].astype(np.float64) for name in FIELDS]
+            if (self.start > 0).any():
+                padding = ~self.columns(0, 0)
+                for values in columns:
+                    values[padding] = np.nan
+        self.open, self.high, self.low, self.close, self.volume = columns
+
+    def columns(self, first, last_gap):
+        """Mask of bars at row index ``first <= i < length - last_gap``."""
+        col = np.arange(self.width)
+        return (col >= (self.start + first)[:, None]) & (col < self.width - last_gap)
+
+
+def _shift(values, periods):
+    """Shift columns right (``periods`` > 0) or left, filling with NaN."""
+    out = np.full_like(values, np.nan)
+    if periods > 0:
+        out[:, periods:] = values[:, :-periods]
+    else:
+        out[:, :periods] = values[:, -periods:]
+    return out
+
+
+def _keep_last(mask, keep):
+    """Only the last ``keep`` True entries of each row."""
+    rank = np.cumsum(mask[:, ::-1], axis=1)[:, ::-1]
+    return mask & (rank <= keep)
+
+
+def _smoothing_weights(n, period, alpha):
+    """Weights w so that ``x @ w`` is the last value of a SMA-seeded exponential smoothing.
+
+    Matches TA-Lib's EMA/ATR: the first output is the mean of the first
+    ``period`` values, then ``y = alpha * x + (1 - alpha) * y``.
+    """
+    w = np.empty(n)
+    w[:period] = (1 - alpha) ** (n - period) / period
+    w[period:] = alpha * (1 - alpha) ** np.arange(n - period - 1, -1, -1)
+    return w
+
+
+def _smoothed_last(values, lengths, period, alpha):
+    out = np.full(len(lengths), np.nan)
+    for n in np.unique(lengths):
+        if n < period:
+            continue  # TA-Lib returns NaN until it has a full period
+        rows = lengths == n
+        out[rows] = values[rows, values.shape[1] - n:] @ _smoothing_weights(n, period, alpha)
+    return out
+
+
+def ema_last(panel, period):
+    """Last EMA(close, period) of every row."""
+    return _smoothed_last(panel.close, panel.lengths, period, 2.0 / (period + 1))
+
+
+def atr_last(panel, period=14):
+    """Last ATR(period) of every row (Wilder smoothing of the true range)."""
+    prev_close = panel.close[:, :-1]
+    high, low = panel.high[:, 1:], panel.low[:, 1:]
+    true_range = np.maximum(high - low, np.maximum(np.abs(high - prev_close), np.abs(low - prev_close)))
+    return _smoothed_last(true_range, np.maximum(panel.lengths - 1, 0), period, 1.0 / period)
+
+
+def trend_scores(panel):
+    """Bounds of ``analyze_trend``'s score: (ties counted as up, ties counted as down)."""
+    close = panel.close[:, -1]
+    ema_8, ema_21, ema_55 = (ema_last(panel, p) for p in (8, 21, 55))
+    tol = TOLERANCE * np.abs(close)
+    high = np.zeros(len(close), dtype=np.int64)
+    low = np.zeros(len(close), dtype=np.int64)
+    for a, b in ((close, ema_8), (ema_8, ema_21), (ema_21, ema_55)):
+        high += a - b > -tol
+        low += a - b > tol
+    momentum = close > panel.close[:, -5]
+    return high + momentum, low + momentum
+
+
+def _last_two(mask, values):
+    """Values at the last and second-to-last True column of each row (NaN if missing)."""
+    rank = np.cumsum(mask[:, ::-1], axis=1)[:, ::-1]
+    rows = np.arange(len(mask))
+
+    def pick(sel):
+        return np.where(sel.any(axis=1), values[rows, sel.argmax(axis=1)], np.nan)
+
+    return pick(mask & (rank == 1)), pick(mask & (rank == 2)), rank[:, 0]
+
+
+def break_of_structure(panel):
+    """(bullish, bearish) masks matching ``detect_break_of_structure``."""
+    high, low = panel.high, panel.low
+    inner = panel.columns(2, 2)
+    swing_high = inner & (high > _shift(high, 1)) & (high > _shift(high, -1))
+    swing_low = inner & (low < _shift(low, 1)) & (low < _shift(low, -1))
+    last_high, prev_high, high_count = _last_two(swing_high, high)
+    last_low, prev_low, low_count = _last_two(swing_low, low)
+
+    enough = (panel.lengths >= 10) & (high_count >= 2) & (low_count >= 2)
+    bullish = enough & (high[:, -1] > last_high) & (last_high > prev_high)
+    bearish = enough & ~bullish & (low[:, -1] < last_low) & (last_low < prev_low)
+    return bullish, bearish
+
+
+def order_block_hits(panel, pv, atr, bid, ask, min_size, stop_mult, keep,
+                     max_distance, min_strength, min_stop, max_stop):
+    """Kept OB count and whether any OB supports a buy / a sell at the current quote.
+
+    Mirrors ``SMCStrategies._order_blocks`` plus the generators' distance,
+    strength and stop-range checks.
+    """
+    o, h, l, c, vol = panel.open, panel.high, panel.low, panel.close, panel.volume
+    pv = pv[:, None]
+    next_close = _shift(c, -1)
+    big = (h - l) / pv >= min_size
+    inner = panel.columns(2, 2)
+    bullish = inner & (c > o) & (next_close > h) & big
+    bearish = inner & (c < o) & (next_close < l) & big
+    kept = _keep_last(bullish | bearish, keep)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        strong = vol / _shift(vol, 1) >= min_strength
+    stop_offset = (atr / pv[:, 0])[:, None] * stop_mult * pv
+    ask, bid = ask[:, None], bid[:, None]
+
+    dist = (ask - l) / pv
+    stop_pips = (ask - (l - stop_offset)) / pv
+    buy = (kept & bullish & strong & (dist >= 0) & (dist <= max_distance)
+           & (stop_pips >= min_stop - TOLERANCE) & (stop_pips <= max_stop + TOLERANCE))
+
+    dist = (h - bid) / pv
+    stop_pips = ((h + stop_offset) - bid) / pv
+    sell = (kept & bearish & strong & (dist >= 0) & (dist <= max_distance)
+            & (stop_pips >= min_stop - TOLERANCE) & (stop_pips <= max_stop + TOLERANCE))
+    return kept.sum(axis=1), buy.any(axis=1), sell.any(axis=1)
+
+
+def fair_value_gap_hits(panel, pv, bid, ask, min_pips, max_pips, keep):
+    """Kept FVG count and whether the ask / bid sits inside a bullish / bearish gap."""
+    h, l = panel.high, panel.low
+    pv = pv[:, None]
+    prev_high, prev_low = _shift(h, 1), _shift(l, 1)
+    next_high, next_low = _shift(h, -1), _shift(l, -1)
+    inner = panel.columns(1, 1)
+    bull_gap = (next_low - prev_high) / pv
+    bear_gap = (prev_low - next_high) / pv
+    bullish = inner & (next_low > prev_high) & (bull_gap >= min_pips) & (bull_gap <= max_pips)
+    bearish = inner & (next_high < prev_low) & (bear_gap >= min_pips) & (bear_gap <= max_pips)
+    kept = _keep_last(bullish | bearish, keep)
+
+    ask, bid = ask[:, None], bid[:, None]
+    buy = kept & bullish & (prev_high <= ask) & (ask <= next_low)
+    sell = kept & bearish & (next_high <= bid) & (bid <= prev_low)
+    return kept.sum(axis=1), buy.any(axis=1), sell.any(axis=1)
+
+
+def _trend_name(score):
+    return "bullish" if score >= 3 else "bearish" if score <= 1 else "ranging"
+
+
+class PanelScreen:
+    """Candidate masks and journal fields of one screening pass."""
+
+    def __init__(self, symbols):
+        self.index = {sym: i for i, sym in enumerate(symbols)}
+        self.results = {}   # {kind: {name: array over symbols}}
+
+    def candidate(self, kind, symbol):
+        result = self.results.get(kind)
+        if result is None or symbol not in self.index:
+            return True   # not screened: use the detailed path
+        return bool(result["candidate"][self.index[symbol]])
+
+    @property
+    def candidates(self):
+        """{kind: number of symbols passed to the detailed path}."""
+        return {kind: int(result["candidate"].sum()) for kind, result in self.results.items()}
+
+    def annotate(self, data, kind):
+        """Fill ``data['analysis']`` / ``data['reason']`` for a screened-out symbol."""
+        r = self.results[kind]
+        i = self.index[data['symbol']]
+        bos = "bullish" if r["bos_bull"][i] else "bearish" if r["bos_bear"][i] else None
+        data['analysis'] = {
+            'trend': {'trend': _trend_name(r["trend"][i]), 'score': int(r["trend"][i])},
+            'trend_entry': {'trend': _trend_name(r["trend_entry"][i]), 'score': int(r["trend_entry"][i])},
+            'bos': {'type': bos} if bos else None,
+            'choch': None,
+            'ob_count': int(r["ob_count"][i]),
+            'fvg_count': int(r["fvg_count"][i]),
+        }
+        data['reason'] = 'no_setup' if bos else 'no_bos'
+
+
+class SignalPanel:
+    """Per-symbol parameter vectors and the scalp/swing screens for a watchlist."""
+
+    def __init__(self, symbols):
+        self.config = Config
+        self.symbols = list(symbols)
+        self.index = {sym: i for i, sym in enumerate(self.symbols)}
+        sym_cfgs = [self.config.SYMBOLS[sym] for sym in self.symbols]
+        self.pip_value = np.array([c["pip_value"] for c in sym_cfgs], dtype=np.float64)
+        self.max_spread = np.array(
+            [c.get("max_spread", self.config.MAX_SPREAD_PIPS) for c in sym_cfgs], dtype=np.float64)
+        self.swing_max_spread = np.array(
+            [c.get("swing_max_spread", self.config.SWING_MAX_SPREAD_PIPS) for c in sym_cfgs], dtype=np.float64)
+
+    def _evaluate(self, bias, entry, structure, setup, pv, bid, ask, spread_ok, ob, fvg):
+        """Shared screen: ``bias``/``entry`` trends, BOS on ``structure``, OB/FVG on ``setup``."""
+        bias_high, bias_low = trend_scores(bias)
+        entry_high, entry_low = trend_scores(entry)
+        bos_bull, bos_bear = break_of_structure(structure)
+        atr = atr_last(setup)
+        ob_count, ob_buy, ob_sell = order_block_hits(setup, pv, atr, bid, ask, **ob)
+        fvg_count, fvg_buy, fvg_sell = fair_value_gap_hits(setup, pv, bid, ask, **fvg)
+
+        buy = (bias_high >= 3) & (entry_high >= 2) & bos_bull & ob_buy & fvg_buy
+        sell = (bias_low <= 1) & (entry_low <= 2) & bos_bear & ob_sell & fvg_sell
+        return {
+            "candidate": spread_ok & (buy | sell),
+            "trend": bias_high,
+            "trend_entry": entry_high,
+            "bos_bull": bos_bull,
+            "bos_bear": bos_bear,
+            "ob_count": ob_count,
+            "fvg_count": fvg_count,
+        }
+
+    def screen(self, market_data, bar_cache=None):
+        """Screen every symbol in ``market_data`` (dicts from ``get_market_data``).
+
+        Swing is screened too when ``bar_cache`` is given and swing trading is on.
+        """
+        cfg = self.config
+        symbols = [d['symbol'] for d in market_data]
+        result = PanelScreen(symbols)
+        if not symbols:
+            return result
+
+        rows = np.array([self.index[sym] for sym in symbols])
+        pv = self.pip_value[rows]
+        bid = np.array([d['bid'] for d in market_data], dtype=np.float64)
+        ask = np.array([d['ask'] for d in market_data], dtype=np.float64)
+        spread = np.array([d['spread'] for d in market_data], dtype=np.float64)
+
+        m15 = Panel([d['m15'].rates for d in market_data], SCALP_BARS["M15"])
+        h1 = Panel([d['h1'].rates for d in market_data], SCALP_BARS["H1"])
+        result.results[KIND_SCALP] = self._evaluate(
+            bias=h1, entry=m15, structure=h1, setup=m15, pv=pv, bid=bid, ask=ask,
+            spread_ok=spread <= self.max_spread[rows],
+            ob=dict(min_size=cfg.MIN_OB_SIZE_PIPS, stop_mult=0.4, keep=8,
+                    max_distance=cfg.MAX_OB_DISTANCE_PIPS, min_strength=cfg.MIN_OB_STRENGTH,
+                    min_stop=cfg.MIN_STOP_PIPS, max_stop=cfg.MAX_STOP_PIPS),
+            fvg=dict(min_pips=cfg.MIN_FVG_PIPS, max_pips=cfg.MAX_FVG_PIPS, keep=12),
+        )
+
+        if bar_cache is not None and cfg.SWING_ENABLED:
+            swing = {tf: [bar_cache.get_rates(sym, tf, count) for sym in symbols]
+                     for tf, count in SWING_BARS.items()}
+            missing = np.array([any(swing[tf][i] is None for tf in SWING_BARS) for i in range(len(symbols))])
+            h1s, h4, d1 = (Panel(swing[tf], count) for tf, count in SWING_BARS.items())
+            result.results[KIND_SWING] = self._evaluate(
+                bias=d1, entry=h4, structure=h4, setup=h1s, pv=pv, bid=bid, ask=ask,
+                spread_ok=spread <= self.swing_max_spread[rows],
+                ob=dict(min_size=cfg.SWING_MIN_OB_SIZE_PIPS, stop_mult=0.5, keep=6,
+                        max_distance=cfg.SWING_MAX_OB_DISTANCE_PIPS, min_strength=cfg.SWING_MIN_OB_STRENGTH,
+                        min_stop=cfg.SWING_MIN_STOP_PIPS, max_stop=cfg.SWING_MAX_STOP_PIPS),
+                fvg=dict(min_pips=cfg.SWING_MIN_FVG_PIPS, max_pips=cfg.SWING_MAX_FVG_PIPS, keep=8),
+            )
+            # Symbols without swing bars keep the detailed path (it handles the missing data)
+            result.results[KIND_SWING]["candidate"] |= missing
+        return result
@@ -1,106 +1,132 @@
 # smc_strategies.py
-import pandas as pd
 import numpy as np
 import talib
 from config import Config
+from market_data.bars import as_bars
+from strategies.kernels import load_backend, warm_up
 
 
 class SMCStrategies:
-    """Smart Money Concepts - Multi-Symbol"""
+    """Smart Money Concepts - Multi-Symbol
 
-    def __init__(self):
+    Detectors accept either a ``Bars`` container or a time-indexed DataFrame.
+    Their inner scans run on the kernel backend picked by
+    ``Config.DETECTOR_BACKEND`` (see strategies/kernels.py).
+    """
+
+    def __init__(self, backend=None):
         self.config = Config
+        self.kernels = load_backend(backend or self.config.DETECTOR_BACKEND)
+
+    def warm_up(self):
+        """Compile/load the detector kernels; returns the elapsed ms."""
+        return warm_up(self.kernels)
+
+    @staticmethod
+    def _f64(values):
+        """TA-Lib only accepts contiguous float64 input."""
+        return np.ascontiguousarray(values, dtype=np.float64)
+
+    @staticmethod
+    def _prices(values):
+        """float64 view of a price column (copies only float32 storage)."""
+        return np.asarray(values, dtype=np.float64)
 
     def calculate_atr_pips(self, df, pip_value=None):
         """Calculate ATR in pips"""
         pv = pip_value or self.config.PIP_VALUE
-        atr = talib.ATR(df["high"], df["low"], df["close"], timeperiod=14)
-        return atr.iloc[-1] / pv
+        bars = as_bars(df)
+        atr = talib.ATR(self._f64(bars.high), self._f64(bars.low), self._f64(bars.close), timeperiod=14)
+        return atr[-1] / pv
+
+    def _order_blocks(self, bars, pv, min_size_pips, stop_atr_mult, keep):
+        """Shared OB scan: candle followed by a close beyond its range."""
+        atr_pips = self.calculate_atr_pips(bars, pv)
+        o, h, l, c = (self._prices(col) for col in (bars.open, bars.high, bars.low, bars.close))
+        vol = bars.tick_volume.astype(np.float64)
+        if len(bars) < 5:
+            return []
 
-    def identify_order_blocks(self, df, pip_value=None):
-        """Find institutional order blocks"""
-        pv = pip_value or self.config.PIP_VALUE
         order_blocks = []
-        atr_pips = self.calculate_atr_pips(df, pv)
-
-        for i in range(2, len(df) - 2):
-            candle = df.iloc[i]
-            next_candle = df.iloc[i + 1]
-
-            if (candle["close"] > candle["open"]
-                    and next_candle["close"] > candle["high"]):
-                ob_size = (candle["high"] - candle["low"]) / pv
-                if ob_size >= self.config.MIN_OB_SIZE_PIPS:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for j in self.kernels.order_block_indices(
+                    o, h, l, c, float(pv), float(min_size_pips), keep):
+                strength = vol[j] / vol[j - 1]
+                if c[j] > o[j]:
                     order_blocks.append({
                         "type": "bullish",
-                        "price": candle["low"],
-                        "stop": candle["low"] - (atr_pips * 0.4 * pv),
-                        "strength": candle["tick_volume"] / df.iloc[i - 1]["tick_volume"],
-                        "time": candle.name,
+                        "price": l[j],
+                        "stop": l[j] - (atr_pips * stop_atr_mult * pv),
+                        "strength": strength,
+                        "time": bars.label(j),
                     })
-
-            if (candle["close"] < candle["open"]
-                    and next_candle["close"] < candle["low"]):
-                ob_size = (candle["high"] - candle["low"]) / pv
-                if ob_size >= self.config.MIN_OB_SIZE_PIPS:
+                else:
                     order_blocks.append({
                         "type": "bearish",
-                        "price": candle["high"],
-                        "stop": candle["high"] + (atr_pips * 0.4 * pv),
-                        "strength": candle["tick_volume"] / df.iloc[i - 1]["tick_volume"],
-                        "time": candle.name,
+                        "price": h[j],
+                        "stop": h[j] + (atr_pips * stop_atr_mult * pv),
+                        "strength": strength,
+                        "time": bars.label(j),
                     })
+        return order_blocks
 
-        return order_blocks[-8:]
+    def _fair_value_gaps(self, bars, pv, min_pips, max_pips, keep):
+        """Shared FVG scan: gap between candle i-1 and candle i+1."""
+        h, l = self._prices(bars.high), self._prices(bars.low)
+        if len(bars) < 3:
+            return []
 
-    def identify_fair_value_gaps(self, df, pip_value=None):
-        """Find Fair Value Gaps"""
-        pv = pip_value or self.config.PIP_VALUE
         fvgs = []
+        for j in self.kernels.fair_value_gap_indices(h, l, float(pv), float(min_pips), float(max_pips), keep):
+            if l[j + 1] > h[j - 1]:
+                fvgs.append({
+                    "type": "bullish",
+                    "top": l[j + 1],
+                    "bottom": h[j - 1],
+                    "mid": (l[j + 1] + h[j - 1]) / 2,
+                    "size": (l[j + 1] - h[j - 1]) / pv,
+                    "time": bars.label(j),
+                })
+            else:
+                fvgs.append({
+                    "type": "bearish",
+                    "top": l[j - 1],
+                    "bottom": h[j + 1],
+                    "mid": (l[j - 1] + h[j + 1]) / 2,
+                    "size": (l[j - 1] - h[j + 1]) / pv,
+                    "time": bars.label(j),
+                })
+        return fvgs
 
-        for i in range(1, len(df) - 1):
-            if df.iloc[i + 1]["low"] > df.iloc[i - 1]["high"]:
-                gap_pips = (df.iloc[i + 1]["low"] - df.iloc[i - 1]["high"]) / pv
-                if self.config.MIN_FVG_PIPS <= gap_pips <= self.config.MAX_FVG_PIPS:
-                    fvgs.append({
-                        "type": "bullish",
-                        "top": df.iloc[i + 1]["low"],
-                        "bottom": df.iloc[i - 1]["high"],
-                        "mid": (df.iloc[i + 1]["low"] + df.iloc[i - 1]["high"]) / 2,
-                        "size": gap_pips,
-                        "time": df.iloc[i].name,
-                    })
-
-            if df.iloc[i + 1]["high"] < df.iloc[i - 1]["low"]:
-                gap_pips = (df.iloc[i - 1]["low"] - df.iloc[i + 1]["high"]) / pv
-                if self.config.MIN_FVG_PIPS <= gap_pips <= self.config.MAX_FVG_PIPS:
-                    fvgs.append({
-                        "type": "bearish",
-                        "top": df.iloc[i - 1]["low"],
-                        "bottom": df.iloc[i + 1]["high"],
-                        "mid": (df.iloc[i - 1]["low"] + df.iloc[i + 1]["high"]) / 2,
-                        "size": gap_pips,
-                        "time": df.iloc[i].name,
-                    })
+    def identify_order_blocks(self, df, pip_value=None):
+        """Find institutional order blocks"""
+        pv = pip_value or self.config.PIP_VALUE
+        return self._order_blocks(as_bars(df), pv, self.config.MIN_OB_SIZE_PIPS, 0.4, 8)
 
-        return fvgs[-12:]
+    def identify_fair_value_gaps(self, df, pip_value=None):
+        """Find Fair Value Gaps"""
+        pv = pip_value or self.config.PIP_VALUE
+        return self._fair_value_gaps(
+            as_bars(df), pv, self.config.MIN_FVG_PIPS, self.config.MAX_FVG_PIPS, 12
+        )
 
     def analyze_trend(self, df):
         """Determine market structure"""
-        ema_8 = talib.EMA(df["close"], timeperiod=8)
-        ema_21 = talib.EMA(df["close"], timeperiod=21)
-        ema_55 = talib.EMA(df["close"], timeperiod=55)
+        close = self._f64(as_bars(df).close)
+        ema_8 = talib.EMA(close, timeperiod=8)
+        ema_21 = talib.EMA(close, timeperiod=21)
+        ema_55 = talib.EMA(close, timeperiod=55)
 
-        current_price = df["close"].iloc[-1]
+        current_price = close[-1]
 
         score = 0
-        if current_price > ema_8.iloc[-1]:
+        if current_price > ema_8[-1]:
             score += 1
-        if ema_8.iloc[-1] > ema_21.iloc[-1]:
+        if ema_8[-1] > ema_21[-1]:
             score += 1
-        if ema_21.iloc[-1] > ema_55.iloc[-1]:
+        if ema_21[-1] > ema_55[-1]:
             score += 1
-        if df["close"].iloc[-1] > df["close"].iloc[-5]:
+        if close[-1] > close[-5]:
             score += 1
 
         if score >= 3:
@@ -119,35 +145,27 @@ class SMCStrategies:
         Bearish BOS: Price breaks below previous swing low
         """
         pv = pip_value or self.config.PIP_VALUE
+        bars = as_bars(df)
         
-        if len(df) < 10:
+        if len(bars) < 10:
             return None
         
-        # Find last 3 swing highs and lows
-        highs = []
-        lows = []
-        
-        for i in range(2, len(df) - 2):
-            # Swing high: bar with higher high on both sides
-            if df['high'].iloc[i] > df['high'].iloc[i-1] and df['high'].iloc[i] > df['high'].iloc[i+1]:
-                highs.append({'price': df['high'].iloc[i], 'idx': i, 'time': df.index[i]})
-            
-            # Swing low: bar with lower low on both sides
-            if df['low'].iloc[i] < df['low'].iloc[i-1] and df['low'].iloc[i] < df['low'].iloc[i+1]:
-                lows.append({'price': df['low'].iloc[i], 'idx': i, 'time': df.index[i]})
+        # Swing high: bar with higher high on both sides
+        # Swing low: bar with lower low on both sides
+        high, low = self._prices(bars.high), self._prices(bars.low)
+        last_hi, prev_hi, last_lo, prev_lo = self.kernels.last_swings(high, low)
         
-        if len(highs) < 2 or len(lows) < 2:
+        if prev_hi < 0 or prev_lo < 0:
             return None
         
-        current_price = df['close'].iloc[-1]
-        current_high = df['high'].iloc[-1]
-        current_low = df['low'].iloc[-1]
+        current_high = high[-1]
+        current_low = low[-1]
         
         # Get last two swings
-        last_high = highs[-1]['price']
-        last_low = lows[-1]['price']
-        prev_high = highs[-2]['price'] if len(highs) >= 2 else 0
-        prev_low = lows[-2]['price'] if len(lows) >= 2 else float('inf')
+        last_high = high[last_hi]
+        last_low = low[last_lo]
+        prev_high = high[prev_hi]
+        prev_low = low[prev_lo]
         
         bos = None
         
@@ -158,7 +176,7 @@ class SMCStrategies:
                 "level": last_high,
                 "price": current_high,
                 "strength": (current_high - last_high) / pv,
-                "time": df.index[-1],
+                "time": bars.label(-1),
             }
         
         # Bearish BOS: Price breaks below previous swing low
@@ -168,7 +186,7 @@ class SMCStrategies:
                 "level": last_low,
                 "price": current_low,
                 "strength": (last_low - current_low) / pv,
-                "time": df.index[-1],
+                "time": bars.label(-1),
             }
         
         return bos
@@ -179,22 +197,25 @@ class SMCStrategies:
         Indicates potential trend reversal or significant volatility shift.
         """
         pv = pip_value or self.config.PIP_VALUE
+        bars = as_bars(df)
         
-        if len(df) < 20:
+        if len(bars) < 20:
             return None
         
-        recent = df.tail(10)
-        historical = df.tail(50)
+        recent = bars.tail(10)
+        historical = bars.tail(50)
         
         # Calculate ATR for volatility comparison
-        recent_atr = talib.ATR(recent['high'], recent['low'], recent['close'], timeperiod=9)
-        historical_atr = talib.ATR(historical['high'], historical['low'], historical['close'], timeperiod=14)
+        recent_atr = talib.ATR(self._f64(recent.high), self._f64(recent.low),
+                               self._f64(recent.close), timeperiod=9)
+        historical_atr = talib.ATR(self._f64(historical.high), self._f64(historical.low),
+                                   self._f64(historical.close), timeperiod=14)
         
         if len(recent_atr) == 0 or len(historical_atr) == 0:
             return None
         
-        recent_vol = recent_atr.iloc[-1]
-        historical_vol = historical_atr.iloc[-1]
+        recent_vol = recent_atr[-1]
+        historical_vol = historical_atr[-1]
         
         if historical_vol == 0:
             return None
@@ -202,26 +223,21 @@ class SMCStrategies:
         volatility_ratio = recent_vol / historical_vol
         
         # Detect structure change in price action
-        recent_highs = recent['high'].values
-        recent_lows = recent['low'].values
-        historical_highs = historical['high'].values
-        historical_lows = historical['low'].values
-        
-        recent_range = recent_highs.max() - recent_lows.min()
-        historical_range = historical_highs.max() - historical_lows.min()
+        recent_range = recent.high.max() - recent.low.min()
+        historical_range = historical.high.max() - historical.low.min()
         
         choch = None
         
         # Significant volatility increase + structure change
         if volatility_ratio > 1.4:
             # Check if price is extending higher or lower
-            if recent['close'].iloc[-1] > recent['close'].iloc[-5]:
+            if recent.close[-1] > recent.close[-5]:
                 if recent_range > historical_range * 0.7:
                     choch = {
                         "type": "bullish",
                         "reason": "increased_volatility_bullish",
                         "volatility_ratio": volatility_ratio,
-                        "time": df.index[-1],
+                        "time": bars.label(-1),
                     }
             else:
                 if recent_range > historical_range * 0.7:
@@ -229,7 +245,7 @@ class SMCStrategies:
                         "type": "bearish",
                         "reason": "increased_volatility_bearish",
                         "volatility_ratio": volatility_ratio,
-                        "time": df.index[-1],
+                        "time": bars.label(-1),
                     }
         
         return choch
@@ -241,23 +257,22 @@ class SMCStrategies:
         Sell-side liquidity: Below recent lows (where long stops sit)
         """
         pv = pip_value or self.config.PIP_VALUE
+        bars = as_bars(df)
         
-        if len(df) < 20:
+        if len(bars) < 20:
             return []
         
-        recent = df.tail(50)
+        recent = bars.tail(50)
+        high, low = self._prices(recent.high), self._prices(recent.low)
+        last_close = self._prices(recent.close)[-1]
         liquidity_zones = []
         
         if direction == 'buy':
             # Find recent swing highs (sell-side liquidity above)
-            highs = []
-            for i in range(2, len(recent) - 2):
-                if recent['high'].iloc[i] > recent['high'].iloc[i-1] and recent['high'].iloc[i] > recent['high'].iloc[i+1]:
-                    highs.append({
-                        'level': recent['high'].iloc[i],
-                        'volume': recent['tick_volume'].iloc[i],
-                        'idx': i
-                    })
+            highs = [
+                {'level': high[i], 'volume': recent.tick_volume[i], 'idx': i}
+                for i in self.kernels.swing_highs(high)
+            ]
             
             # Get top 3 liquidity zones
             if highs:
@@ -266,20 +281,16 @@ class SMCStrategies:
                     liquidity_zones.append({
                         "type": "sell_side_liquidity",
                         "level": hi['level'],
-                        "distance": (hi['level'] - recent['close'].iloc[-1]) / pv,
+                        "distance": (hi['level'] - last_close) / pv,
                         "strength": hi['volume']
                     })
         
         else:  # direction == 'sell'
             # Find recent swing lows (buy-side liquidity below)
-            lows = []
-            for i in range(2, len(recent) - 2):
-                if recent['low'].iloc[i] < recent['low'].iloc[i-1] and recent['low'].iloc[i] < recent['low'].iloc[i+1]:
-                    lows.append({
-                        'level': recent['low'].iloc[i],
-                        'volume': recent['tick_volume'].iloc[i],
-                        'idx': i
-                    })
+            lows = [
+                {'level': low[i], 'volume': recent.tick_volume[i], 'idx': i}
+                for i in self.kernels.swing_lows(low)
+            ]
             
             # Get top 3 liquidity zones
             if lows:
@@ -288,7 +299,7 @@ class SMCStrategies:
                     liquidity_zones.append({
                         "type": "buy_side_liquidity",
                         "level": lo['level'],
-                        "distance": (recent['close'].iloc[-1] - lo['level']) / pv,
+                        "distance": (last_close - lo['level']) / pv,
                         "strength": lo['volume']
                     })
         
@@ -301,34 +312,38 @@ class SMCStrategies:
         indicating strong rejection by smart money.
         """
         pv = pip_value or self.config.PIP_VALUE
+        bars = as_bars(df)
         breaker_blocks = []
         
-        if len(df) < 15:
+        if len(bars) < 15:
             return []
         
-        recent = df.tail(30)
+        recent = bars.tail(30)
+        h, l, c = (self._prices(col) for col in (recent.high, recent.low, recent.close))
+        last_close = c[-1]
+        
+        # Support/resistance = extreme of the 5 bars before each candidate.
+        # Bullish breaker: major support broken but closes above it;
+        # bearish breaker: major resistance broken but closes below it.
+        i, support, resistance, bull, bear = self.kernels.breaker_candidates(h, l, c, 4)
         
-        for i in range(5, len(recent) - 2):
-            # Bullish breaker: Major support broken but closes above it
-            support_level = recent['low'].iloc[i-5:i].min()
-            if recent['low'].iloc[i] < support_level and recent['close'].iloc[i] > support_level:
+        for k in range(len(i)):
+            j = i[k]
+            if bull[k]:
                 breaker_blocks.append({
                     "type": "bullish_breaker",
-                    "level": support_level,
-                    "current_price": recent['close'].iloc[-1],
-                    "distance": (recent['close'].iloc[-1] - support_level) / pv,
-                    "strength": (recent['close'].iloc[i] - recent['low'].iloc[i]) / pv
+                    "level": support[k],
+                    "current_price": last_close,
+                    "distance": (last_close - support[k]) / pv,
+                    "strength": (c[j] - l[j]) / pv
                 })
-            
-            # Bearish breaker: Major resistance broken but closes below it
-            resistance_level = recent['high'].iloc[i-5:i].max()
-            if recent['high'].iloc[i] > resistance_level and recent['close'].iloc[i] < resistance_level:
+            if bear[k]:
                 breaker_blocks.append({
                     "type": "bearish_breaker",
-                    "level": resistance_level,
-                    "current_price": recent['close'].iloc[-1],
-                    "distance": (resistance_level - recent['close'].iloc[-1]) / pv,
-                    "strength": (recent['high'].iloc[i] - recent['close'].iloc[i]) / pv
+                    "level": resistance[k],
+                    "current_price": last_close,
+                    "distance": (resistance[k] - last_close) / pv,
+                    "strength": (h[j] - c[j]) / pv
                 })
         
         return breaker_blocks[-4:]
@@ -338,67 +353,11 @@ class SMCStrategies:
     def identify_order_blocks_swing(self, df, pip_value=None):
         """Find order blocks with swing-width filters."""
         pv = pip_value or self.config.PIP_VALUE
-        order_blocks = []
-        atr_pips = self.calculate_atr_pips(df, pv)
-
-        for i in range(2, len(df) - 2):
-            candle = df.iloc[i]
-            next_candle = df.iloc[i + 1]
-
-            if (candle["close"] > candle["open"]
-                    and next_candle["close"] > candle["high"]):
-                ob_size = (candle["high"] - candle["low"]) / pv
-                if ob_size >= self.config.SWING_MIN_OB_SIZE_PIPS:
-                    order_blocks.append({
-                        "type": "bullish",
-                        "price": candle["low"],
-                        "stop": candle["low"] - (atr_pips * 0.5 * pv),
-                        "strength": candle["tick_volume"] / df.iloc[i - 1]["tick_volume"],
-                        "time": candle.name,
-                    })
-
-            if (candle["close"] < candle["open"]
-                    and next_candle["close"] < candle["low"]):
-                ob_size = (candle["high"] - candle["low"]) / pv
-                if ob_size >= self.config.SWING_MIN_OB_SIZE_PIPS:
-                    order_blocks.append({
-                        "type": "bearish",
-                        "price": candle["high"],
-                        "stop": candle["high"] + (atr_pips * 0.5 * pv),
-                        "strength": candle["tick_volume"] / df.iloc[i - 1]["tick_volume"],
-                        "time": candle.name,
-                    })
-
-        return order_blocks[-6:]
+        return self._order_blocks(as_bars(df), pv, self.config.SWING_MIN_OB_SIZE_PIPS, 0.5, 6)
 
     def identify_fair_value_gaps_swing(self, df, pip_value=None):
         """Find FVGs with swing-width filters."""
         pv = pip_value or self.config.PIP_VALUE
-        fvgs = []
-
-        for i in range(1, len(df) - 1):
-            if df.iloc[i + 1]["low"] > df.iloc[i - 1]["high"]:
-                gap_pips = (df.iloc[i + 1]["low"] - df.iloc[i - 1]["high"]) / pv
-                if self.config.SWING_MIN_FVG_PIPS <= gap_pips <= self.config.SWING_MAX_FVG_PIPS:
-                    fvgs.append({
-                        "type": "bullish",
-                        "top": df.iloc[i + 1]["low"],
-                        "bottom": df.iloc[i - 1]["high"],
-                        "mid": (df.iloc[i + 1]["low"] + df.iloc[i - 1]["high"]) / 2,
-                        "size": gap_pips,
-                        "time": df.iloc[i].name,
-                    })
-
-            if df.iloc[i + 1]["high"] < df.iloc[i - 1]["low"]:
-                gap_pips = (df.iloc[i - 1]["low"] - df.iloc[i + 1]["high"]) / pv
-                if self.config.SWING_MIN_FVG_PIPS <= gap_pips <= self.config.SWING_MAX_FVG_PIPS:
-                    fvgs.append({
-                        "type": "bearish",
-                        "top": df.iloc[i - 1]["low"],
-                        "bottom": df.iloc[i + 1]["high"],
-                        "mid": (df.iloc[i - 1]["low"] + df.iloc[i + 1]["high"]) / 2,
-                        "size": gap_pips,
-                        "time": df.iloc[i].name,
-                    })
-
-        return fvgs[-8:]
+        return self._fair_value_gaps(
+            as_bars(df), pv, self.config.SWING_MIN_FVG_PIPS, self.config.SWING_MAX_FVG_PIPS, 8
+        )
@@ -0,0 +1,182 @@
+# watchlist.py
+"""Two-stage scanning of a large symbol universe (the broker's Market Watch).
+
+Stage 1 ranks the whole universe on cheap H1 features kept per symbol:
+the ``analyze_trend`` score (from the panel's vectorised EMAs), the ATR
+regime (ATR(14) against the long ATR) and the (smoothed) spread as a
+share of the ATR. Stage 2 is the bot's normal M15 pipeline, run only for the
+``WATCHLIST_MAX_ACTIVE`` best-ranked symbols that qualify.
+
+Each loop refreshes the H1 bars and quote of at most
+``WATCHLIST_REFRESH_PER_LOOP`` symbols (round robin), so the terminal
+calls per loop stay bounded however large the universe; ranking is a few
+array operations over stored features. Active symbols are demoted once
+they stop qualifying or fall more than ``WATCHLIST_DEMOTE_MARGIN`` places
+below the cut-off, so symbols near the edge don't flap in and out.
+"""
+import MetaTrader5 as mt5
+import numpy as np
+
+from config import Config
+from strategies.panel import Panel, atr_last, trend_scores
+
+
+H1_BARS = 150          # enough for EMA(55) and the long ATR
+LONG_ATR_PERIOD = 100
+SPREAD_SMOOTHING = 0.2   # EMA weight of each new spread sample
+
+
+def pip_size(info):
+    """Pip of a symbol from its ``symbol_info`` (10 points on 3/5-digit quotes)."""
+    return info.point * 10 if info.digits in (3, 5) else info.point
+
+
+def market_watch(configured, group=None):
+    """{symbol: config} for the visible Market Watch symbols plus ``configured``.
+
+    Hand-picked entries in ``configured`` (Config.SYMBOLS) keep their own
+    spread limits; discovered symbols get a pip value and the defaults.
+    """
+    found = mt5.symbols_get(group=group) if group else mt5.symbols_get()
+    universe = {}
+    for info in found or ():
+        if info.visible:
+            universe[info.name] = configured.get(info.name) or {"pip_value": pip_size(info)}
+    for symbol, sym_cfg in configured.items():
+        universe.setdefault(symbol, sym_cfg)
+    return universe
+
+
+class Watchlist:
+    """Stage-1 features and the active (promoted) set for a symbol universe."""
+
+    def __init__(self):
+        self.config = Config
+        self.symbols = []
+        self.index = {}
+        self.active = []
+        self._next = 0
+        self._rates = {}     # {symbol: H1 rates array}
+
+    def discover(self):
+        """Load the universe from the terminal; returns {symbol: config}."""
+        universe = market_watch(self.config.SYMBOLS, self.config.WATCHLIST_GROUP)
+        self.symbols = list(universe)
+        self.index = {sym: i for i, sym in enumerate(self.symbols)}
+        n = len(self.symbols)
+        self.pip_value = np.array([cfg["pip_value"] for cfg in universe.values()], dtype=np.float64)
+        self.max_spread = np.array(
+            [cfg.get("max_spread", self.config.MAX_SPREAD_PIPS) for cfg in universe.values()], dtype=np.float64)
+        self.trend = np.full(n, 2, dtype=np.int64)     # analyze_trend score (ties counted as up)
+        self.trend_low = np.full(n, 2, dtype=np.int64)  # ... ties counted as down
+        self.atr_pips = np.full(n, np.nan)
+        self.atr_ratio = np.full(n, np.nan)
+        self.spread = np.full(n, np.nan)
+        return universe
+
+    # ── Stage 1 features ──
+
+    def _fetch(self, symbol):
+        """Cached H1 bars of ``symbol``, topped up with the newest bars."""
+        cached = self._rates.get(symbol)
+        if cached is None or len(cached) == 0:
+            rates = mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_H1, 0, H1_BARS)
+        else:
+            fresh = mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_H1, 0, self.config.BASE_REFRESH_BARS)
+            if fresh is None or len(fresh) == 0:
+                return cached
+            if fresh["time"][0] > cached["time"][-1]:
+                rates = mt5.copy_rates_from_pos(symbol, mt5.TIMEFRAME_H1, 0, H1_BARS)
+            else:
+                idx = np.searchsorted(cached["time"], fresh["time"][0], side="left")
+                rates = np.concatenate((cached[:idx], fresh))[-H1_BARS:]
+        if rates is not None and len(rates):
+            self._rates[symbol] = rates
+        return rates
+
+    def refresh(self, symbols):
+        """Recompute the features of ``symbols`` in one vectorised pass."""
+        if not symbols:
+            return
+        rows = np.array([self.index[sym] for sym in symbols])
+        panel = Panel([self._fetch(sym) for sym in symbols], H1_BARS)
+        self.trend[rows], self.trend_low[rows] = trend_scores(panel)
+        atr = atr_last(panel)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.atr_ratio[rows] = atr / atr_last(panel, LONG_ATR_PERIOD)
+        self.atr_pips[rows] = atr / self.pip_value[rows]
+        for row, sym in zip(rows, symbols):
+            tick = mt5.symbol_info_tick(sym)
+            if tick is None:
+                continue
+            # Smoothed, so one wide quote doesn't demote a symbol
+            spread = (tick.ask - tick.bid) / self.pip_value[row]
+            previous = self.spread[row]
+            self.spread[row] = spread if np.isnan(previous) else previous + SPREAD_SMOOTHING * (spread - previous)
+
+    def warm_up(self):
+        """Score the whole universe once and pick the first active set."""
+        self.refresh(self.symbols)
+        return self.rank()
+
+    # ── Ranking ──
+
+    def strength(self):
+        """Trend strength per symbol: 0 ranging, 1-2 trending (either way)."""
+        return np.maximum(np.maximum(self.trend - 2, 2 - self.trend_low), 0)
+
+    def qualifies(self):
+        cfg = self.config
+        with np.errstate(invalid="ignore"):
+            return ((self.strength() >= cfg.WATCHLIST_MIN_TREND_STRENGTH)
+                    & (self.spread <= self.max_spread)
+                    & (self.atr_ratio >= cfg.WATCHLIST_MIN_ATR_RATIO)
+                    & (self.atr_ratio <= cfg.WATCHLIST_MAX_ATR_RATIO))
+
+    def scores(self):
+        """Trend strength less the spread's share of the H1 ATR."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return self.strength() - self.spread / self.atr_pips
+
+    def rank(self):
+        """Update the active set; returns (promoted, demoted) symbols."""
+        qualified = self.qualifies()
+        scores = self.scores()
+        order = [i for i in np.argsort(-scores, kind="stable") if qualified[i]]
+        place = {self.symbols[i]: n for n, i in enumerate(order)}
+
+        limit = self.config.WATCHLIST_MAX_ACTIVE
+        keep_within = limit + self.config.WATCHLIST_DEMOTE_MARGIN
+        active = [sym for sym in self.active if place.get(sym, keep_within) < keep_within][:limit]
+        for i in order:
+            if len(active) >= limit:
+                break
+            if self.symbols[i] not in active:
+                active.append(self.symbols[i])
+
+        promoted = [sym for sym in active if sym not in self.active]
+        demoted = [sym for sym in self.active if sym not in active]
+        self.active = active
+        return promoted, demoted
+
+    def update(self):
+        """One loop's stage 1: refresh the next round-robin slice and re-rank."""
+        count = min(self.config.WATCHLIST_REFRESH_PER_LOOP, len(self.symbols))
+        batch = [self.symbols[(self._next + k) % len(self.symbols)] for k in range(count)]
+        self._next = (self._next + count) % max(len(self.symbols), 1)
+        self.refresh(batch)
+        return self.rank()
+
+    def status(self):
+        """Active symbols with their stage-1 features (for logs and the dashboard)."""
+        scores = self.scores()
+        return {
+            sym: {
+                "score": round(float(scores[i]), 3),
+                "trend": int(self.trend[i]),
+                "atr_ratio": round(float(self.atr_ratio[i]), 3),
+                "spread": round(float(self.spread[i]), 2),
+            }
+            for sym in self.active
+            for i in (self.index[sym],)
+        }
@@ -11,8 +11,12 @@ class TradeHistory:
         self.history_dir = Path("logs/trade_history")
         self.history_dir.mkdir(parents=True, exist_ok=True)
         self.master_file = self.history_dir / "all_trades.json"
-        self.daily_file = self.history_dir / f"trades_{datetime.now().strftime('%Y%m%d')}.json"
-        
+
+    @property
+    def daily_file(self):
+        """Today's file (re-evaluated per use: a long-running bot crosses midnight)."""
+        return self.history_dir / f"trades_{datetime.now().strftime('%Y%m%d')}.json"
+
     def save_executed_trade(self, trade_data):
         """Save a newly executed trade to history."""
         trade_record = {
@@ -71,6 +75,14 @@ class TradeHistory:
         except:
             return []
     
+    def version(self):
+        """Cheap change marker for the master file (mtime + size), for result caches."""
+        try:
+            st = self.master_file.stat()
+        except OSError:
+            return "0"
+        return f"{st.st_mtime_ns}-{st.st_size}"
+
     def load_daily_trades(self):
         """Load today's trades."""
         if not self.daily_file.exists():
@@ -0,0 +1,91 @@
+# checkpoint.py
+"""Crash-safe snapshot of the bot's trading state.
+
+The state (daily counters, per-symbol limits/cooldowns, open positions) is
+serialised to compact JSON and written with write-to-temp + fsync + rename,
+so the file on disk is always either the previous or the new complete
+snapshot. ``save`` is a no-op when the serialised state hasn't changed,
+which makes it cheap to call every loop iteration.
+"""
+import json
+import os
+from datetime import date, datetime
+from pathlib import Path
+
+
+VERSION = 1
+
+
+def _iso(value):
+    return value.isoformat() if isinstance(value, (datetime, date)) else value
+
+
+def _parse(value):
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+
+def dump_state(bot):
+    """Snapshot of what must survive a restart."""
+    return {
+        "version": VERSION,
+        "day": date.today().isoformat(),
+        "daily_trades": bot.daily_trades,
+        "daily_pips": bot.daily_pips,
+        "swing_trades": bot.swing_trades,
+        "wins": bot.wins,
+        "losses": bot.losses,
+        "last_signal_time": _iso(bot.last_signal_time),
+        "symbol_state": {
+            sym: {key: _iso(value) for key, value in state.items()}
+            for sym, state in bot.symbol_state.items()
+        },
+        "positions": [
+            {key: _iso(value) for key, value in p.to_dict().items()}
+            for p in bot.positions.open_positions()
+        ],
+    }
+
+
+def load_symbol_state(saved):
+    """Per-symbol state with datetimes parsed back."""
+    return {
+        sym: {key: _parse(value) if key.startswith("last_") else value for key, value in state.items()}
+        for sym, state in saved.items()
+    }
+
+
+class CheckpointStore:
+    """Atomic, change-only writer (and reader) for one checkpoint file."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._last = None
+
+    def load(self):
+        """The last complete checkpoint, or None."""
+        try:
+            with open(self.path, "rb") as f:
+                raw = f.read()
+            state = json.loads(raw)
+        except (OSError, ValueError):
+            return None
+        if state.get("version") != VERSION:
+            return None
+        self._last = raw
+        return state
+
+    def save(self, state):
+        """Write ``state`` if it differs from the last write; returns True if written."""
+        raw = json.dumps(state, separators=(",", ":"), sort_keys=True).encode()
+        if raw == self._last:
+            return False
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            f.write(raw)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self._last = raw
+        return True
@@ -0,0 +1,149 @@
+# positions.py
+from datetime import datetime
+
+
+class Position:
+    """A live or closed bot position (slotted to keep long sessions lean)."""
+
+    __slots__ = (
+        "ticket", "symbol", "direction", "trade_type", "price", "sl",
+        "tp1", "tp2", "tp3", "volume", "stop_pips", "ob_price", "fvg_mid",
+        "confidence", "bos_confirmed", "open_time", "status",
+        "be_moved", "tp1_hit", "tp2_hit",
+    )
+
+    def __init__(self, ticket, symbol, direction, price, sl, tp1, tp2, tp3, volume,
+                 stop_pips=0.0, trade_type="SCALP", ob_price=None, fvg_mid=None,
+                 confidence=0.0, bos_confirmed=False, open_time=None, status="open",
+                 be_moved=False, tp1_hit=False, tp2_hit=False):
+        self.ticket = ticket
+        self.symbol = symbol
+        self.direction = direction
+        self.trade_type = trade_type
+        self.price = price
+        self.sl = sl
+        self.tp1 = tp1
+        self.tp2 = tp2
+        self.tp3 = tp3
+        self.volume = volume
+        self.stop_pips = stop_pips
+        self.ob_price = ob_price
+        self.fvg_mid = fvg_mid
+        self.confidence = confidence
+        self.bos_confirmed = bos_confirmed
+        self.open_time = open_time or datetime.now()
+        self.status = status
+        self.be_moved = be_moved
+        self.tp1_hit = tp1_hit
+        self.tp2_hit = tp2_hit
+
+    @classmethod
+    def from_signal(cls, ticket, signal, symbol, trade_type):
+        """Build a position from an executed signal dict."""
+        return cls(
+            ticket=ticket,
+            symbol=symbol,
+            direction=signal["direction"],
+            price=signal["price"],
+            sl=signal["sl"],
+            tp1=signal["tp1"],
+            tp2=signal["tp2"],
+            tp3=signal["tp3"],
+            volume=signal["volume"],
+            stop_pips=signal.get("stop_pips", 0.0),
+            trade_type=trade_type,
+            ob_price=signal.get("ob_price"),
+            fvg_mid=signal.get("fvg_mid"),
+            confidence=signal.get("confidence", 0.0),
+            bos_confirmed=signal.get("bos_confirmed", False),
+        )
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Inverse of to_dict (``open_time`` may be an ISO string)."""
+        data = dict(data)
+        if isinstance(data.get("open_time"), str):
+            data["open_time"] = datetime.fromisoformat(data["open_time"])
+        return cls(**data)
+
+    def __repr__(self):
+        return (f"Position(ticket={self.ticket}, symbol={self.symbol}, "
+                f"direction={self.direction}, status={self.status})")
+
+
+class PositionBook:
+    """Positions indexed by ticket, split into open and closed collections.
+
+    Lookup, insertion and closing are O(1); per-symbol and per-trade-type
+    open counts are maintained incrementally so status endpoints never have
+    to rescan the book. ``open_volume`` (total open lots) is kept the same way
+    for the global exposure limit.
+    """
+
+    def __init__(self, max_closed=500):
+        self._open = {}      # {ticket: Position}, insertion ordered
+        self._closed = {}    # {ticket: Position}, oldest evicted past max_closed
+        self.max_closed = max_closed
+        self.total_closed = 0
+        self.open_by_symbol = {}
+        self.open_by_type = {}
+        self.open_volume = 0.0
+
+    def __len__(self):
+        return len(self._open)
+
+    def __contains__(self, ticket):
+        return ticket in self._open or ticket in self._closed
+
+    @property
+    def open_count(self):
+        return len(self._open)
+
+    @property
+    def closed_count(self):
+        return self.total_closed
+
+    def get(self, ticket):
+        """Return the position for a ticket (open or recently closed)."""
+        return self._open.get(ticket) or self._closed.get(ticket)
+
+    def add(self, position):
+        """Register a newly opened position."""
+        self._open[position.ticket] = position
+        self._bump(position, 1)
+
+    def close(self, ticket):
+        """Move an open position to the closed collection."""
+        position = self._open.pop(ticket, None)
+        if position is None:
+            return None
+        position.status = "closed"
+        self._bump(position, -1)
+
+        self._closed[ticket] = position
+        self.total_closed += 1
+        if self.max_closed and len(self._closed) > self.max_closed:
+            del self._closed[next(iter(self._closed))]
+        return position
+
+    def open_positions(self):
+        """Snapshot list of open positions (safe to close while iterating)."""
+        return list(self._open.values())
+
+    def missing_from(self, tickets):
+        """Open positions whose ticket is not in ``tickets`` (set difference, oldest first)."""
+        return [self._open[t] for t in sorted(self._open.keys() - tickets)]
+
+    def closed_positions(self):
+        return list(self._closed.values())
+
+    def _bump(self, position, delta):
+        self.open_volume = round(max(self.open_volume + delta * position.volume, 0.0), 2)
+        for counts, key in ((self.open_by_symbol, position.symbol),
+                            (self.open_by_type, position.trade_type)):
+            counts[key] = counts.get(key, 0) + delta
+            if counts[key] <= 0:
+                del counts[key]
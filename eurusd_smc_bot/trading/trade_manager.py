@@ -44,8 +44,8 @@ class TradeManager:
             "sl": signal["sl"],
             "tp": signal["tp3"],
             "deviation": 10,
-            "magic": 123456,
-            "comment": f"SMC_{signal['direction'].upper()}_{symbol}",
+            "magic": self.config.MAGIC_NUMBER,
+            "comment": signal.get("comment") or f"SMC_{signal['direction'].upper()}_{symbol}",
             "type_time": mt5.ORDER_TIME_GTC,
             "type_filling": self._get_filling_mode(symbol),
         }
@@ -108,7 +108,7 @@ class TradeManager:
             "position": ticket,
             "price": price,
             "deviation": 10,
-            "magic": 123456,
+            "magic": self.config.MAGIC_NUMBER,
             "comment": "SMC_CLOSE",
             "type_time": mt5.ORDER_TIME_GTC,
             "type_filling": self._get_filling_mode(sym),
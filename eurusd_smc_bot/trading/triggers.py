@@ -0,0 +1,130 @@
+# triggers.py
+"""Pending price levels of open positions (breakeven, TP1, TP2, ...).
+
+Each (symbol, direction) side keeps its levels in one sorted list, so a
+price update only touches the levels it crossed: a bisect finds them and
+they are sliced off. Buy levels fire when the bid rises to them, sell
+levels when the ask falls to them; sell levels are stored negated so both
+sides are "fire every key <= threshold" and come out in crossing order.
+
+A level that is pending has by definition not been reached yet, so the
+crossed ones are exactly those between the previous price and this one --
+including, on the first update, levels a restored position is already past.
+"""
+from bisect import bisect_left, bisect_right
+
+
+BREAKEVEN = "breakeven"
+TP1 = "tp1"
+TP2 = "tp2"
+
+
+class Trigger:
+    """One pending level of one position."""
+
+    __slots__ = ("ticket", "kind", "level")
+
+    def __init__(self, ticket, kind, level):
+        self.ticket = ticket
+        self.kind = kind
+        self.level = level
+
+    def __repr__(self):
+        return f"Trigger(ticket={self.ticket}, kind={self.kind}, level={self.level})"
+
+
+class _Side:
+    """Sorted keys and their triggers for one symbol and direction."""
+
+    __slots__ = ("keys", "triggers")
+
+    def __init__(self):
+        self.keys = []
+        self.triggers = []
+
+    def add(self, key, trigger):
+        i = bisect_right(self.keys, key)   # after equal keys: ties fire in insertion order
+        self.keys.insert(i, key)
+        self.triggers.insert(i, trigger)
+
+    def remove(self, key, trigger):
+        i = bisect_left(self.keys, key)
+        while i < len(self.keys) and self.keys[i] == key:
+            if self.triggers[i] is trigger:
+                del self.keys[i], self.triggers[i]
+                return
+            i += 1
+
+    def pop_crossed(self, threshold):
+        k = bisect_right(self.keys, threshold)
+        if k == 0:
+            return []
+        crossed = self.triggers[:k]
+        del self.keys[:k], self.triggers[:k]
+        return crossed
+
+
+class TriggerBook:
+    """Pending trigger levels of all open positions, by symbol and direction."""
+
+    def __init__(self):
+        self._sides = {}       # {(symbol, direction): _Side}
+        self._by_ticket = {}   # {ticket: [(side key, sort key, Trigger)]}
+
+    def __len__(self):
+        return sum(len(side.keys) for side in self._sides.values())
+
+    def add(self, symbol, direction, ticket, kind, level):
+        """Arm ``kind`` for a position; fires when price reaches ``level``."""
+        trigger = Trigger(ticket, kind, level)
+        key = level if direction == 'buy' else -level
+        side_key = (symbol, direction)
+        side = self._sides.get(side_key)
+        if side is None:
+            side = self._sides[side_key] = _Side()
+        side.add(key, trigger)
+        self._by_ticket.setdefault(ticket, []).append((side_key, key, trigger))
+        return trigger
+
+    def discard(self, ticket):
+        """Drop every pending trigger of a position (e.g. once it is closed)."""
+        for side_key, key, trigger in self._by_ticket.pop(ticket, ()):
+            side = self._sides[side_key]
+            side.remove(key, trigger)
+            if not side.keys:
+                del self._sides[side_key]
+
+    def symbols(self):
+        """Symbols with at least one pending trigger."""
+        return list({symbol for symbol, _ in self._sides})
+
+    def pending(self, ticket):
+        return [trigger for _, _, trigger in self._by_ticket.get(ticket, ())]
+
+    def crossed(self, symbol, bid, ask):
+        """Remove and return the triggers reached at this bid/ask, in crossing order.
+
+        Buy triggers come first (bid at or above the level), then sell
+        triggers (ask at or below it).
+        """
+        fired = []
+        for direction, threshold in (('buy', bid), ('sell', -ask)):
+            side_key = (symbol, direction)
+            side = self._sides.get(side_key)
+            if side is None:
+                continue
+            for trigger in side.pop_crossed(threshold):
+                self._forget(trigger)
+                fired.append(trigger)
+            if not side.keys:
+                del self._sides[side_key]
+        return fired
+
+    def _forget(self, trigger):
+        entries = self._by_ticket[trigger.ticket]
+        for i, entry in enumerate(entries):
+            if entry[2] is trigger:
+                del entries[i]
+                break
+        if not entries:
+            del self._by_ticket[trigger.ticket]
@@ -1,19 +1,30 @@
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from datetime import datetime
-from threading import Thread, Lock
+from threading import Lock
 from typing import Optional
 from pathlib import Path
 
-from fastapi import FastAPI
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi import FastAPI, Request
+from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 
+import json
 import os
 import traceback
 
 try:
-    from main import EURUSD_SMC_Bot
+    from trade_history import TradeHistory
+    from http_cache import Revisioned, binary_body, respond, static_body
+    from engine.client import EngineCallError, EngineUnavailable
 except ImportError:
-    from .main import EURUSD_SMC_Bot
+    from .trade_history import TradeHistory
+    from .http_cache import Revisioned, binary_body, respond, static_body
+    from .engine.client import EngineCallError, EngineUnavailable
+
+# The trading stack (MetaTrader5, pandas, numpy, TA-Lib) is only imported by
+# the engine process (engine/), so the dashboard starts fast, runs without
+# MT5 installed and never competes with the trading loop for the GIL.
 
 os.makedirs('logs', exist_ok=True)
 
@@ -30,7 +41,15 @@ logging.basicConfig(
 logger = logging.getLogger('webapp')
 logger.info("Starting EURUSD SMC Bot WebApp")
 
-app = FastAPI(title="EURUSD SMC Bot Dashboard")
+@asynccontextmanager
+async def _lifespan(app):
+    yield
+    if _engine is not None:
+        logger.info("Shutting down the engine...")
+        _engine.shutdown()
+
+
+app = FastAPI(title="EURUSD SMC Bot Dashboard", lifespan=_lifespan)
 
 # Add CORS middleware
 app.add_middleware(
@@ -41,19 +60,69 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-_bot: Optional[EURUSD_SMC_Bot] = None
-_bot_thread: Optional[Thread] = None
+_engine = None          # EngineProcess (or LocalEngine), created on first use
 _lock = Lock()
+_history: Optional[TradeHistory] = None
+_risk_cache: "OrderedDict[tuple, dict]" = OrderedDict()  # Monte Carlo reports by (history version, params)
+_RISK_CACHE_SIZE = 16
+
+# Revisioned dashboard state: the ETag changes only when the payload does
+_status_state = Revisioned("status")
+_positions_state = Revisioned("positions")
+_stats_state = Revisioned("stats")
+_logs_state = Revisioned("logs")
+
+_IDLE = {"status": {"running": False}, "trades": {"running": False, "trades": []},
+         "shards": None, "balance": None}
+
+
+def _get_engine():
+    """The engine handle (bot process, or a thread here if ENGINE_PROCESS is off)."""
+    global _engine
+    if _engine is None:
+        from config import Config
+        from engine.client import EngineProcess, LocalEngine
+        from engine.host import EngineHost
+        _engine = EngineProcess() if Config.ENGINE_PROCESS else LocalEngine(EngineHost())
+    return _engine
+
+
+def _snapshot() -> tuple:
+    """``(source key, state)`` last published by the engine (idle state if none)."""
+    if _engine is None:
+        return None, _IDLE
+    key, snapshot = _engine.snapshot()
+    return key, snapshot or _IDLE
+
+
+def _trade_history() -> TradeHistory:
+    """Trade history for the stats endpoints (the files the engine writes)."""
+    global _history
+    if _history is None:
+        _history = TradeHistory()
+    return _history
 
 
 def _is_running() -> bool:
-    return _bot is not None and getattr(_bot, "_running", False)
+    return _engine is not None and _engine.running()
+
+
+def _log_path() -> Path:
+    return Path("logs") / f"bot_{datetime.now().strftime('%Y%m%d')}.log"
 
 
-def _tail_log_lines(max_lines: int = 200) -> list[str]:
+def _log_version(log_path: Path) -> tuple:
+    """(path, mtime, size) of the log file -- unchanged means the tail is too."""
+    try:
+        st = log_path.stat()
+    except OSError:
+        return (str(log_path), None, None)
+    return (str(log_path), st.st_mtime_ns, st.st_size)
+
+
+def _tail_log_lines(max_lines: int = 200, log_path: Optional[Path] = None) -> list[str]:
     """Return last max_lines from today's log file, if it exists."""
-    today = datetime.now().strftime("%Y%m%d")
-    log_path = Path("logs") / f"bot_{today}.log"
+    log_path = log_path or _log_path()
     if not log_path.exists():
         return []
 
@@ -66,18 +135,15 @@ def _tail_log_lines(max_lines: int = 200) -> list[str]:
 
 
 @app.get("/", response_class=HTMLResponse)
-async def index() -> str:
-    """Single-page dashboard UI."""
-    return HTML_PAGE
+async def index(request: Request):
+    """Single-page dashboard UI (precompressed at startup, revalidated by ETag)."""
+    return respond(request, _PAGE)
 
 
 HTML_PAGE = """<!DOCTYPE html>
 <html lang="en">
 <head>
 <meta charset="UTF-8">
-<meta http-equiv="Cache-Control" content="no-cache, no-store, must-revalidate">
-<meta http-equiv="Pragma" content="no-cache">
-<meta http-equiv="Expires" content="0">
 <meta name="viewport" content="width=device-width, initial-scale=1.0">
 <title>Samidolla SMC Bot</title>
 <style>
@@ -158,6 +224,17 @@ header>p{color:#9ca3af;margin:8px 0 0;font-size:.95rem}
 .trade-pnl{padding-top:8px;font-weight:600;font-size:.9rem;display:flex;justify-content:space-between;align-items:center}
 
 .stats-section{margin-bottom:32px;animation:fadeIn .8s ease-out}
+.equity-chart{width:100%;height:200px;background:rgba(15,23,42,.8);border-radius:10px;border:1px solid rgba(148,163,184,.1)}
+#eqRange{float:right;text-transform:none}
+#eqRange a{color:#9ca3af;text-decoration:none}
+.analysis-table{width:100%;border-collapse:collapse;font-size:.78rem;background:rgba(15,23,42,.8);border-radius:10px;overflow:hidden}
+.analysis-table th{color:#9ca3af;text-align:left;font-weight:600;padding:8px;border-bottom:1px solid rgba(148,163,184,.2)}
+.analysis-table td{padding:6px 8px;border-bottom:1px solid rgba(148,163,184,.06);white-space:nowrap}
+#anClose{float:right;cursor:pointer;text-transform:none}
+.price-chart{width:100%;height:260px;background:rgba(15,23,42,.8);border-radius:10px;border:1px solid rgba(148,163,184,.1);margin-bottom:12px;display:block}
+#chartTf{margin-left:12px;text-transform:none}
+#chartTf a{color:#9ca3af;text-decoration:none}
+#chartTf a.on{color:#f59e0b}
 .stats-cards{display:grid;grid-template-columns:repeat(auto-fit,minmax(130px,1fr));gap:12px}
 .stats-card{padding:14px;border-radius:10px;background:rgba(30,41,59,.5);border:1px solid rgba(148,163,184,.1);text-align:center;transition:all .3s ease;animation:fadeIn .6s ease-out}
 .stats-card:hover{border-color:rgba(148,163,184,.3);transform:scale(1.05)}
@@ -199,12 +276,36 @@ header>p{color:#9ca3af;margin:8px 0 0;font-size:.95rem}
   </div>
 
   <div id="symGrid" class="sym-grid"></div>
+  <div id="shardGrid" class="sym-grid"></div>
+
+  <div id="analysisSection" class="stats-section" style="display:none">
+    <div class="section-title">🔍 <span id="anSymbol"></span> Analysis <span id="chartTf">
+      <a href="#" onclick="return setChartTf('M15')">M15</a> · <a href="#" onclick="return setChartTf('H1')">H1</a> ·
+      <a href="#" onclick="return setChartTf('H4')">H4</a> · <a href="#" onclick="return setChartTf('D1')">D1</a></span>
+      <span id="anClose" onclick="selectSymbol(null)">✕</span></div>
+    <canvas id="priceChart" class="price-chart"></canvas>
+    <div style="overflow-x:auto"><table class="analysis-table">
+      <thead><tr><th>Time</th><th>Kind</th><th>Reason</th><th>Trend</th><th>Entry</th><th>BOS</th><th>ChoCH</th>
+        <th>Spread</th><th>Cooldown</th><th>Nearest OB</th><th>Nearest FVG</th><th>Signal</th></tr></thead>
+      <tbody id="analysisRows"></tbody>
+    </table></div>
+  </div>
 
   <div id="tradesSection" class="trades-section" style="display:none">
     <div class="section-title">📊 Running Trades</div>
     <div id="tradesGrid" class="trades-grid"></div>
   </div>
 
+  <div id="equitySection" class="stats-section" style="display:none">
+    <div class="section-title">💹 Equity <span id="eqRange">
+      <a href="#" onclick="return setEquityDays(1)">1D</a> · <a href="#" onclick="return setEquityDays(7)">1W</a> ·
+      <a href="#" onclick="return setEquityDays(30)">1M</a> · <a href="#" onclick="return setEquityDays(0)">All</a></span></div>
+    <svg id="equityChart" class="equity-chart" viewBox="0 0 1000 200" preserveAspectRatio="none">
+      <polyline id="balanceLine" fill="none" stroke="#38bdf8" stroke-width="1.5" vector-effect="non-scaling-stroke"/>
+      <polyline id="equityLine" fill="none" stroke="#4ade80" stroke-width="1.5" vector-effect="non-scaling-stroke"/>
+    </svg>
+  </div>
+
   <div id="statsSection" class="stats-section" style="display:none">
     <div class="section-title">📈 All-Time Statistics</div>
     <div id="statsGrid" class="stats-cards"></div>
@@ -297,10 +398,29 @@ function setUI(data) {
       card.className = 'sym-card';
       card.innerHTML = '<div class="sym-name">' + s + '</div>' +
         '<div class="sym-stat"><span>Scalp:</span> <span class="sym-stat-val">' + (info.daily_trades || 0) + '</span></div>' +
-        '<div class="sym-stat"><span>Swing:</span> <span class="sym-stat-val" style="color:#38bdf8">' + (info.swing_trades || 0) + '</span></div>';
+        '<div class="sym-stat"><span>Swing:</span> <span class="sym-stat-val" style="color:#38bdf8">' + (info.swing_trades || 0) + '</span></div>' +
+        '<div class="sym-stat"><span>Why:</span> <span class="sym-stat-val" style="color:' + reasonColor(info.scalp_reason) + '">' + (info.scalp_reason || '-') + '</span></div>';
+      card.onclick = (function(sym){ return function(){ selectSymbol(sym); }; })(s);
       sg.appendChild(card);
     }
   }
+
+  // Shard health (sharded mode only)
+  var hg = document.getElementById('shardGrid');
+  hg.innerHTML = '';
+  if (running && data.shards) {
+    for (var j = 0; j < data.shards.length; j++) {
+      var sh = data.shards[j];
+      var scard = document.createElement('div');
+      scard.className = 'sym-card';
+      scard.innerHTML = '<div class="sym-name" style="color:' + (sh.alive ? '#4ade80' : '#f87171') + '">Shard ' + sh.shard + ' (' + sh.symbols.length + ' symbols)</div>' +
+        '<div class="sym-stat"><span>Loop:</span> <span class="sym-stat-val">' + (sh.loop_ms != null ? sh.loop_ms.toFixed(0) + ' ms' : '-') + '</span></div>' +
+        '<div class="sym-stat"><span>Heartbeat:</span> <span class="sym-stat-val">' + (sh.heartbeat_age != null ? sh.heartbeat_age + 's ago' : '-') + '</span></div>' +
+        '<div class="sym-stat"><span>Orders:</span> <span class="sym-stat-val">' + sh.executed + '/' + sh.orders + '</span></div>' +
+        '<div class="sym-stat"><span>Restarts:</span> <span class="sym-stat-val">' + sh.restarts + '</span></div>';
+      hg.appendChild(scard);
+    }
+  }
   
   var badge = document.getElementById('badge');
   var startBtn = document.getElementById('startBtn');
@@ -362,55 +482,247 @@ function displayTrades(tradeData) {
   }
 }
 
-function getTrades() {
-  fetch('/trades')
-    .then(function(r){ return r.json(); })
-    .then(displayTrades)
+// The browser revalidates with If-None-Match and hands a 304 back as the
+// cached 200; an unchanged ETag means there is nothing to re-render.
+var seenTags = {};
+function fetchChanged(url, render) {
+  fetch(url)
+    .then(function(r){
+      var tag = r.headers.get('ETag');
+      if (tag && seenTags[url] === tag) { return null; }
+      seenTags[url] = tag;
+      return r.json();
+    })
+    .then(function(d){ if (d !== null) { render(d); } })
     .catch(function(){ });
 }
 
+function getTrades() {
+  fetchChanged('/trades', displayTrades);
+}
+
 function getStats() {
-  fetch('/trade-stats')
-    .then(function(r){ return r.json(); })
-    .then(function(d){
-      var statsSection = document.getElementById('statsSection');
-      var statsGrid = document.getElementById('statsGrid');
-      if (d && d.stats && d.stats.closed_trades > 0) {
-        statsSection.style.display = 'block';
-        statsGrid.innerHTML = '';
-        var stats = d.stats;
-        var statItems = [
-          {label: 'Total Trades', value: stats.total_trades},
-          {label: 'Closed', value: stats.closed_trades},
-          {label: 'Open', value: stats.open_trades},
-          {label: 'Wins', value: stats.wins, color: '#4ade80'},
-          {label: 'Losses', value: stats.losses, color: '#f87171'},
-          {label: 'Win Rate', value: stats.win_rate + '%'},
-          {label: 'Total Pips', value: stats.total_pips.toFixed(1)},
-          {label: 'Total P&L', value: 'R' + (stats.total_profit >= 0 ? '+' : '') + stats.total_profit.toFixed(2), color: stats.total_profit >= 0 ? '#4ade80' : '#f87171'},
-        ];
-        for (var i = 0; i < statItems.length; i++) {
-          var item = statItems[i];
-          var card = document.createElement('div');
-          card.className = 'stats-card';
-          var valColor = item.color || '#e5e7eb';
-          card.innerHTML = '<div class="stats-label">' + item.label + '</div><div class="stats-value" style="color:' + valColor + '">' + item.value + '</div>';
-          statsGrid.appendChild(card);
-        }
-      } else {
-        statsSection.style.display = 'none';
+  fetchChanged('/trade-stats', function(d){
+    var statsSection = document.getElementById('statsSection');
+    var statsGrid = document.getElementById('statsGrid');
+    if (d && d.stats && d.stats.closed_trades > 0) {
+      statsSection.style.display = 'block';
+      statsGrid.innerHTML = '';
+      var stats = d.stats;
+      var statItems = [
+        {label: 'Total Trades', value: stats.total_trades},
+        {label: 'Closed', value: stats.closed_trades},
+        {label: 'Open', value: stats.open_trades},
+        {label: 'Wins', value: stats.wins, color: '#4ade80'},
+        {label: 'Losses', value: stats.losses, color: '#f87171'},
+        {label: 'Win Rate', value: stats.win_rate + '%'},
+        {label: 'Total Pips', value: stats.total_pips.toFixed(1)},
+        {label: 'Total P&L', value: 'R' + (stats.total_profit >= 0 ? '+' : '') + stats.total_profit.toFixed(2), color: stats.total_profit >= 0 ? '#4ade80' : '#f87171'},
+      ];
+      for (var i = 0; i < statItems.length; i++) {
+        var item = statItems[i];
+        var card = document.createElement('div');
+        card.className = 'stats-card';
+        var valColor = item.color || '#e5e7eb';
+        card.innerHTML = '<div class="stats-label">' + item.label + '</div><div class="stats-value" style="color:' + valColor + '">' + item.value + '</div>';
+        statsGrid.appendChild(card);
       }
-    })
-    .catch(function(){ });
+    } else {
+      statsSection.style.display = 'none';
+    }
+  });
 }
 
 function poll() {
-  fetch('/status')
-    .then(function(r){ return r.json(); })
-    .then(setUI)
+  fetchChanged('/status', setUI);
+}
+
+var equityDays = 1;
+function setEquityDays(days) {
+  equityDays = days;
+  getEquity();
+  return false;
+}
+
+function polylinePoints(times, values, lo, hi) {
+  var t0 = times[0], span = (times[times.length - 1] - t0) || 1, range = (hi - lo) || 1, out = [];
+  for (var i = 0; i < times.length; i++) {
+    out.push(((times[i] - t0) / span * 1000).toFixed(1) + ',' + (195 - (values[i] - lo) / range * 190).toFixed(1));
+  }
+  return out.join(' ');
+}
+
+function getEquity() {
+  fetchChanged('/equity?points=600&days=' + equityDays, function(d){
+    var section = document.getElementById('equitySection');
+    if (!d || d.count < 2) { section.style.display = 'none'; return; }
+    section.style.display = 'block';
+    var lo = Math.min(Math.min.apply(null, d.equity), Math.min.apply(null, d.balance));
+    var hi = Math.max(Math.max.apply(null, d.equity), Math.max.apply(null, d.balance));
+    document.getElementById('equityLine').setAttribute('points', polylinePoints(d.time, d.equity, lo, hi));
+    document.getElementById('balanceLine').setAttribute('points', polylinePoints(d.time, d.balance, lo, hi));
+  });
+}
+
+var analysisSymbol = null;
+function selectSymbol(sym) {
+  analysisSymbol = (sym === analysisSymbol) ? null : sym;
+  getAnalysis();
+  getChart();
+}
+
+// Chart data is binary (market_data/chart.py): a JSON header, then typed
+// arrays wrapped in place. Polls ask only for bars since the last one held.
+var CHART_BARS = 300;
+var ARRAY_TYPES = {Uint8Array: Uint8Array, Int8Array: Int8Array, Uint32Array: Uint32Array, Float32Array: Float32Array};
+var chart = {sym: null, tf: 'M15', loaded: null, bars: null, zones: null};
+
+function decodeChart(buf) {
+  var size = new DataView(buf).getUint32(4, true);
+  var header = JSON.parse(new TextDecoder().decode(new Uint8Array(buf, 8, size)));
+  var start = 8 + size + (8 - (8 + size) % 8) % 8;
+  header.data = {};
+  for (var i = 0; i < header.columns.length; i++) {
+    var c = header.columns[i];
+    header.data[c.name] = new ARRAY_TYPES[c.type](buf, start + c.offset, c.length);
+  }
+  return header;
+}
+
+function mergeBars(old, fresh) {
+  var keep = 0, out = {};
+  if (old) { while (keep < old.time.length && old.time[keep] < fresh.time[0]) keep++; }
+  var names = ['time', 'open', 'high', 'low', 'close', 'volume'];
+  for (var i = 0; i < names.length; i++) {
+    var col = fresh[names[i]];
+    if (keep > 0) {
+      var joined = new col.constructor(keep + col.length);
+      joined.set(old[names[i]].subarray(0, keep));
+      joined.set(col, keep);
+      col = joined;
+    }
+    out[names[i]] = col.subarray(Math.max(0, col.length - CHART_BARS));
+  }
+  return out;
+}
+
+function setChartTf(tf) {
+  chart.tf = tf;
+  getChart();
+  return false;
+}
+
+function getChart() {
+  var sym = analysisSymbol, tf = chart.tf;
+  if (!sym) return;
+  var same = chart.sym === sym && chart.loaded === tf && chart.bars && chart.bars.time.length;
+  var url = '/chart/' + encodeURIComponent(sym) + '/' + tf + '?count=' + CHART_BARS +
+    (same ? '&since=' + chart.bars.time[chart.bars.time.length - 1] : '');
+  fetch(url)
+    .then(function(r){ return r.ok ? r.arrayBuffer() : null; })
+    .then(function(buf){
+      if (!buf || sym !== analysisSymbol || tf !== chart.tf) return;
+      var h = decodeChart(buf), d = h.data;
+      if (h.count) { chart.bars = mergeBars(same ? chart.bars : null, d); }
+      else if (!same) { chart.bars = null; }
+      chart.zones = d;
+      chart.sym = sym;
+      chart.loaded = tf;
+      drawChart();
+    })
     .catch(function(){ });
 }
 
+function drawChart() {
+  var canvas = document.getElementById('priceChart');
+  var links = document.getElementById('chartTf').getElementsByTagName('a');
+  for (var l = 0; l < links.length; l++) { links[l].className = links[l].textContent === chart.tf ? 'on' : ''; }
+  var ratio = window.devicePixelRatio || 1, w = canvas.clientWidth, h = canvas.clientHeight;
+  canvas.width = w * ratio; canvas.height = h * ratio;
+  var ctx = canvas.getContext('2d');
+  ctx.scale(ratio, ratio);
+  ctx.clearRect(0, 0, w, h);
+  var b = chart.bars;
+  if (!b || !b.time.length) { ctx.fillStyle = '#9ca3af'; ctx.fillText('No bars yet.', 12, 20); return; }
+  var n = b.time.length, lo = Infinity, hi = -Infinity;
+  for (var i = 0; i < n; i++) { if (b.low[i] < lo) lo = b.low[i]; if (b.high[i] > hi) hi = b.high[i]; }
+  var pad = (hi - lo) * 0.05 || 1e-4; lo -= pad; hi += pad;
+  var step = w / n, t0 = b.time[0];
+  function y(p) { return (hi - p) / (hi - lo) * h; }
+  function x(t) { var k = 0; while (k < n - 1 && b.time[k] < t) k++; return k * step; }
+
+  var z = chart.zones, fills = ['rgba(74,222,128,.12)', 'rgba(248,113,113,.12)', 'rgba(56,189,248,.12)', 'rgba(250,204,21,.12)'];
+  for (var j = 0; j < z.zone_kind.length; j++) {
+    var kind = z.zone_kind[j], bull = z.zone_side[j] > 0;
+    var left = z.zone_time[j] && z.zone_time[j] >= t0 ? x(z.zone_time[j]) : 0;
+    if (kind === 0 || kind === 1) {
+      ctx.fillStyle = kind === 0 ? fills[bull ? 0 : 1] : fills[2];
+      ctx.fillRect(left, y(z.zone_top[j]), w - left, Math.max(1, y(z.zone_bottom[j]) - y(z.zone_top[j])));
+    } else {
+      var level = kind === 3 ? (bull ? z.zone_bottom[j] : z.zone_top[j]) : z.zone_top[j];
+      ctx.strokeStyle = kind === 3 ? '#facc15' : (bull ? '#4ade80' : '#f87171');
+      ctx.setLineDash(kind === 3 ? [6, 4] : [2, 3]);
+      ctx.beginPath(); ctx.moveTo(left, y(level)); ctx.lineTo(w, y(level)); ctx.stroke();
+      ctx.setLineDash([]);
+    }
+  }
+
+  var body = Math.max(1, step * 0.6);
+  for (var k = 0; k < n; k++) {
+    var up = b.close[k] >= b.open[k], cx = k * step + step / 2;
+    ctx.strokeStyle = ctx.fillStyle = up ? '#4ade80' : '#f87171';
+    ctx.beginPath(); ctx.moveTo(cx, y(b.high[k])); ctx.lineTo(cx, y(b.low[k])); ctx.stroke();
+    var top = y(Math.max(b.open[k], b.close[k]));
+    ctx.fillRect(cx - body / 2, top, body, Math.max(1, y(Math.min(b.open[k], b.close[k])) - top));
+  }
+}
+
+function reasonColor(reason) {
+  if (reason === 'signal') return '#fb923c';
+  if (reason === 'choch' || reason === 'spread') return '#f87171';
+  if (reason === 'cooldown' || reason === 'daily_limit') return '#38bdf8';
+  if (reason === 'no_setup') return '#fbbf24';
+  return '#9ca3af';
+}
+
+function zoneText(zones, price) {
+  if (!zones || !zones.length) return '-';
+  var z = zones[0];
+  return z.type + ' ' + (z.price != null ? z.price : z.bottom + '-' + z.top) + ' (' + z.distance + 'p)';
+}
+
+function analysisRow(r) {
+  var cells = [
+    new Date(r.time * 1000).toLocaleTimeString(),
+    r.kind,
+    '<span style="color:' + reasonColor(r.reason) + '">' + r.reason + '</span>',
+    r.trend ? r.trend.trend + ' (' + r.trend.score + ')' : '-',
+    r.trend_entry ? r.trend_entry.trend + ' (' + r.trend_entry.score + ')' : '-',
+    r.bos ? r.bos.type : '-',
+    r.choch ? r.choch.type : '-',
+    r.spread.toFixed(1),
+    r.cooldown ? r.cooldown + 's' : '-',
+    zoneText(r.order_blocks) + ' / ' + r.ob_count,
+    zoneText(r.fvgs) + ' / ' + r.fvg_count,
+    r.signal ? r.signal.direction.toUpperCase() + ' ' + r.signal.price + ' (' + r.outcome + ')' : '-',
+  ];
+  return '<tr><td>' + cells.join('</td><td>') + '</td></tr>';
+}
+
+function getAnalysis() {
+  var section = document.getElementById('analysisSection');
+  if (!analysisSymbol) { section.style.display = 'none'; return; }
+  var sym = analysisSymbol;
+  fetchChanged('/symbols/' + encodeURIComponent(sym) + '/analysis?depth=20', function(d){
+    if (sym !== analysisSymbol) return;
+    section.style.display = 'block';
+    document.getElementById('anSymbol').textContent = sym;
+    var rows = [];
+    for (var i = d.records.length - 1; i >= 0; i--) { rows.push(analysisRow(d.records[i])); }
+    document.getElementById('analysisRows').innerHTML = rows.join('') || '<tr><td colspan="12">No analysis yet.</td></tr>';
+  });
+}
+
 function colorLine(line) {
   var span = document.createElement('span');
   span.textContent = line + '\n';
@@ -427,145 +739,84 @@ function colorLine(line) {
 }
 
 function getLogs() {
-  fetch('/logs')
-    .then(function(r){ return r.json(); })
-    .then(function(d){
-      var box = document.getElementById('logBox');
-      if (d && Array.isArray(d.lines) && d.lines.length) {
-        box.innerHTML = '';
-        for (var i = 0; i < d.lines.length; i++) {
-          box.appendChild(colorLine(d.lines[i]));
-        }
-        box.scrollTop = box.scrollHeight;
-      } else {
-        box.textContent = 'No logs yet.';
+  fetchChanged('/logs', function(d){
+    var box = document.getElementById('logBox');
+    if (d && Array.isArray(d.lines) && d.lines.length) {
+      box.innerHTML = '';
+      for (var i = 0; i < d.lines.length; i++) {
+        box.appendChild(colorLine(d.lines[i]));
       }
-    })
-    .catch(function(){ });
+      box.scrollTop = box.scrollHeight;
+    } else {
+      box.textContent = 'No logs yet.';
+    }
+  });
 }
 
 poll();
 getLogs();
 getTrades();
 getStats();
+getEquity();
 setInterval(poll, 5000);
 setInterval(getLogs, 7000);
 setInterval(getTrades, 3000);
 setInterval(getStats, 10000);
+setInterval(getEquity, 30000);
+setInterval(getAnalysis, 5000);
+setInterval(getChart, 5000);
 </script>
 </body>
 </html>"""
 
+_PAGE = static_body(HTML_PAGE)
+
 
 @app.get("/status")
-async def status():
-    """Return basic bot status for the UI."""
-    with _lock:
-        running = _is_running()
-        if not running or _bot is None:
-            return {"running": False}
-
-        # Per-symbol breakdown
-        per_symbol = {}
-        for sym, state in _bot.symbol_state.items():
-            per_symbol[sym] = {
-                "daily_trades": state.get("daily_trades", 0),
-                "swing_trades": state.get("swing_trades", 0),
-            }
-
-        return {
-            "running": True,
-            "daily_trades": _bot.daily_trades,
-            "open_positions": len([p for p in _bot.positions if p["status"] == "open"]),
-            "last_signal_time": _bot.last_signal_time.isoformat() if _bot.last_signal_time else None,
-            "wins": getattr(_bot, "wins", 0),
-            "losses": getattr(_bot, "losses", 0),
-            "swing_trades": getattr(_bot, "swing_trades", 0),
-            "per_symbol": per_symbol,
-        }
+async def status(request: Request):
+    """Return basic bot status for the UI (as last published by the engine)."""
+    key, snapshot = _snapshot()
+    return respond(request, _status_state.get(lambda: snapshot["status"], key))
+
+
+@app.get("/shards")
+async def shard_health():
+    """Per-shard health and loop latency when running sharded."""
+    _, snapshot = _snapshot()
+    if not _is_running() or snapshot["shards"] is None:
+        return {"sharded": False, "shards": []}
+    return {"sharded": True, "shards": snapshot["shards"]}
+
+
+@app.get("/accounts")
+async def account_fanout():
+    """Follower accounts: fills, fill latency and slippage, and the skew across accounts."""
+    _, snapshot = _snapshot()
+    accounts = snapshot["status"].get("accounts") if _is_running() else None
+    if accounts is None:
+        return {"fanout": False, "accounts": []}
+    return {"fanout": True, **accounts}
 
 
 @app.get("/trades")
-async def get_open_trades():
+async def get_open_trades(request: Request):
     """Return details of open positions with live profit/loss."""
-    import MetaTrader5 as mt5
-    
-    with _lock:
-        running = _is_running()
-        if not running or _bot is None:
-            return {"running": False, "trades": []}
-        
-        trades = []
-        total_profit = 0
-        
-        for position in _bot.positions:
-            if position['status'] != 'open':
-                continue
-            
-            sym = position.get('symbol', _bot.config.SYMBOL)
-            pv = _bot.config.SYMBOLS.get(sym, {}).get('pip_value', _bot.config.PIP_VALUE)
-            
-            # Get current position data from MT5
-            pos = mt5.positions_get(ticket=position['ticket'])
-            if not pos or len(pos) == 0:
-                continue
-            
-            pos = pos[0]
-            current_price = pos.price_current
-            
-            # Calculate profit/loss
-            profit = pos.profit + pos.swap + pos.commission
-            total_profit += profit
-            
-            # Calculate pips
-            if position['direction'] == 'buy':
-                pips = (current_price - position['price']) / pv
-            else:
-                pips = (position['price'] - current_price) / pv
-            
-            trades.append({
-                "ticket": position['ticket'],
-                "symbol": sym,
-                "direction": position['direction'].upper(),
-                "entry_price": round(position['price'], 5),
-                "current_price": round(current_price, 5),
-                "volume": position['volume'],
-                "pips": round(pips, 2),
-                "profit_r": round(profit, 2),
-                "profit_percent": round((profit / _bot.config.FIXED_LOT_SIZE) * 100, 2) if _bot.config.FIXED_LOT_SIZE else 0,
-                "tp1": round(position['tp1'], 5),
-                "tp2": round(position['tp2'], 5),
-                "sl": round(position['sl'], 5),
-                "tp1_hit": position.get('tp1_hit', False),
-                "tp2_hit": position.get('tp2_hit', False),
-                "be_moved": position.get('be_moved', False),
-            })
-        
-        return {
-            "running": True,
-            "trades": trades,
-            "total_profit": round(total_profit, 2),
-            "trade_count": len(trades),
-        }
+    key, snapshot = _snapshot()
+    return respond(request, _positions_state.get(lambda: snapshot["trades"], key))
 
 
 @app.post("/start")
-async def start_bot():
-    """Start the trading bot in a background thread."""
-    global _bot, _bot_thread
+def start_bot():
+    """Start the trading bot in the engine process (spawned if needed).
 
+    Sync endpoint: spawning and the engine's reply are waited for in the threadpool.
+    """
     with _lock:
-        if _is_running():
-            return JSONResponse({"status": "already_running"})
-
         try:
-            logger.info("Creating bot instance...")
-            _bot = EURUSD_SMC_Bot()
-            logger.info("Starting bot thread...")
-            _bot_thread = Thread(target=_bot.run, daemon=True)
-            _bot_thread.start()
-            logger.info("Bot thread started successfully")
-            return JSONResponse({"status": "started"})
+            logger.info("Starting bot in the engine...")
+            result = _get_engine().start()
+            logger.info(f"Engine pid {_engine.pid()}: {result['status']}")
+            return JSONResponse(result)
         except Exception as e:
             error_msg = f"Failed to start bot: {str(e)}"
             logger.error(f"{error_msg}\n{traceback.format_exc()}")
@@ -573,20 +824,17 @@ async def start_bot():
 
 
 @app.post("/stop")
-async def stop_bot():
-    """Stop the trading bot loop if it is running."""
-    global _bot, _bot_thread
-
+def stop_bot():
+    """Stop the trading bot loop if it is running (the engine process stays up)."""
     with _lock:
-        if not _is_running():
+        if _engine is None or not _engine.alive():
             return JSONResponse({"status": "not_running"})
 
         try:
             logger.info("Stopping bot...")
-            if _bot is not None:
-                _bot.stop()
+            result = _engine.stop()
             logger.info("Bot stop signal sent")
-            return JSONResponse({"status": "stopping"})
+            return JSONResponse(result)
         except Exception as e:
             error_msg = f"Failed to stop bot: {str(e)}"
             logger.error(f"{error_msg}\n{traceback.format_exc()}")
@@ -594,43 +842,229 @@ async def stop_bot():
 
 
 @app.get("/logs")
-async def get_logs():
-    """Return the last N lines from the current log file."""
-    lines = _tail_log_lines(200)
-    return JSONResponse({"lines": lines})
+async def get_logs(request: Request):
+    """Return the last N lines from the current log file.
+
+    The tail is only re-read when the log file's mtime or size changes.
+    """
+    log_path = _log_path()
+    body = _logs_state.get(lambda: {"lines": _tail_log_lines(200, log_path)}, _log_version(log_path))
+    return respond(request, body)
 
 
 @app.get("/trade-stats")
-async def get_trade_stats():
-    """Return trade statistics and history."""
+async def get_trade_stats(request: Request):
+    """Return trade statistics and history.
+
+    Rebuilt only when the trade history file changes, so ``generated_at``
+    is the time of the revision being served.
+    """
     with _lock:
-        if _bot is None:
-            return {"stats": None, "trades": []}
-        
-        stats = _bot.trade_history.get_trade_stats()
-        all_trades = _bot.trade_history.load_all_trades()
-        
-        return {
-            "stats": stats,
-            "trades": all_trades,
+        history = _trade_history()
+        body = _stats_state.get(lambda: {
+            "stats": history.get_trade_stats(),
+            "trades": history.load_all_trades(),
             "generated_at": datetime.now().isoformat(),
-        }
+        }, history.version())
+    return respond(request, body)
+
+
+@app.get("/equity")
+def equity_curve(request: Request, start: Optional[float] = None, end: Optional[float] = None,
+                 days: Optional[float] = None, points: int = 500):
+    """Balance and equity over a time range, downsampled (LTTB) to ``points``.
+
+    ``start``/``end`` are epoch seconds (default: everything up to now);
+    ``days`` is a range ending now. Reads the engine's tier files directly,
+    the finest tier first.
+    """
+    from config import Config
+    from recording.equity import EquityStore, series
+    points = max(10, min(points, 5000))
+    if days:
+        end = end or datetime.now().timestamp()
+        start = end - days * 86400
+    tiers, rows = series(EquityStore(Config.EQUITY_DIR), start, end, points)
+    payload = {
+        "tiers": tiers,
+        "count": len(rows),
+        "time": rows["time"].tolist(),
+        "balance": rows["balance"].round(2).tolist(),
+        "equity": rows["equity"].round(2).tolist(),
+    }
+    return respond(request, static_body(json.dumps(payload, separators=(",", ":")), "application/json"))
+
+
+@app.get("/analytics/risk")
+def risk_analysis(paths: int = 100_000, trades: int = 1_000, method: str = "bootstrap",
+                  symbol: Optional[str] = None, trade_type: Optional[str] = None,
+                  ruin_drawdown: float = 0.5):
+    """Monte Carlo drawdown / risk-of-ruin report over the closed trade history.
+
+    Sync endpoint: the simulation runs in the threadpool, not the event loop.
+    Reports are cached until the trade history file (or the live balance) changes.
+    """
+    if method not in ("bootstrap", "shuffle"):
+        return JSONResponse({"error": "method must be 'bootstrap' or 'shuffle'"}, status_code=400)
+    paths = max(100, min(paths, 200_000))
+    trades = max(10, min(trades, 5_000))
+
+    balance = _snapshot()[1]["balance"] if _is_running() else None
+    from config import Config
+    with _lock:
+        history = _trade_history()
+        version = history.version()
+        key = (version, paths, trades, method, symbol, trade_type, ruin_drawdown, balance,
+               Config.RISK_PERCENT, Config.FIXED_LOT_SIZE)
+        cached = _risk_cache.get(key)
+        if cached is not None:
+            _risk_cache.move_to_end(key)
+            return {**cached, "cached": True}
+
+    from analytics.monte_carlo import analyze
+    report = analyze(history.load_all_trades(), paths=paths, horizon=trades, method=method,
+                     symbol=symbol, trade_type=trade_type, balance=balance,
+                     ruin_drawdown=ruin_drawdown)
+    report["history_version"] = version
+    report["generated_at"] = datetime.now().isoformat()
+
+    with _lock:
+        _risk_cache[key] = report
+        while len(_risk_cache) > _RISK_CACHE_SIZE:
+            _risk_cache.popitem(last=False)
+    return {**report, "cached": False}
+
+
+@app.get("/symbols/{symbol}/analysis")
+def symbol_analysis(request: Request, symbol: str, depth: int = 20, kind: Optional[str] = None, since: int = 0):
+    """Structured scalp/swing decisions for ``symbol``, oldest first.
+
+    The newest ``depth`` records (up to ``ANALYSIS_HISTORY``) from the
+    engine's in-memory ring; ``kind`` filters to scalp or swing and
+    ``since`` returns only records with a larger ``seq``. Sync endpoint:
+    the engine call runs in the threadpool.
+    """
+    if kind not in (None, "scalp", "swing"):
+        return JSONResponse({"error": "kind must be 'scalp' or 'swing'"}, status_code=400)
+    records = []
+    if _engine is not None and _engine.alive():
+        try:
+            records = _engine.call("analysis", timeout=5, symbol=symbol, depth=depth, kind=kind, since=since)
+        except (EngineUnavailable, EngineCallError) as e:
+            return JSONResponse({"error": str(e)}, status_code=503)
+    payload = {
+        "symbol": symbol,
+        "count": len(records),
+        "last_seq": records[-1]["seq"] if records else since,
+        "records": records,
+    }
+    return respond(request, static_body(json.dumps(payload, separators=(",", ":")), "application/json"))
+
+
+@app.get("/chart/{symbol}/{timeframe}")
+def chart_data(request: Request, symbol: str, timeframe: str, start: Optional[int] = None,
+               end: Optional[int] = None, since: Optional[int] = None, count: Optional[int] = None):
+    """OHLCV bars and SMC overlays in the binary columnar format of market_data/chart.py.
+
+    The newest ``count`` bars (default ``CHART_DEFAULT_BARS``) in
+    [``start``, ``end``) epoch seconds; ``since`` sends only bars from that
+    time on, so a chart polls with its last bar's time and appends. Served
+    by the engine (spawned if needed; the bot doesn't have to be running):
+    the live bar cache, else the bar store. Sync endpoint: the engine call
+    runs in the threadpool.
+    """
+    try:
+        engine = _get_engine()
+        engine.ensure_process()
+        payload = engine.call("chart", timeout=10, symbol=symbol, timeframe=timeframe,
+                              start=start, end=end, since=since, count=count)
+    except EngineUnavailable as e:
+        return JSONResponse({"error": str(e)}, status_code=503)
+    except EngineCallError as e:
+        return JSONResponse({"error": str(e)}, status_code=400 if e.kind == "ValueError" else 500)
+    return respond(request, binary_body(payload))
 
 
 @app.get("/debug")
-async def debug_info():
+def debug_info():
     """Return diagnostic information for debugging."""
     import sys
-    import MetaTrader5 as mt5
-    
-    return {
+    info = {
         "bot_running": _is_running(),
-        "bot_instance": _bot is not None,
+        "bot_instance": False,
+        "engine_pid": _engine.pid() if _engine is not None else None,
+        "engine_alive": _engine is not None and _engine.alive(),
+        "engine_restarts": _engine.restarts if _engine is not None else 0,
+        "state_age_seconds": _engine.state_age() if _engine is not None else None,
         "python_version": sys.version,
-        "mt5_version": mt5.version() if mt5 else "Not available",
+        "mt5_version": "Not available",
         "logs_path": str(Path("logs").absolute()),
         "timestamp": datetime.now().isoformat(),
     }
+    if info["engine_alive"]:
+        try:
+            engine = _engine.call("debug", timeout=5)
+        except (EngineUnavailable, EngineCallError) as e:
+            info["engine_error"] = str(e)
+        else:
+            info.update(bot_instance=engine["bot_instance"], mt5_version=engine["mt5_version"],
+                        bot_started=engine["bot_started"], iterations=engine["iterations"],
+                        detector_backend=engine["detector_backend"])
+    return info
+
+
+@app.get("/debug/profile")
+def debug_profile(seconds: float = 5.0, interval_ms: float = 5.0, top: int = 30, format: str = "json"):
+    """Sample the running bot loop's stack for ``seconds`` (max 60).
+
+    Runs in the engine process, next to the bot thread. Returns a
+    top-functions table and collapsed stacks; ``format=collapsed`` returns
+    only the collapsed stacks as text (pipe into flamegraph.pl or
+    speedscope). Sync endpoint: the wait runs in the threadpool.
+    """
+    if not _is_running():
+        return JSONResponse({"error": "bot is not running"}, status_code=409)
+    try:
+        report = _engine.call("profile", timeout=min(seconds, 60) + 15,
+                              seconds=seconds, interval=interval_ms / 1000, top=top)
+    except EngineUnavailable as e:
+        return JSONResponse({"error": str(e)}, status_code=409)
+    except EngineCallError as e:
+        return JSONResponse({"error": str(e)}, status_code=409 if e.kind in ("NotRunning", "DiagnosticBusy") else 500)
+    logger.info(f"Profiled bot thread for {report['seconds']}s ({report['samples']} samples)")
+    if format == "collapsed":
+        return PlainTextResponse(report["collapsed"])
+    return report
+
+
+@app.get("/debug/memory")
+def debug_memory(seconds: float = 10.0, top: int = 25, group_by: str = "lineno", frames: int = 1,
+                 process: str = "engine"):
+    """Python allocations made over ``seconds`` (max 60) that are still alive.
+
+    tracemalloc runs for the window only; ``group_by=traceback`` with
+    ``frames=N`` shows who made the allocations. ``process`` is ``engine``
+    (the bot) or ``web`` (this server).
+    """
+    from diagnostics.profiler import DiagnosticBusy, memory_growth
+    if process not in ("engine", "web"):
+        return JSONResponse({"error": "process must be 'engine' or 'web'"}, status_code=400)
+    try:
+        if process == "web":
+            return memory_growth(seconds, top, group_by, frames)
+        if _engine is None or not _engine.alive():
+            return JSONResponse({"error": "engine is not running"}, status_code=409)
+        return _engine.call("memory", timeout=min(seconds, 60) + 15,
+                            seconds=seconds, top=top, group_by=group_by, frames=frames)
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+    except DiagnosticBusy as e:
+        return JSONResponse({"error": str(e)}, status_code=409)
+    except EngineUnavailable as e:
+        return JSONResponse({"error": str(e)}, status_code=409)
+    except EngineCallError as e:
+        status_code = {"ValueError": 400, "DiagnosticBusy": 409}.get(e.kind, 500)
+        return JSONResponse({"error": str(e)}, status_code=status_code)
 
 
 # Optional: make `python webapp.py` start uvicorn automatically